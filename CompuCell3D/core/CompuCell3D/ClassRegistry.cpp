@@ -23,6 +23,7 @@
 
 #include "Simulator.h"
 #include "CC3DExceptions.h"
+#include <PublicUtilities/SimulationProfiler.h>
 
 
 
@@ -65,9 +66,16 @@ void ClassRegistry::start() {
 
 void ClassRegistry::step(const unsigned int currentStep) {
   ActiveSteppers_t::iterator it;
+  SimulationProfiler & profiler = simulator->getProfiler();
   for (it = activeSteppers.begin(); it != activeSteppers.end(); it++) {
-     if ((*it)->frequency && (currentStep % (*it)->frequency) == 0)
-      (*it)->step(currentStep);
+     if ((*it)->frequency && (currentStep % (*it)->frequency) == 0){
+       if (profiler.isEnabled()){
+         ProfilerTimer timer(&profiler, "Steppable", steppableTypeMap[*it]);
+         (*it)->step(currentStep);
+       }else{
+         (*it)->step(currentStep);
+       }
+     }
   }
 }
 
@@ -82,6 +90,7 @@ void ClassRegistry::finish() {
 void ClassRegistry::addStepper(std::string _type, Steppable *_steppable){
       activeSteppers.push_back(_steppable);
       activeSteppersMap[_type] = _steppable;
+      steppableTypeMap[_steppable] = _type;
 
 }
 
@@ -44,6 +44,9 @@ namespace CompuCell3D {
     typedef std::map<std::string, Steppable *> ActiveSteppersMap_t;
     ActiveSteppersMap_t activeSteppersMap;
 
+    // names under which steppables are reported by simulation profiler
+    std::map<Steppable *, std::string> steppableTypeMap;
+
 
     Simulator *simulator;
 
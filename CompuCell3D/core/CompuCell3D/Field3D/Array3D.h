@@ -196,6 +196,16 @@ class Array3DLinearFortranField3DAdapter:public Field3DImpl<float>{
 
 	  std::vector<double> & getContainerRef(){return container;}
 	  double * getContainerArrayPtr(){return &(container[0]);}	  
+	  virtual bool getStridedStorage(void *&_data, long _strides[3], size_t &_elementSize){
+		 if (container.empty())
+			 return false;
+		 _data=&(container[0]);
+		 _strides[0]=1;
+		 _strides[1]=internalDim.x;
+		 _strides[2]=internalDim.x*internalDim.y;
+		 _elementSize=sizeof(double);
+		 return true;
+	  }
 
       inline unsigned int index(int _x,int _y,int _z ) const{
         //return _x+1 + (_y+1+ (_z+1) * internalDim.y) * internalDim.x;
@@ -348,6 +358,16 @@ class Array2DLinearFortranField3DAdapter:public Field3DImpl<float>{
 	  }
 	  std::vector<double> & getContainerRef(){return container;}
 	  double * getContainerArrayPtr(){return &(container[0]);}
+	  virtual bool getStridedStorage(void *&_data, long _strides[3], size_t &_elementSize){
+		 if (container.empty())
+			 return false;
+		 _data=&(container[0]);
+		 _strides[0]=1;
+		 _strides[1]=internalDim.x;
+		 _strides[2]=0;
+		 _elementSize=sizeof(double);
+		 return true;
+	  }
 
       inline unsigned int index(int _x,int _y ) const{
         //return _x+1 + (_y+1) * internalDim.x;
@@ -784,6 +804,17 @@ public:
 	void allocateArray(const Dim3D & _dim , T val=T());
 	//       operator Type&();
 	ContainerType getContainer(){return arrayCont;}
+	virtual bool getStridedStorage(void *&_data, long _strides[3], size_t &_elementSize){
+		if (!arrayCont)
+			return false;
+		//current (not swap) array occupies every other z-layer
+		_data=&arrayCont[((borderWidth+shiftArray) + (((borderWidth+shiftArray) + ((2*borderWidth+shiftArray) * internalDim.y)) * internalDim.x))];
+		_strides[0]=1;
+		_strides[1]=internalDim.x;
+		_strides[2]=2*internalDim.x*internalDim.y;
+		_elementSize=sizeof(T);
+		return true;
+	}
 
 	//T & getDirect(int x,int y,int z){
 	//    return arrayCont[(x + ((y + (z * internalDim)) * internalDim))];
@@ -998,6 +1029,16 @@ public:
 	void allocateArray(const Dim3D & _dim , T val=static_cast<T>(0));
 	//       operator Type&();
 	ContainerType getContainer(){return arrayCont;}
+	virtual bool getStridedStorage(void *&_data, long _strides[3], size_t &_elementSize){
+		if (!arrayCont)
+			return false;
+		_data=&arrayCont[borderWidth*(internalDim.x)*(internalDim.y)+borderWidth*(internalDim.x)+borderWidth];
+		_strides[0]=1;
+		_strides[1]=internalDim.x;
+		_strides[2]=internalDim.x*internalDim.y;
+		_elementSize=sizeof(T);
+		return true;
+	}
 
 
 	T  get(int x,int y,int z) const {return getDirect(x+borderWidth,y+borderWidth,z+borderWidth);}
@@ -1149,6 +1190,17 @@ public:
 	virtual void resizeAndShift(const Dim3D newDim,  Dim3D shiftVec=Dim3D());
 	//       operator Type&();
 	ContainerType getContainer(){return arrayCont;}
+	virtual bool getStridedStorage(void *&_data, long _strides[3], size_t &_elementSize){
+		if (!arrayCont)
+			return false;
+		//current (not swap) array occupies every other row
+		_data=&arrayCont[borderWidth+shiftArray + (2*borderWidth+shiftArray)* internalDim.x];
+		_strides[0]=1;
+		_strides[1]=2*internalDim.x;
+		_strides[2]=0;
+		_elementSize=sizeof(T);
+		return true;
+	}
 
 
 	T  get(int x,int y) const {return getDirect(x+borderWidth,y+borderWidth);}
@@ -1347,6 +1399,17 @@ public:
 
 	//       operator Type&();
 	ContainerType getContainer(){return arrayCont;}
+	virtual bool getStridedStorage(void *&_data, long _strides[3], size_t &_elementSize){
+		if (!arrayCont)
+			return false;
+		//current (not swap) array occupies every other z-layer
+		_data=&arrayCont[((borderWidth+shiftArray) + (((borderWidth+shiftArray) + ((2*borderWidth+shiftArray) * internalDim.y)) * internalDim.x))];
+		_strides[0]=1;
+		_strides[1]=internalDim.x;
+		_strides[2]=2*internalDim.x*internalDim.y;
+		_elementSize=sizeof(T);
+		return true;
+	}
 
 	T  get(int x,int y,int z) const {return getDirect(x+borderWidth,y+borderWidth,z+borderWidth);}
 	void set(int x,int y,int z, T t){return setDirect(x+borderWidth,y+borderWidth,z+borderWidth,t);}
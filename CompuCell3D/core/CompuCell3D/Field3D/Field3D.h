@@ -150,6 +150,21 @@ namespace CompuCell3D {
      */
     virtual void setDim(const Dim3D theDim) {}
 	virtual void resizeAndShift(const Dim3D theDim,const Dim3D shiftVec) {}
+
+    /**
+     * Describes memory that stores field values so that it can be accessed directly (e.g. as a numpy array).
+     * Element at pt is stored at address
+     * _data + (pt.x * _strides[0] + pt.y * _strides[1] + pt.z * _strides[2]) * _elementSize
+     * Ghost (boundary) layers are skipped. The description is valid until the field is resized and, for solvers
+     * that swap arrays, until the next swap.
+     *
+     * @param _data Set on return to the address of the element at (0,0,0).
+     * @param _strides Set on return to the distances (in elements) between neighboring elements along x, y, z.
+     * @param _elementSize Set on return to the size (in bytes) of the stored element.
+     *
+     * @return False if field values are not stored in a single strided block of memory.
+     */
+    virtual bool getStridedStorage(void *&_data, long _strides[3], size_t &_elementSize) {return false;}
     
     virtual void clearSecData(){}
     //virtual std::vector<std::vector<int> > &  getDoNotDiffuseVec();
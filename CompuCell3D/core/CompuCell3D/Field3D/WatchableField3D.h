@@ -24,6 +24,7 @@
 #define WATCHABLEFIELD3D_H
 
 #include <vector>
+#include <algorithm>
 
 #include "Field3DImpl.h"
 #include "Field3DChangeWatcher.h"
@@ -53,6 +54,10 @@ namespace CompuCell3D {
       changeWatchers.push_back(watcher);
     }
 
+    virtual void removeChangeWatcher(Field3DChangeWatcher<T> *watcher) {
+      changeWatchers.erase(std::remove(changeWatchers.begin(), changeWatchers.end(), watcher), changeWatchers.end());
+    }
+
     virtual void set(const Point3D &pt, const T value) {
       T oldValue = Field3DImpl<T>::get(pt);
       Field3DImpl<T>::set(pt, value);
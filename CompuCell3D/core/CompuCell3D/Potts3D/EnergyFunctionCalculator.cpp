@@ -5,12 +5,16 @@
 #include <algorithm>
 
 #include "EnergyFunction.h"
+#include <PublicUtilities/ParallelUtilsOpenMP.h>
+#include <PublicUtilities/SimulationProfiler.h>
 
 using namespace CompuCell3D;
 using namespace std;
 
 EnergyFunctionCalculator::EnergyFunctionCalculator(){
    potts=0;
+   profilingEnabled=false;
+   pUtils=0;
 }
 
 EnergyFunctionCalculator::~EnergyFunctionCalculator(){
@@ -75,6 +79,20 @@ double EnergyFunctionCalculator::changeEnergy(Point3D &pt, const CellG *newCell,
 
 
   double change = 0;
+
+  if (profilingEnabled){
+    unsigned int workNodeNum = pUtils ? pUtils->getCurrentWorkNodeNumber() : 0;
+    vector<double> & timeVec = profilingTimeVec[workNodeNum];
+    vector<long long> & callsVec = profilingCallsVec[workNodeNum];
+    for (unsigned int i = 0; i < energyFunctions.size(); i++){
+      SimulationProfiler::Clock_t::time_point begin = SimulationProfiler::Clock_t::now();
+      change += energyFunctions[i]->changeEnergy(pt, newCell, oldCell);
+      timeVec[i] += SimulationProfiler::secondsSince(begin);
+      ++callsVec[i];
+    }
+    return change;
+  }
+
   for (unsigned int i = 0; i < energyFunctions.size(); i++){
     change += energyFunctions[i]->changeEnergy(pt, newCell, oldCell);
 		//cerr<<"CHANGE FROM ACCEPTANCE FUNCTION"<<change<<" FCNNAME="<<energyFunctionsNameVec[i]<<endl;
@@ -83,6 +101,37 @@ double EnergyFunctionCalculator::changeEnergy(Point3D &pt, const CellG *newCell,
 
 }
 
+void EnergyFunctionCalculator::setProfilingEnabled(bool _enabled, ParallelUtilsOpenMP *_pUtils){
+  profilingEnabled = _enabled;
+  pUtils = _pUtils;
+  if (!profilingEnabled) return;
+
+  unsigned int numberOfWorkNodes = pUtils ? pUtils->getMaxNumberOfWorkNodesPotts() : 1;
+  // energy functions may be registered or unregistered between MCS's
+  profilingTimeVec.resize(numberOfWorkNodes);
+  profilingCallsVec.resize(numberOfWorkNodes);
+  for (unsigned int i = 0; i < numberOfWorkNodes; ++i){
+    profilingTimeVec[i].assign(energyFunctions.size(), 0.0);
+    profilingCallsVec[i].assign(energyFunctions.size(), 0);
+  }
+}
+
+void EnergyFunctionCalculator::collectProfilingData(SimulationProfiler &_profiler){
+  if (!profilingEnabled) return;
+
+  for (unsigned int i = 0; i < energyFunctions.size(); ++i){
+    double time = 0.0;
+    long long calls = 0;
+    for (unsigned int j = 0; j < profilingTimeVec.size(); ++j){
+      time += profilingTimeVec[j][i];
+      calls += profilingCallsVec[j][i];
+      profilingTimeVec[j][i] = 0.0;
+      profilingCallsVec[j][i] = 0;
+    }
+    _profiler.addTime("EnergyFunction", energyFunctionsNameVec[i], time, calls);
+  }
+}
+
 void EnergyFunctionCalculator::checkEnergyFunction(EnergyFunction *_function) {
   if (!_function) throw CC3DException("registerEnergyFunction() function cannot be NULL!");
   if (!potts) throw CC3DException("Potts3D Pointer cannot be NULL!");
@@ -24,6 +24,10 @@ namespace CompuCell3D {
 
     class PottsTestData;
 
+    class ParallelUtilsOpenMP;
+
+    class SimulationProfiler;
+
     class EnergyFunctionCalculator {
 
     public:
@@ -122,6 +126,22 @@ namespace CompuCell3D {
          */
         virtual void log_output(PottsTestData &potts_test_data) {};
 
+        /**
+         * Turns on or off accumulation of run time and number of calls of every energy function. Accumulators are
+         * kept per work node so that no synchronization is needed during Metropolis sweep
+         * @param _enabled flag
+         * @param _pUtils parallel utils used to identify work node
+         */
+        virtual void setProfilingEnabled(bool _enabled, ParallelUtilsOpenMP *_pUtils = 0);
+
+        bool isProfilingEnabled() { return profilingEnabled; }
+
+        /**
+         * Adds values accumulated by all work nodes to "EnergyFunction" category of profiler and clears accumulators
+         * @param _profiler profiler
+         */
+        virtual void collectProfilingData(SimulationProfiler &_profiler);
+
 
     protected:
         std::vector<EnergyFunction *> energyFunctions;
@@ -133,6 +153,12 @@ namespace CompuCell3D {
         Simulator *sim;
 
         bool lastFlipAccepted;
+
+        bool profilingEnabled;
+        ParallelUtilsOpenMP *pUtils;
+        // [work node][energy function index]
+        std::vector<std::vector<double> > profilingTimeVec;
+        std::vector<std::vector<long long> > profilingCallsVec;
         /**
          * Validates energy function and current internal state. 
          * Throws a CC3DException if validation fails. 
@@ -40,10 +40,13 @@
 #include <CompuCell3D/Simulator.h>
 #include <PublicUtilities/StringUtils.h>
 #include <PublicUtilities/ParallelUtilsOpenMP.h>
+#include <PublicUtilities/SimulationProfiler.h>
 #include <deque>
 #include <sstream>
 #include <algorithm>
 #include <chrono>
+#include <unordered_map>
+#include <CompuCell3D/RandomNumberGenerators.h>
 #include "PottsTestData.h"
 
 #include "Potts3D.h"
@@ -66,7 +69,11 @@ Potts3D::Potts3D() :
     sim(0),
     automaton(0),
     temperature(0.0),
-    pUtils(0)
+    pUtils(0),
+    checkerboardBlockSize(16),
+    checkerboardInteractionRange(3),
+    checkerboardSeed(0),
+    boundaryPixelTrackerInitialized(false)
 
 {
     neighbors.assign(100, Point3D());//statically allocated this buffer maybe will come with something better later
@@ -94,7 +101,11 @@ Potts3D::Potts3D(const Dim3D dim) :
     sim(0),
     automaton(0),
     temperature(0.0),
-    pUtils(0)
+    pUtils(0),
+    checkerboardBlockSize(16),
+    checkerboardInteractionRange(3),
+    checkerboardSeed(0),
+    boundaryPixelTrackerInitialized(false)
 
 {
     neighbors.assign(100, Point3D());//statically allocated this buffer maybe will come with something better later
@@ -546,7 +557,25 @@ void Potts3D::runSteppers() {
 
 unsigned int Potts3D::metropolis(const unsigned int steps, const double temp) {
     temperature = temp;
-    return (this->*metropolisFcnPtr)(steps, temp);
+
+    SimulationProfiler *profiler = sim ? &sim->getProfiler() : 0;
+    if (!profiler || !profiler->isEnabled()) {
+        if (energyCalculator->isProfilingEnabled()) energyCalculator->setProfilingEnabled(false);
+        return (this->*metropolisFcnPtr)(steps, temp);
+    }
+
+    energyCalculator->setProfilingEnabled(true, pUtils);
+
+    SimulationProfiler::Clock_t::time_point begin = SimulationProfiler::Clock_t::now();
+    unsigned int result = (this->*metropolisFcnPtr)(steps, temp);
+    profiler->addTime("Potts", "Metropolis", SimulationProfiler::secondsSince(begin));
+
+    profiler->addCount("PixelCopies", "Attempted", numberOfAttempts);
+    profiler->addCount("PixelCopies", "AttemptedEnergyCalculations", attemptedEC);
+    profiler->addCount("PixelCopies", "Accepted", flips);
+    energyCalculator->collectProfilingData(*profiler);
+
+    return result;
 }
 
 unsigned int Potts3D::metropolisList(const unsigned int steps, const double temp) {
@@ -979,34 +1008,390 @@ unsigned int Potts3D::metropolisFast(const unsigned int steps, const double temp
 }
 
 ///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
-Point3D Potts3D::randomPickBoundaryPixel(RandomNumberGenerator * rand) {
+unsigned int Potts3D::metropolisCheckerboard(const unsigned int steps, const double temp) {
+
+    this->step_output = "";
+
+    if (!cellFieldG) throw CC3DException("Potts3D: cell field G not initialized");
+    if (!acceptanceFunction) throw CC3DException("Potts3D: You must supply an acceptance function!");
+
+    // fixed steppers run after every pixel copy attempt in the whole lattice which cannot be reproduced block by block
+    if (fixedSteppers.size())
+        throw CC3DException("Checkerboard algorithm does not support fixed steppers (e.g. PDESolverCaller). Please use Fast algorithm");
+
+    if (customAcceptanceExpressionDefined) {
+        customAcceptanceFunction.initialize(this->sim); //actual initialization will happen only once at MCS=0 all other calls will return without doing anything
+    }
+
+    if (!flipNeighborVec.size() || pUtils->getMaxNumberOfWorkNodesPotts() > flipNeighborVec.size()) {
+        flipNeighborVec.assign(pUtils->getMaxNumberOfWorkNodesPotts(), Point3D());
+    }
+
+    Dim3D fieldDim = cellFieldG->getDim();
+    if (!checkerboardColorBlockVec.size() || checkerboardFieldDim != fieldDim) {
+        initCheckerboardBlocks();
+    }
+
+    unsigned int currentStep = sim->getStep();
+
+    // colors are visited in random order - stream 0 of current MCS is reserved for it, blocks use streams 1,2,...
+    RandomNumberGeneratorPhilox colorOrderRand(checkerboardSeed);
+    colorOrderRand.setStream(currentStep, 0);
+
+    vector<unsigned int> colorOrderVec(checkerboardColorBlockVec.size());
+    for (unsigned int i = 0; i < colorOrderVec.size(); ++i) {
+        colorOrderVec[i] = i;
+    }
+    for (int i = (int)colorOrderVec.size() - 1; i > 0; --i) {
+        swap(colorOrderVec[i], colorOrderVec[colorOrderRand.getInteger(0, i)]);
+    }
+
+    currentAttempt = 0;
+    flips = 0;
+    attemptedEC = 0;
+    energy = 0.0;
+
+    numberOfAttempts = (int)fieldDim.x*fieldDim.y*fieldDim.z*sim->getFlip2DimRatio();
+
+    if (debugOutputFrequency && !(currentStep % debugOutputFrequency)) {
+        stringstream oss;
+
+        oss << "Metropolis Checkerboard" << endl;
+        oss << "total number of pixel copy attempts=" << numberOfAttempts << endl;
+        oss << "number of blocks=" << (checkerboardBlockEdgeVec[0].size() - 1)*(checkerboardBlockEdgeVec[1].size() - 1)*(checkerboardBlockEdgeVec[2].size() - 1)
+            << " number of colors=" << checkerboardColorBlockVec.size() << endl;
+        cerr << oss.str() << endl;
+        add_step_output(oss.str());
+    }
+
+    pUtils->prepareParallelRegionPotts();
+    pUtils->allowNestedParallelRegions(true); //necessary in case we use e.g. PDE solver caller which in turn calls parallel PDE solver
+
+    for (unsigned int c = 0; c < colorOrderVec.size(); ++c) {
+
+        // blocks of the same color that share cells are processed one after another by a single task
+        vector<vector<unsigned int> > taskVec = groupCheckerboardBlocks(checkerboardColorBlockVec[colorOrderVec[c]]);
+
+        // per-task accumulators are summed in task order so that totals do not depend on scheduling
+        vector<double> energyVec(taskVec.size(), 0.0);
+        vector<int> attemptedECVec(taskVec.size(), 0);
+        vector<int> flipsVec(taskVec.size(), 0);
+
+#pragma omp parallel for schedule(dynamic)
+        for (int t = 0; t < (int)taskVec.size(); ++t) {
+            for (unsigned int b = 0; b < taskVec[t].size(); ++b) {
+                runCheckerboardBlock(taskVec[t][b], currentStep, energyVec[t], attemptedECVec[t], flipsVec[t]);
+            }
+        }
+
+        for (unsigned int t = 0; t < taskVec.size(); ++t) {
+            energy += energyVec[t];
+            attemptedEC += attemptedECVec[t];
+            flips += flipsVec[t];
+        }
+    }
+
+    if (debugOutputFrequency && !(currentStep % debugOutputFrequency)) {
+        cerr << "Number of Attempted Energy Calculations=" << attemptedEC << endl;
+    }
+
+    return flips;
+}
+
+void Potts3D::initCheckerboardBlocks() {
+
+    if (checkerboardInteractionRange > checkerboardBlockSize)
+        throw CC3DException("Checkerboard algorithm: InteractionRange must not be greater than BlockSize");
+
+    if (!sim->ppdCC3DPtr->seed) {
+        srand(std::chrono::high_resolution_clock::now().time_since_epoch().count());
+        checkerboardSeed = (unsigned int)rand()*((std::numeric_limits<unsigned int>::max)() - 1);
+    }
+    else {
+        checkerboardSeed = sim->ppdCC3DPtr->seed;
+    }
+
+    checkerboardFieldDim = cellFieldG->getDim();
+
+    checkerboardPeriodicVec.assign(3, false);
+    checkerboardPeriodicVec[0] = boundary_x == "Periodic";
+    checkerboardPeriodicVec[1] = boundary_y == "Periodic";
+    checkerboardPeriodicVec[2] = boundary_z == "Periodic";
+
+    // every block is at least checkerboardBlockSize wide so that blocks of the same color never come closer than interaction range
+    checkerboardBlockEdgeVec.assign(3, vector<int>());
+    vector<unsigned int> colorsPerDim(3, 1);
+    for (int d = 0; d < 3; ++d) {
+        int dimSize = checkerboardFieldDim[d];
+        int numberOfBlocks = (std::max)(1, dimSize / (int)checkerboardBlockSize);
+
+        for (int i = 0; i <= numberOfBlocks; ++i) {
+            checkerboardBlockEdgeVec[d].push_back((int)((long long)i*dimSize / numberOfBlocks));
+        }
+
+        if (numberOfBlocks > 1) {
+            // with periodic boundaries odd number of blocks means first and last block are neighbors - last one gets third color
+            colorsPerDim[d] = (checkerboardPeriodicVec[d] && numberOfBlocks % 2) ? 3 : 2;
+        }
+    }
+
+    int nx = checkerboardBlockEdgeVec[0].size() - 1;
+    int ny = checkerboardBlockEdgeVec[1].size() - 1;
+    int nz = checkerboardBlockEdgeVec[2].size() - 1;
+
+    auto blockColor = [](int _idx, int _numberOfBlocks, unsigned int _colors) {
+        if (_colors == 3 && _idx == _numberOfBlocks - 1) return 2;
+        return _colors > 1 ? _idx % 2 : 0;
+    };
+
+    checkerboardColorBlockVec.assign(colorsPerDim[0] * colorsPerDim[1] * colorsPerDim[2], vector<unsigned int>());
+    for (int k = 0; k < nz; ++k)
+        for (int j = 0; j < ny; ++j)
+            for (int i = 0; i < nx; ++i) {
+                unsigned int color = blockColor(i, nx, colorsPerDim[0])
+                    + colorsPerDim[0] * (blockColor(j, ny, colorsPerDim[1]) + colorsPerDim[1] * blockColor(k, nz, colorsPerDim[2]));
+                checkerboardColorBlockVec[color].push_back(i + nx * (j + ny * k));
+            }
+}
+
+std::pair<Dim3D, Dim3D> Potts3D::getCheckerboardBlock(unsigned int _blockIdx) {
+    unsigned int nx = checkerboardBlockEdgeVec[0].size() - 1;
+    unsigned int ny = checkerboardBlockEdgeVec[1].size() - 1;
+
+    unsigned int i = _blockIdx % nx;
+    unsigned int j = (_blockIdx / nx) % ny;
+    unsigned int k = _blockIdx / (nx * ny);
 
-    size_t vec_size = boundaryPixelVector.size();
+    return make_pair(
+        Dim3D(checkerboardBlockEdgeVec[0][i], checkerboardBlockEdgeVec[1][j], checkerboardBlockEdgeVec[2][k]),
+        Dim3D(checkerboardBlockEdgeVec[0][i + 1], checkerboardBlockEdgeVec[1][j + 1], checkerboardBlockEdgeVec[2][k + 1])
+    );
+}
+
+void Potts3D::collectCheckerboardBlockCells(unsigned int _blockIdx, std::vector<CellG *> & _cells) {
+
+    // cells present in block extended by interaction range - the only cells pixel copies in the block can read or modify
+    pair<Dim3D, Dim3D> blockDims = getCheckerboardBlock(_blockIdx);
+    int range = checkerboardInteractionRange;
+
+    vector<vector<int> > coordinateVec(3);
+    for (int d = 0; d < 3; ++d) {
+        int dimSize = checkerboardFieldDim[d];
+        int minCoord = blockDims.first[d] - range;
+        int maxCoord = blockDims.second[d] + range;
+
+        if (!checkerboardPeriodicVec[d] || maxCoord - minCoord >= dimSize) {
+            minCoord = (std::max)(minCoord, 0);
+            maxCoord = (std::min)(maxCoord, dimSize);
+        }
+        for (int c = minCoord; c < maxCoord; ++c) {
+            coordinateVec[d].push_back((c + dimSize) % dimSize);
+        }
+    }
+
+    _cells.clear();
+    CellG *previousCell = 0;
     Point3D pt;
-    int counter = 0;
-    while (true) {
-        ++counter;
-        long boundaryPointIndex = rand->getInteger(0, boundaryPixelSet.size() - 1);
-        if (boundaryPointIndex < vec_size) {
-            pt = boundaryPixelVector[boundaryPointIndex];
+    for (int z : coordinateVec[2])
+        for (int y : coordinateVec[1])
+            for (int x : coordinateVec[0]) {
+                pt.x = x;
+                pt.y = y;
+                pt.z = z;
+                CellG *cell = cellFieldG->getQuick(pt);
+                if (cell && cell != previousCell) {
+                    _cells.push_back(cell);
+                }
+                previousCell = cell;
+            }
+
+    sort(_cells.begin(), _cells.end());
+    _cells.erase(unique(_cells.begin(), _cells.end()), _cells.end());
+}
+
+std::vector<std::vector<unsigned int> > Potts3D::groupCheckerboardBlocks(const std::vector<unsigned int> & _blocks) {
+
+    vector<vector<CellG *> > blockCellsVec(_blocks.size());
+
+#pragma omp parallel for schedule(dynamic)
+    for (int i = 0; i < (int)_blocks.size(); ++i) {
+        collectCheckerboardBlockCells(_blocks[i], blockCellsVec[i]);
+    }
+
+    // union-find where root is always the block with the lowest position in _blocks
+    vector<unsigned int> parentVec(_blocks.size());
+    for (unsigned int i = 0; i < parentVec.size(); ++i) {
+        parentVec[i] = i;
+    }
+    auto findRoot = [&parentVec](unsigned int _i) {
+        while (parentVec[_i] != _i) {
+            parentVec[_i] = parentVec[parentVec[_i]];
+            _i = parentVec[_i];
         }
-        else {
-            std::unordered_set<Point3D, Point3DHasher, Point3DComparator>::iterator sitr = justInsertedBoundaryPixelSet.begin();
-            advance(sitr, boundaryPointIndex - vec_size);
-            pt = *sitr;
+        return _i;
+    };
+
+    unordered_map<CellG *, unsigned int> cellBlockMap;
+    for (unsigned int i = 0; i < blockCellsVec.size(); ++i) {
+        for (CellG *cell : blockCellsVec[i]) {
+            auto mitr = cellBlockMap.insert(make_pair(cell, i));
+            if (!mitr.second) {
+                unsigned int root1 = findRoot(i);
+                unsigned int root2 = findRoot(mitr.first->second);
+                if (root1 < root2) parentVec[root2] = root1;
+                else parentVec[root1] = root2;
+            }
+        }
+    }
+
+    vector<vector<unsigned int> > taskVec;
+    vector<int> rootTaskVec(_blocks.size(), -1);
+    for (unsigned int i = 0; i < _blocks.size(); ++i) {
+        unsigned int root = findRoot(i);
+        if (rootTaskVec[root] < 0) {
+            rootTaskVec[root] = taskVec.size();
+            taskVec.push_back(vector<unsigned int>());
+        }
+        taskVec[rootTaskVec[root]].push_back(_blocks[i]);
+    }
+
+    return taskVec;
+}
+
+void Potts3D::runCheckerboardBlock(unsigned int _blockIdx, unsigned int _mcs, double & _energy, int & _attemptedEC, int & _flips) {
+
+    unsigned int currentWorkNodeNumber = pUtils->getCurrentWorkNodeNumber();
+    unsigned int numberOfThreads = pUtils->getNumberOfWorkNodesPotts();
+
+    RandomNumberGeneratorPhilox rand(checkerboardSeed);
+    rand.setStream(_mcs, _blockIdx + 1);
+
+    BoundaryStrategy * boundaryStrategy = BoundaryStrategy::getInstance();
+
+    pair<Dim3D, Dim3D> blockDims = getCheckerboardBlock(_blockIdx);
+    int numberOfAttemptsLocal = (int)(blockDims.second.x - blockDims.first.x)*(blockDims.second.y - blockDims.first.y)*(blockDims.second.z - blockDims.first.z)*sim->getFlip2DimRatio();
+
+    for (int i = 0; i < numberOfAttemptsLocal; ++i) {
+
+        // unlike metropolisFast change pixel is picked inside block and pixel whose cell is copied is its neighbor
+        // so that all writes stay inside the block
+        Point3D changePixel;
+        changePixel.x = rand.getInteger(blockDims.first.x, blockDims.second.x - 1);
+        changePixel.y = rand.getInteger(blockDims.first.y, blockDims.second.y - 1);
+        changePixel.z = rand.getInteger(blockDims.first.z, blockDims.second.z - 1);
+
+        CellG *changePixelCell = cellFieldG->getQuick(changePixel);
+
+        if (sizeFrozenTypeVec && changePixelCell) {///must also make sure that cell ptr is different 0; Will never freeze medium
+            if (checkIfFrozen(changePixelCell->type))
+                continue;
+        }
+
+        unsigned int directIdx = rand.getInteger(0, maxNeighborIndex);
 
+        Neighbor n = boundaryStrategy->getNeighborDirect(changePixel, directIdx);
+
+        if (!n.distance) {
+            //if distance is 0 then the neighbor returned is invalid
+            continue;
+        }
+        Point3D pt = n.pt;
+
+        CellG *cell = cellFieldG->getQuick(pt);
+
+        if (cell == changePixelCell) {
+            continue;
+        }
+
+        if (sizeFrozenTypeVec && cell) {///must also make sure that cell ptr is different 0; Will never freeze medium
+            if (checkIfFrozen(cell->type))
+                continue;
         }
-        if (justDeletedBoundaryPixelSet.find(pt) != justDeletedBoundaryPixelSet.end()) {
+        ++_attemptedEC;
 
+        flipNeighborVec[currentWorkNodeNumber] = pt;
+
+        double change = energyCalculator->changeEnergy(changePixel, cell, changePixelCell, i);
+
+        double motility = fluctAmplFcn->fluctuationAmplitude(cell, changePixelCell);
+
+        double prob = acceptanceFunction->accept(motility, change);
+
+        if (numberOfThreads == 1) {
+            energyCalculator->set_acceptance_probability(prob);
+        }
+
+        if (prob >= 1.0 || rand.getRatio() < prob) {
+
+            _energy += change;
+
+            if (connectivityConstraint && connectivityConstraint->changeEnergy(changePixel, cell, changePixelCell)) {
+                if (numberOfThreads == 1) {
+                    energyCalculator->setLastFlipAccepted(false);
+                }
+            }
+            else {
+                cellFieldG->set(changePixel, pt, cell);
+
+                ++_flips;
+                if (numberOfThreads == 1) {
+                    energyCalculator->setLastFlipAccepted(true);
+                }
+            }
         }
         else {
-            break;
+            if (numberOfThreads == 1) {
+                energyCalculator->setLastFlipAccepted(false);
+            }
         }
+
+        // Run steppers
+        for (unsigned int j = 0; j < steppers.size(); j++)
+            steppers[j]->step();
     }
-    if (counter > 5) {
-        cerr << "had to try more than 5 times" << endl;
+}
+
+///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+Point3D Potts3D::randomPickBoundaryPixel(RandomNumberGenerator * rand) {
+    return boundaryPixelVector[rand->getInteger(0, boundaryPixelVector.size() - 1)];
+}
+
+void Potts3D::insertBoundaryPixel(const Point3D & _pt) {
+    if (boundaryPixelIndexMap.insert(make_pair(_pt, boundaryPixelVector.size())).second) {
+        boundaryPixelVector.push_back(_pt);
+    }
+}
+
+void Potts3D::removeBoundaryPixel(const Point3D & _pt) {
+    auto mitr = boundaryPixelIndexMap.find(_pt);
+    if (mitr == boundaryPixelIndexMap.end()) return;
+
+    // last pixel takes place of removed one
+    size_t idx = mitr->second;
+    boundaryPixelIndexMap.erase(mitr);
+
+    if (idx != boundaryPixelVector.size() - 1) {
+        boundaryPixelVector[idx] = boundaryPixelVector.back();
+        boundaryPixelIndexMap[boundaryPixelVector[idx]] = idx;
     }
-    return pt;
+    boundaryPixelVector.pop_back();
+}
+
+void Potts3D::clearBoundaryPixels() {
+    boundaryPixelVector.clear();
+    boundaryPixelIndexMap.clear();
+}
+
+void Potts3D::initBoundaryPixelTracker() {
+    // BoundaryWalker needs boundary pixels tracked with at least Potts neighbor order. Tracker loaded here
+    // builds set of boundary pixels from current lattice in extraInit
+    bool pluginAlreadyRegisteredFlag;
+    Plugin *plugin = Simulator::pluginManager.get("GlobalBoundaryPixelTracker", &pluginAlreadyRegisteredFlag);
+    if (!pluginAlreadyRegisteredFlag) {
+        plugin->init(sim);
+        plugin->extraInit(sim);
+    }
+    boundaryPixelTrackerInitialized = true;
 }
 
 ///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
@@ -1058,6 +1443,11 @@ unsigned int Potts3D::metropolisBoundaryWalker(const unsigned int steps, const d
         throw CC3DException("BoundaryWalker Algorithm works only in single processor mode. Please change number of processors to 1");
 
     if (!cellFieldG) throw CC3DException("Potts3D: cell field G not initialized");
+    if (!acceptanceFunction) throw CC3DException("Potts3D: You must supply an acceptance function!");
+
+    if (!boundaryPixelTrackerInitialized) {
+        initBoundaryPixelTracker();
+    }
 
     if (customAcceptanceExpressionDefined) {
         customAcceptanceFunction.initialize(this->sim); //actual initialization will happen only once at MCS=0 all other calls will return without doing anything
@@ -1073,230 +1463,133 @@ unsigned int Potts3D::metropolisBoundaryWalker(const unsigned int steps, const d
         flipNeighborVec.assign(pUtils->getMaxNumberOfWorkNodesPotts(), Point3D());
     }
 
-    // generating random order in which subgridSections will be handled
-    vector<unsigned int> subgridSectionOrderVec(pUtils->getNumberOfSubgridSectionsPotts());
-    for (int i = 0; i < subgridSectionOrderVec.size(); ++i) {
-        subgridSectionOrderVec[i] = i;
-    }
-    random_shuffle(subgridSectionOrderVec.begin(), subgridSectionOrderVec.end());
-
-
-    unsigned int maxNumberOfThreads = pUtils->getMaxNumberOfWorkNodesPotts();
-    unsigned int numberOfThreads = pUtils->getNumberOfWorkNodesPotts();
-
-    unsigned int numberOfSections = pUtils->getNumberOfSubgridSectionsPotts();
-
     //reset current attepmt counter
     currentAttempt = 0;
 
-    //THESE VARIABLES ARE SHARED
     flips = 0;
     attemptedEC = 0;
     energy = 0.0;
 
-    //THESE WILL BE USED IN SEPARATE THREADS - WE USE VECTORS TO AVOID USING SYNCHRONIZATION EXPLICITELY
-    vector<double> energyVec(maxNumberOfThreads, 0.0);
-    vector<int>	attemptedECVec(maxNumberOfThreads, 0);
-    vector<int> flipsVec(maxNumberOfThreads, 0);
-
-    Dim3D dim = cellFieldG->getDim();
-    if (!acceptanceFunction) throw CC3DException("Potts3D: You must supply an acceptance function!");
-
-    //FOR NOW WE WILL IGNORE BOX WATCHER FOR POTTS SECTION IT WILL STILL WORK WITH PDE SOLVERS
+    // number of attempts is the same as in Fast algorithm. Attempts whose pixel is not a boundary pixel can never
+    // change lattice - instead of drawing them we skip over them. Number of such attempts preceding next boundary
+    // pixel attempt follows geometric distribution with success probability equal to fraction of boundary pixels
     Dim3D fieldDim = cellFieldG->getDim();
+    double latticeVolume = (double)fieldDim.x*fieldDim.y*fieldDim.z;
     numberOfAttempts = (int)fieldDim.x*fieldDim.y*fieldDim.z*sim->getFlip2DimRatio();
     unsigned int currentStep = sim->getStep();
 
-
-    pUtils->prepareParallelRegionPotts();
-
-    //necessary in case we use e.g. PDE solver caller which in turn calls parallel PDE solver
-    //omp_set_nested(true);
-    pUtils->allowNestedParallelRegions(true);
-
-    long boundaryPointIndex;
-    long counter = 0;
-    //set<Point3D>::iterator sitr;
-    std::unordered_set<Point3D, Point3DHasher, Point3DComparator>::iterator sitr;
-    vector<Point3D> boundaryPointVector;
-    //boundaryPointVector.assign(boundaryPixelSet.begin(), boundaryPixelSet.end());
-    numberOfAttempts = boundaryPixelSet.size();
     if (debugOutputFrequency && !(currentStep % debugOutputFrequency)) {
 
         stringstream oss;
 
         oss << "Boundary Walker" << endl;
-        oss << "number of pixel copy attempts=" << numberOfAttempts << endl;
+        oss << "total number of pixel copy attempts=" << numberOfAttempts << endl;
+        oss << "number of boundary pixels=" << boundaryPixelVector.size() << endl;
         cerr << oss.str() << endl;
         add_step_output(oss.str());
 
     }
 
-#pragma omp parallel
-    {
-
-        int currentAttemptLocal;
-        //int numberOfAttemptsLocal;
-        Point3D flipNeighborLocal;
-
-        unsigned int currentWorkNodeNumber = pUtils->getCurrentWorkNodeNumber();
-
-        RandomNumberGenerator * rand = randNSVec[currentWorkNodeNumber];
-        BoundaryStrategy * boundaryStrategy = BoundaryStrategy::getInstance();
-
-        //iterating over subgridSections
-        for (int s = 0; s < subgridSectionOrderVec.size(); ++s) {
-
-            pair<Dim3D, Dim3D> sectionDims = pUtils->getPottsSection(currentWorkNodeNumber, s);
-            //numberOfAttemptsLocal = (int)(sectionDims.second.x - sectionDims.first.x)*(sectionDims.second.y - sectionDims.first.y)*(sectionDims.second.z - sectionDims.first.z)*sim->getFlip2DimRatio();
-
-            // #pragma omp critical
-
-
-            for (unsigned int i = 0; i < numberOfAttempts; ++i) {
-
-
-
-                //////currentAttempt=i;
-                //currentAttemptLocal=i; //this will need to be fixed as this is used in PDE SOLVER CALLER
-                //run fixed steppers - they are executed regardless whether spin flip take place or not . Note, regular stepers are executed only after spin flip attepmts takes place 
-
-                if (fixedSteppers.size()) {
-#pragma omp critical
-                {
-                    //IMPORTANT: fixed steppers cause really bad performance with multiple processor runs. Currently only two of them are supported 
-                    // PDESolverCaller plugin and Secretion plugin. PDESolverCaller is deprecated and Secretion plugin section that mimics functionality of PDE sovler Secretion data section is depreecated as well
-                    // However Secretion plugin can be used to do "per cell" secretion (using python scripting). This will not slow down multicore simulation
-
-                    //cerr<<"pUtils->getCurrentWorkNodeNumber()="<<pUtils->getCurrentWorkNodeNumber()<<" currentAttempt="<<currentAttempt<<endl;
-                    for (unsigned int j = 0; j < fixedSteppers.size(); j++)
-                        fixedSteppers[j]->step();
-
-                    ++currentAttempt; //to be consistent with serial code currentAttampt has to be increamented after fixedSteppers run 
-
-                }
-                }
-
-                Point3D pt;
-
-                //boundaryPointVector.assign(boundaryPixelSet.begin(), boundaryPixelSet.end());
-
-                // Pick a random integer and pick a random point from a boundary
-                pt = randomPickBoundaryPixel(rand);
+    pUtils->allowNestedParallelRegions(true); //necessary in case we use e.g. PDE solver caller which in turn calls parallel PDE solver
 
-                //////boundaryPointIndex = rand->getInteger(0, boundaryPixelSet.size() - 1);
-                //////sitr = boundaryPixelSet.begin();
-                //////
-                //////advance(sitr, boundaryPointIndex);
-                //////continue;
-                //////pt = *sitr;
+    unsigned int currentWorkNodeNumber = pUtils->getCurrentWorkNodeNumber();
+    RandomNumberGenerator * rand = randNSVec[currentWorkNodeNumber];
+    BoundaryStrategy * boundaryStrategy = BoundaryStrategy::getInstance();
 
-                //pt = boundaryPointVector[boundaryPointIndex];
+    for (unsigned int i = 0; i < numberOfAttempts; ++i) {
 
+        size_t numberOfBoundaryPixels = boundaryPixelVector.size();
 
-                //boundaryPointVector.assign(boundaryPixelSet.begin(), boundaryPixelSet.end());
+        if (numberOfBoundaryPixels < latticeVolume) {
+            double skippedAttempts = numberOfAttempts - i;
+            if (numberOfBoundaryPixels) {
+                skippedAttempts = (std::min)(skippedAttempts, floor(log(1.0 - rand->getRatio()) / log1p(-numberOfBoundaryPixels / latticeVolume)));
+            }
 
-                //// Pick a random integer and pick a random point from a boundary
-                //boundaryPointIndex = rand->getInteger(0, boundaryPointVector.size() - 1);
-                //pt = boundaryPointVector[boundaryPointIndex];
+            //fixed steppers are executed regardless whether spin flip take place or not
+            for (unsigned int s = 0; s < (unsigned int)skippedAttempts; ++s) {
+                for (unsigned int j = 0; j < fixedSteppers.size(); j++)
+                    fixedSteppers[j]->step();
+                ++currentAttempt;
+            }
 
-                CellG *cell = cellFieldG->getQuick(pt);
+            i += (unsigned int)skippedAttempts;
+            if (i >= numberOfAttempts) break;
+        }
 
-                if (sizeFrozenTypeVec && cell) {///must also make sure that cell ptr is different 0; Will never freeze medium
-                    if (checkIfFrozen(cell->type))
-                        continue;
-                }
+        //run fixed steppers - they are executed regardless whether spin flip take place or not . Note, regular stepers are executed only after spin flip attepmts takes place 
+        for (unsigned int j = 0; j < fixedSteppers.size(); j++)
+            fixedSteppers[j]->step();
+        ++currentAttempt;
 
-                unsigned int directIdx = rand->getInteger(0, maxNeighborIndex);
+        // Pick a random point from a boundary
+        Point3D pt = randomPickBoundaryPixel(rand);
 
-                Neighbor n = boundaryStrategy->getNeighborDirect(pt, directIdx);
+        CellG *cell = cellFieldG->getQuick(pt);
 
-                if (!n.distance) {
-                    //if distance is 0 then the neighbor returned is invalid
-                    continue;
-                }
-                Point3D changePixel = n.pt;
+        if (sizeFrozenTypeVec && cell) {///must also make sure that cell ptr is different 0; Will never freeze medium
+            if (checkIfFrozen(cell->type))
+                continue;
+        }
 
-                //check if changePixel refers to different cell. 
-                CellG* changePixelCell = cellFieldG->getQuick(changePixel);
+        unsigned int directIdx = rand->getInteger(0, maxNeighborIndex);
 
-                if (changePixelCell == cell) {
-                    continue;//skip the rest of the loop if change pixel points to the same cell as pt
-                }
+        Neighbor n = boundaryStrategy->getNeighborDirect(pt, directIdx);
 
-                if (sizeFrozenTypeVec && changePixelCell) {///must also make sure that cell ptr is different 0; Will never freeze medium
-                    if (checkIfFrozen(changePixelCell->type))
-                        continue;
-                }
-                ++attemptedECVec[currentWorkNodeNumber];
+        if (!n.distance) {
+            //if distance is 0 then the neighbor returned is invalid
+            continue;
+        }
+        Point3D changePixel = n.pt;
 
-                flipNeighborVec[currentWorkNodeNumber] = pt;
+        //check if changePixel refers to different cell. 
+        CellG* changePixelCell = cellFieldG->getQuick(changePixel);
 
+        if (changePixelCell == cell) {
+            continue;//skip the rest of the loop if change pixel points to the same cell as pt
+        }
 
-                /// change takes place at change pixel  and pt is a neighbor of changePixel
-                // Calculate change in energy
-                double change = energyCalculator->changeEnergy(changePixel, cell, changePixelCell, i);
+        if (sizeFrozenTypeVec && changePixelCell) {///must also make sure that cell ptr is different 0; Will never freeze medium
+            if (checkIfFrozen(changePixelCell->type))
+                continue;
+        }
+        ++attemptedEC;
 
-                // Acceptance based on probability
-                double motility = fluctAmplFcn->fluctuationAmplitude(cell, changePixelCell);
+        flipNeighborVec[currentWorkNodeNumber] = pt;
 
-                double prob = acceptanceFunction->accept(motility, change);
+        /// change takes place at change pixel  and pt is a neighbor of changePixel
+        // Calculate change in energy
+        double change = energyCalculator->changeEnergy(changePixel, cell, changePixelCell, i);
 
+        // Acceptance based on probability
+        double motility = fluctAmplFcn->fluctuationAmplitude(cell, changePixelCell);
 
-                if (numberOfThreads == 1) {
-                    energyCalculator->set_acceptance_probability(prob);
-                }
+        double prob = acceptanceFunction->accept(motility, change);
 
-                if (prob >= 1.0 || rand->getRatio() < prob) {
+        energyCalculator->set_acceptance_probability(prob);
 
-                    // Accept the change
-                    energyVec[currentWorkNodeNumber] += change;
+        if (prob >= 1.0 || rand->getRatio() < prob) {
 
-                    if (connectivityConstraint && connectivityConstraint->changeEnergy(changePixel, cell, changePixelCell)) {
-                        if (numberOfThreads == 1) {
-                            energyCalculator->setLastFlipAccepted(false);
-                        }
-                    }
-                    else {
-                        cellFieldG->set(changePixel, flipNeighborVec[currentWorkNodeNumber], cell);
-                        flipsVec[currentWorkNodeNumber]++;
-                        if (numberOfThreads == 1) {
-                            energyCalculator->setLastFlipAccepted(true);
-                        }
-                    }
-                }
-                else {
-                    if (numberOfThreads == 1) {
-                        energyCalculator->setLastFlipAccepted(false);
-                    }
-                }
+            // Accept the change
+            energy += change;
 
-                // Run steppers
-                //#pragma omp single 
-                {
-                    for (unsigned int j = 0; j < steppers.size(); j++)
-                        steppers[j]->step();
-                }
+            if (connectivityConstraint && connectivityConstraint->changeEnergy(changePixel, cell, changePixelCell)) {
+                energyCalculator->setLastFlipAccepted(false);
             }
-
-#pragma omp barrier
-        }//iteration over subrid sections
-
-#pragma omp critical
-        {
-
-            energy += energyVec[currentWorkNodeNumber];
-            attemptedEC += attemptedECVec[currentWorkNodeNumber];
-            flips += flipsVec[currentWorkNodeNumber];
-
-            //reseting values before processing new slice
-
-            energyVec[currentWorkNodeNumber] = 0.0;
-            attemptedECVec[currentWorkNodeNumber] = 0;
-            flipsVec[currentWorkNodeNumber] = 0;
+            else {
+                cellFieldG->set(changePixel, pt, cell);
+                flips++;
+                energyCalculator->setLastFlipAccepted(true);
+            }
+        }
+        else {
+            energyCalculator->setLastFlipAccepted(false);
         }
 
-    } //pragma omp parallel
+        // Run steppers
+        for (unsigned int j = 0; j < steppers.size(); j++)
+            steppers[j]->step();
+    }
 
     if (debugOutputFrequency && !(currentStep % debugOutputFrequency)) {
         cerr << "Number of Attempted Energy Calculations=" << attemptedEC << endl;
@@ -1388,12 +1681,27 @@ void Potts3D::setMetropolisAlgorithm(std::string _algName) {
     else if (algName == "testrun") {
         metropolisFcnPtr = &Potts3D::metropolisTestRun;
     }
+    else if (algName == "checkerboard") {
+        metropolisFcnPtr = &Potts3D::metropolisCheckerboard;
+    }
     else {
         metropolisFcnPtr = &Potts3D::metropolisFast;
     }
 
 }
 
+void Potts3D::setCheckerboardParameters(unsigned int _blockSize, unsigned int _interactionRange) {
+
+    if (!_blockSize) throw CC3DException("Checkerboard algorithm: BlockSize must be positive");
+    if (_interactionRange > _blockSize)
+        throw CC3DException("Checkerboard algorithm: InteractionRange must not be greater than BlockSize");
+
+    checkerboardBlockSize = _blockSize;
+    checkerboardInteractionRange = _interactionRange;
+    //forces new decomposition at next call to metropolisCheckerboard
+    checkerboardColorBlockVec.clear();
+}
+
 
 //////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
 
@@ -131,16 +131,14 @@ namespace CompuCell3D {
 
 		std::map<std::string, EnergyFunction *> nameToEnergyFunctionMap;
 
-		//containers associated with BoundaryWalker/GlobalPixelTracker
-		//std::set<Point3D> boundaryPixelSet;
-		//std::set<Point3D>  justInsertedBoundaryPixelSet;
-		//std::set<Point3D>  justDeletedBoundaryPixelSet;
-
-		std::unordered_set<Point3D, Point3DHasher, Point3DComparator> boundaryPixelSet;
-		std::unordered_set<Point3D, Point3DHasher, Point3DComparator> justInsertedBoundaryPixelSet;
-		std::unordered_set<Point3D, Point3DHasher, Point3DComparator> justDeletedBoundaryPixelSet;
+		//containers associated with BoundaryWalker/GlobalBoundaryPixelTracker
+		//boundary pixels are stored in a vector so that they can be picked uniformly in constant time.
+		//Map stores position of every boundary pixel in the vector so that removal is constant time as well
 		std::vector<Point3D> boundaryPixelVector;
+		std::unordered_map<Point3D, size_t, Point3DHasher, Point3DComparator> boundaryPixelIndexMap;
+		bool boundaryPixelTrackerInitialized;
 		Point3D randomPickBoundaryPixel(RandomNumberGenerator * rand);
+		void initBoundaryPixelTracker();
 
 
 
@@ -216,6 +214,22 @@ namespace CompuCell3D {
 		double temperature;
 		ParallelUtilsOpenMP *pUtils;
 
+		//checkerboard algorithm - lattice is divided into blocks whose size does not depend on number of threads.
+		//Blocks of the same color are separated by at least one block and are processed concurrently
+		unsigned int checkerboardBlockSize;
+		unsigned int checkerboardInteractionRange;
+		unsigned int checkerboardSeed;
+		Dim3D checkerboardFieldDim;
+		std::vector<std::vector<int> > checkerboardBlockEdgeVec;
+		std::vector<bool> checkerboardPeriodicVec;
+		std::vector<std::vector<unsigned int> > checkerboardColorBlockVec;
+
+		void initCheckerboardBlocks();
+		std::pair<Dim3D, Dim3D> getCheckerboardBlock(unsigned int _blockIdx);
+		void collectCheckerboardBlockCells(unsigned int _blockIdx, std::vector<CellG *> & _cells);
+		std::vector<std::vector<unsigned int> > groupCheckerboardBlocks(const std::vector<unsigned int> & _blocks);
+		void runCheckerboardBlock(unsigned int _blockIdx, unsigned int _mcs, double & _energy, int & _attemptedEC, int & _flips);
+
 	public:
 
 		Potts3D();
@@ -241,31 +255,18 @@ namespace CompuCell3D {
 
 		bool checkIfFrozen(unsigned char _type);
 
-		//std::set<Point3D> * getBoundaryPixelSetPtr() { return &boundaryPixelSet; }
-		std::unordered_set<Point3D, Point3DHasher, Point3DComparator> * getBoundaryPixelSetPtr() { return &boundaryPixelSet; }
-
-		std::unordered_set<Point3D, Point3DHasher, Point3DComparator> *  getJustInsertedBoundaryPixelSetPtr() {
-			return &justInsertedBoundaryPixelSet;
-
-		}
-
-		std::unordered_set<Point3D, Point3DHasher, Point3DComparator> * getJustDeletedBoundaryPixelSetPtr() {
-			return &justDeletedBoundaryPixelSet;
-		}
-
-		//std::set<Point3D> *  getJustInsertedBoundaryPixelSetPtr() {
-		//	return &justInsertedBoundaryPixelSet;
-
-		//}
-
-		//std::set<Point3D> * getJustDeletedBoundaryPixelSetPtr() {
-		//	return &justDeletedBoundaryPixelSet;
-		//}
+		//boundary pixels - pixels with at least one neighbor belonging to a different cell - are maintained by GlobalBoundaryPixelTracker
+		void insertBoundaryPixel(const Point3D & _pt);
+		void removeBoundaryPixel(const Point3D & _pt);
+		bool isBoundaryPixel(const Point3D & _pt) { return boundaryPixelIndexMap.find(_pt) != boundaryPixelIndexMap.end(); }
+		void clearBoundaryPixels();
 
 		std::vector<Point3D> * getBoundaryPixelVectorPtr() {
 			return &boundaryPixelVector;
 		}
 
+		unsigned int getMaxNeighborIndex() { return maxNeighborIndex; }
+
         void add_step_output(const std::string &s);
 
         std::string get_step_output();
@@ -457,8 +458,23 @@ namespace CompuCell3D {
 		unsigned int metropolisFast(const unsigned int steps, const double temp);
 		unsigned int metropolisBoundaryWalker(const unsigned int steps, const double temp);
         unsigned int metropolisTestRun(const unsigned int steps, const double temp);
+		/**
+		 * Sublattice (checkerboard) parallel metropolis. Every block of lattice draws random numbers from its own
+		 * counter-based stream keyed by random seed, MCS and block index so for a fixed seed trajectory
+		 * does not depend on number of threads
+		 */
+		unsigned int metropolisCheckerboard(const unsigned int steps, const double temp);
 		void setMetropolisAlgorithm(std::string _algName);
 
+		/**
+		 * @param _blockSize edge length of checkerboard blocks
+		 * @param _interactionRange largest distance (in pixels along each axis) between pixel copy target and any
+		 * pixel read by Potts or energy terms - must not exceed block size
+		 */
+		void setCheckerboardParameters(unsigned int _blockSize, unsigned int _interactionRange);
+		unsigned int getCheckerboardBlockSize() { return checkerboardBlockSize; }
+		unsigned int getCheckerboardInteractionRange() { return checkerboardInteractionRange; }
+
 		/// @return A pointer to the potts cell field.
 
 
@@ -99,6 +99,64 @@ double RandomNumberGeneratorLegacy::getRatio() {
     return mj * CC3DPRNG_FAC;
 }
 
+RandomNumberGeneratorPhilox::RandomNumberGeneratorPhilox() {
+    setSeed(1);
+}
+
+RandomNumberGeneratorPhilox::RandomNumberGeneratorPhilox(const unsigned int& seed) {
+    setSeed(seed);
+}
+
+void RandomNumberGeneratorPhilox::setSeed(const unsigned int& _seed) {
+    seed = _seed;
+    key[0] = _seed;
+    key[1] = 0;
+    setStream(0, 0, 0);
+}
+
+void RandomNumberGeneratorPhilox::setStream(const uint32_t& _s0, const uint32_t& _s1, const uint32_t& _s2) {
+    counter[0] = _s0;
+    counter[1] = _s1;
+    counter[2] = _s2;
+    counter[3] = 0;
+    outputPos = 4;
+}
+
+void RandomNumberGeneratorPhilox::generateBlock() {
+    uint32_t ctr[4] = {counter[0], counter[1], counter[2], counter[3]};
+    uint32_t k0 = key[0];
+    uint32_t k1 = key[1];
+
+    for (int round = 0; round < 10; ++round) {
+        uint64_t p0 = uint64_t(0xD2511F53) * ctr[0];
+        uint64_t p1 = uint64_t(0xCD9E8D57) * ctr[2];
+
+        uint32_t x0 = uint32_t(p1 >> 32) ^ ctr[1] ^ k0;
+        uint32_t x1 = uint32_t(p1);
+        uint32_t x2 = uint32_t(p0 >> 32) ^ ctr[3] ^ k1;
+        uint32_t x3 = uint32_t(p0);
+
+        ctr[0] = x0;
+        ctr[1] = x1;
+        ctr[2] = x2;
+        ctr[3] = x3;
+
+        k0 += 0x9E3779B9;
+        k1 += 0xBB67AE85;
+    }
+
+    for (int i = 0; i < 4; ++i) output[i] = ctr[i];
+    outputPos = 0;
+
+    // last counter word enumerates blocks within stream
+    if (!++counter[3]) ++counter[2];
+}
+
+double RandomNumberGeneratorPhilox::getRatio() {
+    if (outputPos == 4) generateBlock();
+    return output[outputPos++] * (1.0 / 4294967296.0);
+}
+
 RandomNumberGenerator* RandomNumberGeneratorFactory::generateRandomNumberGenerator(const unsigned int& seed) {
 
     switch (type) {
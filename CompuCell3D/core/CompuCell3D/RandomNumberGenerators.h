@@ -1,6 +1,7 @@
 #ifndef RANDOMNUMBERGENERATOR_H
 #define RANDOMNUMBERGENERATOR_H
 
+#include <cstdint>
 #include <random>
 #include <string>
 #include <sys/timeb.h>
@@ -83,6 +84,35 @@ namespace CompuCell3D {
 
     };
 
+    // Counter-based Philox4x32-10 generator (Salmon et al., SC'11). Numbers depend only on the key (seed) and on
+    // the counter, so independent streams can be selected using setStream e.g. by MCS and lattice partition,
+    // regardless of which thread draws them
+    class RandomNumberGeneratorPhilox: public RandomNumberGenerator {
+
+        uint32_t key[2];
+        uint32_t counter[4];
+        uint32_t output[4];
+        unsigned int outputPos;
+
+        void generateBlock();
+
+    public:
+
+        RandomNumberGeneratorPhilox();
+        RandomNumberGeneratorPhilox(const unsigned int& seed);
+
+        void setSeed(const unsigned int& _seed);
+
+        /**
+         * @brief Selects stream of random numbers. The same seed and stream always produce the same sequence
+         */
+        void setStream(const uint32_t& _s0, const uint32_t& _s1 = 0, const uint32_t& _s2 = 0);
+
+        double getRatio();
+        std::string name() { return "Philox"; }
+
+    };
+
     // Random number generator factory
     class RandomNumberGeneratorFactory {
 
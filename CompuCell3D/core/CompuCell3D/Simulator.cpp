@@ -392,6 +392,8 @@ void Simulator::step(const unsigned int currentStep) {
 		//    for (std::map<std::string,SteerableObject *>::iterator mitr=steerableObjectMap.begin() ; mitr!=steerableObjectMap.end() ; ++mitr){
 		//       cerr<<"Module "<<mitr->first <<" toString() "<< mitr->second->toString()<<endl;
 		//    }
+		if (profiler.isEnabled()) profiler.beginStep(currentStep);
+
 		// Run potts metropolis
 		Dim3D dim = potts.getCellFieldG()->getDim();
 		int flipAttempts = (int)(dim.x * dim.y * dim.z * ppdCC3DPtr->flip2DimRatio); //may be a member
@@ -723,6 +725,14 @@ void Simulator::initializePottsCC3D(CC3DXMLElement * _xmlData){
 		potts.setMetropolisAlgorithm(metropolisAlgorithmName);
 	}
 
+	// e.g. <MetropolisAlgorithm BlockSize="16" InteractionRange="3">Checkerboard</MetropolisAlgorithm>
+	CC3DXMLElement* metropolisAlgorithmEl = _xmlData->getFirstElement("MetropolisAlgorithm");
+	if (metropolisAlgorithmEl && (metropolisAlgorithmEl->findAttribute("BlockSize") || metropolisAlgorithmEl->findAttribute("InteractionRange"))) {
+		unsigned int blockSize = metropolisAlgorithmEl->findAttribute("BlockSize") ? metropolisAlgorithmEl->getAttributeAsUInt("BlockSize") : potts.getCheckerboardBlockSize();
+		unsigned int interactionRange = metropolisAlgorithmEl->findAttribute("InteractionRange") ? metropolisAlgorithmEl->getAttributeAsUInt("InteractionRange") : potts.getCheckerboardInteractionRange();
+		potts.setCheckerboardParameters(blockSize, interactionRange);
+	}
+
 	RandomNumberGeneratorFactory::Type rngType = RandomNumberGeneratorFactory::DEFAULT;
 	CC3DXMLElement* rngEl = _xmlData->getFirstElement("RandomNumberGenerator");
 	if (rngEl && rngEl->findAttribute("Name")) {
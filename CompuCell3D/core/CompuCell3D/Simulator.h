@@ -41,6 +41,7 @@
 #include <CompuCell3D/PottsParseData.h>
 #include <CompuCell3D/ParserStorage.h>
 #include <CompuCell3D/CC3DEvents.h>
+#include <PublicUtilities/SimulationProfiler.h>
 //#include <QtWrappers/StreamRedirectors/CustomStreamBuffers.h>
 
 
@@ -83,6 +84,7 @@ namespace CompuCell3D {
 		bool restartEnabled;
         std::string step_output;
 		RandomNumberGeneratorFactory rngFactory;
+		SimulationProfiler profiler;
 
 	public:
 
@@ -165,6 +167,8 @@ namespace CompuCell3D {
 		Potts3D *getPotts() {return &potts;}
 		Simulator *getSimulatorPtr(){return this;}
 		ClassRegistry *getClassRegistry() {return classRegistry;}
+		// run times of energy functions, steppables and PDE solvers - collected only when profiler is enabled
+		SimulationProfiler & getProfiler() {return profiler;}
 
         std::string formatErrorMessage(const CC3DException &e);
 
@@ -33,12 +33,7 @@ GlobalBoundaryPixelTrackerPlugin::GlobalBoundaryPixelTrackerPlugin() :
 	simulator(0),
 	potts(0),
 	boundaryStrategy(0),
-	container_refresh_fraction(0.20),
-	xmlData(0),
-	boundaryPixelSetPtr(0),
-	justInsertedBoundaryPixelSetPtr(0),
-	justDeletedBoundaryPixelSetPtr(0), 
-	boundaryPixelVectorPtr(0)
+	xmlData(0)
 {}
 
 GlobalBoundaryPixelTrackerPlugin::~GlobalBoundaryPixelTrackerPlugin() {
@@ -68,6 +63,8 @@ void GlobalBoundaryPixelTrackerPlugin::init(Simulator *_simulator, CC3DXMLElemen
 ///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
 void GlobalBoundaryPixelTrackerPlugin::extraInit(Simulator *simulator) {
 	update(xmlData, true);
+	//plugin may be loaded after cells were created e.g. by BoundaryWalker algorithm
+	refreshBoundaryPixels();
 }
 
 ///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
@@ -78,7 +75,10 @@ void GlobalBoundaryPixelTrackerPlugin::update(CC3DXMLElement *_xmlData, bool _fu
 	boundaryStrategy = BoundaryStrategy::getInstance();
 	maxNeighborIndex = 0;
 
-	if (_xmlData->getFirstElement("Depth")) {
+	if (!_xmlData) {
+		maxNeighborIndex = boundaryStrategy->getMaxNeighborIndexFromNeighborOrder(1);
+	}
+	else if (_xmlData->getFirstElement("Depth")) {
 		maxNeighborIndex = boundaryStrategy->getMaxNeighborIndexFromDepth(_xmlData->getFirstElement("Depth")->getDouble());
 		//cerr<<"got here will do depth"<<endl;
 	}
@@ -95,11 +95,9 @@ void GlobalBoundaryPixelTrackerPlugin::update(CC3DXMLElement *_xmlData, bool _fu
 
 	}
 
-	//assigning containers defined in Potts3D
-	boundaryPixelSetPtr = potts->getBoundaryPixelSetPtr();
-	justInsertedBoundaryPixelSetPtr = potts->getJustInsertedBoundaryPixelSetPtr();
-	justDeletedBoundaryPixelSetPtr = potts->getJustDeletedBoundaryPixelSetPtr();
-	boundaryPixelVectorPtr = potts->getBoundaryPixelVectorPtr();
+	//BoundaryWalker picks pixel copy attempts only from boundary pixels - every pixel that has a neighbor
+	//belonging to a different cell within Potts neighbor order has to be tracked
+	maxNeighborIndex = (std::max)(maxNeighborIndex, potts->getMaxNeighborIndex());
 
 
 }
@@ -109,62 +107,47 @@ void GlobalBoundaryPixelTrackerPlugin::handleEvent(CC3DEvent & _event) {
 		return;
 	}
 
-	CC3DEventLatticeResize ev = static_cast<CC3DEventLatticeResize&>(_event);
-	Dim3D newDim = ev.newDim;
-	Dim3D oldDim = ev.oldDim;
-	Dim3D shiftVec = ev.shiftVec;
-
-
-	/*for (std::set<Point3D>::iterator sitr = boundaryPixelSetPtr->begin(); sitr != boundaryPixelSetPtr->end(); ++sitr) {*/
-	for (std::unordered_set<Point3D, Point3DHasher, Point3DComparator>::iterator sitr = boundaryPixelSetPtr->begin(); sitr != boundaryPixelSetPtr->end(); ++sitr) {
+	//lattice is already resized and shifted
+	refreshBoundaryPixels();
+}
 
-		Point3D & pixel = const_cast<Point3D&>(*sitr);
-		pixel.x += shiftVec.x;
-		pixel.y += shiftVec.y;
-		pixel.z += shiftVec.z;
+///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+bool GlobalBoundaryPixelTrackerPlugin::isBoundaryPixel(const Point3D & pt, CellG * cell) {
+	WatchableField3D<CellG *> *fieldG = (WatchableField3D<CellG *> *) potts->getCellFieldG();
 
-		// 		sitr->x+=ev.shiftVec.x;
-		// 		sitr->y+=ev.shiftVec.y;
-		// 		sitr->z+=ev.shiftVec.z;
+	for (unsigned int nIdx = 0; nIdx <= maxNeighborIndex; ++nIdx) {
+		Neighbor neighbor = boundaryStrategy->getNeighborDirect(const_cast<Point3D&>(pt), nIdx);
+		if (!neighbor.distance) {
+			//if distance is 0 then the neighbor returned is invalid
+			continue;
+		}
+		if (fieldG->get(neighbor.pt) != cell)
+			return true;
 	}
-
+	return false;
 }
-
-
 ///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
-void GlobalBoundaryPixelTrackerPlugin::insertPixel(Point3D & pt) {
-	boundaryPixelSetPtr->insert(pt);
-	justDeletedBoundaryPixelSetPtr->erase(pt);
-	justInsertedBoundaryPixelSetPtr->insert(pt);
-	refreshContainers();
+void GlobalBoundaryPixelTrackerPlugin::updatePixel(const Point3D & pt, CellG * cell) {
+	if (isBoundaryPixel(pt, cell))
+		potts->insertBoundaryPixel(pt);
+	else
+		potts->removeBoundaryPixel(pt);
 }
 ///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
-void GlobalBoundaryPixelTrackerPlugin::removePixel(Point3D & pt) {
-	//std::set<Point3D>::iterator sitr_pt = boundaryPixelSetPtr->find(pt);
-
-	std::unordered_set<Point3D, Point3DHasher, Point3DComparator>::iterator sitr_pt = boundaryPixelSetPtr->find(pt);
-	if (sitr_pt == boundaryPixelSetPtr->end()) throw CC3DException("Could not find point:" + pt + " in the set of all boundary pixels stored in Potts3D.cpp");
-
-	boundaryPixelSetPtr->erase(sitr_pt);
-	//boundaryPixelSetPtr->erase(pt);
-
-	justDeletedBoundaryPixelSetPtr->insert(pt);
-	justInsertedBoundaryPixelSetPtr->erase(pt);
-	refreshContainers();
+void GlobalBoundaryPixelTrackerPlugin::refreshBoundaryPixels() {
+	WatchableField3D<CellG *> *fieldG = (WatchableField3D<CellG *> *) potts->getCellFieldG();
+	Dim3D dim = fieldG->getDim();
 
+	potts->clearBoundaryPixels();
 
-}
-///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
-void GlobalBoundaryPixelTrackerPlugin::refreshContainers() {
-
-	double size_thresh = this->container_refresh_fraction*boundaryPixelSetPtr->size();
-	//double size_thresh = this->container_refresh_fraction;
-	if (justInsertedBoundaryPixelSetPtr->size() > size_thresh || justDeletedBoundaryPixelSetPtr->size() > size_thresh) {
-		//cerr << "refreshing containers" << endl;
-		boundaryPixelVectorPtr->assign(boundaryPixelSetPtr->begin(), boundaryPixelSetPtr->end());
-		justInsertedBoundaryPixelSetPtr->clear();
-		justDeletedBoundaryPixelSetPtr->clear();
-	}
+	Point3D pt;
+	for (pt.z = 0; pt.z < dim.z; ++pt.z)
+		for (pt.y = 0; pt.y < dim.y; ++pt.y)
+			for (pt.x = 0; pt.x < dim.x; ++pt.x) {
+				CellG * cell = fieldG->get(pt);
+				if (isBoundaryPixel(pt, cell))
+					potts->insertBoundaryPixel(pt);
+			}
 }
 
 void GlobalBoundaryPixelTrackerPlugin::field3DChange(const Point3D &pt, CellG *newCell, CellG *oldCell) {
@@ -176,64 +159,23 @@ void GlobalBoundaryPixelTrackerPlugin::field3DChange(const Point3D &pt, CellG *n
 
 	WatchableField3D<CellG *> *fieldG = (WatchableField3D<CellG *> *) potts->getCellFieldG();
 
-	Neighbor neighbor;
-	Neighbor neighborOfNeighbor;
-	CellG * nCell;
-	CellG * nnCell;
-	//handling global boundary pixel set
-	//newCell section
-
-
-	//boundaryPixelSetPtr->insert(pt);//always insert pt to the global set of boundary pixels
-	this->insertPixel(const_cast<Point3D&>(pt));//always insert pt to the global set of boundary pixels
+	updatePixel(pt, newCell);
 
+	// neighbors belonging to newCell may have lost their last foreign neighbor, neighbors belonging to oldCell
+	// gained one. Remaining neighbors had foreign neighbor pt before and after the change
 	for (unsigned int nIdx = 0; nIdx <= maxNeighborIndex; ++nIdx) {
-		neighbor = boundaryStrategy->getNeighborDirect(const_cast<Point3D&>(pt), nIdx);
+		Neighbor neighbor = boundaryStrategy->getNeighborDirect(const_cast<Point3D&>(pt), nIdx);
 		if (!neighbor.distance) {
 			//if distance is 0 then the neighbor returned is invalid
 			continue;
 		}
 
-		nCell = fieldG->get(neighbor.pt);
-		if (nCell != newCell)
-			continue; //we visit only neighbors of pt that belong to newCell
-
-		bool keepNeighborInBoundary = false;
-		//to check if neighboring pixel is still in the boundary we visit its neighbors and make sure at least
-		//one of the pixel neighbors belongs to cell different than newCell
-		for (unsigned int nnIdx = 0; nnIdx <= maxNeighborIndex; ++nnIdx) {
-			neighborOfNeighbor = boundaryStrategy->getNeighborDirect(const_cast<Point3D&>(neighbor.pt), nnIdx);
-			if (!neighborOfNeighbor.distance) {
-				continue;
-			}
-			nnCell = fieldG->get(neighborOfNeighbor.pt);
-			if (neighborOfNeighbor.pt != pt && nnCell != newCell) {
-				keepNeighborInBoundary = true;
-				//boundaryPixelSetPtr->insert(neighbor.pt);
-				break;
-			}
-		}
-		if (!keepNeighborInBoundary) {
-			removePixel(neighbor.pt);
-
+		CellG * nCell = fieldG->get(neighbor.pt);
+		if (nCell == newCell) {
+			updatePixel(neighbor.pt, newCell);
 		}
-	}
-
-	//oldCell section
-
-	//handling global boundary pixel set
-	//add all the neighboring pixels of pt to the boundary provided they belong to oldCell
-	for (unsigned int nIdx = 0; nIdx <= maxNeighborIndex; ++nIdx) {
-		neighbor = boundaryStrategy->getNeighborDirect(const_cast<Point3D&>(pt), nIdx);
-		if (!neighbor.distance) {
-			//if distance is 0 then the neighbor returned is invalid
-			continue;
-		}
-		nCell = fieldG->get(neighbor.pt);
-
-		if (nCell == oldCell) {
-			this->insertPixel(neighbor.pt);
-			//boundaryPixelSetPtr->insert(neighbor.pt);	
+		else if (nCell == oldCell) {
+			potts->insertBoundaryPixel(neighbor.pt);
 		}
 	}
 
@@ -69,23 +69,15 @@ namespace CompuCell3D {
 		Simulator *simulator;
 		Potts3D* potts;
 		unsigned int maxNeighborIndex;
-		float container_refresh_fraction;
 		BoundaryStrategy * boundaryStrategy;
 		CC3DXMLElement *xmlData;
-		//std::set<Point3D> * boundaryPixelSetPtr;
-		//std::set<Point3D>  * justInsertedBoundaryPixelSetPtr;
-		//std::set<Point3D>  * justDeletedBoundaryPixelSetPtr;
-		std::unordered_set<Point3D, Point3DHasher, Point3DComparator> *  boundaryPixelSetPtr;
-		std::unordered_set<Point3D, Point3DHasher, Point3DComparator> *justInsertedBoundaryPixelSetPtr;
-		std::unordered_set<Point3D, Point3DHasher, Point3DComparator> *justDeletedBoundaryPixelSetPtr;
-		std::vector<Point3D> * boundaryPixelVectorPtr;
 
-		//std::unordered_set<Point3D, Point3DHasher, Point3DComparator> justInsertedBoundaryPixelSet;
+		//boundary pixels are stored in Potts3D
+		bool isBoundaryPixel(const Point3D & pt, CellG * cell);
+		void updatePixel(const Point3D & pt, CellG * cell);
 
-		void insertPixel(Point3D & pt);
-		void removePixel(Point3D & pt);
-
-		void refreshContainers();
+		//rebuilds set of boundary pixels from the whole lattice
+		void refreshBoundaryPixels();
 
 
 	public:
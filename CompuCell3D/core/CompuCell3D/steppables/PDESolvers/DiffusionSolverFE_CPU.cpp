@@ -4,6 +4,7 @@
 #include <CompuCell3D/Automaton/Automaton.h>
 #include <CompuCell3D/steppables/BoxWatcher/BoxWatcher.h>
 #include <PublicUtilities/ParallelUtilsOpenMP.h>
+#include <PublicUtilities/SimulationProfiler.h>
 #include "FluctuationCompensator.h"
 #include <cfloat>
 
@@ -822,6 +823,13 @@ void DiffusionSolverFE_CPU::stepImpl(const unsigned int _currentStep){
 	
 	if (fluctuationCompensator) fluctuationCompensator->applyCorrections();
 
+	SimulationProfiler & profiler = simPtr->getProfiler();
+	// clock is read only when profiling is on - it would be read for every field and every extra MCS
+	const bool profiling = profiler.isEnabled();
+	SimulationProfiler::Clock_t::time_point begin;
+	double secreteTime = 0.0;
+	double diffuseTime = 0.0;
+
 	for(unsigned int i = 0 ; i < diffSecrFieldTuppleVec.size() ; ++i ){
 		//cerr<<"scalingExtraMCSVec[i]="<<scalingExtraMCSVec[i]<<endl;
         
@@ -829,34 +837,50 @@ void DiffusionSolverFE_CPU::stepImpl(const unsigned int _currentStep){
         
         if (scaleSecretion){
             if (!scalingExtraMCSVec[i]){ //we do not call diffusion step but call secretion - this happens when diffusion const is 0 but we still want to have secretion
+                if (profiling) begin = SimulationProfiler::Clock_t::now();
                 for(unsigned int j = 0 ; j <diffSecrFieldTuppleVec[i].secrData.secretionFcnPtrVec.size() ; ++j){
                     (this->*diffSecrFieldTuppleVec[i].secrData.secretionFcnPtrVec[j])(i);
 
                 }
+                if (profiling) secreteTime += SimulationProfiler::secondsSince(begin);
             }
             
             for(int extraMCS = 0; extraMCS < scalingExtraMCSVec[i]; extraMCS++) {
+                if (profiling) begin = SimulationProfiler::Clock_t::now();
                 boundaryConditionInit(i);//initializing boundary conditions
                 diffuseSingleField(i);
+                if (profiling) diffuseTime += SimulationProfiler::secondsSince(begin);
+
+                if (profiling) begin = SimulationProfiler::Clock_t::now();
                 for(unsigned int j = 0 ; j <diffSecrFieldTuppleVec[i].secrData.secretionFcnPtrVec.size() ; ++j){
                     (this->*diffSecrFieldTuppleVec[i].secrData.secretionFcnPtrVec[j])(i);
                 }
+                if (profiling) secreteTime += SimulationProfiler::secondsSince(begin);
             }
         }else{ //solver behaves as FlexibleDiffusionSolver - i.e. secretion is done at once followed by multiple diffusive steps
         
+            if (profiling) begin = SimulationProfiler::Clock_t::now();
             for(unsigned int j = 0 ; j <diffSecrFieldTuppleVec[i].secrData.secretionFcnPtrVec.size() ; ++j){
                 (this->*diffSecrFieldTuppleVec[i].secrData.secretionFcnPtrVec[j])(i);
 
             }
+            if (profiling) secreteTime += SimulationProfiler::secondsSince(begin);
         
+            if (profiling) begin = SimulationProfiler::Clock_t::now();
             for(int extraMCS = 0; extraMCS < scalingExtraMCSVec[i]; extraMCS++) {
                 boundaryConditionInit(i);//initializing boundary conditions
                 diffuseSingleField(i);
             }
+            if (profiling) diffuseTime += SimulationProfiler::secondsSince(begin);
         
         }
 	}
 
+	if (profiling) {
+		profiler.addTime("PDESolver", toString() + ".secrete", secreteTime);
+		profiler.addTime("PDESolver", toString() + ".diffuse", diffuseTime);
+	}
+
 	if (fluctuationCompensator) fluctuationCompensator->resetCorrections();
 
 }
@@ -13,6 +13,7 @@
 
 #include <PublicUtilities/StringUtils.h>
 #include <PublicUtilities/ParallelUtilsOpenMP.h>
+#include <PublicUtilities/SimulationProfiler.h>
 
 #include <string>
 #include <cmath>
@@ -330,9 +331,18 @@ void FlexibleDiffusionSolverFE::step(const unsigned int _currentStep) {
 
 	currentStep=_currentStep;
 
-	(this->*secretePtr)();
+	SimulationProfiler * profiler = &simPtr->getProfiler();
+	// timer names are built only when profiling is on
+	const bool profiling = profiler->isEnabled();
+	{
+		ProfilerTimer timer(profiler, "PDESolver", profiling ? toString() + ".secrete" : string());
+		(this->*secretePtr)();
+	}
 
-	(this->*diffusePtr)();
+	{
+		ProfilerTimer timer(profiler, "PDESolver", profiling ? toString() + ".diffuse" : string());
+		(this->*diffusePtr)();
+	}
 
 	if(serializeFrequency>0 && serializeFlag && !(_currentStep % serializeFrequency)){
 		serializerPtr->setCurrentStep(currentStep);
@@ -19,6 +19,7 @@
 #include <fstream>
 #include <sstream>
 #include <PublicUtilities/ParallelUtilsOpenMP.h>
+#include <PublicUtilities/SimulationProfiler.h>
 
 
 //////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
@@ -758,6 +759,11 @@ void ReactionDiffusionSolverFE::step(const unsigned int _currentStep) {
 
 	if (fluctuationCompensator) fluctuationCompensator->applyCorrections();
 
+    SimulationProfiler & profiler = simPtr->getProfiler();
+    SimulationProfiler::Clock_t::time_point secreteBegin = SimulationProfiler::Clock_t::now();
+    double secreteTime = 0.0;
+    SimulationProfiler::Clock_t::time_point diffuseBegin;
+
     if (scaleSecretion) {
         for (int callIdx = 0; callIdx < maxNumberOfDiffusionCalls; ++callIdx) {
 
@@ -772,6 +778,9 @@ void ReactionDiffusionSolverFE::step(const unsigned int _currentStep) {
             }
         }
 
+		secreteTime = SimulationProfiler::secondsSince(secreteBegin);
+		diffuseBegin = SimulationProfiler::Clock_t::now();
+
 		for (int callIdx = 0; callIdx < maxNumberOfDiffusionCalls; ++callIdx) {
 
 			for (int idx = 0; idx < numberOfFields; ++idx) {
@@ -796,6 +805,9 @@ void ReactionDiffusionSolverFE::step(const unsigned int _currentStep) {
             }
         }
 
+        secreteTime = SimulationProfiler::secondsSince(secreteBegin);
+        diffuseBegin = SimulationProfiler::Clock_t::now();
+
         for (int callIdx = 0; callIdx < maxNumberOfDiffusionCalls; ++callIdx) {
 
             //reaction-diffusive steps
@@ -813,6 +825,11 @@ void ReactionDiffusionSolverFE::step(const unsigned int _currentStep) {
 
     }
 
+	if (profiler.isEnabled()) {
+		profiler.addTime("PDESolver", toString() + ".secrete", secreteTime);
+		profiler.addTime("PDESolver", toString() + ".diffuse", SimulationProfiler::secondsSince(diffuseBegin));
+	}
+
 	if (fluctuationCompensator) fluctuationCompensator->resetCorrections();
 
     if (serializeFrequency > 0 && serializeFlag && !(_currentStep % serializeFrequency)) {
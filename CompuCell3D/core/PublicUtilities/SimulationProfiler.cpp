@@ -0,0 +1,101 @@
+#include "SimulationProfiler.h"
+
+using namespace CompuCell3D;
+using namespace std;
+
+SimulationProfiler::SimulationProfiler() : enabled(false), currentStep(0) {}
+
+void SimulationProfiler::setEnabled(bool _enabled) {
+    enabled = _enabled;
+}
+
+void SimulationProfiler::reset() {
+    recordMap.clear();
+}
+
+void SimulationProfiler::beginStep(unsigned int _currentStep) {
+    currentStep = _currentStep;
+    for (auto &categoryItem: recordMap) {
+        for (auto &nameItem: categoryItem.second) {
+            nameItem.second.stepTime = 0.0;
+            nameItem.second.stepCalls = 0;
+        }
+    }
+}
+
+SimulationProfiler::ProfileRecord &SimulationProfiler::getRecord(const string &_category, const string &_name) {
+    return recordMap[_category][_name];
+}
+
+void SimulationProfiler::addTime(const string &_category, const string &_name, double _seconds, long long _calls) {
+    ProfileRecord &record = getRecord(_category, _name);
+    record.totalTime += _seconds;
+    record.totalCalls += _calls;
+    record.stepTime += _seconds;
+    record.stepCalls += _calls;
+}
+
+void SimulationProfiler::addCount(const string &_category, const string &_name, long long _count) {
+    addTime(_category, _name, 0.0, _count);
+}
+
+vector<string> SimulationProfiler::getCategories() {
+    vector<string> categories;
+    for (auto &categoryItem: recordMap) {
+        categories.push_back(categoryItem.first);
+    }
+    return categories;
+}
+
+vector<string> SimulationProfiler::getNames(const string &_category) {
+    vector<string> names;
+    auto mitr = recordMap.find(_category);
+    if (mitr == recordMap.end()) return names;
+
+    for (auto &nameItem: mitr->second) {
+        names.push_back(nameItem.first);
+    }
+    return names;
+}
+
+const SimulationProfiler::ProfileRecord *SimulationProfiler::findRecord(const string &_category,
+                                                                        const string &_name) const {
+    auto mitr = recordMap.find(_category);
+    if (mitr == recordMap.end()) return 0;
+
+    auto nameItr = mitr->second.find(_name);
+    if (nameItr == mitr->second.end()) return 0;
+
+    return &nameItr->second;
+}
+
+double SimulationProfiler::getTotalTime(const string &_category, const string &_name) {
+    const ProfileRecord *record = findRecord(_category, _name);
+    return record ? record->totalTime : 0.0;
+}
+
+long long SimulationProfiler::getTotalCalls(const string &_category, const string &_name) {
+    const ProfileRecord *record = findRecord(_category, _name);
+    return record ? record->totalCalls : 0;
+}
+
+double SimulationProfiler::getStepTime(const string &_category, const string &_name) {
+    const ProfileRecord *record = findRecord(_category, _name);
+    return record ? record->stepTime : 0.0;
+}
+
+long long SimulationProfiler::getStepCalls(const string &_category, const string &_name) {
+    const ProfileRecord *record = findRecord(_category, _name);
+    return record ? record->stepCalls : 0;
+}
+
+ProfilerTimer::ProfilerTimer(SimulationProfiler *_profiler, const char *_category, const std::string &_name) :
+        profiler(_profiler && _profiler->isEnabled() ? _profiler : 0),
+        category(_category),
+        name(profiler ? _name : string()) {
+    if (profiler) begin = SimulationProfiler::Clock_t::now();
+}
+
+ProfilerTimer::~ProfilerTimer() {
+    if (profiler) profiler->addTime(category, name, SimulationProfiler::secondsSince(begin));
+}
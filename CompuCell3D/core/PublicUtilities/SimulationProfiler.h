@@ -0,0 +1,112 @@
+#ifndef SIMULATIONPROFILER_H
+#define SIMULATIONPROFILER_H
+
+#include <chrono>
+#include <map>
+#include <string>
+#include <vector>
+
+namespace CompuCell3D {
+
+    /**
+     * Collects run times and call counts of simulation components (energy functions, steppables, PDE solvers)
+     * when profiling is enabled. Every record belongs to a category (e.g. "EnergyFunction", "Steppable",
+     * "PDESolver", "Potts") and has a name. Records of "PixelCopies" category are counters - they store
+     * number of attempted and accepted pixel copies in place of number of calls. Values from the most recent
+     * MCS and totals since profiling was enabled are kept. Records are added only outside of parallel
+     * regions - per-thread values are accumulated by callers and added once per MCS
+     */
+    class SimulationProfiler {
+
+    public:
+
+        typedef std::chrono::steady_clock Clock_t;
+
+        SimulationProfiler();
+
+        void setEnabled(bool _enabled);
+        bool isEnabled() { return enabled; }
+
+        /**
+         * Removes all records
+         */
+        void reset();
+
+        /**
+         * Clears values of previous MCS. Called by Simulator at the beginning of every MCS
+         * @param _currentStep MCS
+         */
+        void beginStep(unsigned int _currentStep);
+        unsigned int getCurrentStep() { return currentStep; }
+
+        /**
+         * Adds run time and number of calls to a record
+         * @param _category record category
+         * @param _name record name
+         * @param _seconds run time in seconds
+         * @param _calls number of calls
+         */
+        void addTime(const std::string & _category, const std::string & _name, double _seconds, long long _calls = 1);
+
+        /**
+         * Adds to a counter - record that has no run time e.g. number of accepted pixel copies
+         */
+        void addCount(const std::string & _category, const std::string & _name, long long _count);
+
+        std::vector<std::string> getCategories();
+        std::vector<std::string> getNames(const std::string & _category);
+
+        // getters return 0 for records that do not exist
+        double getTotalTime(const std::string & _category, const std::string & _name);
+        long long getTotalCalls(const std::string & _category, const std::string & _name);
+        double getStepTime(const std::string & _category, const std::string & _name);
+        long long getStepCalls(const std::string & _category, const std::string & _name);
+
+        static double secondsSince(const Clock_t::time_point & _begin) {
+            return std::chrono::duration<double>(Clock_t::now() - _begin).count();
+        }
+
+    private:
+
+        struct ProfileRecord {
+            ProfileRecord() : totalTime(0.0), totalCalls(0), stepTime(0.0), stepCalls(0) {}
+
+            double totalTime;
+            long long totalCalls;
+            double stepTime;
+            long long stepCalls;
+        };
+
+        // creates missing records - used when values are added
+        ProfileRecord & getRecord(const std::string & _category, const std::string & _name);
+        // returns null for missing records - used by getters so that queries do not add empty records
+        const ProfileRecord * findRecord(const std::string & _category, const std::string & _name) const;
+
+        bool enabled;
+        unsigned int currentStep;
+        std::map<std::string, std::map<std::string, ProfileRecord> > recordMap;
+
+    };
+
+    /**
+     * Adds time elapsed between construction and destruction to a profiler record. Does nothing when profiling is disabled
+     */
+    class ProfilerTimer {
+
+    public:
+
+        ProfilerTimer(SimulationProfiler * _profiler, const char * _category, const std::string & _name);
+        ~ProfilerTimer();
+
+    private:
+
+        SimulationProfiler * profiler;
+        const char * category;
+        std::string name;
+        SimulationProfiler::Clock_t::time_point begin;
+
+    };
+
+};
+
+#endif
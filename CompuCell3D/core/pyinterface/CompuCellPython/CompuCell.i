@@ -90,10 +90,13 @@
 // Third Party Libraries
 #include <PublicUtilities/NumericalUtils.h>
 #include <PublicUtilities/Vector3.h>
+#include <PublicUtilities/SimulationProfiler.h>
 
 // System Libraries
 #include <iostream>
 #include <stdlib.h>
+#include <unordered_map>
+#include <unordered_set>
 
 
 #include "STLPyIterator.h"
@@ -1060,6 +1063,302 @@ FIELD3DEXTENDERBASE(type,returnType)
     
     
     
+// numpy view of the memory that stores field values - see Field3D::getStridedStorage
+%define FLOATFIELD3DNUMPYEXTENDER(type)
+%extend  type{
+
+  PyObject * getNumpyArray(bool _writable=true){
+    void *data=0;
+    long strides[3];
+    size_t elementSize=0;
+
+    if (!$self->getStridedStorage(data,strides,elementSize)){
+        Py_RETURN_NONE;
+    }
+
+    // some solvers store float fields in double precision
+    int typeNum;
+    if (elementSize==sizeof(float)){
+        typeNum=NPY_FLOAT32;
+    }else if (elementSize==sizeof(double)){
+        typeNum=NPY_FLOAT64;
+    }else{
+        Py_RETURN_NONE;
+    }
+
+    Dim3D dim=$self->getDim();
+    npy_intp dims[3]={dim.x,dim.y,dim.z};
+    npy_intp byteStrides[3]={strides[0]*(npy_intp)elementSize,strides[1]*(npy_intp)elementSize,strides[2]*(npy_intp)elementSize};
+
+    int flags=NPY_ARRAY_ALIGNED;
+    if (_writable)
+        flags|=NPY_ARRAY_WRITEABLE;
+
+    // array does not own the memory - it is valid until the field is resized or the solver swaps its arrays
+    return PyArray_New(&PyArray_Type,3,dims,typeNum,byteStrides,data,(int)elementSize,flags,NULL);
+  }
+
+}
+%enddef
+
+
+// bulk export of the cell lattice (cell types, ids and cluster ids) to preallocated numpy arrays
+%{
+PyArrayObject * cellLatticeArray(PyObject *_array, const char *_name){
+    if (_array==Py_None)
+        return 0;
+
+    if (!PyArray_Check(_array))
+        throw std::runtime_error(std::string(_name)+": expected numpy array");
+
+    PyArrayObject *array=(PyArrayObject *)_array;
+    if (PyArray_NDIM(array)!=3)
+        throw std::runtime_error(std::string(_name)+": expected 3D array");
+
+    if (!PyArray_IS_C_CONTIGUOUS(array) || !PyArray_ISWRITEABLE(array))
+        throw std::runtime_error(std::string(_name)+": array must be writable and C-contiguous");
+
+    if (!PyArray_ISSIGNED(array) || (PyArray_ITEMSIZE(array)!=4 && PyArray_ITEMSIZE(array)!=8))
+        throw std::runtime_error(std::string(_name)+": array must be of int32 or int64 type");
+
+    return array;
+}
+
+inline void setCellLatticeValue(PyArrayObject *_array, npy_intp _idx, long _value){
+    if (PyArray_ITEMSIZE(_array)==4)
+        ((npy_int32 *)PyArray_DATA(_array))[_idx]=(npy_int32)_value;
+    else
+        ((npy_int64 *)PyArray_DATA(_array))[_idx]=(npy_int64)_value;
+}
+%}
+
+%define CELLFIELD3DNUMPYEXTENDER(type)
+%extend  type{
+
+  // arrays are indexed [x,y,z] relative to (_xMin,_yMin,_zMin), their shape determines the exported box.
+  // Medium pixels are set to 0. Any of the arrays can be None
+  void fillCellArrays(PyObject *_typeArray, PyObject *_idArray, PyObject *_clusterIdArray, int _xMin=0, int _yMin=0, int _zMin=0){
+    PyArrayObject *arrays[3]={
+        cellLatticeArray(_typeArray,"type array"),
+        cellLatticeArray(_idArray,"id array"),
+        cellLatticeArray(_clusterIdArray,"cluster id array")
+    };
+
+    PyArrayObject *shapeArray=0;
+    for (int i=0 ; i<3 ; ++i){
+        if (!arrays[i])
+            continue;
+        if (!shapeArray)
+            shapeArray=arrays[i];
+        else if (!PyArray_SAMESHAPE(shapeArray,arrays[i]))
+            throw std::runtime_error("fillCellArrays: arrays must have the same shape");
+    }
+
+    if (!shapeArray)
+        return;
+
+    npy_intp *dims=PyArray_DIMS(shapeArray);
+    Dim3D dim=$self->getDim();
+
+    if (_xMin<0 || _yMin<0 || _zMin<0 || _xMin+dims[0]>dim.x || _yMin+dims[1]>dim.y || _zMin+dims[2]>dim.z)
+        throw std::runtime_error("fillCellArrays: exported box does not fit in the lattice");
+
+    // loop order follows memory layout of the cell field
+    Point3D pt;
+    for (pt.z=_zMin ; pt.z<_zMin+dims[2] ; ++pt.z)
+        for (pt.y=_yMin ; pt.y<_yMin+dims[1] ; ++pt.y)
+            for (pt.x=_xMin ; pt.x<_xMin+dims[0] ; ++pt.x){
+                CellG *cell=$self->get(pt);
+                npy_intp idx=((pt.x-_xMin)*dims[1]+(pt.y-_yMin))*dims[2]+(pt.z-_zMin);
+
+                if (arrays[0])
+                    setCellLatticeValue(arrays[0],idx,cell ? cell->type : 0);
+                if (arrays[1])
+                    setCellLatticeValue(arrays[1],idx,cell ? cell->id : 0);
+                if (arrays[2])
+                    setCellLatticeValue(arrays[2],idx,cell ? cell->clusterId : 0);
+            }
+  }
+
+%pythoncode %{
+
+    def set_pixels(self, pixels, cell):
+        """
+        Assigns pixels given as (N x 3) integer array to a cell (None means medium) in a single call
+        """
+        self.setPixels(pixels, cell, getattr(self, 'volumeTrackerPlugin', None))
+
+    def assign(self, pixels, cells=None, origin=(0, 0, 0)):
+        """
+        Bulk assignment of lattice pixels. All changes are applied in C++ and bounds are checked before
+        the lattice is modified. Supported forms:
+
+        assign(pixels, cell) - (N x 3) integer array of pixels is assigned to a cell (None means medium)
+
+        assign(pixels, cell_ids) - i-th pixel is assigned to cell with id cell_ids[i] (0 means medium)
+
+        assign(labels, origin=(x, y, z)) - 3D integer array of cell ids (label volume) is placed at origin.
+        Pixels labeled 0 are left unchanged
+        """
+        import numpy as np
+
+        if cells is None and np.ndim(pixels) == 3:
+            labels = np.asarray(pixels)
+            pixels = np.argwhere(labels != 0)
+            cells = labels[tuple(pixels.T)]
+            pixels = pixels + np.asarray(origin, dtype=pixels.dtype)
+
+        if cells is None or isinstance(cells, CellG):
+            self.set_pixels(pixels, cells)
+        else:
+            self.setPixelsByCellId(pixels, cells, self.cellInventory, getattr(self, 'volumeTrackerPlugin', None))
+
+%}
+
+  // sets pixels given as (N x 3) integer array to _cell. Bounds are checked before the lattice is modified
+  void setPixels(PyObject *_pixels, CellG *_cell, void *_volumeTrackerPlugin=0){
+    VolumeTrackerPlugin *volumeTrackerPlugin=(VolumeTrackerPlugin *)_volumeTrackerPlugin;
+
+    PyArrayObject *pixels=(PyArrayObject *)PyArray_FROMANY(_pixels,NPY_INT64,2,2,NPY_ARRAY_IN_ARRAY);
+    if (!pixels){
+        PyErr_Clear();
+        throw std::runtime_error("setPixels: expected (N x 3) integer array of pixels");
+    }
+
+    npy_intp numPixels=PyArray_DIM(pixels,0);
+    npy_int64 *pixelsPtr=(npy_int64 *)PyArray_DATA(pixels);
+
+    if (numPixels && PyArray_DIM(pixels,1)!=3){
+        Py_DECREF(pixels);
+        throw std::runtime_error("setPixels: expected (N x 3) integer array of pixels");
+    }
+
+    Dim3D dim=$self->getDim();
+    for (npy_intp i=0 ; i<numPixels ; ++i){
+        npy_int64 *pixel=pixelsPtr+3*i;
+        if (pixel[0]<0 || pixel[0]>=dim.x || pixel[1]<0 || pixel[1]>=dim.y || pixel[2]<0 || pixel[2]>=dim.z){
+            Py_DECREF(pixels);
+            throw std::runtime_error("setPixels: pixel outside the lattice");
+        }
+    }
+
+    for (npy_intp i=0 ; i<numPixels ; ++i){
+        npy_int64 *pixel=pixelsPtr+3*i;
+        $self->set(Point3D(pixel[0],pixel[1],pixel[2]),_cell);
+        // removes cells whose volume dropped to zero
+        if (volumeTrackerPlugin)
+            volumeTrackerPlugin->step();
+    }
+
+    Py_DECREF(pixels);
+  }
+
+  // assigns i-th pixel of (N x 3) integer array to cell with id _cellIds[i] (0 means medium). All checks are done
+  // before the lattice is modified - pixels must be unique and inside the lattice, cells must exist and no cell
+  // receiving pixels may lose all its pixels during the assignment (it would be removed by VolumeTracker)
+  void setPixelsByCellId(PyObject *_pixels, PyObject *_cellIds, void *_inventory, void *_volumeTrackerPlugin=0){
+    CellInventory *inventory=(CellInventory *)_inventory;
+    VolumeTrackerPlugin *volumeTrackerPlugin=(VolumeTrackerPlugin *)_volumeTrackerPlugin;
+
+    PyArrayObject *pixels=(PyArrayObject *)PyArray_FROMANY(_pixels,NPY_INT64,2,2,NPY_ARRAY_IN_ARRAY);
+    PyArrayObject *cellIds=(PyArrayObject *)PyArray_FROMANY(_cellIds,NPY_INT64,1,1,NPY_ARRAY_IN_ARRAY);
+    if (!pixels || !cellIds){
+        PyErr_Clear();
+        Py_XDECREF(pixels);
+        Py_XDECREF(cellIds);
+        throw std::runtime_error("setPixelsByCellId: expected (N x 3) integer array of pixels and N cell ids");
+    }
+
+    // references are released when leaving the function - including leaving it with an exception
+    struct ArrayReleaser{
+        PyArrayObject *pixels, *cellIds;
+        ~ArrayReleaser(){Py_DECREF(pixels); Py_DECREF(cellIds);}
+    } arrayReleaser={pixels,cellIds};
+
+    npy_intp numPixels=PyArray_DIM(pixels,0);
+    if ((numPixels && PyArray_DIM(pixels,1)!=3) || PyArray_DIM(cellIds,0)!=numPixels)
+        throw std::runtime_error("setPixelsByCellId: expected (N x 3) integer array of pixels and N cell ids");
+
+    npy_int64 *pixelsPtr=(npy_int64 *)PyArray_DATA(pixels);
+    npy_int64 *cellIdsPtr=(npy_int64 *)PyArray_DATA(cellIds);
+
+    Dim3D dim=$self->getDim();
+    std::vector<Point3D> points(numPixels);
+    std::vector<CellG *> cells(numPixels,(CellG *)0);
+    std::unordered_set<long> pixelIndices;
+    // simulated volumes of cells that receive pixels
+    std::unordered_map<CellG *,long> targetVolumes;
+
+    CellG *lastCell=0;
+    npy_int64 lastId=0;
+    for (npy_intp i=0 ; i<numPixels ; ++i){
+        npy_int64 *pixel=pixelsPtr+3*i;
+        if (pixel[0]<0 || pixel[0]>=dim.x || pixel[1]<0 || pixel[1]>=dim.y || pixel[2]<0 || pixel[2]>=dim.z)
+            throw std::runtime_error("setPixelsByCellId: pixel outside the lattice");
+
+        points[i]=Point3D(pixel[0],pixel[1],pixel[2]);
+        if (!pixelIndices.insert(pixel[0]+(pixel[1]+pixel[2]*(long)dim.y)*(long)dim.x).second)
+            throw std::runtime_error("setPixelsByCellId: pixels must be unique");
+
+        if (!cellIdsPtr[i])
+            continue;
+
+        // label volumes assign long runs of pixels to the same cell
+        if (!lastCell || cellIdsPtr[i]!=lastId){
+            lastCell=inventory->getSize() ? inventory->attemptFetchingCellById(cellIdsPtr[i]) : 0;
+            lastId=cellIdsPtr[i];
+            if (!lastCell){
+                std::ostringstream s;
+                s<<"setPixelsByCellId: cell with id "<<lastId<<" does not exist";
+                throw std::runtime_error(s.str());
+            }
+            targetVolumes.insert(std::make_pair(lastCell,lastCell->volume));
+        }
+        cells[i]=lastCell;
+    }
+
+    // pixels taken from cells that do not receive pixels go first so that receiving cells grow before they shrink
+    std::vector<npy_intp> order;
+    order.reserve(numPixels);
+    for (int pass=0 ; pass<2 ; ++pass){
+        for (npy_intp i=0 ; i<numPixels ; ++i){
+            bool fromTarget=targetVolumes.count($self->get(points[i]))>0;
+            if (fromTarget==(pass==1))
+                order.push_back(i);
+        }
+    }
+
+    for (npy_intp i=0 ; i<numPixels ; ++i){
+        CellG *oldCell=$self->get(points[order[i]]);
+        CellG *newCell=cells[order[i]];
+        if (oldCell==newCell)
+            continue;
+
+        std::unordered_map<CellG *,long>::iterator mitr=targetVolumes.find(oldCell);
+        if (mitr!=targetVolumes.end() && --mitr->second==0){
+            std::ostringstream s;
+            s<<"setPixelsByCellId: cell with id "<<oldCell->id<<" would lose all its pixels before receiving new ones";
+            throw std::runtime_error(s.str());
+        }
+
+        mitr=targetVolumes.find(newCell);
+        if (mitr!=targetVolumes.end())
+            ++mitr->second;
+    }
+
+    for (npy_intp i=0 ; i<numPixels ; ++i){
+        $self->set(points[order[i]],cells[order[i]]);
+        // removes cells whose volume dropped to zero
+        if (volumeTrackerPlugin)
+            volumeTrackerPlugin->step();
+    }
+  }
+
+}
+%enddef
+
+
+
 %ignore Field3D<float>::typeStr;
 %ignore Field3DImpl<float>::typeStr;
 %ignore Field3D<int>::typeStr;
@@ -1081,6 +1380,8 @@ FIELD3DEXTENDERBASE(type,returnType)
 CELLFIELD3DEXTENDER(Field3D<CellG *>,CellG*)
 FIELD3DEXTENDER(Field3D<float>,float)
 FIELD3DEXTENDER(Field3D<int>,int)
+FLOATFIELD3DNUMPYEXTENDER(Field3D<float>)
+CELLFIELD3DNUMPYEXTENDER(Field3D<CellG *>)
 
 
 
@@ -1110,6 +1411,228 @@ FIELD3DEXTENDER(Field3D<int>,int)
 %include "Automaton/Automaton.h"
 %include <CompuCell3D/Potts3D/CellInventory.h>
 
+// struct-of-arrays access to core attributes of all cells - see cc3d/core/CellTable.py
+%{
+struct CellTableColumn{
+    const char *name;
+    double (*get)(const CellG *);
+    // null for attributes maintained by trackers (volume, surface, center of mass etc.)
+    void (*set)(CellG *, double);
+};
+
+#define CELL_TABLE_READ_ONLY_COLUMN(attr) {#attr, [](const CellG *_cell){return (double)_cell->attr;}, 0}
+#define CELL_TABLE_COLUMN(attr) {#attr, [](const CellG *_cell){return (double)_cell->attr;}, [](CellG *_cell, double _value){_cell->attr=(decltype(_cell->attr))_value;}}
+
+const CellTableColumn cellTableColumns[]={
+    CELL_TABLE_READ_ONLY_COLUMN(id),
+    CELL_TABLE_READ_ONLY_COLUMN(clusterId),
+    CELL_TABLE_COLUMN(type),
+    CELL_TABLE_COLUMN(subtype),
+    CELL_TABLE_READ_ONLY_COLUMN(volume),
+    CELL_TABLE_COLUMN(targetVolume),
+    CELL_TABLE_COLUMN(lambdaVolume),
+    CELL_TABLE_READ_ONLY_COLUMN(surface),
+    CELL_TABLE_COLUMN(targetSurface),
+    CELL_TABLE_COLUMN(lambdaSurface),
+    CELL_TABLE_READ_ONLY_COLUMN(clusterSurface),
+    CELL_TABLE_COLUMN(targetClusterSurface),
+    CELL_TABLE_COLUMN(lambdaClusterSurface),
+    CELL_TABLE_COLUMN(angle),
+    CELL_TABLE_READ_ONLY_COLUMN(xCM),
+    CELL_TABLE_READ_ONLY_COLUMN(yCM),
+    CELL_TABLE_READ_ONLY_COLUMN(zCM),
+    CELL_TABLE_READ_ONLY_COLUMN(xCOM),
+    CELL_TABLE_READ_ONLY_COLUMN(yCOM),
+    CELL_TABLE_READ_ONLY_COLUMN(zCOM),
+    CELL_TABLE_COLUMN(xCOMPrev),
+    CELL_TABLE_COLUMN(yCOMPrev),
+    CELL_TABLE_COLUMN(zCOMPrev),
+    CELL_TABLE_READ_ONLY_COLUMN(iXX),
+    CELL_TABLE_READ_ONLY_COLUMN(iXY),
+    CELL_TABLE_READ_ONLY_COLUMN(iXZ),
+    CELL_TABLE_READ_ONLY_COLUMN(iYY),
+    CELL_TABLE_READ_ONLY_COLUMN(iYZ),
+    CELL_TABLE_READ_ONLY_COLUMN(iZZ),
+    CELL_TABLE_READ_ONLY_COLUMN(lX),
+    CELL_TABLE_READ_ONLY_COLUMN(lY),
+    CELL_TABLE_READ_ONLY_COLUMN(lZ),
+    CELL_TABLE_READ_ONLY_COLUMN(ecc),
+    CELL_TABLE_COLUMN(lambdaVecX),
+    CELL_TABLE_COLUMN(lambdaVecY),
+    CELL_TABLE_COLUMN(lambdaVecZ),
+    CELL_TABLE_COLUMN(flag),
+    CELL_TABLE_COLUMN(averageConcentration),
+    CELL_TABLE_COLUMN(fluctAmpl),
+    CELL_TABLE_COLUMN(lambdaMotility),
+    CELL_TABLE_COLUMN(biasVecX),
+    CELL_TABLE_COLUMN(biasVecY),
+    CELL_TABLE_COLUMN(biasVecZ)
+};
+
+const CellTableColumn * findCellTableColumn(const std::string &_name){
+    for (size_t i=0 ; i<sizeof(cellTableColumns)/sizeof(CellTableColumn) ; ++i){
+        if (_name==cellTableColumns[i].name)
+            return &cellTableColumns[i];
+    }
+    throw std::runtime_error("Unknown cell attribute: "+_name);
+}
+
+PyArrayObject * cellTableArray(PyObject *_array, const std::string &_name, bool _writable){
+    if (!PyArray_Check(_array))
+        throw std::runtime_error(_name+": expected numpy array");
+
+    PyArrayObject *array=(PyArrayObject *)_array;
+    if (PyArray_NDIM(array)!=1 || !PyArray_IS_C_CONTIGUOUS(array) || (_writable && !PyArray_ISWRITEABLE(array)))
+        throw std::runtime_error(_name+": expected C-contiguous 1D array");
+
+    if (PyArray_ITEMSIZE(array)!=8 || !(PyArray_ISFLOAT(array) || PyArray_ISSIGNED(array)))
+        throw std::runtime_error(_name+": array must be of float64 or int64 type");
+
+    return array;
+}
+
+inline double getCellTableValue(PyArrayObject *_array, npy_intp _row){
+    if (PyArray_ISFLOAT(_array))
+        return ((npy_float64 *)PyArray_DATA(_array))[_row];
+    return (double)((npy_int64 *)PyArray_DATA(_array))[_row];
+}
+
+inline void setCellTableValue(PyArrayObject *_array, npy_intp _row, double _value){
+    if (PyArray_ISFLOAT(_array))
+        ((npy_float64 *)PyArray_DATA(_array))[_row]=_value;
+    else
+        ((npy_int64 *)PyArray_DATA(_array))[_row]=(npy_int64)_value;
+}
+
+// cell lists returned in a single call - see cc3d/core/iterators.py
+PyObject * newCellGPyObject(CellG *_cell){
+    static swig_type_info *cellType=SWIG_TypeQuery("CompuCell3D::CellG *");
+    return SWIG_NewPointerObj(SWIG_as_voidptr(_cell),cellType,0);
+}
+
+std::vector<bool> cellTypeMask(const std::vector<int> &_types){
+    std::vector<bool> typeMask(256,false);
+    for (size_t i=0 ; i<_types.size() ; ++i){
+        if (_types[i]>=0 && _types[i]<256)
+            typeMask[_types[i]]=true;
+    }
+    return typeMask;
+}
+%}
+
+%extend CompuCell3D::CellInventory{
+
+  // tuple of all cells in inventory order
+  PyObject * getCells(){
+    PyObject *cells=PyTuple_New($self->getSize());
+
+    Py_ssize_t idx=0;
+    for (CellInventory::cellInventoryIterator itr=$self->cellInventoryBegin() ; itr!=$self->cellInventoryEnd() ; ++itr, ++idx){
+        PyTuple_SET_ITEM(cells,idx,newCellGPyObject(itr->second));
+    }
+
+    return cells;
+  }
+
+  // tuple of cells of given types in inventory order
+  PyObject * getCellsByType(const std::vector<int> &_types){
+    std::vector<bool> typeMask=cellTypeMask(_types);
+    PyObject *cells=PyList_New(0);
+
+    for (CellInventory::cellInventoryIterator itr=$self->cellInventoryBegin() ; itr!=$self->cellInventoryEnd() ; ++itr){
+        if (!typeMask[itr->second->type])
+            continue;
+
+        PyObject *cell=newCellGPyObject(itr->second);
+        PyList_Append(cells,cell);
+        Py_DECREF(cell);
+    }
+
+    PyObject *cellTuple=PyList_AsTuple(cells);
+    Py_DECREF(cells);
+    return cellTuple;
+  }
+
+  int getNumberOfCellsByType(const std::vector<int> &_types){
+    std::vector<bool> typeMask=cellTypeMask(_types);
+    int numberOfCells=0;
+
+    for (CellInventory::cellInventoryIterator itr=$self->cellInventoryBegin() ; itr!=$self->cellInventoryEnd() ; ++itr){
+        if (typeMask[itr->second->type])
+            ++numberOfCells;
+    }
+
+    return numberOfCells;
+  }
+
+  bool isCellTableColumnWritable(const std::string &_name){
+    return findCellTableColumn(_name)->set!=0;
+  }
+
+  // _columns is a dictionary {attribute name:array} - arrays have one row per cell, rows follow inventory order
+  void fillCellTable(PyObject *_columns){
+    if (!PyDict_Check(_columns))
+        throw std::runtime_error("fillCellTable: expected dictionary of arrays");
+
+    std::vector<const CellTableColumn *> columns;
+    std::vector<PyArrayObject *> arrays;
+
+    PyObject *key, *value;
+    Py_ssize_t pos=0;
+    while (PyDict_Next(_columns,&pos,&key,&value)){
+        const char *name=PyUnicode_AsUTF8(key);
+        if (!name)
+            throw std::runtime_error("fillCellTable: column names must be strings");
+
+        columns.push_back(findCellTableColumn(name));
+        arrays.push_back(cellTableArray(value,name,true));
+
+        if (PyArray_DIM(arrays.back(),0)!=$self->getSize())
+            throw std::runtime_error(std::string(name)+": number of rows differs from number of cells");
+    }
+
+    npy_intp row=0;
+    for (CellInventory::cellInventoryIterator itr=$self->cellInventoryBegin() ; itr!=$self->cellInventoryEnd() ; ++itr, ++row){
+        const CellG *cell=itr->second;
+        for (size_t i=0 ; i<columns.size() ; ++i){
+            setCellTableValue(arrays[i],row,columns[i]->get(cell));
+        }
+    }
+  }
+
+  // sets attribute _name of cells _ids to _values. Nothing is modified if any of the cells does not exist
+  void setCellTableColumn(const std::string &_name, PyObject *_ids, PyObject *_values){
+    const CellTableColumn *column=findCellTableColumn(_name);
+    if (!column->set)
+        throw std::runtime_error("Cell attribute "+_name+" is read-only");
+
+    PyArrayObject *ids=cellTableArray(_ids,"ids",false);
+    PyArrayObject *values=cellTableArray(_values,_name,false);
+    npy_intp numRows=PyArray_DIM(ids,0);
+
+    if (PyArray_DIM(values,0)!=numRows)
+        throw std::runtime_error("setCellTableColumn: ids and values have different lengths");
+
+    std::vector<CellG *> cells(numRows,(CellG *)0);
+    for (npy_intp row=0 ; row<numRows ; ++row){
+        long id=(long)getCellTableValue(ids,row);
+        if ($self->getSize())
+            cells[row]=$self->attemptFetchingCellById(id);
+
+        if (!cells[row]){
+            std::ostringstream s;
+            s<<"setCellTableColumn: cell with id "<<id<<" does not exist";
+            throw std::runtime_error(s.str());
+        }
+    }
+
+    for (npy_intp row=0 ; row<numRows ; ++row){
+        column->set(cells[row],getCellTableValue(values,row));
+    }
+  }
+
+}
+
 %include <CompuCell3D/Potts3D/EnergyFunctionCalculator.h>
 %include <CompuCell3D/Potts3D/Potts3D.h>
 
@@ -1119,6 +1642,9 @@ FIELD3DEXTENDER(Field3D<int>,int)
 %include "Steppable.h"
 %include "ClassRegistry.h"
 %include <CompuCell3D/SteerableObject.h>
+%ignore CompuCell3D::SimulationProfiler::secondsSince;
+%ignore CompuCell3D::ProfilerTimer;
+%include <PublicUtilities/SimulationProfiler.h>
 %include "Simulator.h"
 %include <CompuCell3D/CC3DEvents.h>
 
@@ -61,8 +61,10 @@ using namespace CompuCell3D;
 %include "Simulator.h"
 
 
+%ignore CompuCell3D::PyCompuCellObjAdapter::getDeliveredEvents;
 %include <PyCompuCellObjAdapter.h>
 %include <EnergyFunctionPyWrapper.h>
+%include <ExpressionEnergyFunction.h>
 %include <ChangeWatcherPyWrapper.h>
 %include <TypeChangeWatcherPyWrapper.h>
 %include <StepperPyWrapper.h>
@@ -263,6 +265,74 @@ PLUGINACCESSOR(CenterOfMass)
 
 PLUGINACCESSOR(NeighborTracker)
 
+%{
+PyObject * int64VectorToNumpy(const std::vector<npy_int64> &_vec){
+    npy_intp size=_vec.size();
+    PyObject *array=PyArray_SimpleNew(1,&size,NPY_INT64);
+    if (size)
+        memcpy(PyArray_DATA((PyArrayObject *)array),&_vec[0],size*sizeof(npy_int64));
+    return array;
+}
+%}
+
+%extend CompuCell3D::NeighborTrackerPlugin{
+
+  // contact network of all cells in a single pass over cell inventory - see cc3d/core/NeighborGraph.py
+  // returns (cell ids, cell types, offsets, neighbor ids, neighbor types, common surface areas).
+  // Neighbors of i-th cell occupy [offsets[i], offsets[i+1]) range of neighbor arrays. Medium has id 0 and type 0
+  PyObject * getNeighborGraph(CellInventory *_inventory, bool _includeMedium=true){
+    ExtraMembersGroupAccessor<NeighborTracker> *neighborTrackerAccessor=$self->getNeighborTrackerAccessorPtr();
+
+    std::vector<npy_int64> cellIds, cellTypes, offsets(1,0), neighborIds, neighborTypes, commonSurfaceAreas;
+    cellIds.reserve(_inventory->getSize());
+    cellTypes.reserve(_inventory->getSize());
+    offsets.reserve(_inventory->getSize()+1);
+
+    for (CellInventory::cellInventoryIterator itr=_inventory->cellInventoryBegin() ; itr!=_inventory->cellInventoryEnd() ; ++itr){
+        CellG *cell=itr->second;
+        cellIds.push_back(cell->id);
+        cellTypes.push_back(cell->type);
+
+        std::set<NeighborSurfaceData> &cellNeighbors=neighborTrackerAccessor->get(cell->extraAttribPtr)->cellNeighbors;
+        for (std::set<NeighborSurfaceData>::iterator sitr=cellNeighbors.begin() ; sitr!=cellNeighbors.end() ; ++sitr){
+            CellG *neighbor=sitr->neighborAddress;
+            if (!neighbor && !_includeMedium)
+                continue;
+
+            neighborIds.push_back(neighbor ? neighbor->id : 0);
+            neighborTypes.push_back(neighbor ? neighbor->type : 0);
+            commonSurfaceAreas.push_back(sitr->commonSurfaceArea);
+        }
+
+        offsets.push_back(neighborIds.size());
+    }
+
+    return Py_BuildValue("(NNNNNN)",int64VectorToNumpy(cellIds),int64VectorToNumpy(cellTypes),int64VectorToNumpy(offsets),
+        int64VectorToNumpy(neighborIds),int64VectorToNumpy(neighborTypes),int64VectorToNumpy(commonSurfaceAreas));
+  }
+
+}
+
+%extend CompuCell3D::PyCompuCellObjAdapter{
+
+  // events being delivered in buffered mode - one row per event. Valid only inside batch callback
+  // (field3DChangeBatch, typeChangeBatch, stepBatch)
+  PyObject * getDeliveredEventArray(){
+    const std::vector<long> &events=$self->getDeliveredEvents();
+    npy_intp dims[2]={0,$self->getEventSize()};
+    if (dims[1])
+        dims[0]=events.size()/dims[1];
+
+    PyObject *array=PyArray_SimpleNew(2,dims,NPY_INT64);
+    npy_int64 *data=(npy_int64 *)PyArray_DATA((PyArrayObject *)array);
+    for (size_t i = 0 ; i < events.size() ; ++i)
+        data[i]=events[i];
+
+    return array;
+  }
+
+}
+
 
 %include <CompuCell3D/plugins/PixelTracker/PixelTracker.h>
 %template (PixelTrackerAccessor) ExtraMembersGroupAccessor<PixelTracker>; //necessary to get PixelTracker accessor working
@@ -272,6 +342,51 @@ PLUGINACCESSOR(NeighborTracker)
 // %template (pixelSetPyItr) STLPyIterator<std::set<CompuCell3D::PixelTrackerData> >;
 PLUGINACCESSOR(PixelTracker)
 
+%{
+// pixels of several pixel sets as (N x 3) int32 array and offsets of the sets - rows [offsets[i], offsets[i+1])
+// hold pixels of i-th set
+template<typename PixelSetType>
+PyObject * pixelSetsToNumpy(const std::vector<const PixelSetType *> &_pixelSets){
+    std::vector<npy_int64> offsets(1,0);
+    for (size_t i=0 ; i<_pixelSets.size() ; ++i){
+        offsets.push_back(offsets.back()+_pixelSets[i]->size());
+    }
+
+    npy_intp dims[2]={(npy_intp)offsets.back(),3};
+    PyObject *pixels=PyArray_SimpleNew(2,dims,NPY_INT32);
+    npy_int32 *pixelsPtr=(npy_int32 *)PyArray_DATA((PyArrayObject *)pixels);
+
+    for (size_t i=0 ; i<_pixelSets.size() ; ++i){
+        for (typename PixelSetType::const_iterator sitr=_pixelSets[i]->begin() ; sitr!=_pixelSets[i]->end() ; ++sitr){
+            *pixelsPtr++=sitr->pixel.x;
+            *pixelsPtr++=sitr->pixel.y;
+            *pixelsPtr++=sitr->pixel.z;
+        }
+    }
+
+    return Py_BuildValue("(NN)",pixels,int64VectorToNumpy(offsets));
+}
+%}
+
+%extend CompuCell3D::PixelTrackerPlugin{
+
+  // pixels of cells in a single call - returns (pixels, offsets), see pixelSetsToNumpy
+  PyObject * getPixelArrays(const std::vector<CellG *> &_cells){
+    ExtraMembersGroupAccessor<PixelTracker> *pixelTrackerAccessor=$self->getPixelTrackerAccessorPtr();
+
+    std::vector<const std::set<PixelTrackerData> *> pixelSets;
+    for (size_t i=0 ; i<_cells.size() ; ++i){
+        if (!_cells[i])
+            throw std::runtime_error("getPixelArrays: pixels of medium are not tracked per cell");
+
+        pixelSets.push_back(&pixelTrackerAccessor->get(_cells[i]->extraAttribPtr)->pixelSet);
+    }
+
+    return pixelSetsToNumpy(pixelSets);
+  }
+
+}
+
 
 %include <CompuCell3D/plugins/BoundaryPixelTracker/BoundaryPixelTracker.h>
 %template (BoundaryPixelTrackerAccessor) ExtraMembersGroupAccessor<BoundaryPixelTracker>; //necessary to get BoundaryPixelTracker accessor working
@@ -281,6 +396,38 @@ PLUGINACCESSOR(PixelTracker)
 // %template (boundaryPixelSetPyItr) STLPyIterator<std::set<CompuCell3D::BoundaryPixelTrackerData> >;
 PLUGINACCESSOR(BoundaryPixelTracker)
 
+%extend CompuCell3D::BoundaryPixelTrackerPlugin{
+
+  // boundary pixels of cells in a single call - returns (pixels, offsets), see pixelSetsToNumpy
+  PyObject * getBoundaryPixelArrays(const std::vector<CellG *> &_cells, int _neighborOrder=-1){
+    ExtraMembersGroupAccessor<BoundaryPixelTracker> *boundaryPixelTrackerAccessor=$self->getBoundaryPixelTrackerAccessorPtr();
+
+    std::vector<const std::set<BoundaryPixelTrackerData> *> pixelSets;
+    for (size_t i=0 ; i<_cells.size() ; ++i){
+        if (!_cells[i])
+            throw std::runtime_error("getBoundaryPixelArrays: pixels of medium are not tracked per cell");
+
+        const std::set<BoundaryPixelTrackerData> *pixelSet;
+        if (_neighborOrder<=0)
+            pixelSet=&boundaryPixelTrackerAccessor->get(_cells[i]->extraAttribPtr)->pixelSet;
+        else
+            pixelSet=$self->getPixelSetForNeighborOrderPtr(_cells[i],_neighborOrder);
+
+        if (!pixelSet){
+            std::ostringstream s;
+            s<<"getBoundaryPixelArrays: could not locate pixel set for neighbor order = "<<_neighborOrder
+                <<". Make sure your BoundaryPixelTracker plugin definition requests tracking of this neighbor order";
+            throw std::runtime_error(s.str());
+        }
+
+        pixelSets.push_back(pixelSet);
+    }
+
+    return pixelSetsToNumpy(pixelSets);
+  }
+
+}
+
 
 %include <CompuCell3D/plugins/ContactLocalFlex/ContactLocalFlexData.h>
 %template (contactlocalflexcontainerccessor) ExtraMembersGroupAccessor<ContactLocalFlexDataContainer>; //necessary to get ContactlocalFlexData accessor working
@@ -794,6 +941,184 @@ PLUGINACCESSOR(ContactOrientation)
 PLUGINACCESSOR(Polarization23)
 
 
+// bulk restore of per-cell plugin data from restart files - see RestartManager.load_columns. Rows of the columns
+// are matched with cells by id and rows of cells that do not exist are skipped
+%{
+PyArrayObject * restartColumnArray(PyObject *_array, const char *_name, int _typeNum, int _ndim){
+    if (!PyArray_Check(_array))
+        throw std::runtime_error(std::string(_name)+": expected numpy array");
+
+    PyArrayObject *array=(PyArrayObject *)_array;
+    if (PyArray_NDIM(array)!=_ndim || !PyArray_IS_C_CONTIGUOUS(array) || !PyArray_EquivTypenums(PyArray_TYPE(array),_typeNum)){
+        std::ostringstream s;
+        s<<_name<<": expected C-contiguous "<<_ndim<<"D array of "<<(_typeNum==NPY_INT64 ? "int64" : "float64")<<" type";
+        throw std::runtime_error(s.str());
+    }
+
+    return array;
+}
+
+// cells matching rows of restart columns - null for cells that do not exist
+std::vector<CellG *> restartColumnCells(CellInventory *_inventory, PyObject *_ids){
+    PyArrayObject *ids=restartColumnArray(_ids,"ids",NPY_INT64,1);
+    npy_intp numRows=PyArray_DIM(ids,0);
+    const npy_int64 *idPtr=(const npy_int64 *)PyArray_DATA(ids);
+
+    std::vector<CellG *> cells(numRows,(CellG *)0);
+    if (!_inventory->getSize())
+        return cells;
+
+    for (npy_intp row=0 ; row<numRows ; ++row){
+        cells[row]=_inventory->attemptFetchingCellById((long)idPtr[row]);
+    }
+
+    return cells;
+}
+
+// values of restart columns stacked into a 2D array - one row per cell
+const double * restartColumnValues(PyObject *_values, size_t _numRows, npy_intp _numColumns){
+    PyArrayObject *values=restartColumnArray(_values,"values",NPY_FLOAT64,2);
+    if (PyArray_DIM(values,0)!=(npy_intp)_numRows || PyArray_DIM(values,1)!=_numColumns){
+        std::ostringstream s;
+        s<<"values: expected array of shape ("<<_numRows<<", "<<_numColumns<<")";
+        throw std::runtime_error(s.str());
+    }
+
+    return (const double *)PyArray_DATA(values);
+}
+
+// ragged restart column - see RestartManager.ragged_columns. Values of i-th row are values[offsets[i]:offsets[i+1]]
+std::vector<std::vector<float> > restartRaggedColumn(PyObject *_values, PyObject *_offsets, size_t _numRows){
+    PyArrayObject *values=restartColumnArray(_values,"values",NPY_FLOAT64,1);
+    PyArrayObject *offsets=restartColumnArray(_offsets,"offsets",NPY_INT64,1);
+    if (PyArray_DIM(offsets,0)!=(npy_intp)_numRows+1)
+        throw std::runtime_error("offsets: number of offsets has to be number of rows + 1");
+
+    const double *valuePtr=(const double *)PyArray_DATA(values);
+    const npy_int64 *offsetPtr=(const npy_int64 *)PyArray_DATA(offsets);
+
+    std::vector<std::vector<float> > rows(_numRows);
+    for (size_t row=0 ; row<_numRows ; ++row){
+        if (offsetPtr[row]<0 || offsetPtr[row]>offsetPtr[row+1] || offsetPtr[row+1]>PyArray_DIM(values,0))
+            throw std::runtime_error("offsets: offsets have to be ascending and fit in values array");
+
+        rows[row].assign(valuePtr+offsetPtr[row],valuePtr+offsetPtr[row+1]);
+    }
+
+    return rows;
+}
+%}
+
+%extend CompuCell3D::LengthConstraintPlugin{
+  // _values columns: lambdaLength, targetLength, minorTargetLength
+  void setLengthConstraintColumns(CellInventory *_inventory, PyObject *_ids, PyObject *_values){
+    std::vector<CellG *> cells=restartColumnCells(_inventory,_ids);
+    const double *values=restartColumnValues(_values,cells.size(),3);
+
+    for (size_t row=0 ; row<cells.size() ; ++row, values+=3){
+        if (cells[row])
+            $self->setLengthConstraintData(cells[row],values[0],values[1],values[2]);
+    }
+  }
+}
+
+%extend CompuCell3D::ConnectivityGlobalPlugin{
+  // _values columns: connectivityStrength
+  void setConnectivityStrengthColumns(CellInventory *_inventory, PyObject *_ids, PyObject *_values){
+    std::vector<CellG *> cells=restartColumnCells(_inventory,_ids);
+    const double *values=restartColumnValues(_values,cells.size(),1);
+
+    for (size_t row=0 ; row<cells.size() ; ++row){
+        if (cells[row])
+            $self->setConnectivityStrength(cells[row],values[row]);
+    }
+  }
+}
+
+%extend CompuCell3D::ConnectivityLocalFlexPlugin{
+  // _values columns: connectivityStrength
+  void setConnectivityStrengthColumns(CellInventory *_inventory, PyObject *_ids, PyObject *_values){
+    std::vector<CellG *> cells=restartColumnCells(_inventory,_ids);
+    const double *values=restartColumnValues(_values,cells.size(),1);
+
+    for (size_t row=0 ; row<cells.size() ; ++row){
+        if (cells[row])
+            $self->setConnectivityStrength(cells[row],values[row]);
+    }
+  }
+}
+
+%extend CompuCell3D::CellOrientationPlugin{
+  // _values columns: lambdaCellOrientation
+  void setLambdaCellOrientationColumns(CellInventory *_inventory, PyObject *_ids, PyObject *_values){
+    std::vector<CellG *> cells=restartColumnCells(_inventory,_ids);
+    const double *values=restartColumnValues(_values,cells.size(),1);
+
+    for (size_t row=0 ; row<cells.size() ; ++row){
+        if (cells[row])
+            $self->setLambdaCellOrientation(cells[row],values[row]);
+    }
+  }
+}
+
+%extend CompuCell3D::PolarizationVectorPlugin{
+  // _values columns: x, y, z components of polarization vector
+  void setPolarizationVectorColumns(CellInventory *_inventory, PyObject *_ids, PyObject *_values){
+    std::vector<CellG *> cells=restartColumnCells(_inventory,_ids);
+    const double *values=restartColumnValues(_values,cells.size(),3);
+
+    for (size_t row=0 ; row<cells.size() ; ++row, values+=3){
+        if (cells[row])
+            $self->setPolarizationVector(cells[row],(float)values[0],(float)values[1],(float)values[2]);
+    }
+  }
+}
+
+%extend CompuCell3D::Polarization23Plugin{
+  // _values columns: x, y, z components of polarization vector, two polarization markers, lambdaPolarization
+  void setPolarization23Columns(CellInventory *_inventory, PyObject *_ids, PyObject *_values){
+    std::vector<CellG *> cells=restartColumnCells(_inventory,_ids);
+    const double *values=restartColumnValues(_values,cells.size(),6);
+
+    for (size_t row=0 ; row<cells.size() ; ++row, values+=6){
+        if (!cells[row])
+            continue;
+
+        Vector3 polarizationVec(values[0],values[1],values[2]);
+        $self->setPolarizationVector(cells[row],polarizationVec);
+        $self->setPolarizationMarkers(cells[row],(unsigned char)values[3],(unsigned char)values[4]);
+        $self->setLambdaPolarization(cells[row],values[5]);
+    }
+  }
+}
+
+%extend CompuCell3D::AdhesionFlexPlugin{
+  // _values and _offsets - ragged column of adhesion molecule densities
+  void assignAdhesionMoleculeDensityColumns(CellInventory *_inventory, PyObject *_ids, PyObject *_values, PyObject *_offsets){
+    std::vector<CellG *> cells=restartColumnCells(_inventory,_ids);
+    std::vector<std::vector<float> > densities=restartRaggedColumn(_values,_offsets,cells.size());
+
+    for (size_t row=0 ; row<cells.size() ; ++row){
+        if (cells[row])
+            $self->assignNewAdhesionMoleculeDensityVector(cells[row],densities[row]);
+    }
+  }
+}
+
+%extend CompuCell3D::ContactLocalProductPlugin{
+  // _values and _offsets - ragged column of cadherin concentrations
+  void setCadherinConcentrationColumns(CellInventory *_inventory, PyObject *_ids, PyObject *_values, PyObject *_offsets){
+    std::vector<CellG *> cells=restartColumnCells(_inventory,_ids);
+    std::vector<std::vector<float> > concentrations=restartRaggedColumn(_values,_offsets,cells.size());
+
+    for (size_t row=0 ; row<cells.size() ; ++row){
+        if (cells[row])
+            $self->setCadherinConcentrationVec(cells[row],concentrations[row]);
+    }
+  }
+}
+
+
 //ClusterSurface_autogenerated2
 PLUGINACCESSOR(ClusterSurface)
 
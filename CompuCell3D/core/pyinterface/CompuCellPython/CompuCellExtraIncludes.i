@@ -38,6 +38,7 @@
 
 #include <PyCompuCellObjAdapter.h>
 #include <EnergyFunctionPyWrapper.h>
+#include <ExpressionEnergyFunction.h>
 #include <ChangeWatcherPyWrapper.h>
 #include <TypeChangeWatcherPyWrapper.h>
 #include <StepperPyWrapper.h>
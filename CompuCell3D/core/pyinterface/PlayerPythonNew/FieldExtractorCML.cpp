@@ -16,6 +16,8 @@
 #include <vtkPointData.h>
 #include <vtkStructuredPoints.h>
 #include <vtkStructuredPointsReader.h>
+#include <vtkImageData.h>
+#include <vtkAlgorithm.h>
 #include <algorithm>
 #include <cmath>
 #include <set>
@@ -40,7 +42,8 @@ FieldExtractorCML::~FieldExtractorCML(){
 
 void FieldExtractorCML::setSimulationData(vtk_obj_addr_int_t _structuredPointsAddr){
 
-	lds=(vtkStructuredPoints *)_structuredPointsAddr;
+	// vtkStructuredPoints (legacy *.vtk) and vtkImageData (XML *.vti) snapshots are handled alike
+	lds=(vtkImageData *)_structuredPointsAddr;
 }
 
 ////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
@@ -1424,7 +1427,8 @@ bool FieldExtractorCML::fillScalarFieldCellLevelData3D(vtk_obj_addr_int_t _conAr
 
 
 bool FieldExtractorCML::readVtkStructuredPointsData(vtk_obj_addr_int_t _structuredPointsReaderAddr){
-    vtkStructuredPointsReader * reader=(vtkStructuredPointsReader *)_structuredPointsReaderAddr;
+    // accepts vtkStructuredPointsReader as well as vtkXMLImageDataReader
+    vtkAlgorithm * reader=(vtkAlgorithm *)_structuredPointsReaderAddr;
     reader->Update();
 
     return true;
@@ -21,6 +21,7 @@ class vtkFloatArray;
 class vtkPoints;
 class vtkCellArray;
 class vtkStructuredPoints;
+class vtkImageData;
 class vtkStructuredPointsReader;
 class vtkObject;
 
@@ -100,7 +101,7 @@ namespace CompuCell3D{
 	private:
 		Dim3D fieldDim;
 		int zDimFactor,yDimFactor;
-		vtkStructuredPoints * lds;
+		vtkImageData * lds;
 	};
 
 };
@@ -7,6 +7,9 @@
 #include <CompuCell3D/Field3D/Dim3D.h>
 #include <CompuCell3D/Field3D/Field3D.h>
 #include <CompuCell3D/Automaton/Automaton.h> //to get type id to type name mapping
+#include <CompuCell3D/Potts3D/CellInventory.h>
+#include <CompuCell3D/Potts3D/CellGChangeWatcher.h>
+#include <CompuCell3D/Field3D/WatchableField3D.h>
 #include <Utils/Coordinates3D.h>
 #include <vtkIntArray.h>
 #include <vtkDoubleArray.h>
@@ -19,7 +22,13 @@
 #include <vtkStructuredPoints.h>
 #include <vtkStructuredPointsWriter.h>
 #include <vtkStructuredPointsReader.h>
+#include <vtkXMLImageDataWriter.h>
+#include <vtkXMLImageDataReader.h>
+#include <vtkZLibDataCompressor.h>
+#include <vtkImageData.h>
+#include <vtkAlgorithm.h>
 #include <vtkPointData.h>
+#include <vtkFieldData.h>
 #include <algorithm>
 #include <cmath>
 
@@ -28,7 +37,43 @@
 using namespace std;
 using namespace CompuCell3D;
 
-FieldWriter::FieldWriter():fsPtr(0),potts(0),sim(0),latticeData(0)
+namespace CompuCell3D{
+
+	// collects indices of lattice points whose cell changed - each point is stored once
+	class CellFieldChangeRecorder : public CellGChangeWatcher{
+	public:
+		CellFieldChangeRecorder():valid(false){}
+
+		virtual void field3DChange(const Point3D &pt, CellG *newCell, CellG *oldCell){
+			if (!valid) return;
+			if (pt.x >= dim.x || pt.y >= dim.y || pt.z >= dim.z){
+				// lattice was resized - changes can no longer be expressed relative to last keyframe
+				valid = false;
+				return;
+			}
+			long idx = (long)dim.x * ((long)dim.y * pt.z + pt.y) + pt.x;
+			if (!changedFlags[idx]){
+				changedFlags[idx] = 1;
+				changedIndices.push_back(idx);
+			}
+		}
+
+		void reset(const Dim3D & _dim){
+			dim = _dim;
+			changedFlags.assign((long)dim.x * dim.y * dim.z, 0);
+			changedIndices.clear();
+			valid = true;
+		}
+
+		Dim3D dim;
+		bool valid;
+		std::vector<unsigned char> changedFlags;
+		std::vector<long> changedIndices;
+	};
+
+};
+
+FieldWriter::FieldWriter():fsPtr(0),potts(0),sim(0),latticeData(0),binaryFlag(false),changeRecorder(0)
 {
 
 }
@@ -37,6 +82,8 @@ FieldWriter::~FieldWriter(){
 	if (latticeData){
 		latticeData->Delete();
 	}
+	// recorder is unregistered by stopRecordingCellFieldChanges - Potts may no longer exist here
+	delete changeRecorder;
 }
 ////////////////////////////////////////////////////////////////////////////////
 void FieldWriter::init(Simulator * _sim){
@@ -63,6 +110,10 @@ void FieldWriter::clear(){
 		latticeData->GetPointData()->RemoveArray(arrayNameVec[i].c_str());	
 	}
 	arrayNameVec.clear();
+	for (int i = 0; i < fieldDataArrayNameVec.size(); ++i){
+		latticeData->GetFieldData()->RemoveArray(fieldDataArrayNameVec[i].c_str());
+	}
+	fieldDataArrayNameVec.clear();
 }
 ////////////////////////////////////////////////////////////////////////////////
 void FieldWriter::setFileTypeToBinary(bool flag){
@@ -82,10 +133,10 @@ void FieldWriter::writeFields(std::string _fileName){
     latticeData->SetDimensions(fieldDim.x,fieldDim.y,fieldDim.z);
 
 
-//	if (binaryFlag)
-//	    latticeDataWriter->SetFileTypeToBinary();
-//	else
-//	    latticeDataWriter->SetFileTypeToASCII();
+	if (binaryFlag)
+	    latticeDataWriter->SetFileTypeToBinary();
+	else
+	    latticeDataWriter->SetFileTypeToASCII();
         #ifdef VTK6
             latticeDataWriter->SetInputData(latticeData);
         #else
@@ -99,16 +150,62 @@ void FieldWriter::writeFields(std::string _fileName){
 	latticeDataWriter->Delete();
 }
 ////////////////////////////////////////////////////////////////////////////////
+void FieldWriter::writeFieldsXML(std::string _fileName, int _compressionLevel){
+
+	//get new field dim before each write event - in case simulation dimensions have changed
+	Field3D<CellG*> * cellFieldG=potts->getCellFieldG();
+	Dim3D fieldDim=cellFieldG->getDim();
+
+	latticeData->SetDimensions(fieldDim.x,fieldDim.y,fieldDim.z);
+
+	vtkXMLImageDataWriter * latticeDataWriter=vtkXMLImageDataWriter::New();
+	latticeDataWriter->SetFileName(_fileName.c_str());
+	// arrays are stored as raw binary blocks appended after XML header - no base64 or ASCII formatting
+	latticeDataWriter->SetDataModeToAppended();
+	latticeDataWriter->EncodeAppendedDataOff();
+
+	vtkZLibDataCompressor * compressor=vtkZLibDataCompressor::New();
+	compressor->SetCompressionLevel(_compressionLevel);
+	latticeDataWriter->SetCompressor(compressor);
+
+        #ifdef VTK6
+            latticeDataWriter->SetInputData(latticeData);
+        #else
+            latticeDataWriter->SetInput(latticeData);
+        #endif
+
+	latticeDataWriter->Write();
+	latticeDataWriter->Delete();
+	compressor->Delete();
+}
+////////////////////////////////////////////////////////////////////////////////
 void FieldWriter::generatePIFFileFromVTKOutput(std::string _vtkFileName,std::string _pifFileName,short _dimX, short _dimY, short _dimZ,std::map<int,std::string> &typeIdTypeNameMap){
 
-	vtkStructuredPointsReader * latticeDataReader=vtkStructuredPointsReader::New();
-	latticeDataReader->SetFileName(_vtkFileName.c_str());
-	latticeDataReader->Update();
-	vtkStructuredPoints * lds=latticeDataReader->GetOutput();
+	vtkAlgorithm * latticeDataReader=0;
+	vtkImageData * lds=0;
+	if (_vtkFileName.size() >= 4 && _vtkFileName.compare(_vtkFileName.size() - 4, 4, ".vti") == 0){
+		vtkXMLImageDataReader * reader=vtkXMLImageDataReader::New();
+		reader->SetFileName(_vtkFileName.c_str());
+		reader->Update();
+		lds=reader->GetOutput();
+		latticeDataReader=reader;
+	}else{
+		vtkStructuredPointsReader * reader=vtkStructuredPointsReader::New();
+		reader->SetFileName(_vtkFileName.c_str());
+		reader->Update();
+		lds=reader->GetOutput();
+		latticeDataReader=reader;
+	}
 	
 	vtkCharArray *typeArrayRead=(vtkCharArray *)lds->GetPointData()->GetArray("CellType");
 	vtkLongArray *idArrayRead=(vtkLongArray *)lds->GetPointData()->GetArray("CellId");
 	vtkLongArray *clusterIdArrayRead=(vtkLongArray *)lds->GetPointData()->GetArray("ClusterId");
+
+	if (!typeArrayRead || !idArrayRead || !clusterIdArrayRead){
+		cout << "FieldWriter::generatePIFFileFromVTKOutput(): " << _vtkFileName << " does not store full cell field" << endl;
+		latticeDataReader->Delete();
+		return;
+	}
 	
 	ofstream outFile(_pifFileName.c_str());
 	outFile<<"Include Clusters"<<endl;
@@ -221,6 +318,89 @@ void FieldWriter::addCellFieldForOutput(){
 			clusterIdArray->Delete();
 }
 ////////////////////////////////////////////////////////////////////////////////
+void FieldWriter::recordCellFieldChanges(){
+	if (!changeRecorder){
+		changeRecorder = new CellFieldChangeRecorder();
+		potts->registerCellGChangeWatcher(changeRecorder);
+	}
+	changeRecorder->reset(potts->getCellFieldG()->getDim());
+}
+////////////////////////////////////////////////////////////////////////////////
+void FieldWriter::stopRecordingCellFieldChanges(){
+	if (!changeRecorder) return;
+
+	WatchableField3D<CellG *> *cellFieldG = dynamic_cast<WatchableField3D<CellG *> *>(potts->getCellFieldG());
+	if (cellFieldG) cellFieldG->removeChangeWatcher(changeRecorder);
+	delete changeRecorder;
+	changeRecorder = 0;
+}
+////////////////////////////////////////////////////////////////////////////////
+bool FieldWriter::addCellFieldChangesForOutput(){
+	Field3D<CellG*> * cellFieldG=potts->getCellFieldG();
+	Dim3D fieldDim=cellFieldG->getDim();
+
+	if (!changeRecorder || !changeRecorder->valid || !(changeRecorder->dim == fieldDim)) return false;
+
+	const std::vector<long> & changedIndices = changeRecorder->changedIndices;
+	long numberOfChanges = changedIndices.size();
+
+	vtkLongArray *indexArray=vtkLongArray::New();
+	indexArray->SetName("ChangedPixelIndex");
+	indexArray->SetNumberOfValues(numberOfChanges);
+
+	vtkLongArray *idArray=vtkLongArray::New();
+	idArray->SetName("ChangedPixelCellId");
+	idArray->SetNumberOfValues(numberOfChanges);
+
+	Point3D pt;
+	long sliceSize = (long)fieldDim.x * fieldDim.y;
+	for (long i = 0; i < numberOfChanges; ++i){
+		long idx = changedIndices[i];
+		pt.z = idx / sliceSize;
+		pt.y = (idx % sliceSize) / fieldDim.x;
+		pt.x = idx % fieldDim.x;
+
+		CellG * cell = cellFieldG->get(pt);
+		indexArray->SetValue(i, idx);
+		idArray->SetValue(i, cell ? cell->id : 0);
+	}
+
+	// types and cluster ids of all cells - cell types may change without any pixel copy
+	CellInventory & inventory = potts->getCellInventory();
+
+	vtkLongArray *tableIdArray=vtkLongArray::New();
+	tableIdArray->SetName("CellTableId");
+	tableIdArray->SetNumberOfValues(inventory.getSize());
+
+	vtkCharArray *tableTypeArray=vtkCharArray::New();
+	tableTypeArray->SetName("CellTableType");
+	tableTypeArray->SetNumberOfValues(inventory.getSize());
+
+	vtkLongArray *tableClusterIdArray=vtkLongArray::New();
+	tableClusterIdArray->SetName("CellTableClusterId");
+	tableClusterIdArray->SetNumberOfValues(inventory.getSize());
+
+	long row = 0;
+	for (CellInventory::cellInventoryIterator cInvItr = inventory.cellInventoryBegin(); cInvItr != inventory.cellInventoryEnd(); ++cInvItr){
+		CellG * cell = inventory.getCell(cInvItr);
+		tableIdArray->SetValue(row, cell->id);
+		tableTypeArray->SetValue(row, cell->type);
+		tableClusterIdArray->SetValue(row, cell->clusterId);
+		++row;
+	}
+
+	vtkDataArray * arrays[] = {indexArray, idArray, tableIdArray, tableTypeArray, tableClusterIdArray};
+	for (int i = 0; i < 5; ++i){
+		latticeData->GetFieldData()->AddArray(arrays[i]);
+		fieldDataArrayNameVec.push_back(arrays[i]->GetName());
+		arrays[i]->Delete();
+	}
+
+	changeRecorder->reset(fieldDim);
+
+	return true;
+}
+////////////////////////////////////////////////////////////////////////////////
 bool FieldWriter::addConFieldForOutput(std::string _conFieldName){
 	Field3D<CellG*> * cellFieldG=potts->getCellFieldG();
 	Dim3D fieldDim=cellFieldG->getDim();
@@ -29,6 +29,7 @@ namespace CompuCell3D{
 	class Potts3D;
 	class Simulator;
 	class Dim3D;
+	class CellFieldChangeRecorder;
 
 	class FIELDEXTRACTOR_EXPORT  FieldWriter{
 	public:
@@ -41,8 +42,16 @@ namespace CompuCell3D{
 		FieldStorage * getFieldStorage(FieldStorage * _fsPtr){return fsPtr;}
       void init(Simulator * _sim);
 
-		void setFileTypeToBinary(bool flag);  // not currently used
+		void setFileTypeToBinary(bool flag);
 		void addCellFieldForOutput();
+		// starts (or restarts) recording of cell field changes - called after each keyframe snapshot
+		void recordCellFieldChanges();
+		// stops recording of cell field changes - has to be called before Potts is destroyed
+		void stopRecordingCellFieldChanges();
+		// adds cell field changes recorded since last call (changed pixels with their current cell ids and
+		// table of cell types and cluster ids) as field data of the snapshot. Returns false if changes
+		// were not recorded (e.g. lattice was resized) and full cell field has to be written instead
+		bool addCellFieldChangesForOutput();
 		bool addConFieldForOutput(std::string _conFieldName);
 		bool addScalarFieldForOutput(std::string _scalarFieldName);
 		bool addScalarFieldCellLevelForOutput(std::string _scalarFieldCellLevelName);
@@ -51,6 +60,8 @@ namespace CompuCell3D{
 
 		void clear();
 		void writeFields(std::string _fileName);
+		// writes fields as VTK XML image data (*.vti) - binary, zlib-compressed arrays
+		void writeFieldsXML(std::string _fileName, int _compressionLevel = 6);
 
 		void generatePIFFileFromVTKOutput(std::string _vtkFileName,std::string _pifFileName,short _dimX, short _dimY, short _dimZ, std::map<int,std::string> &typeIdTypeNameMap);
 	    void generatePIFFileFromCurrentStateOfSimulation(std::string _pifFileName);
@@ -60,7 +71,9 @@ namespace CompuCell3D{
 		std::vector<Coordinates3D<double> > hexagonVertices;
         vtkStructuredPoints *latticeData;
 		std::vector<std::string> arrayNameVec;
-		bool binaryFlag;   // not currently used
+		std::vector<std::string> fieldDataArrayNameVec;
+		CellFieldChangeRecorder * changeRecorder;
+		bool binaryFlag;
 		/*Dim3D fieldDim;*/
 	};
 
@@ -7,6 +7,10 @@ using namespace CompuCell3D;
 ChangeWatcherPyWrapper::ChangeWatcherPyWrapper():
 CellGChangeWatcher()
 {
+	// buffered event: x, y, z, new cell id, old cell id (0 means medium)
+	eventSize=5;
+	batchMethodName="field3DChangeBatch";
+
 	lockPtr=new ParallelUtilsOpenMP::OpenMPLock_t;
 	pUtils->initLock(lockPtr);
 }
@@ -25,6 +29,12 @@ CellGChangeWatcher * ChangeWatcherPyWrapper::getChangeWatcherPyWrapperPtr()
 void ChangeWatcherPyWrapper::field3DChange(const Point3D &pt, CellG *_newCell,CellG *_oldCell)
 {
    
+   if (buffered){
+      long event[]={pt.x,pt.y,pt.z,_newCell ? _newCell->id : 0,_oldCell ? _oldCell->id : 0};
+      bufferEvent(event);
+      return;
+   }
+
    //return;
    int currentWorkNodeNumber=pUtils->getCurrentWorkNodeNumber();	
    //cerr<<"CHANGE WATCHER pt="<<pt<<" _newCell="<<_newCell<<" _oldCell="<<_oldCell<<" currentWorkNodeNumber="<<currentWorkNodeNumber<<" newCellVec.size()="<<newCellVec.size()<<endl;
@@ -0,0 +1,121 @@
+#include "ExpressionEnergyFunction.h"
+#include <CompuCell3D/Simulator.h>
+#include <CompuCell3D/Potts3D/Cell.h>
+#include <stdexcept>
+
+using namespace std;
+using namespace CompuCell3D;
+
+// attributes of new and old cell available in expressions - prefixed with new_ and old_
+static const char * cellVariableNames[] = {"medium", "type", "id", "clusterId", "volume", "targetVolume",
+	"lambdaVolume", "surface", "targetSurface", "lambdaSurface", "xCOM", "yCOM", "zCOM", "fluctAmpl"};
+static const unsigned int numberOfCellVariables = sizeof(cellVariableNames) / sizeof(cellVariableNames[0]);
+
+ExpressionEnergyFunction::ExpressionEnergyFunction():
+EnergyFunction(),
+pUtils(0)
+{
+	builtinVariableNames.push_back("x");
+	builtinVariableNames.push_back("y");
+	builtinVariableNames.push_back("z");
+
+	const char * prefixes[] = {"new_", "old_"};
+	for (int i = 0; i < 2; ++i){
+		for (unsigned int j = 0; j < numberOfCellVariables; ++j){
+			builtinVariableNames.push_back(string(prefixes[i]) + cellVariableNames[j]);
+		}
+	}
+}
+
+void ExpressionEnergyFunction::init(Simulator * _sim){
+	if (eed.size()){//this means initialization already happened
+		return;
+	}
+	pUtils = _sim->getParallelUtils();
+	eed.allocateSize(pUtils->getMaxNumberOfWorkNodesPotts());
+	eed.addVariables(builtinVariableNames.begin(), builtinVariableNames.end());
+}
+
+void ExpressionEnergyFunction::setParameter(std::string _name, double _value){
+	if (!eed.size()) throw runtime_error("ExpressionEnergyFunction::setParameter(): init has to be called first");
+
+	if (!parameters.count(_name)){
+		// adding variable reinitializes parsers of all work nodes and sets expression again
+		eed.addVariable(_name);
+	}
+	parameters[_name] = _value;
+
+	for (unsigned int i = 0; i < eed.size(); ++i){
+		eed[i].setVar(_name, _value);
+	}
+}
+
+double ExpressionEnergyFunction::getParameter(std::string _name){
+	map<string, double>::iterator mitr = parameters.find(_name);
+	if (mitr == parameters.end()) throw runtime_error("ExpressionEnergyFunction: undefined parameter " + _name);
+
+	return mitr->second;
+}
+
+void ExpressionEnergyFunction::setExpression(std::string _expression){
+	if (!eed.size()) throw runtime_error("ExpressionEnergyFunction::setExpression(): init has to be called first");
+
+	// expression is validated by a separate parser - parsers of work nodes keep previous expression if it is invalid
+	ExpressionEvaluator ev;
+	ev.addVariables(builtinVariableNames.begin(), builtinVariableNames.end());
+	for (map<string, double>::iterator mitr = parameters.begin(); mitr != parameters.end(); ++mitr){
+		ev.addVariable(mitr->first);
+		ev.setVar(mitr->first, mitr->second);
+	}
+	ev.setExpression(_expression);
+
+	// muParser reports undefined variables and syntax errors only on evaluation
+	try{
+		ev.eval();
+	}catch (mu::Parser::exception_type &e){
+		throw runtime_error("ExpressionEnergyFunction: invalid expression " + _expression + " : " + e.GetMsg());
+	}
+
+	eed.setExpression(_expression);
+
+	expression = _expression;
+}
+
+void ExpressionEnergyFunction::setCellVariables(ExpressionEvaluator & _ev, unsigned int _offset, const CellG *_cell){
+	if (!_cell){
+		_ev[_offset] = 1.0;
+		for (unsigned int i = 1; i < numberOfCellVariables; ++i){
+			_ev[_offset + i] = 0.0;
+		}
+		return;
+	}
+
+	_ev[_offset] = 0.0;
+	_ev[_offset + 1] = _cell->type;
+	_ev[_offset + 2] = _cell->id;
+	_ev[_offset + 3] = _cell->clusterId;
+	_ev[_offset + 4] = _cell->volume;
+	_ev[_offset + 5] = _cell->targetVolume;
+	_ev[_offset + 6] = _cell->lambdaVolume;
+	_ev[_offset + 7] = _cell->surface;
+	_ev[_offset + 8] = _cell->targetSurface;
+	_ev[_offset + 9] = _cell->lambdaSurface;
+	_ev[_offset + 10] = _cell->xCOM;
+	_ev[_offset + 11] = _cell->yCOM;
+	_ev[_offset + 12] = _cell->zCOM;
+	_ev[_offset + 13] = _cell->fluctAmpl;
+}
+
+double ExpressionEnergyFunction::changeEnergy(const Point3D &pt, const CellG *newCell, const CellG *oldCell){
+	if (expression.empty()) return 0.0;
+
+	ExpressionEvaluator & ev = eed[pUtils->getCurrentWorkNodeNumber()];
+
+	ev[0] = pt.x;
+	ev[1] = pt.y;
+	ev[2] = pt.z;
+	setCellVariables(ev, 3, newCell);
+	setCellVariables(ev, 3 + numberOfCellVariables, oldCell);
+
+	return ev.eval();
+}
@@ -0,0 +1,54 @@
+#ifndef EXPRESSIONENERGYFUNCTION_H
+#define EXPRESSIONENERGYFUNCTION_H
+
+#include <CompuCell3D/Potts3D/EnergyFunction.h>
+#include <PublicUtilities/ParallelUtilsOpenMP.h>
+#include <muParser/ExpressionEvaluator/ExpressionEvaluator.h>
+#include <map>
+#include <string>
+#include <vector>
+
+namespace CompuCell3D{
+   class Simulator;
+   class CellG;
+
+   // Energy term defined in Python as muParser expression. Unlike EnergyFunctionPyWrapper it is evaluated
+   // in C++ by every Potts work node using its own parser - no GIL and no lock are needed.
+   // Expression can use pixel coordinates (x, y, z), attributes of new and old cell
+   // (new_volume, old_targetVolume, new_medium, ...) and parameters defined using setParameter
+   class ExpressionEnergyFunction: public EnergyFunction{
+
+   public:
+      ExpressionEnergyFunction();
+      virtual ~ExpressionEnergyFunction(){}
+
+      // allocates one parser per Potts work node - has to be called before setExpression
+      void init(Simulator * _sim);
+
+      // defines parameter or changes its value
+      void setParameter(std::string _name, double _value);
+      double getParameter(std::string _name);
+
+      // throws std::runtime_error if expression cannot be evaluated
+      void setExpression(std::string _expression);
+      std::string getExpression(){return expression;}
+
+      // names of variables that can be used in expressions besides parameters
+      std::vector<std::string> getBuiltinVariableNames(){return builtinVariableNames;}
+
+      virtual double changeEnergy(const Point3D &pt, const CellG *newCell, const CellG *oldCell);
+      virtual std::string toString(){return "ExpressionEnergyFunction";}
+
+   private:
+      void setCellVariables(ExpressionEvaluator & _ev, unsigned int _offset, const CellG *_cell);
+
+      ExpressionEvaluatorDepot eed;
+      ParallelUtilsOpenMP * pUtils;
+      std::vector<std::string> builtinVariableNames;
+      std::map<std::string, double> parameters;
+      std::string expression;
+   };
+
+};
+
+#endif
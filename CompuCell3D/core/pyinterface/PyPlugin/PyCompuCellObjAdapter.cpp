@@ -3,10 +3,17 @@
 using namespace CompuCell3D;
 using namespace std;
 
-PyCompuCellObjAdapter::PyCompuCellObjAdapter():pUtils(0)
+PyCompuCellObjAdapter::PyCompuCellObjAdapter():pUtils(0),buffered(false),maxBufferedEvents(0),eventSize(0),bufferLockPtr(0)
 {	
 }
 
+PyCompuCellObjAdapter::~PyCompuCellObjAdapter(){
+	if (bufferLockPtr){
+		pUtils->destroyLock(bufferLockPtr);
+		delete bufferLockPtr;
+	}
+}
+
 void PyCompuCellObjAdapter::setPotts(Potts3D * _potts){
 	potts=_potts;
 }
@@ -18,7 +25,13 @@ void PyCompuCellObjAdapter::setSimulator(Simulator * _sim){
     oldCellVec.assign(maxNumberOfWorkNodes,(CellG*)0);
     flipNeighborVec.assign(maxNumberOfWorkNodes,Point3D());
     changePointVec.assign(maxNumberOfWorkNodes,Point3D());
+    newTypeVec.assign(maxNumberOfWorkNodes,0);
+    eventBufferVec.assign(maxNumberOfWorkNodes,vector<long>());
 
+    if (!bufferLockPtr){
+        bufferLockPtr=new ParallelUtilsOpenMP::OpenMPLock_t;
+        pUtils->initLock(bufferLockPtr);
+    }
 }
 
  bool PyCompuCellObjAdapter::isNewCellValid(){return newCellVec[pUtils->getCurrentWorkNodeNumber()];}
@@ -33,4 +46,61 @@ void PyCompuCellObjAdapter::setSimulator(Simulator * _sim){
 void PyCompuCellObjAdapter::registerPyObject(PyObject * _pyObject){
 
    vecPyObject.push_back(_pyObject);
+}
+
+void PyCompuCellObjAdapter::setBuffered(bool _flag, unsigned int _maxBufferedEvents){
+	if (buffered && !_flag){
+		// events buffered so far are delivered before switching back to immediate calls
+		flush();
+	}
+	buffered=_flag;
+	maxBufferedEvents=_maxBufferedEvents;
+}
+
+void PyCompuCellObjAdapter::flush(){
+	deliverBufferedEvents();
+}
+
+void PyCompuCellObjAdapter::bufferEvent(const long * _event){
+	int currentWorkNodeNumber=pUtils->getCurrentWorkNodeNumber();
+	vector<long> & eventBuffer=eventBufferVec[currentWorkNodeNumber];
+
+	eventBuffer.insert(eventBuffer.end(),_event,_event+eventSize);
+
+	if (maxBufferedEvents && eventBuffer.size() >= maxBufferedEvents*eventSize){
+		deliverBufferedEvents(currentWorkNodeNumber);
+	}
+}
+
+void PyCompuCellObjAdapter::deliverBufferedEvents(int _workNodeNumber){
+	// only one buffer is delivered at a time - other threads keep appending to their own buffers
+	pUtils->setLock(bufferLockPtr);
+
+	deliveredEvents.clear();
+	for (int i = 0 ; i < eventBufferVec.size() ; ++i){
+		if (_workNodeNumber >= 0 && i != _workNodeNumber) continue;
+
+		deliveredEvents.insert(deliveredEvents.end(),eventBufferVec[i].begin(),eventBufferVec[i].end());
+		eventBufferVec[i].clear();
+	}
+
+	if (deliveredEvents.size()){
+		PyGILState_STATE gstate;
+		gstate = PyGILState_Ensure();
+		for (int i = 0 ; i < vecPyObject.size() ; ++i){
+			PyObject *ret=PyObject_CallMethod(vecPyObject[i],const_cast<char *>(batchMethodName.c_str()),0);
+			if (!ret){
+				// Potts work nodes deliver full buffers during Metropolis sweep where exceptions cannot be
+				// propagated - traceback is printed and Python error indicator is cleared
+				PyErr_Print();
+				continue;
+			}
+			Py_DECREF(ret);
+		}
+		PyGILState_Release(gstate);
+
+		deliveredEvents.clear();
+	}
+
+	pUtils->unsetLock(bufferLockPtr);
 }
\ No newline at end of file
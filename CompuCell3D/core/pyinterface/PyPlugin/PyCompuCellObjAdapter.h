@@ -5,6 +5,7 @@
 #include <CompuCell3D/Field3D/Point3D.h>
 #include <PublicUtilities/ParallelUtilsOpenMP.h>
 #include <vector>
+#include <string>
 #include <Python.h>
 
 
@@ -19,7 +20,7 @@ namespace CompuCell3D{
    
    public:
 	  PyCompuCellObjAdapter();
-	  virtual ~PyCompuCellObjAdapter(){};
+	  virtual ~PyCompuCellObjAdapter();
 	  
      void setPotts(Potts3D * _potts);
      void setSimulator(Simulator * _sim);
@@ -34,6 +35,17 @@ namespace CompuCell3D{
 	 Point3D  getChangePoint();
 	 CellG::CellType_t getNewType();
 
+     // buffered mode - events are appended to per-thread buffers without acquiring GIL and are delivered
+     // to Python objects (method named batchMethodName) when flush is called or when buffer of a thread
+     // reaches _maxBufferedEvents events (0 means no limit). During delivery events are available via getDeliveredEvents
+     void setBuffered(bool _flag, unsigned int _maxBufferedEvents = 0);
+     bool isBuffered(){return buffered;}
+     void flush();
+     const std::vector<long> & getDeliveredEvents(){return deliveredEvents;}
+     // number of values describing single event
+     unsigned int getEventSize(){return eventSize;}
+     std::string getBatchMethodName(){return batchMethodName;}
+
 
      //bool isNewCellValid(){return newCell;}
      //bool isOldCellValid(){return oldCell;}
@@ -63,6 +75,18 @@ namespace CompuCell3D{
 	 std::vector<Point3D> flipNeighborVec;
 	 std::vector<Point3D> changePointVec;
 	 std::vector<CellG::CellType_t> newTypeVec;
+
+	 // buffered mode
+	 void bufferEvent(const long * _event);
+	 void deliverBufferedEvents(int _workNodeNumber = -1);
+
+	 bool buffered;
+	 unsigned int maxBufferedEvents;
+	 unsigned int eventSize;
+	 std::string batchMethodName;
+	 std::vector<std::vector<long> > eventBufferVec;
+	 std::vector<long> deliveredEvents;
+	 ParallelUtilsOpenMP::OpenMPLock_t *bufferLockPtr;
    };
 
 
@@ -7,6 +7,10 @@ using namespace CompuCell3D;
 StepperPyWrapper::StepperPyWrapper():
 Stepper()
 {
+	// buffered event: work node number of the thread that ran the stepper
+	eventSize=1;
+	batchMethodName="stepBatch";
+
 	lockPtr=new ParallelUtilsOpenMP::OpenMPLock_t;
 	pUtils->initLock(lockPtr);
 }
@@ -24,6 +28,12 @@ Stepper* StepperPyWrapper::getStepperPyWrapperPtr()
 
 void StepperPyWrapper::step()
 {
+   if (buffered){
+      long event[]={pUtils->getCurrentWorkNodeNumber()};
+      bufferEvent(event);
+      return;
+   }
+
    //cerr<<"STEPPER "<<endl;
    
    PyObject *ret;
@@ -6,6 +6,10 @@ using namespace CompuCell3D;
 TypeChangeWatcherPyWrapper::TypeChangeWatcherPyWrapper():
 TypeChangeWatcher()
 {
+	// buffered event: cell id, old type, new type
+	eventSize=3;
+	batchMethodName="typeChangeBatch";
+
 	lockPtr=new ParallelUtilsOpenMP::OpenMPLock_t;
 	pUtils->initLock(lockPtr);
 }
@@ -23,6 +27,12 @@ TypeChangeWatcher * TypeChangeWatcherPyWrapper::getTypeChangeWatcherPyWrapperPtr
 
 void TypeChangeWatcherPyWrapper::typeChange(CellG* _cell,CellG::CellType_t _newType)
 {
+  if (buffered){
+     // watchers are called before new type is assigned
+     long event[]={_cell ? _cell->id : 0,_cell ? _cell->type : 0,_newType};
+     bufferEvent(event);
+     return;
+  }
 
   int currentWorkNodeNumber=pUtils->getCurrentWorkNodeNumber();
    newCellVec[currentWorkNodeNumber]=const_cast<CellG *>(_cell);
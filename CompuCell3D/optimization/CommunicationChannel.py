@@ -1,7 +1,7 @@
 
 import multiprocessing
 from multiprocessing import Queue,Event
-from Queue import Empty
+from queue import Empty
 
 class CommunicationChannel(object):
     def __init__(self):
@@ -155,8 +155,8 @@ class MonitorBase(OptionsObject):
 
                 self.process_message(msg=msg)
 
-            except StopIteration, e:
-                print 'GOT STOP ITERATION REQUEST ', str(e)
+            except StopIteration as e:
+                print('GOT STOP ITERATION REQUEST ', str(e))
                 # dbgMsg('GOT STOP ITERATION REQUEST ', str(e))
                 break
 
@@ -1,7 +1,7 @@
-from multiprocessing import Process
+from multiprocessing import Process, Value
 # from subprocess import call
 import subprocess
-from template_utils import generate_simulation_files_from_template
+from cc3d.core.param_scan.template_utils import stage_simulation_from_template
 from jinja2 import Environment, FileSystemLoader
 from glob import glob
 from MonitorBase import *
@@ -13,17 +13,54 @@ from os.path import *
 import shutil
 
 import random
+import signal
+import sys
 import time
 
 
+def kill_process_tree(pid):
+    """
+    Kills process and all its descendants. On POSIX systems the process has to be a process group leader
+    (e.g. started with start_new_session=True)
+    :param pid: {int} process id
+    :return: None
+    """
+    if sys.platform.startswith('win'):
+        subprocess.call(['taskkill', '/F', '/T', '/PID', str(pid)], stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL)
+        return
+
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        # process already exited
+        pass
+
+
 class OptimizerWorkerProcessZMQ(MonitorBase, Process):
     def __init__(self, id_number=-1, name='generic_monitor', configuration=None, session_data=None):
         MonitorBase.__init__(self, id_number=id_number, name=name, configuration=configuration,
                              session_data=session_data)
-        Process.__init__(self)
+        Process.__init__(self, name=name)
         self.push_address_str = None
         self.pull_address_str = None
 
+        # sockets are created once in event_loop and reused for every workload the worker processes
+        self.context = None
+        self.consumer_receiver = None
+        self.consumer_sender = None
+
+        # CC3D run script process of the current workload - killed when worker is terminated
+        self.simulation_process = None
+
+        # pid of the CC3D run script process shared with the process that started the worker so that it can kill
+        # simulation together with the worker - 0 means no simulation is running
+        self.simulation_pid = Value('i', 0)
+
+        # worker exits when the process that started it (optimizer or worker node) is gone
+        self.parent_pid = os.getpid()
+        self.parent_check_interval = 1.0
+
     def set_pull_address_str(self, address_str):
         """
         Sets address for the listening socket (zmq.PULL)
@@ -50,17 +87,18 @@ class OptimizerWorkerProcessZMQ(MonitorBase, Process):
         pass
 
 
-    def create_dir_hash(self, simulation_name, param_dict):
+    def create_dir_hash(self, simulation_name, param_dict, worker_tag=''):
         """
         creates hashed name for the workspace directory based on  simulation_name, current_timestamp and
         string representation of parameter dictionary
         :param simulation_name:{str} full path to the simulation template
         :param param_dict: {dict} dictionary of parameters
+        :param worker_tag: {str} tag of the workload - distinguishes repeated evaluations of the same parameters
         :return: {str} hashed corename of workspace directory
         """
 
         hasher = hashlib.sha1()
-        hasher.update(str(param_dict) + simulation_name)
+        hasher.update((str(param_dict) + simulation_name + worker_tag).encode('utf-8'))
 
         return self.get_formatted_timestamp() + '_' + hasher.hexdigest()
 
@@ -84,7 +122,8 @@ class OptimizerWorkerProcessZMQ(MonitorBase, Process):
         os.makedirs(dirname)
 
 
-    def generate_simulation_files_from_template(self, workspace_dir, simulation_template_name, param_dict):
+    def generate_simulation_files_from_template(self, workspace_dir, simulation_template_name, param_dict,
+                                                worker_tag='', staging_mode='copy'):
         """
         Uses jinja2 templating engine to generate actual simulation files from simulation templates
         ( we use jinja2 templating syntax)
@@ -92,25 +131,27 @@ class OptimizerWorkerProcessZMQ(MonitorBase, Process):
         :param simulation_template_name: full path to current cc3d simulation template - a regular cc3d simulation with
         numbers replaced by template labels
         :param param_dict: {dict} - dictionary of template parameters used to replace template labels with actual parameters
+        :param worker_tag: {str} tag of the workload
+        :param staging_mode: {str} how files that are not templates are placed in the generated simulation -
+        one of 'copy', 'hardlink', 'symlink'
         :return : ({str},{str}) - tuple  where first element is a path to cc3d simulation generated using param_dict.
         The simulation is placed in the "hashed" directory and the second element is the "hashed" workspace dir
         """
 
     # dir core path
         hashed_workspace_dir_corename = self.create_dir_hash(simulation_name=simulation_template_name,
-                                                             param_dict=param_dict)
+                                                             param_dict=param_dict, worker_tag=worker_tag)
 
         # hashed workspace dir
         hashed_workspace_dir = join(workspace_dir, hashed_workspace_dir_corename)
 
         simulation_dirname = join(hashed_workspace_dir, 'simulation_template')
 
-        generated_simulation_fname, simulation_dirname = generate_simulation_files_from_template(
-            simulation_dirname=simulation_dirname,
-            # simulation_dirname=hashed_workspace_dir,
-            simulation_template_name=simulation_template_name,param_dict=param_dict)
+        generated_simulation_fname = stage_simulation_from_template(
+            cc3d_proj_template=simulation_template_name, target_dir=simulation_dirname,
+            param_dict=param_dict, staging_mode=staging_mode)
 
-        return generated_simulation_fname, hashed_workspace_dir
+        return str(generated_simulation_fname), hashed_workspace_dir
 
     def cleanup_actions(self,clean_workdirs,simulation_fname):
 
@@ -122,53 +163,89 @@ class OptimizerWorkerProcessZMQ(MonitorBase, Process):
         if clean_workdirs:
             shutil.rmtree(current_simulation_workspace_dir)
 
-    def send_abort_message(self,push_address, worker_tag):
+    def send_abort_message(self, push_address, worker_tag):
         """
         Used in case simulation throws an exception . IN this case we are sending abort message to
         optimization runner (Optimizer)
+        :param push_address: {str} address of the optimizer's listening socket
+        :param worker_tag: {str} tag of the workload that failed
         :return: None
         """
-        context = zmq.Context()
-
 
-        consumer_sender = context.socket(zmq.PUSH)
-        consumer_sender.connect(push_address)
+        result = {'return_value_tag': worker_tag, 'return_value': -1, 'abort': True}
 
-        result = {'return_value_tag': worker_tag, 'return_value': -1,'abort':True}
+        self.send_result(push_address=push_address, result=result)
 
+    def send_result(self, push_address, result):
+        """
+        Sends result dictionary to the optimization runner (Optimizer). Reuses persistent sending socket
+        if the worker already has one
+        :param push_address: {str} address of the optimizer's listening socket
+        :param result: {dict} result dictionary
+        :return: None
+        """
+        if self.consumer_sender is not None:
+            self.consumer_sender.send_json(result)
+            return
 
+        context = zmq.Context()
+        consumer_sender = context.socket(zmq.PUSH)
+        consumer_sender.connect(push_address)
         consumer_sender.send_json(result)
 
-
-    def event_loop(self):
+    def send_ready_message(self):
         """
-        Main function of the worker - listens to incoming connection to retrieve workload json file, executes simulation
-        and returns the result
+        Notifies optimization runner that the worker connected its sockets and is ready to accept workloads
         :return: None
         """
+        self.consumer_receiver.send_json({'worker_status': 'ready', 'worker_id': self.id_number, 'slots': 1})
 
-        print 'I am consumer #%s' % self.id_number
-        context = zmq.Context()
+    def send_done_message(self, worker_tag):
+        """
+        Notifies optimization runner that the worker finished processing workload. Simulation sends its result
+        directly to the optimizer so this message lets optimizer detect simulations that exited without
+        sending result
+        :param worker_tag: {str} tag of the workload
+        :return: None
+        """
+        self.consumer_receiver.send_json({'worker_status': 'done', 'worker_id': self.id_number,
+                                          'worker_tag': worker_tag})
 
-        # recieve work
-        consumer_receiver = context.socket(zmq.PULL)
-        consumer_receiver.connect(self.pull_address_str)
+    def handle_terminate_signal(self, signum, frame):
+        """
+        Kills simulation process when optimizer terminates the worker (e.g. because evaluation timed out)
+        :param signum: {int} signal number
+        :param frame: current stack frame
+        :return: None
+        """
+        if self.simulation_process is not None and self.simulation_process.poll() is None:
+            kill_process_tree(self.simulation_process.pid)
 
-        workload_json = consumer_receiver.recv_json()
+        sys.exit(1)
 
-        param_dict = workload_json['param_dict']
-        simulation_template_name = workload_json['simulation_filename']
-        cc3d_command = workload_json['cc3d_command']
-        workspace_dir = workload_json['workspace_dir']
-        worker_tag = workload_json['worker_tag']
-        clean_workdirs = workload_json['clean_workdirs']
+    def kill_with_simulation(self):
+        """
+        Kills worker together with the simulation it runs (including processes started by CC3D run script).
+        Called by the process that started the worker. Unlike terminate it works on every platform and also
+        when the worker runs simulation in-process and cannot handle signals
+        :return: None
+        """
+        simulation_pid = self.simulation_pid.value
+        if simulation_pid:
+            kill_process_tree(simulation_pid)
 
-        print 'received param_dict = ', param_dict
+        if self.is_alive():
+            self.kill()
 
-        simulation_fname, hashed_workspace_dir = self.generate_simulation_files_from_template(
-            workspace_dir=workspace_dir,
-            simulation_template_name=simulation_template_name,
-            param_dict=param_dict)
+    def run_simulation_subprocess(self, cc3d_command, simulation_fname, hashed_workspace_dir, worker_tag):
+        """
+        Runs simulation by calling CC3D run script. The simulation itself sends return value to the optimizer
+        :param cc3d_command: {str} CC3D run script
+        :param simulation_fname: {str} path to the generated simulation
+        :param hashed_workspace_dir: {str} simulation output directory
+        :param worker_tag: {str} tag of the workload
+        :return: None
+        """
 
         popen_args = [cc3d_command]
 
@@ -199,21 +276,155 @@ class OptimizerWorkerProcessZMQ(MonitorBase, Process):
 
         popen_args.append(str(worker_tag))
 
-        print 'popen_args=', popen_args
+        print('popen_args=', popen_args)
 
-        # # this call will block until simulation is done
-        # subprocess.popen(popen_args)
-        # subprocess.call(popen_args) # this allows debugging because all the output goes to stdout
+        popen_kwargs = {}
+        if not sys.platform.startswith('win'):
+            # simulation gets its own process group so that it can be killed together with its children
+            popen_kwargs['start_new_session'] = True
 
-        # # this call will block until simulation is done
-        try:
-            # this runs single cc3d job and catches exceptions
-            subprocess.check_output(popen_args)
-        except subprocess.CalledProcessError as e:
-            print 'GOT subprocess.CalledProcessError '
-            print e.output
+        # this call will block until simulation is done
+        self.simulation_process = subprocess.Popen(popen_args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                                   **popen_kwargs)
+        self.simulation_pid.value = self.simulation_process.pid
+        output = self.simulation_process.communicate()[0]
+        return_code = self.simulation_process.returncode
+        self.simulation_pid.value = 0
+        self.simulation_process = None
+
+        if return_code:
+            print('simulation exited with code ', return_code)
+            print(output)
 
             self.send_abort_message(push_address=self.push_address_str, worker_tag=worker_tag)
 
+    def run_simulation_in_process(self, simulation_fname, hashed_workspace_dir, worker_tag):
+        """
+        Runs simulation inside worker process using CC3DCaller. This avoids paying interpreter and
+        plugin startup cost for every evaluation. Return value of the simulation
+        (persistent_globals.return_object) is sent to the optimizer by the worker
+        :param simulation_fname: {str} path to the generated simulation
+        :param hashed_workspace_dir: {str} simulation output directory
+        :param worker_tag: {str} tag of the workload
+        :return: None
+        """
+        from cc3d.CompuCellSetup.CC3DCaller import CC3DCaller
+
+        try:
+            cc3d_caller = CC3DCaller(cc3d_sim_fname=simulation_fname,
+                                     output_frequency=0,
+                                     output_dir=hashed_workspace_dir,
+                                     result_identifier_tag=worker_tag)
+            ret_value = cc3d_caller.run()
+            return_value = float(ret_value['result'])
+        except Exception as e:
+            print('GOT exception while running simulation in-process: ', str(e))
+            self.send_abort_message(push_address=self.push_address_str, worker_tag=worker_tag)
+            return
+
+        self.send_result(push_address=self.push_address_str,
+                         result={'return_value_tag': worker_tag, 'return_value': return_value})
+
+    def process_workload(self, workload_json):
+        """
+        Generates simulation from the template, runs it and cleans up after the run
+        :param workload_json: {dict} workload dictionary received from the optimizer
+        :return: None
+        """
+
+        param_dict = workload_json['param_dict']
+        simulation_template_name = workload_json['simulation_filename']
+        cc3d_command = workload_json['cc3d_command']
+        workspace_dir = workload_json['workspace_dir']
+        worker_tag = workload_json['worker_tag']
+        clean_workdirs = workload_json['clean_workdirs']
+        run_in_process = workload_json.get('run_in_process', False)
+        staging_mode = workload_json.get('staging_mode', 'copy')
+
+        print('received param_dict = ', param_dict)
+
+        simulation_fname, hashed_workspace_dir = self.generate_simulation_files_from_template(
+            workspace_dir=workspace_dir,
+            simulation_template_name=simulation_template_name,
+            param_dict=param_dict,
+            worker_tag=worker_tag,
+            staging_mode=staging_mode)
+
+        if run_in_process:
+            self.run_simulation_in_process(simulation_fname=simulation_fname,
+                                           hashed_workspace_dir=hashed_workspace_dir,
+                                           worker_tag=worker_tag)
+        else:
+            self.run_simulation_subprocess(cc3d_command=cc3d_command,
+                                           simulation_fname=simulation_fname,
+                                           hashed_workspace_dir=hashed_workspace_dir,
+                                           worker_tag=worker_tag)
+
+        self.cleanup_actions(clean_workdirs=clean_workdirs, simulation_fname=simulation_fname)
+
+    def event_loop(self):
+        """
+        Main function of the worker - connects to the optimizer once and keeps retrieving workload json files,
+        executing simulations and returning results until shutdown message arrives
+        :return: None
+        """
+
+        print('I am consumer #%s' % self.id_number)
+        self.context = zmq.Context()
+
+        # recieve work - identity lets the optimizer address workloads to this worker
+        self.consumer_receiver = self.context.socket(zmq.DEALER)
+        self.consumer_receiver.setsockopt(zmq.IDENTITY, self.name.encode('utf-8'))
+        self.consumer_receiver.connect(self.pull_address_str)
+
+        # send results and status messages
+        self.consumer_sender = self.context.socket(zmq.PUSH)
+        self.consumer_sender.connect(self.push_address_str)
+
+        signal.signal(signal.SIGTERM, self.handle_terminate_signal)
+
+        self.send_ready_message()
+
+        while True:
+            if not self.consumer_receiver.poll(self.parent_check_interval * 1000):
+                if self.parent_lost():
+                    print('consumer #%s lost its parent process. Exiting' % self.id_number)
+                    break
+                continue
+
+            workload_json = self.consumer_receiver.recv_json()
+
+            if workload_json.get('shutdown', False):
+                print('consumer #%s received shutdown message' % self.id_number)
+                break
+
+            try:
+                self.process_workload(workload_json=workload_json)
+            except Exception as e:
+                # failed workload must not take the worker down - optimizer decides whether to reissue it
+                print('GOT exception while processing workload: ', str(e))
+                self.send_abort_message(push_address=self.push_address_str, worker_tag=workload_json['worker_tag'])
+
+            self.send_done_message(workload_json['worker_tag'])
+
+    def parent_lost(self):
+        """
+        Checks whether process that started the worker exited
+        :return: {bool}
+        """
+        if not hasattr(os, 'getppid'):
+            return False
+
+        return os.getppid() != self.parent_pid
+
+    def finish(self):
+        """
+        Closes worker sockets
+        :return: None
+        """
+        for socket in (self.consumer_receiver, self.consumer_sender):
+            if socket is not None:
+                socket.close(linger=1000)
 
-        self.cleanup_actions(clean_workdirs=clean_workdirs,simulation_fname=simulation_fname)
+        if self.context is not None:
+            self.context.term()
@@ -0,0 +1,283 @@
+import hashlib
+import json
+import os
+import pickle
+import numpy as np
+from os.path import *
+
+
+class EvaluationStore(object):
+    """
+    Append-only on-disk store of optimization run. It consists of:
+    - evaluation cache (evaluations.jsonl) - content-addressed cache of loss function values keyed by a hash of
+    simulation template and rounded parameter vector
+    - journal (journal.jsonl) - record of every ask/tell generation of the optimizer
+    - CMA state (cma_state.pkl) - pickled optimizer state after last completed generation
+    """
+
+    def __init__(self, store_dir, simulation_template_name, precision=10, cache_fname=None):
+        """
+        :param store_dir: {str} directory where store files are written (typically optimization workspace dir)
+        :param simulation_template_name: {str} full path to cc3d simulation template
+        :param precision: {int} number of decimal places parameters are rounded to before computing cache key
+        :param cache_fname: {str} path to evaluation cache file. Allows sharing cache between optimization runs.
+        Defaults to evaluations.jsonl in store_dir
+        """
+
+        self.store_dir = store_dir
+        self.precision = precision
+
+        self.cache_fname = cache_fname if cache_fname is not None else join(store_dir, 'evaluations.jsonl')
+        self.journal_fname = join(store_dir, 'journal.jsonl')
+        self.cma_state_fname = join(store_dir, 'cma_state.pkl')
+
+        self.template_hash = self.hash_simulation_template(simulation_template_name)
+
+        # {evaluation_key:value}
+        self.cache = {}
+
+        self.load_cache()
+
+    @staticmethod
+    def hash_simulation_template(simulation_template_name):
+        """
+        Computes hash of all files of the simulation template
+        :param simulation_template_name: {str} full path to cc3d simulation template
+        :return: {str} hex digest
+        """
+
+        hasher = hashlib.sha1()
+        simulation_dir_path = dirname(simulation_template_name)
+
+        for root, dirs, files in os.walk(simulation_dir_path):
+            dirs.sort()
+            for fname in sorted(files):
+                full_fname = join(root, fname)
+                hasher.update(relpath(full_fname, simulation_dir_path).replace('\\', '/').encode('utf-8'))
+                with open(full_fname, 'rb') as fin:
+                    for chunk in iter(lambda: fin.read(1 << 20), b''):
+                        hasher.update(chunk)
+
+        return hasher.hexdigest()
+
+    def evaluation_key(self, param_dict):
+        """
+        Returns cache key of the evaluation
+        :param param_dict: {dict} dictionary of parameters - the format is {parameter_name:value}
+        :return: {str} cache key
+        """
+
+        rounded_params = sorted((name, round(float(val), self.precision)) for name, val in param_dict.items())
+
+        hasher = hashlib.sha1()
+        hasher.update((self.template_hash + json.dumps(rounded_params)).encode('utf-8'))
+
+        return hasher.hexdigest()
+
+    @staticmethod
+    def read_json_lines(fname):
+        """
+        Reads records from json-lines file. Truncated last record (e.g. due to crash during write) is skipped
+        :param fname: {str} file name
+        :return: {list} list of records
+        """
+
+        records = []
+        if not isfile(fname):
+            return records
+
+        with open(fname, 'r') as fin:
+            for line in fin:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+
+        return records
+
+    @staticmethod
+    def append_json_line(fname, record):
+        """
+        Appends record to json-lines file
+        :param fname: {str} file name
+        :param record: {dict} record
+        :return: None
+        """
+
+        with open(fname, 'a') as fout:
+            fout.write(json.dumps(record) + '\n')
+            fout.flush()
+            os.fsync(fout.fileno())
+
+    def load_cache(self):
+        """
+        Loads evaluation cache from disk
+        :return: None
+        """
+
+        for record in self.read_json_lines(self.cache_fname):
+            self.cache[record['key']] = record['value']
+
+    def lookup(self, param_dict):
+        """
+        Looks up cached loss function value
+        :param param_dict: {dict} dictionary of parameters
+        :return: {float} cached value or None if parameters were not evaluated yet
+        """
+
+        return self.cache.get(self.evaluation_key(param_dict))
+
+    def add(self, param_dict, value):
+        """
+        Adds loss function value to the cache
+        :param param_dict: {dict} dictionary of parameters
+        :param value: {float} loss function value
+        :return: None
+        """
+
+        key = self.evaluation_key(param_dict)
+        if key in self.cache:
+            return
+
+        self.cache[key] = value
+        self.append_json_line(self.cache_fname, {'key': key,
+                                                 'params': dict((k, float(v)) for k, v in param_dict.items()),
+                                                 'value': value})
+
+    def record_ask(self, generation, param_set_list):
+        """
+        Records candidate solutions of a generation in the journal
+        :param generation: {int} generation number
+        :param param_set_list: {list of ndarray's} candidate solutions (mapped to [0,1])
+        :return: None
+        """
+
+        self.append_json_line(self.journal_fname, {'generation': generation,
+                                                   'event': 'ask',
+                                                   'candidates': [list(map(float, param)) for param in param_set_list]})
+
+    def record_tell(self, generation, return_value_vec, optim):
+        """
+        Records loss function values of a generation in the journal and saves optimizer state. The journal is
+        written first and is authoritative - if the run is interrupted before the state is saved, the generation
+        is replayed from the journal on resume (see completed_generations)
+        :param generation: {int} generation number
+        :param return_value_vec: {ndarray} loss function values
+        :param optim: optimizer object (CMAEvolutionStrategy)
+        :return: None
+        """
+
+        self.append_json_line(self.journal_fname, {'generation': generation,
+                                                   'event': 'tell',
+                                                   'values': list(map(float, return_value_vec))})
+
+        self.save_cma_state(generation, optim)
+
+    def save_cma_state(self, generation, optim):
+        """
+        Saves optimizer state. The state is written to a temporary file which then atomically replaces
+        previously saved state so that crash during write does not corrupt it
+        :param generation: {int} number of the last generation told to the optimizer
+        :param optim: optimizer object (CMAEvolutionStrategy)
+        :return: None
+        """
+
+        tmp_fname = self.cma_state_fname + '.tmp'
+        with open(tmp_fname, 'wb') as fout:
+            pickle.dump({'generation': generation, 'optim': optim}, fout, protocol=2)
+            fout.flush()
+            os.fsync(fout.fileno())
+
+        os.replace(tmp_fname, self.cma_state_fname)
+
+    def last_completed_generation(self):
+        """
+        Returns number of the last generation for which both candidates and loss function values were recorded
+        :return: {int} generation number or -1 if no generation was completed
+        """
+
+        last_generation = -1
+        for record in self.read_json_lines(self.journal_fname):
+            if record['event'] == 'tell':
+                last_generation = max(last_generation, record['generation'])
+
+        return last_generation
+
+    def pending_candidates(self, generation):
+        """
+        Returns candidate solutions of a generation that was asked for but never completed
+        :param generation: {int} generation number
+        :return: {list of lists} candidate solutions or None
+        """
+
+        candidates = None
+        for record in self.read_json_lines(self.journal_fname):
+            if record['generation'] == generation and record['event'] == 'ask':
+                candidates = record['candidates']
+
+        return candidates
+
+    def completed_generations(self):
+        """
+        Returns generations recorded in the journal for which both candidates and loss function values were recorded
+        :return: {list} list of tuples (generation, candidates, values) ordered by generation
+        """
+
+        candidates = {}
+        completed = {}
+        for record in self.read_json_lines(self.journal_fname):
+            if record['event'] == 'ask':
+                candidates[record['generation']] = record['candidates']
+            elif record['event'] == 'tell' and record['generation'] in candidates:
+                completed[record['generation']] = (record['generation'], candidates[record['generation']],
+                                                   record['values'])
+
+        return [completed[generation] for generation in sorted(completed.keys())]
+
+    def load_cma_state(self):
+        """
+        Loads last saved optimizer state. Saved state may lag behind the journal - generations completed after
+        the returned generation should be replayed using completed_generations
+        :return: ({optimizer object},{int}) - optimizer (CMAEvolutionStrategy) or None if state was not saved yet
+        and number of the last generation told to the optimizer (-1 if state was not saved yet)
+        :raises RuntimeError: state file was not written by save_cma_state
+        """
+
+        if not isfile(self.cma_state_fname):
+            return None, -1
+
+        with open(self.cma_state_fname, 'rb') as fin:
+            state = pickle.load(fin)
+
+        if not isinstance(state, dict) or 'optim' not in state or 'generation' not in state:
+            raise RuntimeError('Cannot resume optimization run. Optimizer state file %s has unknown format'
+                               % self.cma_state_fname)
+
+        return state['optim'], state['generation']
+
+    def restore_cma_state(self, create_optimizer):
+        """
+        Restores optimizer state of an interrupted run. The journal is authoritative - generations completed
+        after the state was saved are replayed (candidates and loss function values are told again to
+        the optimizer) and the updated state is saved
+        :param create_optimizer: callable returning new optimizer object. Used when state was not saved yet
+        :return: ({optimizer object},{int}) - optimizer and number of the last completed generation (-1 if no
+        generation was completed)
+        """
+
+        optim, state_generation = self.load_cma_state()
+        if optim is None:
+            optim = create_optimizer()
+
+        replayed_generation = state_generation
+        for generation, candidates, values in self.completed_generations():
+            if generation <= state_generation:
+                continue
+            optim.ask(number=len(candidates))
+            optim.tell([np.array(param) for param in candidates], values)
+            replayed_generation = generation
+
+        if replayed_generation > state_generation:
+            self.save_cma_state(replayed_generation, optim)
+
+        return optim, replayed_generation
@@ -18,12 +18,11 @@ def print_rendered_xml():
     param_vals = [12.2,13.0, 20]
 
     param_dict = OrderedDict( zip(param_labels,param_vals ))
-    print  'param_dict=',param_dict
+    print('param_dict=', param_dict)
 
-
-    print j2_env.get_template('short_demo.xml').render(
+    print(j2_env.get_template('short_demo.xml').render(
         **param_dict
-    )
+    ))
 
 
 if __name__ == '__main__':
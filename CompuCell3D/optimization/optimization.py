@@ -7,10 +7,13 @@
 
 import numpy as np
 from OptimizerWorkerProcessZMQ import OptimizerWorkerProcessZMQ
-from template_utils import generate_simulation_files_from_template
-from collections import OrderedDict
+from cc3d.core.param_scan.template_utils import stage_simulation_from_template
+from evaluation_store import EvaluationStore
+from replicate_policy import ReplicatePolicy
+from collections import OrderedDict, deque
 import os
 from os.path import *
+import shutil
 import datetime
 
 
@@ -31,14 +34,21 @@ class OptimizationCMLParser(object):
         self.parser.add_argument('-p', '--params-file', required=True, action='store', default='',
                                  help="json parameter file")
         self.parser.add_argument('-n', '--num-workers', required=False, action='store', default=1, type=int,
-                                 help="number of workers")
+                                 help="number of local workers. Can be 0 when all simulations are run by "
+                                      "remote workers (see --broker-address)")
+        self.parser.add_argument('--broker-address', required=False, action='store', default=None,
+                                 help="address at which optimization accepts remote workers "
+                                      "(optimization_worker.py) e.g. tcp://*:5600. Remote workers need access to "
+                                      "the simulation template and workspace directory under the same paths")
+        self.parser.add_argument('--heartbeat-timeout', required=False, action='store', default=30.0, type=float,
+                                 help="time (in seconds) after which remote worker that did not send any message "
+                                      "is considered lost and its evaluations are re-queued")
 
         self.parser.add_argument('-s', '--population-size', required=False, action='store', default=6, type=int,
                                  help="candidate solution population size. "
                                       "Specifies number of loss function values needed at each optimization step. "
-                                      "For best performance population size should be equal number of workers but "
-                                      "if this is not possible it is best to have population size being "
-                                      "a multiple of number of workers")
+                                      "Candidates are streamed to workers as soon as they become idle so "
+                                      "population size does not need to be a multiple of number of workers")
 
 
         # adding cc3d run script will make it easier to write .sh, .bat or .command optimization scripts
@@ -50,6 +60,35 @@ class OptimizationCMLParser(object):
                                  help='do not clean temporary simulation output')
         self.parser.set_defaults(clean_workdirs=True)
 
+        self.parser.add_argument('--in-process', dest='in_process', action='store_true',
+                                 help='run simulations inside worker processes using CC3DCaller instead of '
+                                      'calling CC3D run script for every evaluation')
+        self.parser.set_defaults(in_process=False)
+
+        self.parser.add_argument('--staging-mode', required=False, action='store', default='copy',
+                                 choices=['copy', 'hardlink', 'symlink'],
+                                 help="how files of the simulation template that are not jinja2 templates are placed "
+                                      "in generated simulations. Linked files are shared with the template and "
+                                      "must not be modified by simulations")
+
+        self.parser.add_argument('--eval-timeout', required=False, action='store', default=0.0, type=float,
+                                 help="maximum time (in seconds) single evaluation may take. "
+                                      "Hung evaluations are reissued or penalized. 0 means no timeout")
+        self.parser.add_argument('--max-retries', required=False, action='store', default=1, type=int,
+                                 help="number of times failed or hung evaluation is reissued before "
+                                      "failure penalty is assigned to it")
+        self.parser.add_argument('--failure-penalty', required=False, action='store', default=None, type=float,
+                                 help="loss value assigned to evaluations that failed. If not specified the worst "
+                                      "loss value of the successfully evaluated candidates of the generation is used")
+
+        self.parser.add_argument('--resume', required=False, action='store', default=None,
+                                 help="workspace directory of interrupted optimization run. The run is restarted "
+                                      "from the last completed generation")
+        self.parser.add_argument('--evaluation-cache', required=False, action='store', default=None,
+                                 help="evaluation cache file. Allows reusing loss function values computed "
+                                      "in other optimization runs. Defaults to evaluations.jsonl "
+                                      "in the workspace directory")
+
         # self.parser.add_argument('-c', '--clean-workdirs', required=False, action='store', default=1, type=bool)
 
         self.arg_list = []
@@ -66,7 +105,7 @@ class OptimizationCMLParser(object):
             sys.path.append(path)
 
     def parse(self):
-        print sys.argv
+        print(sys.argv)
         if len(sys.argv) <= self.arg_count_threshold and len(self.arg_list):
             args = self.parser.parse_args(self.arg_list)
         else:
@@ -81,7 +120,8 @@ class OptimizationParameterManager(object):
         self.parameters = None
         self._params_names = []
         self._std_dev = 0.5
-        self._default_bounds = np.array([0., 1.], dtype=np.float)
+        self._default_bounds = np.array([0., 1.], dtype=float)
+        self._replicate_policy = ReplicatePolicy()
 
     def parse(self, fname):
         """
@@ -91,13 +131,15 @@ class OptimizationParameterManager(object):
         """
         self.params_jn = json.load(open(fname, 'r'))
         self.parameters = self.params_jn['parameters']
-        self._params_names = self.parameters.keys()
+        self._params_names = list(self.parameters.keys())
         try:
             self._std_dev = self.params_jn['std_dev']
         except:
-            print 'Could not find "std_dev" in %s. Will use default value of %f ' % (fname, self.std_dev)
+            print('Could not find "std_dev" in %s. Will use default value of %f ' % (fname, self.std_dev))
+
+        self._replicate_policy = ReplicatePolicy(self.params_jn.get('replicates'))
 
-        self.params_bounds = np.zeros((len(self._params_names), 2), dtype=np.float)
+        self.params_bounds = np.zeros((len(self._params_names), 2), dtype=float)
 
         for i, name in enumerate(self._params_names):
             self.params_bounds[i, :] = self.parameters[name]
@@ -114,12 +156,16 @@ class OptimizationParameterManager(object):
     def std_dev(self):
         return self._std_dev
 
+    @property
+    def replicate_policy(self):
+        return self._replicate_policy
+
     def get_starting_points(self):
         """
         Returns starting point for the optimization run by picking "center" fo the parameter hyperspace
         :return: {ndarray} vector describing the "center" of the parameter hyperspace
         """
-        return 0.5 * np.ones(len(self._params_names), dtype=np.float)
+        return 0.5 * np.ones(len(self._params_names), dtype=float)
 
     def params_from_0_1(self, param_vec_0_1):
         """
@@ -169,7 +215,8 @@ class Optimizer(object):
         self.parse_args = None
 
         # setting up push and pull sockets
-        self.push_socket = self.push_context.socket(zmq.PUSH)
+        # workloads are sent through ROUTER socket so that they can be addressed to an idle worker
+        self.push_socket = self.push_context.socket(zmq.ROUTER)
         self.push_port = self.push_socket.bind_to_random_port(self.core_ip_address, min_port=5557, max_port=6557, max_tries=100)
         self.push_address_str = self.core_ip_address+":%s"%str(self.push_port)
 
@@ -178,10 +225,41 @@ class Optimizer(object):
         self.pull_port = self.pull_socket.bind_to_random_port(self.core_ip_address, min_port=5557, max_port=6557, max_tries=100)
         self.pull_address_str = self.core_ip_address + ":%s" % str(self.pull_port)
 
-
+        self.poller = zmq.Poller()
+        self.poller.register(self.push_socket, zmq.POLLIN)
+        self.poller.register(self.pull_socket, zmq.POLLIN)
 
         self.num_workers = 1
 
+        # local worker processes {worker_identity:process}
+        self.worker_pool = OrderedDict()
+        self.next_worker_id = 0
+
+        # registered workers {worker_identity:{'slots':number of concurrent workloads, 'busy':set of worker tags}}
+        self.worker_registry = OrderedDict()
+
+        # evaluation settings - overwritten by command line arguments in set_parse_args
+        self.eval_timeout = 0.0
+        self.max_retries = 1
+        self.failure_penalty = None
+        self.heartbeat_timeout = 30.0
+        self.poll_interval = 0.5
+
+        # time (in seconds) optimizer waits for the result of the simulation after worker reported that the
+        # simulation finished. Results are sent by simulations through a different socket than worker status
+        # messages so they may arrive after the status message
+        self.result_grace_period = 10.0
+
+        # state of the population currently being evaluated
+        self.generation = 0
+        self.population_counter = 0
+        self.pending_tasks = deque()
+        self.in_flight_tasks = OrderedDict()
+        self.population_results = None
+
+        # instance of EvaluationStore - evaluation cache and journal of the optimization run
+        self.evaluation_store = None
+
     def acknowledge_presence(self, num_workers):
         """
         Receives handshamke message from workers
@@ -189,57 +267,432 @@ class Optimizer(object):
         :return:None
         """
 
-        context = zmq.Context()
-        results_receiver = context.socket(zmq.PULL)
-        results_receiver.bind(self.pull_address_str)
+        while len(self.worker_registry) < num_workers:
+            self.process_worker_messages(timeout=self.poll_interval)
+            self.check_workers()
 
-        for x in xrange(num_workers):
-            result = results_receiver.recv_json()
-            print 'worker x=', x, ' ready'
+    def spawn_worker(self):
+        """
+        Starts new local worker process. Worker registers itself by sending handshake message
+        :return: {bytes} identity of the worker
+        """
 
-    def reduce(self, num_workers):
+        worker_name = 'worker_%s' % self.next_worker_id
+        worker = OptimizerWorkerProcessZMQ(id_number=self.next_worker_id, name=worker_name)
+        worker.set_pull_address_str(self.push_address_str)
+        worker.set_push_address_str(self.pull_address_str)
+        self.next_worker_id += 1
+
+        worker.start()
+
+        identity = worker_name.encode('utf-8')
+        self.worker_pool[identity] = worker
+
+        return identity
+
+    def start_worker_pool(self, num_workers):
         """
-        receives output from workers
+        Starts pool of persistent workers. Workers connect to push and pull sockets once and
+        keep processing workloads until stop_worker_pool is called
         :param num_workers: {int} number of workers
         :return: None
         """
 
-        results_receiver = self.pull_socket
+        if self.worker_pool:
+            return
+
+        for w in range(num_workers):
+            self.spawn_worker()
+
+        self.acknowledge_presence(num_workers)
+
+    def stop_worker_pool(self, timeout=10.0):
+        """
+        Sends shutdown message to every worker in the pool and waits for workers to exit
+        :param timeout: {float} time (in seconds) to wait for each worker before terminating it
+        :return: None
+        """
+
+        for identity in self.worker_registry.keys():
+            self.send_to_worker(identity, {'shutdown': True})
+
+        for worker in self.worker_pool.values():
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.kill_with_simulation()
 
-        return_data_dict = {}  # {worker_tag:return_value}
+        self.worker_pool = OrderedDict()
+        self.worker_registry = OrderedDict()
 
-        sum = 0
-        print 'reducing=', num_workers, ' workers'
-        abort_flag = False
-        abort_worker_tag = None
-        for x in xrange(num_workers):
-            print 'waiting for worker x=', x
-            result = results_receiver.recv_json()
-            print 'reduce result=',result
+    def send_to_worker(self, identity, msg):
+        """
+        Sends json message to a worker with a given identity
+        :param identity: {bytes} worker identity
+        :param msg: {dict} message
+        :return: None
+        """
+        self.push_socket.send_multipart([identity, json.dumps(msg).encode('utf-8')])
+
+    def register_worker(self, identity, msg):
+        """
+        Adds worker to the registry of workers that can accept workloads
+        :param identity: {bytes} worker identity
+        :param msg: {dict} handshake message
+        :return: None
+        """
+        print('worker ', msg['worker_id'], ' ready. Number of slots: ', msg.get('slots', 1))
+        self.worker_registry[identity] = {'slots': msg.get('slots', 1), 'busy': set(), 'last_seen': time.time()}
+
+    def remove_worker(self, identity):
+        """
+        Removes worker from the registry and re-queues workloads the worker was processing
+        :param identity: {bytes} worker identity
+        :return: None
+        """
+
+        try:
+            worker_info = self.worker_registry.pop(identity)
+        except KeyError:
+            return
+
+        for worker_tag in worker_info['busy']:
+            self.handle_failed_task(worker_tag, reason='worker %s lost' % identity.decode('utf-8'))
+
+    def check_workers(self):
+        """
+        Detects local workers that died and replaces them with new ones
+        :return: None
+        """
+
+        for identity, worker in list(self.worker_pool.items()):
+            if worker.is_alive():
+                continue
+
+            print('worker ', identity.decode('utf-8'), ' died. Starting replacement worker')
+            del self.worker_pool[identity]
+            self.remove_worker(identity)
+            self.spawn_worker()
+
+    def check_timeouts(self):
+        """
+        Fails evaluations whose simulation finished without sending result. If evaluation timeout is set, also
+        kills workers (together with their simulations) whose evaluations exceeded it. Such evaluations are
+        retried or penalized once check_workers notices that the worker is gone
+        :return: None
+        """
 
-            return_data_dict[result['return_value_tag']] = result['return_value']
+        now = time.time()
+        for worker_tag, task in list(self.in_flight_tasks.items()):
+            if task['done_time'] is not None:
+                if now - task['done_time'] > self.result_grace_period:
+                    self.handle_failed_task(worker_tag, reason='simulation finished without sending result')
+                continue
 
+            if self.eval_timeout <= 0 or task['cancelled'] or now - task['start_time'] < self.eval_timeout:
+                continue
 
+            print('evaluation ', worker_tag, ' timed out after ', self.eval_timeout, ' s')
+            task['cancelled'] = True
+            identity = task['worker']
             try:
-                if result['abort']:
-                    # print 'GOT ABORT MESSAGE'
-                    abort_flag = True
-                    abort_worker_tag = result['return_value_tag']
+                self.worker_pool[identity].kill_with_simulation()
+            except KeyError:
+                # remote worker - it terminates process running the evaluation and keeps remaining ones
+                self.send_to_worker(identity, {'cancel': worker_tag})
+                self.handle_failed_task(worker_tag, reason='evaluation timed out')
+
+    def check_heartbeats(self):
+        """
+        Detects remote workers that stopped sending messages. Their evaluations are re-queued.
+        Local workers are monitored by check_workers
+        :return: None
+        """
+
+        now = time.time()
+        for identity, worker_info in list(self.worker_registry.items()):
+            if identity in self.worker_pool:
+                continue
+
+            if now - worker_info['last_seen'] > self.heartbeat_timeout:
+                print('worker ', identity.decode('utf-8'), ' did not send heartbeat for ', self.heartbeat_timeout,
+                      ' s. Considering it lost')
+                self.remove_worker(identity)
+
+    def free_slots(self):
+        """
+        Generates identities of registered workers that can accept another workload - one entry per free slot
+        :return: {generator}
+        """
+        for identity, worker_info in self.worker_registry.items():
+            for slot in range(worker_info['slots'] - len(worker_info['busy'])):
+                yield identity
+
+    def dispatch_pending_tasks(self, workload_dict):
+        """
+        Sends pending tasks to workers that have free slots
+        :param workload_dict: {dictionary-like} workload information to be sent to worker - does not include param_dict
+        :return: None
+        """
+
+        for identity in list(self.free_slots()):
+            if not self.pending_tasks:
+                break
+
+            task = self.pending_tasks.popleft()
+            worker_tag = 'pop_%s_cand_%s_try_%s' % (self.population_counter, task['idx'], task['attempt'])
+
+            workload_dict['param_dict'] = task['param_dict']
+            workload_dict['worker_tag'] = worker_tag
+
+            task['worker'] = identity
+            task['start_time'] = time.time()
+            task['done_time'] = None
+            task['cancelled'] = False
+
+            self.in_flight_tasks[worker_tag] = task
+            self.worker_registry[identity]['busy'].add(worker_tag)
+
+            self.send_to_worker(identity, workload_dict)
+
+    def release_task(self, worker_tag):
+        """
+        Removes task from the in-flight tasks and frees slot of the worker that processed it
+        :param worker_tag: {str} tag of the workload
+        :return: {dict} task or None if task is not in flight (e.g. result arrived after timeout)
+        """
+
+        try:
+            task = self.in_flight_tasks.pop(worker_tag)
+        except KeyError:
+            return None
+
+        try:
+            self.worker_registry[task['worker']]['busy'].discard(worker_tag)
+        except KeyError:
+            pass
+
+        return task
+
+    def handle_failed_task(self, worker_tag, reason):
+        """
+        Reissues failed evaluation or, after max_retries attempts, assigns failure penalty to it
+        :param worker_tag: {str} tag of the workload
+        :param reason: {str} reason of failure
+        :return: None
+        """
+
+        task = self.release_task(worker_tag)
+        if task is None:
+            return
+
+        print('evaluation ', worker_tag, ' failed: ', reason)
+
+        if task['attempt'] < self.max_retries:
+            task['attempt'] += 1
+            self.pending_tasks.append(task)
+        else:
+            # nan marks failed evaluation - it is replaced by penalty once whole population is evaluated
+            for idx in task['indices']:
+                self.population_results[idx] = np.nan
+
+    def handle_result(self, result):
+        """
+        Stores result received from worker
+        :param result: {dict} result message
+        :return: None
+        """
+
+        worker_tag = result['return_value_tag']
+
+        if result.get('abort', False):
+            self.handle_failed_task(worker_tag, reason='abort message received from worker')
+            return
+
+        task = self.release_task(worker_tag)
+        if task is None:
+            # stale result of the evaluation that already timed out
+            return
+
+        for idx in task['indices']:
+            self.population_results[idx] = result['return_value']
+
+        if self.evaluation_store is not None:
+            self.evaluation_store.add(task['param_dict'], result['return_value'])
+
+    def handle_worker_message(self, identity, msg):
+        """
+        Handles status message sent by worker through workload socket
+        :param identity: {bytes} worker identity
+        :param msg: {dict} message
+        :return: None
+        """
+
+        worker_status = msg.get('worker_status')
+
+        if worker_status == 'ready' or identity not in self.worker_registry:
+            # worker that was considered lost re-registers with its next message
+            self.register_worker(identity, msg)
+
+        self.worker_registry[identity]['last_seen'] = time.time()
+
+        if worker_status == 'result':
+            # results of remote workers are relayed through workload socket
+            self.handle_result(msg['result'])
+        elif worker_status == 'done':
+            self.handle_done_message(msg['worker_tag'])
+
+    def handle_done_message(self, worker_tag):
+        """
+        Records that worker finished processing workload. If result of the workload does not arrive within
+        result_grace_period the evaluation is considered failed
+        :param worker_tag: {str} tag of the workload
+        :return: None
+        """
+        try:
+            self.in_flight_tasks[worker_tag]['done_time'] = time.time()
+        except KeyError:
+            # result already arrived
+            pass
+
+    def process_worker_messages(self, timeout):
+        """
+        Waits for messages from workers and processes them
+        :param timeout: {float} maximum wait time in seconds
+        :return: None
+        """
+
+        events = dict(self.poller.poll(timeout * 1000))
+
+        if self.push_socket in events:
+            while True:
+                try:
+                    identity, msg_str = self.push_socket.recv_multipart(zmq.NOBLOCK)
+                except zmq.Again:
+                    break
+                self.handle_worker_message(identity, json.loads(msg_str.decode('utf-8')))
+
+        if self.pull_socket in events:
+            while True:
+                try:
+                    result = self.pull_socket.recv_json(zmq.NOBLOCK)
+                except zmq.Again:
                     break
+                self.handle_result(result)
+
+    def apply_failure_penalty(self, return_value_vec):
+        """
+        Replaces values of failed evaluations with failure penalty. If penalty is not specified the worst
+        successfully evaluated value of the population is used
+        :param return_value_vec: {ndarray} vector of return values with failed evaluations marked as nan
+        :return: {ndarray} vector of return values
+        """
+
+        failed = np.isnan(return_value_vec)
+        if not np.any(failed):
+            return return_value_vec
+
+        if np.all(failed):
+            raise AssertionError("All evaluations of generation %s failed" % self.generation)
 
+        penalty = self.failure_penalty
+        if penalty is None:
+            penalty = np.max(return_value_vec[~failed])
+
+        return_value_vec[failed] = penalty
+
+        return return_value_vec
+
+    def evaluate_param_dicts(self, workload_dict, param_dict_list):
+        """
+        Streams all parameter dictionaries to workers and collects results as they finish.
+        There is no barrier between workers - idle worker gets next workload as soon as it returns result.
+        Hung evaluations are reissued and dead workers are replaced
+        :param workload_dict: {dictionary-like} workload information to be sent to worker - does not include param_dict.
+        param_dict will be set by this function
+        :param param_dict_list: {list of dicts} parameter dictionaries - the format is {parameter_name:value}
+        :return: {ndarray} vector of return values - order matches the order of param_dict_list.
+        Failed evaluations are marked as nan
+        """
+
+        self.start_worker_pool(self.num_workers)
+
+        self.in_flight_tasks = OrderedDict()
+        self.population_results = [None] * len(param_dict_list)
+
+        # {param_dict_str:task} - duplicate parameter dictionaries are simulated once
+        tasks = OrderedDict()
+        for idx, param_dict in enumerate(param_dict_list):
+
+            if self.evaluation_store is not None:
+                cached_value = self.evaluation_store.lookup(param_dict)
+                if cached_value is not None:
+                    print('using cached value for ', param_dict)
+                    self.population_results[idx] = cached_value
+                    continue
+
+            param_dict_str = str(sorted(param_dict.items()))
+            try:
+                tasks[param_dict_str]['indices'].append(idx)
             except KeyError:
-                pass
+                tasks[param_dict_str] = {'idx': idx, 'indices': [idx], 'param_dict': param_dict, 'attempt': 0,
+                                         'worker': None, 'start_time': None, 'done_time': None,
+                                         'cancelled': False}
+
+        self.pending_tasks = deque(tasks.values())
+
+        while self.pending_tasks or self.in_flight_tasks:
+            self.dispatch_pending_tasks(workload_dict)
+            self.process_worker_messages(timeout=self.poll_interval)
+            self.check_timeouts()
+            self.check_workers()
+            self.check_heartbeats()
+
+        self.population_counter += 1
+
+        print('FINISHED REDUCING')
+
+        return np.array(self.population_results, dtype=float)
+
+    def evaluate_population(self, workload_dict, param_set_list):
+        """
+        Evaluates loss function at candidate solutions. Every candidate is simulated using number of replicates
+        given by replicate policy of the optimization parameters manager. With racing enabled additional replicates
+        are requested only for candidates whose rank is uncertain
+        :param workload_dict: {dictionary-like} workload information to be sent to worker - does not include param_dict.
+        param_dict will be set by this function
+        :param param_set_list: {list of ndarray's} candidate solutions
+        :return: {ndarray} vector of return values - order matches the order of param_set_list
+        """
 
-            # print 'got result from worker x=', x, ' res=', result
+        replicate_policy = self.optimization_params_mgr.replicate_policy
 
+        # mapping parameters from [0,1] to true range and producing dictionaries that will be sent to workers
+        param_dict_list = [self.optimization_params_mgr.param_from_0_1_dict(param) for param in param_set_list]
 
-        if abort_flag:
-            print 'GOT ABORT FLAG'
-            raise AssertionError("Abort command received from worker %s "%abort_worker_tag)
+        replicate_values = [[] for param_dict in param_dict_list]
 
-        # print 'sum = ', sum
-        # print 'return_data_dict=',return_data_dict
-        return return_data_dict
+        # list of (candidate index, replicate index) pairs evaluated in the current round
+        replicate_requests = [(idx, replicate_idx) for idx in range(len(param_dict_list))
+                              for replicate_idx in range(replicate_policy.min_replicates)]
+
+        while replicate_requests:
+            values = self.evaluate_param_dicts(workload_dict, [
+                replicate_policy.replicate_param_dict(param_dict_list[idx], replicate_idx)
+                for idx, replicate_idx in replicate_requests])
+
+            for (idx, replicate_idx), value in zip(replicate_requests, values):
+                replicate_values[idx].append(value)
+
+            replicate_requests = [(idx, len(replicate_values[idx]))
+                                  for idx in replicate_policy.uncertain_candidates(replicate_values)]
+
+            if replicate_requests:
+                print('requesting additional replicates for candidates ', [idx for idx, r in replicate_requests])
+
+        return_value_vec = np.array([replicate_policy.aggregate(values) for values in replicate_values],
+                                    dtype=float)
+
+        return self.apply_failure_penalty(return_value_vec)
 
     def param_generator(self, num_workers):
         counter = 0
@@ -285,63 +738,10 @@ class Optimizer(object):
         param_dict will be set by this function
         :param param_set: {list of ndarray's} parameter_set - a list of param array -first index goes over workers,
         second indexes parameters for a given worker
-        :return: None
+        :return: {ndarray} vector of return values
         """
 
-        self.worker_pool = []
-
-        num_params = len(param_set)
-
-        # for w in xrange(self.num_workers):
-        for w in xrange(num_params):
-            worker = OptimizerWorkerProcessZMQ(id_number=w, name='worker_%s' % w)
-            worker.set_pull_address_str(self.push_address_str)
-            worker.set_push_address_str(self.pull_address_str)
-            self.worker_pool.append(worker)
-
-        for worker in self.worker_pool:
-            worker.start()
-
-        time.sleep(1.0)
-
-        # self.acknowledge_presence(self.num_workers)
-
-        # {worker_tag:param} - ordered dict needed for correct identification of positional index of return value
-        param_set_dict = OrderedDict()
-
-        for param_idx, param in enumerate(param_set):
-            # mapping parameters from [0,1] to true range and producing dictionary that will be sent to workers
-            param_dict = self.optimization_params_mgr.param_from_0_1_dict(param)
-
-            # appending param_dict to  workload dict
-            workload_dict['param_dict'] = param_dict
-
-            # tagging worker to identify return result
-            worker_tag = 'worker_' + str(param_idx)
-            workload_dict['worker_tag'] = worker_tag
-
-            param_set_dict[worker_tag] = param
-
-            # self.zmq_socket.send_json(param_dict)
-            self.push_socket.send_json(workload_dict)
-
-            print 'sent = ', workload_dict
-
-        print 'WILL REDUCE ', param_idx + 1, ' workers'
-        return_data_dict = self.reduce(param_idx + 1)
-
-
-        # producing vector of return values - have to ensure that the order of values in the vector
-        # is the same as the order of parameter vectors in the param_set
-
-        return_value_vec = np.zeros((num_params,), dtype=np.float)
-
-        for idx, worker_tag in enumerate(param_set_dict.keys()):
-            return_value_vec[idx] = return_data_dict[worker_tag]
-
-        print 'FINISHED REDUCING'
-
-        return return_value_vec
+        return self.evaluate_population(workload_dict, param_set)
 
     def prepare_optimization_run(self, simulation_name):
         """
@@ -358,7 +758,15 @@ class Optimizer(object):
 
         simulation_corename, ext = splitext(basename(simulation_name))
 
-        workspace_dir = self.create_workspace_dir(simulation_corename, workspace_root_dir)
+        if self.parse_args.resume is not None:
+            workspace_dir = self.parse_args.resume
+            if not isdir(workspace_dir):
+                raise IOError('Cannot resume optimization run. Directory %s does not exist' % workspace_dir)
+        else:
+            workspace_dir = self.create_workspace_dir(simulation_corename, workspace_root_dir)
+
+        self.evaluation_store = EvaluationStore(store_dir=workspace_dir, simulation_template_name=simulation_name,
+                                                cache_fname=self.parse_args.evaluation_cache)
 
         workload_dict = OrderedDict()
         # workload_dict['cc3d_command'] = r'C:\CompuCell3D-64bit\runScript.bat'
@@ -366,6 +774,8 @@ class Optimizer(object):
         workload_dict['workspace_dir'] = workspace_dir
         workload_dict['simulation_filename'] = simulation_name
         workload_dict['clean_workdirs'] = self.parse_args.clean_workdirs
+        workload_dict['run_in_process'] = self.parse_args.in_process
+        workload_dict['staging_mode'] = self.parse_args.staging_mode
         workload_dict['param_dict'] = None  # set externally
         workload_dict['worker_tag'] = None  # set externally
 
@@ -387,13 +797,16 @@ class Optimizer(object):
 
         optimal_simulation_dir = join(workspace_dir, 'optimal_simulation')
 
-        generated_simulation_fname, workspace_dir = generate_simulation_files_from_template(
-            simulation_dirname=optimal_simulation_dir,
-            simulation_template_name=simulation_template_name,
-            param_dict=optimal_param_dict
-        )
+        # resumed run replaces optimal simulation saved by the interrupted one
+        if isdir(optimal_simulation_dir):
+            shutil.rmtree(optimal_simulation_dir)
 
-        print
+        stage_simulation_from_template(
+            cc3d_proj_template=simulation_template_name,
+            target_dir=optimal_simulation_dir,
+            param_dict=optimal_param_dict,
+            staging_mode='copy'
+        )
 
     def run_debug(self):
 
@@ -404,10 +817,13 @@ class Optimizer(object):
         simulation_name = r'D:\CC3DProjects\short_demo\short_demo.cc3d'
         workload_dict = self.prepare_optimization_run(simulation_name=simulation_name)
 
-        for param_set in self.param_generator(self.num_workers):
-            print 'CURRENT PARAM SET=', param_set
-            self.run_task(workload_dict, param_set)
-            print 'FINISHED PARAM_SET=', param_set
+        try:
+            for param_set in self.param_generator(self.num_workers):
+                print('CURRENT PARAM SET=', param_set)
+                self.run_task(workload_dict, param_set)
+                print('FINISHED PARAM_SET=', param_set)
+        finally:
+            self.stop_worker_pool()
 
     def set_optimization_parameters_manager(self, optimization_params_mgr):
 
@@ -416,6 +832,16 @@ class Optimizer(object):
     def set_parse_args(self, parse_args):
         self.parse_args = parse_args
 
+        self.eval_timeout = parse_args.eval_timeout
+        self.max_retries = parse_args.max_retries
+        self.failure_penalty = parse_args.failure_penalty
+        self.heartbeat_timeout = parse_args.heartbeat_timeout
+
+        if parse_args.broker_address is not None:
+            # remote workers connect to the same ROUTER socket that local workers use
+            self.push_socket.bind(parse_args.broker_address)
+            print('accepting remote workers at ', parse_args.broker_address)
+
     def set_num_workers(self, num_workers):
         self.num_workers = num_workers
 
@@ -438,12 +864,12 @@ class Optimizer(object):
         optim_param_mgr.parse(self.parse_args.params_file)
 
         starting_params = optim_param_mgr.get_starting_points()
-        print 'starting_params (mapped to [0,1])=', starting_params
-        print 'remapped (true) starting params=', optim_param_mgr.params_from_0_1(starting_params)
-        print 'dictionary of remapped parameters labeled by parameter name=', optim_param_mgr.param_from_0_1_dict(
-            starting_params)
+        print('starting_params (mapped to [0,1])=', starting_params)
+        print('remapped (true) starting params=', optim_param_mgr.params_from_0_1(starting_params))
+        print('dictionary of remapped parameters labeled by parameter name=', optim_param_mgr.param_from_0_1_dict(
+            starting_params))
 
-        print 'simulation_name=', simulation_name
+        print('simulation_name=', simulation_name)
         self.workload_dict = self.prepare_optimization_run(simulation_name=simulation_name)
         workload_dict = self.workload_dict
 
@@ -452,13 +878,35 @@ class Optimizer(object):
         std_dev = optim_param_mgr.std_dev
         default_bounds = optim_param_mgr.default_bounds
 
-        optim = CMAEvolutionStrategy(starting_params, std_dev, {'bounds': list(default_bounds)})
+        evaluation_store = self.evaluation_store
+
+        def create_optimizer():
+            return CMAEvolutionStrategy(starting_params, std_dev, {'bounds': list(default_bounds)})
+
+        self.generation = 0
+        if self.parse_args.resume is not None:
+            optim, last_generation = evaluation_store.restore_cma_state(create_optimizer)
+            self.generation = last_generation + 1
+            print('resuming optimization from generation ', self.generation)
+        else:
+            optim = create_optimizer()
 
         while not optim.stop():  # iterate
             # get candidate solutions
             # param_set_list = optim.ask(number=self.num_workers)
             # param_set_list = optim.ask(number=1)
-            param_set_list = optim.ask(number=population_size)
+            # if the run was interrupted in the middle of a generation we reuse its candidates so that
+            # evaluations that finished before interruption come from the cache
+            pending_candidates = evaluation_store.pending_candidates(self.generation)
+            if pending_candidates is not None and len(pending_candidates) == population_size:
+                param_set_list = [np.array(param) for param in pending_candidates]
+                # optimizer accepts loss function values only for a generation it handed out - journal candidates
+                # are injected so that this generation consists of them unchanged
+                optim.inject(param_set_list, force=True)
+                optim.ask(number=population_size)
+            else:
+                param_set_list = optim.ask(number=population_size)
+                evaluation_store.record_ask(self.generation, param_set_list)
 
             # set param_set_list for run_task to iterate over
             self.set_param_set_list(param_set_list=param_set_list)
@@ -466,23 +914,18 @@ class Optimizer(object):
             # #debug
             # return_result_vec = [self.fcn(optim_param_mgr.params_from_0_1(X)) for X in param_set_list]
 
-            # evaluate  targert function values at the candidate solutions
-            return_result_vec = np.array([], dtype=float)
-            for param_set in self.param_generator(self.num_workers):
-                print('CURRENT PARAM SET=', param_set)
-                # distribution param_set to workers - run tasks spawns appropriate number of workers
-                # given self.num_workers and the size of the param_set
-                partial_return_result_vec = self.run_task(workload_dict, param_set)
-
-                return_result_vec = np.append(return_result_vec, partial_return_result_vec)
-
-                print('FINISHED PARAM_SET=', param_set)
+            # evaluate  targert function values at the candidate solutions - all candidates are streamed
+            # to workers and results are collected as they finish
+            return_result_vec = self.evaluate_population(workload_dict, param_set_list)
 
 
             optim.tell(param_set_list, return_result_vec)  # do all the real "update" work
             optim.disp(20)  # display info every 20th iteration
             optim.logger.add()  # log another "data line"
 
+            evaluation_store.record_tell(self.generation, return_result_vec, optim)
+            self.generation += 1
+
         optimal_parameters = optim.result()[0]
 
         print('termination by', optim.stop())
@@ -501,7 +944,11 @@ class Optimizer(object):
         return (x[0] - 2) ** 2 + (x[1] - 3) ** 2
 
     def run(self):
-        self.run_optimization()
+        self.start_worker_pool(self.num_workers)
+        try:
+            self.run_optimization()
+        finally:
+            self.stop_worker_pool()
 
 
 # def main_debug():
@@ -529,7 +976,7 @@ class Optimizer(object):
 #     try:
 #         optimizer.run()
 #     except AssertionError as e:
-#         print 'ABNORMAL EXIT ',e.message
+#         print('ABNORMAL EXIT ', str(e))
 #         print 'Make sure your simulation scripts run correctly. Run them using Player or runScript and watch for errors'
 
 
@@ -561,7 +1008,7 @@ def main_debug_win():
     try:
         optimizer.run()
     except AssertionError as e:
-        print('ABNORMAL EXIT ', e.message())
+        print('ABNORMAL EXIT ', str(e))
         print('Make sure your simulation scripts run correctly. '
               'Run them using Player or runScript and watch for errors')
 
@@ -590,7 +1037,7 @@ def main_debug_osx():
     try:
         optimizer.run()
     except AssertionError as e:
-        print('ABNORMAL EXIT ', e.message)
+        print('ABNORMAL EXIT ', str(e))
         print('Make sure your simulation scripts run correctly. '
               'Run them using Player or runScript and watch for errors')
 
@@ -619,7 +1066,7 @@ def main_debug_linux():
     try:
         optimizer.run()
     except AssertionError as e:
-        print( 'ABNORMAL EXIT ', e.message)
+        print('ABNORMAL EXIT ', str(e))
         print('Make sure your simulation scripts run correctly. '
               'Run them using Player or runScript and watch for errors')
 
@@ -653,7 +1100,7 @@ def main():
     try:
         optimizer.run()
     except AssertionError as e:
-        print('ABNORMAL EXIT ',e.message)
+        print('ABNORMAL EXIT ', str(e))
         print('Make sure your simulation scripts run correctly. Run them using Player or runScript and watch for errors')
 
 if __name__ == '__main__':
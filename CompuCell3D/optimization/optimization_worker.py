@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+#
+# Standalone optimization worker (cc3d-opt-worker). Can be started on any machine that sees the same file system
+# as the optimization driver (workspace directory and simulation template paths are sent as absolute paths).
+# Usage:
+# python optimization_worker.py --broker-address=tcp://<driver host>:<broker port> --num-cores=8
+#
+
+from OptimizerWorkerProcessZMQ import OptimizerWorkerProcessZMQ
+from collections import OrderedDict, deque
+import multiprocessing
+import argparse
+import socket
+import time
+import json
+import os
+import zmq
+
+
+class OptimizationWorkerCMLParser(object):
+    def __init__(self):
+        self.parser = argparse.ArgumentParser(description='CMA Optimization Worker')
+        self.parser.add_argument('-b', '--broker-address', required=True, action='store',
+                                 help="address of the optimization driver broker e.g. tcp://node01:5600")
+        self.parser.add_argument('-n', '--num-cores', required=False, action='store',
+                                 default=multiprocessing.cpu_count(), type=int,
+                                 help="number of simulations this worker runs concurrently. "
+                                      "Defaults to number of cores")
+        self.parser.add_argument('-r', '--cc3d-run-script', required=False, action='store', default=None,
+                                 help="CC3D run script on this machine. Overrides run script sent by the driver")
+        self.parser.add_argument('--heartbeat-interval', required=False, action='store', default=5.0, type=float,
+                                 help="time (in seconds) between heartbeat messages sent to the driver")
+
+    def parse(self):
+        return self.parser.parse_args()
+
+
+class OptimizationWorker(object):
+    """
+    Worker node of the multi-node optimization. Connects to the optimization driver (broker), announces number of
+    cores and runs that many workloads concurrently using local pool of OptimizerWorkerProcessZMQ processes.
+    Results of local workers are relayed to the driver. Heartbeats let the driver detect lost worker nodes
+    """
+
+    def __init__(self, broker_address, num_cores=1, cc3d_run_script=None, heartbeat_interval=5.0):
+        """
+        :param broker_address: {str} address of the optimization driver broker
+        :param num_cores: {int} number of concurrent workloads
+        :param cc3d_run_script: {str} CC3D run script on this machine - None means using script sent by driver
+        :param heartbeat_interval: {float} time (in seconds) between heartbeat messages
+        """
+
+        self.broker_address = broker_address
+        self.num_cores = num_cores
+        self.cc3d_run_script = cc3d_run_script
+        self.heartbeat_interval = heartbeat_interval
+
+        self.identity = 'node_%s_%s' % (socket.gethostname(), os.getpid())
+
+        self.context = zmq.Context()
+
+        # connection to the driver
+        self.broker_socket = self.context.socket(zmq.DEALER)
+        self.broker_socket.setsockopt(zmq.IDENTITY, self.identity.encode('utf-8'))
+        self.broker_socket.connect(self.broker_address)
+
+        # sockets of the local worker pool - the same layout as in Optimizer
+        self.local_push_socket = self.context.socket(zmq.ROUTER)
+        local_push_port = self.local_push_socket.bind_to_random_port('tcp://127.0.0.1', min_port=5557,
+                                                                     max_port=6557, max_tries=100)
+        self.local_push_address_str = 'tcp://127.0.0.1:%s' % local_push_port
+
+        self.local_pull_socket = self.context.socket(zmq.PULL)
+        local_pull_port = self.local_pull_socket.bind_to_random_port('tcp://127.0.0.1', min_port=5557,
+                                                                     max_port=6557, max_tries=100)
+        self.local_pull_address_str = 'tcp://127.0.0.1:%s' % local_pull_port
+
+        self.poller = zmq.Poller()
+        self.poller.register(self.broker_socket, zmq.POLLIN)
+        self.poller.register(self.local_push_socket, zmq.POLLIN)
+        self.poller.register(self.local_pull_socket, zmq.POLLIN)
+
+        # {local worker identity:process}
+        self.worker_pool = OrderedDict()
+        self.next_worker_id = 0
+
+        # identities of local workers that registered and do not process any workload
+        self.idle_workers = deque()
+
+        # {worker_tag:local worker identity}
+        self.busy_workers = OrderedDict()
+
+        # workloads received from the driver that wait for idle local worker
+        self.pending_workloads = deque()
+
+        self.last_message_time = 0.0
+        self.stop_requested = False
+
+    def send_to_broker(self, msg):
+        """
+        Sends message to the optimization driver
+        :param msg: {dict} message
+        :return: None
+        """
+
+        msg['worker_id'] = self.identity
+        msg['slots'] = self.num_cores
+        self.broker_socket.send_json(msg)
+        self.last_message_time = time.time()
+
+    def send_to_local_worker(self, identity, msg):
+        """
+        Sends json message to local worker
+        :param identity: {bytes} local worker identity
+        :param msg: {dict} message
+        :return: None
+        """
+        self.local_push_socket.send_multipart([identity, json.dumps(msg).encode('utf-8')])
+
+    def spawn_worker(self):
+        """
+        Starts new local worker process
+        :return: None
+        """
+
+        worker_name = 'worker_%s' % self.next_worker_id
+        worker = OptimizerWorkerProcessZMQ(id_number=self.next_worker_id, name=worker_name)
+        worker.set_pull_address_str(self.local_push_address_str)
+        worker.set_push_address_str(self.local_pull_address_str)
+        self.next_worker_id += 1
+
+        worker.start()
+
+        self.worker_pool[worker_name.encode('utf-8')] = worker
+
+    def start_worker_pool(self):
+        """
+        Starts local worker pool and waits until all local workers are ready
+        :return: None
+        """
+
+        for w in range(self.num_cores):
+            self.spawn_worker()
+
+        while len(self.idle_workers) < self.num_cores:
+            self.process_messages(timeout=self.heartbeat_interval)
+            self.check_workers()
+
+    def stop_worker_pool(self, timeout=10.0):
+        """
+        Shuts down local worker pool
+        :param timeout: {float} time (in seconds) to wait for each worker before terminating it
+        :return: None
+        """
+
+        for identity in self.worker_pool.keys():
+            self.send_to_local_worker(identity, {'shutdown': True})
+
+        for worker in self.worker_pool.values():
+            worker.join(timeout)
+            if worker.is_alive():
+                worker.kill_with_simulation()
+
+        self.worker_pool = OrderedDict()
+
+    def release_worker(self, worker_tag):
+        """
+        Marks local worker that processed workload worker_tag as idle
+        :param worker_tag: {str} tag of the workload
+        :return: None
+        """
+        try:
+            identity = self.busy_workers.pop(worker_tag)
+        except KeyError:
+            return
+
+        if identity in self.worker_pool:
+            self.idle_workers.append(identity)
+
+    def dispatch_pending_workloads(self):
+        """
+        Sends pending workloads to idle local workers
+        :return: None
+        """
+
+        while self.pending_workloads and self.idle_workers:
+            workload_dict = self.pending_workloads.popleft()
+            identity = self.idle_workers.popleft()
+
+            self.busy_workers[workload_dict['worker_tag']] = identity
+            self.send_to_local_worker(identity, workload_dict)
+
+    def cancel_workload(self, worker_tag):
+        """
+        Cancels workload - e.g. after driver decided that evaluation timed out
+        :param worker_tag: {str} tag of the workload
+        :return: None
+        """
+
+        for workload_dict in list(self.pending_workloads):
+            if workload_dict['worker_tag'] == worker_tag:
+                self.pending_workloads.remove(workload_dict)
+                return
+
+        try:
+            identity = self.busy_workers[worker_tag]
+        except KeyError:
+            return
+
+        print('cancelling workload ', worker_tag)
+        # the worker gets replaced by check_workers
+        self.worker_pool[identity].kill_with_simulation()
+
+    def handle_broker_message(self, msg):
+        """
+        Handles message received from the driver
+        :param msg: {dict} message
+        :return: None
+        """
+
+        if msg.get('shutdown', False):
+            self.stop_requested = True
+            return
+
+        if 'cancel' in msg:
+            self.cancel_workload(msg['cancel'])
+            return
+
+        if self.cc3d_run_script is not None:
+            msg['cc3d_command'] = self.cc3d_run_script
+
+        self.pending_workloads.append(msg)
+
+    def process_messages(self, timeout):
+        """
+        Waits for messages from the driver and from local workers and processes them
+        :param timeout: {float} maximum wait time in seconds
+        :return: None
+        """
+
+        events = dict(self.poller.poll(timeout * 1000))
+
+        if self.broker_socket in events:
+            while True:
+                try:
+                    msg = self.broker_socket.recv_json(zmq.NOBLOCK)
+                except zmq.Again:
+                    break
+                self.handle_broker_message(msg)
+
+        if self.local_push_socket in events:
+            while True:
+                try:
+                    identity, msg_str = self.local_push_socket.recv_multipart(zmq.NOBLOCK)
+                except zmq.Again:
+                    break
+                msg = json.loads(msg_str.decode('utf-8'))
+                if msg.get('worker_status') == 'ready':
+                    self.idle_workers.append(identity)
+                elif msg.get('worker_status') == 'done':
+                    # driver decides whether result of the workload arrived
+                    self.release_worker(msg['worker_tag'])
+                    self.send_to_broker({'worker_status': 'done', 'worker_tag': msg['worker_tag']})
+
+        if self.local_pull_socket in events:
+            while True:
+                try:
+                    result = self.local_pull_socket.recv_json(zmq.NOBLOCK)
+                except zmq.Again:
+                    break
+                self.release_worker(result['return_value_tag'])
+                self.send_to_broker({'worker_status': 'result', 'result': result})
+
+    def check_workers(self):
+        """
+        Replaces local workers that died. Workloads of such workers are reported to the driver as aborted
+        :return: None
+        """
+
+        for identity, worker in list(self.worker_pool.items()):
+            if worker.is_alive():
+                continue
+
+            del self.worker_pool[identity]
+
+            if identity in self.idle_workers:
+                self.idle_workers.remove(identity)
+
+            for worker_tag, busy_identity in list(self.busy_workers.items()):
+                if busy_identity == identity:
+                    del self.busy_workers[worker_tag]
+                    self.send_to_broker({'worker_status': 'result',
+                                         'result': {'return_value_tag': worker_tag, 'return_value': -1,
+                                                    'abort': True}})
+
+            self.spawn_worker()
+
+    def run(self):
+        """
+        Main loop of the worker node
+        :return: None
+        """
+
+        print('starting %s local workers' % self.num_cores)
+        self.start_worker_pool()
+
+        print('connecting to %s as %s' % (self.broker_address, self.identity))
+        self.send_to_broker({'worker_status': 'ready'})
+
+        try:
+            while not self.stop_requested:
+                self.dispatch_pending_workloads()
+                self.process_messages(timeout=self.heartbeat_interval / 2.0)
+                self.check_workers()
+
+                if time.time() - self.last_message_time >= self.heartbeat_interval:
+                    self.send_to_broker({'worker_status': 'heartbeat'})
+        finally:
+            self.stop_worker_pool()
+
+        print('received shutdown message from the driver')
+
+
+def main():
+    args = OptimizationWorkerCMLParser().parse()
+
+    worker = OptimizationWorker(broker_address=args.broker_address,
+                                num_cores=args.num_cores,
+                                cc3d_run_script=args.cc3d_run_script,
+                                heartbeat_interval=args.heartbeat_interval)
+    worker.run()
+
+
+if __name__ == '__main__':
+    main()
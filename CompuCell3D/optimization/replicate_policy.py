@@ -0,0 +1,147 @@
+import numpy as np
+
+
+class ReplicatePolicy(object):
+    """
+    Describes how many replicates (simulations with different random seeds) are run for every candidate solution
+    and how replicate loss values are aggregated into a single loss value. The policy is read from "replicates"
+    section of the optimization parameters json file, e.g.:
+
+    "replicates": {
+        "min": 2,
+        "max": 8,
+        "aggregate": "trimmed_mean",
+        "trim_fraction": 0.1,
+        "racing": true,
+        "confidence_z": 1.96,
+        "seed_label": "RANDOM_SEED",
+        "base_seed": 1
+    }
+
+    Replicate seed is passed to simulation templates using seed_label template label ({{RANDOM_SEED}} by default).
+    Replicate r of every candidate uses the same seed (base_seed + r) so that candidates are compared using
+    common random numbers. With racing enabled candidates start with "min" replicates and additional replicates are
+    run only for candidates whose rank within the population is uncertain
+    """
+
+    AGGREGATORS = ('mean', 'median', 'trimmed_mean')
+
+    def __init__(self, replicates_jn=None):
+        """
+        :param replicates_jn: {dict} "replicates" section of the optimization parameters json file
+        """
+
+        if replicates_jn is None:
+            replicates_jn = {}
+
+        self.min_replicates = int(replicates_jn.get('min', 1))
+        self.max_replicates = int(replicates_jn.get('max', self.min_replicates))
+        self.aggregate_name = replicates_jn.get('aggregate', 'mean')
+        self.trim_fraction = float(replicates_jn.get('trim_fraction', 0.1))
+        self.racing = bool(replicates_jn.get('racing', False))
+        self.confidence_z = float(replicates_jn.get('confidence_z', 1.96))
+        self.seed_label = replicates_jn.get('seed_label', 'RANDOM_SEED')
+        self.base_seed = int(replicates_jn.get('base_seed', 1))
+
+        if self.min_replicates < 1:
+            raise ValueError('Minimum number of replicates must be at least 1')
+
+        if self.max_replicates < self.min_replicates:
+            raise ValueError('Maximum number of replicates (%s) must not be smaller than minimum number '
+                             'of replicates (%s)' % (self.max_replicates, self.min_replicates))
+
+        if self.aggregate_name not in self.AGGREGATORS:
+            raise ValueError('Unknown replicate aggregate "%s". Supported aggregates are: %s' % (
+                self.aggregate_name, ', '.join(self.AGGREGATORS)))
+
+        if not 0.0 <= self.trim_fraction < 0.5:
+            raise ValueError('trim_fraction must be in [0, 0.5) interval')
+
+    @property
+    def replicated(self):
+        """
+        Flag indicating whether candidates are evaluated using more than one replicate
+        :return: {bool}
+        """
+        return self.max_replicates > 1
+
+    def replicate_param_dict(self, param_dict, replicate_idx):
+        """
+        Returns parameter dictionary of a given replicate - i.e. param_dict with random seed added
+        :param param_dict: {dict} dictionary of parameters - the format is {parameter_name:value}
+        :param replicate_idx: {int} replicate index
+        :return: {dict} dictionary of parameters
+        """
+
+        if not self.replicated:
+            return param_dict
+
+        replicate_param_dict = dict(param_dict)
+        replicate_param_dict[self.seed_label] = self.base_seed + replicate_idx
+
+        return replicate_param_dict
+
+    def aggregate(self, values):
+        """
+        Aggregates replicate loss values. Failed replicates (nan) are ignored
+        :param values: {list} replicate loss values
+        :return: {float} aggregated loss value or nan if all replicates failed
+        """
+
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+
+        if not len(values):
+            return np.nan
+
+        if self.aggregate_name == 'median':
+            return float(np.median(values))
+
+        if self.aggregate_name == 'trimmed_mean':
+            values = np.sort(values)
+            num_trimmed = int(self.trim_fraction * len(values))
+            if num_trimmed:
+                values = values[num_trimmed:-num_trimmed]
+
+        return float(np.mean(values))
+
+    def standard_error(self, values):
+        """
+        Returns standard error of the mean of replicate loss values. Failed replicates (nan) are ignored
+        :param values: {list} replicate loss values
+        :return: {float} standard error - infinite if there are fewer than 2 successful replicates
+        """
+
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+
+        if len(values) < 2:
+            return np.inf
+
+        return float(np.std(values, ddof=1) / np.sqrt(len(values)))
+
+    def uncertain_candidates(self, replicate_values):
+        """
+        Returns indices of candidates that need additional replicate. Candidate rank is uncertain if its
+        confidence interval overlaps confidence interval of its neighbor in the population sorted by aggregated
+        loss value
+        :param replicate_values: {list of lists} replicate loss values of every candidate
+        :return: {list} indices of candidates
+        """
+
+        if not self.racing:
+            return []
+
+        aggregated = np.array([self.aggregate(values) for values in replicate_values])
+        half_widths = np.array([self.confidence_z * self.standard_error(values) for values in replicate_values])
+
+        # candidates whose all replicates failed are excluded from racing
+        ranked = [idx for idx in np.argsort(aggregated) if not np.isnan(aggregated[idx])]
+
+        uncertain = set()
+        for idx_lower, idx_upper in zip(ranked[:-1], ranked[1:]):
+            if aggregated[idx_lower] + half_widths[idx_lower] >= aggregated[idx_upper] - half_widths[idx_upper]:
+                uncertain.add(idx_lower)
+                uncertain.add(idx_upper)
+
+        return sorted(int(idx) for idx in uncertain if len(replicate_values[idx]) < self.max_replicates)
@@ -0,0 +1,5 @@
+import sys
+from os.path import abspath, dirname
+
+# optimizer modules import each other as top-level modules (optimization.py is run as a script)
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
@@ -0,0 +1,129 @@
+import json
+import os
+import pickle
+import warnings
+
+import numpy as np
+import pytest
+
+from evaluation_store import EvaluationStore
+
+warnings.filterwarnings('ignore', message='Could not import matplotlib')
+cma = pytest.importorskip('cma')
+
+
+def sphere(x):
+    return float(np.sum((np.asarray(x) - 0.3) ** 2))
+
+
+@pytest.fixture
+def simulation_template(tmp_path):
+    template_dir = tmp_path / 'template'
+    (template_dir / 'Simulation').mkdir(parents=True)
+    (template_dir / 'demo.cc3d').write_text('<Simulation/>')
+    (template_dir / 'Simulation' / 'demo.py').write_text('x = {{x}}')
+    return str(template_dir / 'demo.cc3d')
+
+
+@pytest.fixture
+def store(tmp_path, simulation_template):
+    store_dir = tmp_path / 'workspace'
+    store_dir.mkdir()
+    return EvaluationStore(store_dir=str(store_dir), simulation_template_name=simulation_template)
+
+
+def create_optimizer():
+    return cma.CMAEvolutionStrategy([0.5, 0.5], 0.2, {'bounds': [0, 1], 'seed': 3, 'verbose': -9})
+
+
+def run_generation(store, optim, generation):
+    candidates = optim.ask(number=6)
+    store.record_ask(generation, candidates)
+    values = [sphere(x) for x in candidates]
+    optim.tell(candidates, values)
+    store.record_tell(generation, values, optim)
+
+
+def test_cache_is_reloaded(store, simulation_template):
+    store.add({'x': 0.1, 'y': 2.0}, 1.5)
+
+    reopened = EvaluationStore(store_dir=store.store_dir, simulation_template_name=simulation_template)
+    assert reopened.lookup({'y': 2.0, 'x': 0.1}) == 1.5
+    assert reopened.lookup({'x': 0.2, 'y': 2.0}) is None
+
+
+def test_journal_is_written_before_state(store, monkeypatch):
+    optim = create_optimizer()
+    run_generation(store, optim, 0)
+
+    def crash(generation, optim):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(store, 'save_cma_state', crash)
+    with pytest.raises(KeyboardInterrupt):
+        run_generation(store, optim, 1)
+
+    assert store.last_completed_generation() == 1
+    saved_optim, saved_generation = store.load_cma_state()
+    assert saved_generation == 0
+    assert saved_optim.countiter == 1
+
+
+def test_resume_replays_generations_missing_from_state(store, monkeypatch):
+    optim = create_optimizer()
+    run_generation(store, optim, 0)
+    run_generation(store, optim, 1)
+
+    # interrupted after the journal was written but before the state was saved
+    monkeypatch.setattr(store, 'save_cma_state', lambda generation, optim: None)
+    run_generation(store, optim, 2)
+    monkeypatch.undo()
+
+    restored, last_generation = store.restore_cma_state(create_optimizer)
+
+    assert last_generation == 2
+    assert restored.countiter == optim.countiter == 3
+    np.testing.assert_allclose(restored.mean, optim.mean)
+    np.testing.assert_allclose(restored.sigma, optim.sigma)
+    # replayed state is saved so that the next resume does not replay again
+    assert store.load_cma_state()[1] == 2
+
+
+def test_resume_without_saved_state_replays_journal(store):
+    optim = create_optimizer()
+    run_generation(store, optim, 0)
+    run_generation(store, optim, 1)
+    store.record_ask(2, optim.ask(number=6))
+
+    os.remove(store.cma_state_fname)
+
+    restored, last_generation = store.restore_cma_state(create_optimizer)
+
+    assert last_generation == 1
+    assert restored.countiter == 2
+    np.testing.assert_allclose(restored.mean, optim.mean)
+    assert len(store.pending_candidates(2)) == 6
+
+
+def test_truncated_journal_record_is_ignored(store):
+    optim = create_optimizer()
+    run_generation(store, optim, 0)
+    candidates = optim.ask(number=6)
+    store.record_ask(1, candidates)
+    with open(store.journal_fname, 'a') as fout:
+        fout.write(json.dumps({'generation': 1, 'event': 'tell', 'values': [1.0] * 6})[:20])
+
+    restored, last_generation = store.restore_cma_state(create_optimizer)
+
+    assert last_generation == 0
+    assert restored.countiter == 1
+
+
+def test_unknown_state_format_is_rejected(store):
+    optim = create_optimizer()
+    run_generation(store, optim, 0)
+    with open(store.cma_state_fname, 'wb') as fout:
+        pickle.dump(optim, fout)
+
+    with pytest.raises(RuntimeError, match='unknown format'):
+        store.restore_cma_state(create_optimizer)
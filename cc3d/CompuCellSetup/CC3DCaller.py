@@ -13,9 +13,14 @@ class CC3DCaller:
     def __init__(self,
                  cc3d_sim_fname=None,
                  output_frequency=0,
+                 output_format='vti',
+                 output_keyframe_interval=0,
                  screenshot_output_frequency=0,
                  restart_snapshot_frequency=0,
                  restart_multiple_snapshots=False,
+                 restart_asynchronous_output=False,
+                 profile_simulation=False,
+                 profiling_timeline_file=None,
                  output_dir=None,
                  output_file_core_name=None,
                  result_identifier_tag=None,
@@ -24,9 +29,17 @@ class CC3DCaller:
 
         :param cc3d_sim_fname:
         :param output_frequency:
+        :param output_format: lattice snapshot format - 'vti' (compressed binary) or 'vtk' (legacy ASCII)
+        :param output_keyframe_interval: number of lattice snapshots per keyframe - remaining snapshots store only
+                                         cell field changes
         :param screenshot_output_frequency:
         :param restart_snapshot_frequency:
         :param restart_multiple_snapshots:
+        :param restart_asynchronous_output:
+        :param profile_simulation: turns on reporting of run times of energy functions, C++ steppables and
+                                   PDE solvers
+        :param profiling_timeline_file: optional .csv, .json or .jsonl file storing run times collected during
+                                        every MCS - implies profile_simulation
         :param output_dir:
         :param output_file_core_name:
         :param result_identifier_tag:
@@ -36,9 +49,14 @@ class CC3DCaller:
 
         self.cc3d_sim_fname = cc3d_sim_fname
         self.output_frequency = output_frequency
+        self.output_format = output_format
+        self.output_keyframe_interval = output_keyframe_interval
         self.screenshot_output_frequency = screenshot_output_frequency
         self.restart_snapshot_frequency = restart_snapshot_frequency
         self.restart_multiple_snapshots = restart_multiple_snapshots
+        self.restart_asynchronous_output = restart_asynchronous_output
+        self.profile_simulation = profile_simulation
+        self.profiling_timeline_file = profiling_timeline_file
         self.output_dir = output_dir
         self.output_file_core_name = output_file_core_name
         self.result_identifier_tag = result_identifier_tag
@@ -63,11 +81,16 @@ class CC3DCaller:
 
         persistent_globals.simulation_file_name = self.cc3d_sim_fname
         persistent_globals.output_frequency = self.output_frequency
+        persistent_globals.output_format = self.output_format
+        persistent_globals.output_keyframe_interval = self.output_keyframe_interval
         persistent_globals.screenshot_output_frequency = self.screenshot_output_frequency
         persistent_globals.set_output_dir(self.output_dir)
         persistent_globals.output_file_core_name = self.output_file_core_name
         persistent_globals.restart_snapshot_frequency = self.restart_snapshot_frequency
         persistent_globals.restart_multiple_snapshots = self.restart_multiple_snapshots
+        persistent_globals.restart_asynchronous_output = self.restart_asynchronous_output
+        persistent_globals.profile_simulation = self.profile_simulation or self.profiling_timeline_file is not None
+        persistent_globals.profiling_timeline_file = self.profiling_timeline_file
         persistent_globals.input_object = self.sim_input
 
         run_cc3d_project(cc3d_sim_fname=self.cc3d_sim_fname)
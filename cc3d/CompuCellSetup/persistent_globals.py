@@ -52,12 +52,24 @@ class PersistentGlobals:
         self.__param_scan_iteration = None
 
         self.output_frequency = 0
+        # lattice snapshot format - 'vti' (compressed binary VTK XML) or 'vtk' (legacy ASCII VTK)
+        self.output_format = 'vti'
+        # number of lattice snapshots per keyframe - snapshots between keyframes store only cell field changes.
+        # 0 or 1 means every snapshot stores full cell field
+        self.output_keyframe_interval = 0
         self.screenshot_output_frequency = 0
 
         self.restart_snapshot_frequency = 0
         self.restart_multiple_snapshots = 0
+        # flag that tells restart manager to write restart snapshots in the background
+        self.restart_asynchronous_output = False
         self.restart_manager = None
 
+        # flag that turns on collection of run times of energy functions, C++ steppables and PDE solvers
+        self.profile_simulation = False
+        # optional file (.csv, .json or .jsonl) storing values collected by C++ profiler during every MCS
+        self.profiling_timeline_file = None
+
         # todo - move it elsewhere or come up with a better solution
         # two objects that handle adding addition of python attributes
         self.attribute_adder = None
@@ -74,6 +86,11 @@ class PersistentGlobals:
         self.global_sbml_simulator_options = None
         self.free_floating_sbml_simulators = {}
 
+        # {model name:SBMLBatch} - cell SBML models integrated in batches
+        self.sbml_batches = {}
+        # flag indicating that some cells carry SBML models that are not batched
+        self.unbatched_cell_sbml = False
+
         # dictionary holding steering parameter objects - used for custom steering panel
         self.steering_param_dict = OrderedDict()
         self.steering_panel_synchronizer = Lock()
@@ -16,6 +16,8 @@ import time
 import weakref
 from cc3d import CompuCellSetup
 from cc3d.core import RestartManager
+from cc3d.core.SimulationProfiler import get_cpp_profiling_report, print_cpp_profiling_report, \
+    ProfilingTimelineWriter
 from cc3d.CompuCellSetup.simulation_utils import check_for_cpp_errors
 from cc3d.core.Validation.sanity_checkers import validate_cc3d_entity_identifier
 from cc3d.CompuCellSetup.cluster_utils import check_nanohub_and_count
@@ -119,7 +121,16 @@ def run():
 
     main_loop_fcn = determine_main_loop_fcn()
 
-    main_loop_fcn(simulator, simthread=simthread, steppable_registry=steppable_registry)
+    try:
+        main_loop_fcn(simulator, simthread=simthread, steppable_registry=steppable_registry)
+    finally:
+        # main loops supplied by players do not know about restart snapshots written in the background
+        if persistent_globals.restart_manager is not None:
+            persistent_globals.restart_manager.finish_restart_output()
+
+        # change recorder of keyframe snapshots watches cell field and has to be removed before Potts is destroyed
+        if persistent_globals.cml_field_handler is not None:
+            persistent_globals.cml_field_handler.finish()
 
 
 def register_steppable(steppable):
@@ -137,12 +148,14 @@ def register_steppable(steppable):
     steppable_registry.registerSteppable(_steppable=steppable)
 
 
-def print_profiling_report(py_steppable_profiler_report, compiled_code_run_time, total_run_time):
+def print_profiling_report(py_steppable_profiler_report, compiled_code_run_time, total_run_time,
+                           cpp_profiler_report=None):
     """
     prints profiling information after simulation finishes running
     :param py_steppable_profiler_report:
     :param compiled_code_run_time:
     :param total_run_time:
+    :param cpp_profiler_report: optional breakdown of compiled code run time returned by get_cpp_profiling_report
     :return:
     """
     profiling_format = '{:>32.32}: {:11.2f} ({:5.1%})'
@@ -170,6 +183,9 @@ def print_profiling_report(py_steppable_profiler_report, compiled_code_run_time,
     print(profiling_format.format('Compiled Code (C++) Run Time', int(compiled_code_run_time) / 1000.,
                                   int(compiled_code_run_time) / total_run_time))
 
+    if cpp_profiler_report:
+        print_cpp_profiling_report(cpp_profiler_report=cpp_profiler_report, total_run_time=total_run_time)
+
     print(profiling_format.format('Other Time', int(total_run_time - compiled_code_run_time - totStepTime) / 1000.,
                                   int(total_run_time - compiled_code_run_time - totStepTime) / total_run_time))
 
@@ -396,10 +412,13 @@ def initialize_cc3d_sim(sim, simthread):
     restart_manager = pg.restart_manager
     restart_manager.output_frequency = pg.restart_snapshot_frequency
     restart_manager.allow_multiple_restart_directories = pg.restart_multiple_snapshots
+    restart_manager.asynchronous_output = pg.restart_asynchronous_output
 
     init_using_restart_snapshot_enabled = restart_manager.restart_enabled()
     sim.setRestartEnabled(init_using_restart_snapshot_enabled)
 
+    sim.getProfiler().setEnabled(pg.profile_simulation)
+
     if init_using_restart_snapshot_enabled:
         print('WILL RESTART SIMULATION')
         restart_manager.loadRestartFiles()
@@ -480,40 +499,55 @@ def main_loop(sim, simthread, steppable_registry=None):
 
     cur_step = beginning_step
 
-    while cur_step < sim.getNumSteps():
-        if CompuCellSetup.persistent_globals.user_stop_simulation_flag:
-            run_finish_flag = False
-            break
+    profiling_timeline_writer = None
+    if pg.profiling_timeline_file is not None:
+        profiling_timeline_writer = ProfilingTimelineWriter(pg.profiling_timeline_file)
+
+    try:
+        while cur_step < sim.getNumSteps():
+            if CompuCellSetup.persistent_globals.user_stop_simulation_flag:
+                run_finish_flag = False
+                break
 
-        if steppable_registry is not None:
-            steppable_registry.stepRunBeforeMCSSteppables(cur_step)
+            if steppable_registry is not None:
+                steppable_registry.stepRunBeforeMCSSteppables(cur_step)
 
-        compiled_code_begin = time.time()
+            compiled_code_begin = time.time()
 
-        sim.step(cur_step)  # steering using steppables
-        check_for_cpp_errors(CompuCellSetup.persistent_globals.simulator)
+            sim.step(cur_step)  # steering using steppables
+            check_for_cpp_errors(CompuCellSetup.persistent_globals.simulator)
 
-        compiled_code_end = time.time()
+            compiled_code_end = time.time()
 
-        compiled_code_run_time += (compiled_code_end - compiled_code_begin) * 1000
+            compiled_code_run_time += (compiled_code_end - compiled_code_begin) * 1000
 
-        if steppable_registry is not None:
-            steppable_registry.step(cur_step)
+            if profiling_timeline_writer is not None:
+                profiling_timeline_writer.write_step(sim, cur_step)
 
-        # restart manager will decide whether to output files or not based on its settings
-        restart_manager.output_restart_files(cur_step)
+            if steppable_registry is not None:
+                steppable_registry.step(cur_step)
 
-        store_lattice_snapshot(cur_step=cur_step)
-        store_screenshots(cur_step=cur_step)
+            # restart manager will decide whether to output files or not based on its settings
+            restart_manager.output_restart_files(cur_step)
 
-        # passing Python-script-made changes in XML to C++ code
-        incorporate_script_steering_changes(simulator=sim)
+            store_lattice_snapshot(cur_step=cur_step)
+            store_screenshots(cur_step=cur_step)
 
-        # steer application will only update modules that uses requested using updateCC3DModule function from simulator
-        sim.steer()
-        check_for_cpp_errors(CompuCellSetup.persistent_globals.simulator)
+            # passing Python-script-made changes in XML to C++ code
+            incorporate_script_steering_changes(simulator=sim)
+
+            # steer application will only update modules that uses requested using updateCC3DModule function from simulator
+            sim.steer()
+            check_for_cpp_errors(CompuCellSetup.persistent_globals.simulator)
+
+            cur_step += 1
+    finally:
+        if profiling_timeline_writer is not None:
+            profiling_timeline_writer.close()
 
-        cur_step += 1
+        # restart snapshot written in the background has to be complete before simulation ends - also when
+        # simulation is stopped by the user or by an error
+        restart_manager.finish_restart_output()
 
     if run_finish_flag:
         print("CALLING FINISH")
@@ -522,5 +556,7 @@ def main_loop(sim, simthread, steppable_registry=None):
         steppable_registry.on_stop()
 
     t2 = time.time()
+    cpp_profiler_report = get_cpp_profiling_report(sim) if pg.profile_simulation else None
     print_profiling_report(py_steppable_profiler_report=steppable_registry.get_profiler_report(),
-                           compiled_code_run_time=compiled_code_run_time, total_run_time=(t2 - t1) * 1000.0)
+                           compiled_code_run_time=compiled_code_run_time, total_run_time=(t2 - t1) * 1000.0,
+                           cpp_profiler_report=cpp_profiler_report)
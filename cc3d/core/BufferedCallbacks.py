@@ -0,0 +1,148 @@
+"""
+Batched Python callbacks for cell field changes, cell type changes and steppers. Instead of acquiring GIL
+for every accepted pixel copy, C++ wrappers append events to per-thread buffers during Metropolis sweep
+and deliver them to Python as numpy arrays once per MCS (before steppables run) or whenever a thread
+buffers max_buffered_events events, e.g.
+
+.. code-block:: python
+
+    class ContactCounter(BufferedCellChangeWatcher):
+        def on_changes(self, points, new_cell_ids, old_cell_ids):
+            self.copies_into_medium += int((new_cell_ids == 0).sum())
+
+    self.register_buffered_callback(ContactCounter())
+
+"""
+from cc3d import CompuCellSetup
+from cc3d.cpp import CompuCell
+
+
+class BufferedCallback:
+    """
+    Base class of batched callbacks. Order of events buffered by different threads is not preserved
+    """
+
+    def __init__(self, max_buffered_events: int = 0):
+        """
+        :param int max_buffered_events: number of events buffered by a single thread after which they are
+            delivered immediately, defaults to 0 - events are delivered once per MCS
+        """
+        self.max_buffered_events = max_buffered_events
+        self.wrapper = None
+
+    def create_wrapper(self):
+        raise NotImplementedError
+
+    def register_wrapper(self, potts) -> None:
+        raise NotImplementedError
+
+    def delivered_events(self):
+        return self.wrapper.getDeliveredEventArray()
+
+
+class BufferedCellChangeWatcher(BufferedCallback):
+    """
+    Receives accepted pixel copies. Subclasses implement on_changes
+    """
+
+    def create_wrapper(self):
+        return CompuCell.ChangeWatcherPyWrapper()
+
+    def register_wrapper(self, potts) -> None:
+        potts.registerCellGChangeWatcher(self.wrapper.getChangeWatcherPyWrapperPtr())
+
+    def field3DChangeBatch(self):
+        events = self.delivered_events()
+        self.on_changes(events[:, :3], events[:, 3], events[:, 4])
+
+    def on_changes(self, points, new_cell_ids, old_cell_ids) -> None:
+        """
+        :param numpy.ndarray points: (n, 3) array of x-, y-, z-coordinates of changed pixels
+        :param numpy.ndarray new_cell_ids: ids of cells that gained pixels - 0 means medium
+        :param numpy.ndarray old_cell_ids: ids of cells that lost pixels - 0 means medium
+        :return: None
+        """
+        raise NotImplementedError
+
+
+class BufferedTypeChangeWatcher(BufferedCallback):
+    """
+    Receives cell type changes made through type transition (e.g. by cell type plugin). Subclasses
+    implement on_type_changes
+    """
+
+    def create_wrapper(self):
+        return CompuCell.TypeChangeWatcherPyWrapper()
+
+    def register_wrapper(self, potts) -> None:
+        potts.getTypeTransition().registerTypeChangeWatcher(self.wrapper.getTypeChangeWatcherPyWrapperPtr())
+
+    def typeChangeBatch(self):
+        events = self.delivered_events()
+        self.on_type_changes(events[:, 0], events[:, 1], events[:, 2])
+
+    def on_type_changes(self, cell_ids, old_types, new_types) -> None:
+        """
+        :param numpy.ndarray cell_ids: ids of cells whose type changed
+        :param numpy.ndarray old_types: types before change
+        :param numpy.ndarray new_types: types after change
+        :return: None
+        """
+        raise NotImplementedError
+
+
+class BufferedStepper(BufferedCallback):
+    """
+    Counts stepper calls made by Potts after pixel copy attempts. Subclasses implement on_steps
+    """
+
+    def create_wrapper(self):
+        return CompuCell.StepperPyWrapper()
+
+    def register_wrapper(self, potts) -> None:
+        potts.registerStepper(self.wrapper.getStepperPyWrapperPtr())
+
+    def stepBatch(self):
+        self.on_steps(self.delivered_events()[:, 0])
+
+    def on_steps(self, work_node_numbers) -> None:
+        """
+        :param numpy.ndarray work_node_numbers: work node (thread) number of every stepper call
+        :return: None
+        """
+        raise NotImplementedError
+
+
+def register_buffered_callback(callback: BufferedCallback, simulator) -> BufferedCallback:
+    """
+    Creates C++ wrapper of batched callback in buffered mode and registers it with Potts
+
+    :param BufferedCallback callback: callback
+    :param simulator: simulator
+    :return: callback
+    :rtype: BufferedCallback
+    """
+
+    potts = simulator.getPotts()
+
+    callback.wrapper = callback.create_wrapper()
+    callback.wrapper.setPotts(potts)
+    callback.wrapper.setSimulator(simulator)
+    callback.wrapper.registerPyObject(callback)
+    callback.wrapper.setBuffered(True, callback.max_buffered_events)
+    callback.register_wrapper(potts)
+
+    # callbacks have to outlive objects that created them
+    CompuCellSetup.persistent_globals.persistent_holder.setdefault('buffered_callbacks', []).append(callback)
+
+    return callback
+
+
+def flush_buffered_callbacks() -> None:
+    """
+    Delivers events buffered since last call. Called by steppable registry once per MCS before steppables run
+    :return: None
+    """
+
+    for callback in CompuCellSetup.persistent_globals.persistent_holder.get('buffered_callbacks', []):
+        callback.wrapper.flush()
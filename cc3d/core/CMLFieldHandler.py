@@ -1,5 +1,6 @@
 """
-This class handles field serialization to the (currently) vtk format
+This class handles field serialization to the vtk formats - compressed binary VTK XML image data (*.vti)
+or legacy VTK (*.vtk)
 """
 
 from os.path import join
@@ -19,8 +20,15 @@ class CMLFieldHandler:
         self.field_writer = PlayerPython.FieldWriter()
         self.field_writer.setFieldStorage(self.field_storage)
 
-        # not being used currently
-        # self.fieldWriter.setFileTypeToBinary(False)
+        # {output format: (file extension, function writing fields added to field writer)}
+        self.snapshot_writers = {
+            "vti": (".vti", self.field_writer.writeFieldsXML),
+            "vtk": (".vtk", self.field_writer.writeFields)
+        }
+        self.output_format = "vti"
+        # number of snapshots per keyframe - snapshots in between store only cell field changes
+        self.keyframe_interval = 0
+        self.snapshots_since_keyframe = 0
 
         self.field_types = {}
         self.output_freq = 1
@@ -48,6 +56,12 @@ class CMLFieldHandler:
         if persistent_globals.output_file_core_name:
             self.output_file_core_name = persistent_globals.output_file_core_name
 
+        if persistent_globals.output_format not in self.snapshot_writers:
+            raise ValueError('Unsupported lattice snapshot format: {}. Supported formats: {}'.format(
+                persistent_globals.output_format, ', '.join(self.snapshot_writers.keys())))
+        self.output_format = persistent_globals.output_format
+        self.keyframe_interval = persistent_globals.output_keyframe_interval
+
         self.field_writer.init(persistent_globals.simulator)
 
         if field_storage is not None:
@@ -70,7 +84,7 @@ class CMLFieldHandler:
 
         for field_name in self.field_types.keys():
             if self.field_types[field_name] == self.FIELD_TYPES[0]:
-                self.field_writer.addCellFieldForOutput()
+                self.add_cell_field_for_output()
             elif self.field_types[field_name] == self.FIELD_TYPES[1]:
                 self.field_writer.addConFieldForOutput(field_name)
             elif self.field_types[field_name] == self.FIELD_TYPES[2]:
@@ -84,13 +98,45 @@ class CMLFieldHandler:
 
         mcs_formatted_number = str(mcs).zfill(self.out_file_number_of_digits)
 
-        # e.g. /path/Step_01.vtk
+        extension, write_fields_fcn = self.snapshot_writers[self.output_format]
+
+        # e.g. /path/Step_01.vti
         lattice_data_file_name = join(self.output_dir_name,
-                                      self.output_file_core_name + "_" + mcs_formatted_number + ".vtk")
+                                      self.output_file_core_name + "_" + mcs_formatted_number + extension)
 
-        self.field_writer.writeFields(lattice_data_file_name)
+        write_fields_fcn(lattice_data_file_name)
         self.field_writer.clear()
 
+    def add_cell_field_for_output(self) -> None:
+        """
+        Adds cell field to the snapshot - either full cell field (keyframe) or changes recorded since previous
+        snapshot. Keyframe is written every self.keyframe_interval snapshots and whenever changes
+        could not be recorded (e.g. after lattice resize)
+        :return: None
+        """
+
+        if self.keyframe_interval <= 1:
+            self.field_writer.addCellFieldForOutput()
+            return
+
+        if 0 < self.snapshots_since_keyframe < self.keyframe_interval \
+                and self.field_writer.addCellFieldChangesForOutput():
+            self.snapshots_since_keyframe += 1
+            return
+
+        self.field_writer.addCellFieldForOutput()
+        self.field_writer.recordCellFieldChanges()
+        self.snapshots_since_keyframe = 1
+
+    def finish(self) -> None:
+        """
+        Stops recording of cell field changes. Has to be called at the end of simulation while Potts still exists
+        :return: None
+        """
+
+        self.field_writer.stopRecordingCellFieldChanges()
+        self.snapshots_since_keyframe = 0
+
     def write_xml_description_file(self, file_name: str = "") -> None:
         """
         This function will write XML description of the stored fields. It has to be called after
@@ -118,7 +164,9 @@ class CMLFieldHandler:
         lattice_data_xml_element.ElementCC3D("Output",
                                              {"Frequency": str(self.output_freq), "NumberOfSteps": str(number_of_steps),
                                               "CoreFileName": self.output_file_core_name,
-                                              "Directory": self.output_dir_name})
+                                              "Directory": self.output_dir_name,
+                                              "Format": self.output_format,
+                                              "KeyframeInterval": str(self.keyframe_interval)})
 
         # output information about cell type names and cell ids.
         # It is necessary during generation of the PIF files from VTK output
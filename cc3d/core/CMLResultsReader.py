@@ -16,9 +16,12 @@ from cc3d.cpp import CC3DXML
 from cc3d.cpp.CompuCell import Dim3D
 import cc3d.CompuCellSetup as CompuCellSetup
 import vtk
+from vtk.util.numpy_support import vtk_to_numpy, numpy_to_vtk
+import numpy as np
 import os
 import os.path
 from cc3d.core.GraphicsUtils.utils import extract_address_int_from_vtk_object
+from cc3d.core.LabelVolume import save_label_volume, label_volume_from_vtk
 
 
 def generate_pif_from_vtk(_vtkFileName: str, _pifFileName: str, _lds_file_name: str) -> None:
@@ -35,6 +38,116 @@ def generate_pif_from_vtk(_vtkFileName: str, _pifFileName: str, _lds_file_name:
                                              lds_reader.type_id_type_name_cpp_map)
 
 
+def generate_compressed_pif_from_vtk(_vtkFileName: str, _pifFileName: str, _lds_file_name: str) -> None:
+    """
+    generates compressed label volume (binary counterpart of PIFF, see cc3d.core.LabelVolume) from VTK file
+    :param _vtkFileName:
+    :param _pifFileName: output .npz file
+    :param _lds_file_name:
+    :return:
+    """
+    lds_reader = LatticeDataSummaryReader(_lds_file_name)
+    save_label_volume(_pifFileName, type_id_type_name_dict=lds_reader.type_id_type_name_dict,
+                      **label_volume_from_vtk(_vtkFileName, lds_reader.field_dim))
+
+
+# lattice snapshots - legacy VTK (*.vtk) and compressed VTK XML image data (*.vti)
+LATTICE_DATA_FILE_REGEX = r".*\.vt[ki]$"
+
+
+def lattice_data_reader(file_name: str):
+    """
+    Returns vtk reader matching lattice snapshot format - vtkXMLImageDataReader for *.vti files and
+    vtkStructuredPointsReader for legacy *.vtk files. Reader output is vtkImageData in both cases
+    :param file_name: {str} snapshot file name
+    :return: vtk reader
+    """
+    if file_name.endswith('.vti'):
+        return vtk.vtkXMLImageDataReader()
+    return vtk.vtkStructuredPointsReader()
+
+
+def read_lattice_data(file_name: str):
+    """
+    Reads lattice snapshot
+    :param file_name: {str} snapshot file name
+    :return: {vtkImageData} snapshot data
+    """
+    reader = lattice_data_reader(file_name)
+    reader.SetFileName(file_name)
+    reader.Update()
+    return reader.GetOutput()
+
+
+class CellFieldReplay:
+    """
+    Restores cell field of snapshots that store only cell field changes since previous snapshot
+    (see CMLFieldHandler.keyframe_interval) by replaying changes from the nearest preceding keyframe.
+    Cell ids of the last restored snapshot are cached so that consecutive snapshots are restored
+    by applying a single change set
+    """
+
+    def __init__(self):
+        self.file_name = None
+        self.cell_ids = None
+
+    @staticmethod
+    def is_keyframe(lattice_data) -> bool:
+        return lattice_data.GetFieldData().GetArray("ChangedPixelIndex") is None
+
+    def restore(self, lattice_data, file_number: int, file_names: list) -> None:
+        """
+        Adds CellType, CellId and ClusterId arrays to snapshot that stores only cell field changes.
+        Keyframes are only cached
+        :param lattice_data: {vtkImageData} snapshot data
+        :param file_number: {int} index of snapshot in file_names
+        :param file_names: {list} full names of all snapshot files in output order
+        :return: None
+        """
+        if self.is_keyframe(lattice_data):
+            cell_id_array = lattice_data.GetPointData().GetArray("CellId")
+            if cell_id_array is not None:
+                self.file_name = file_names[file_number]
+                self.cell_ids = vtk_to_numpy(cell_id_array).astype(np.int64)
+            return
+
+        change_sets = [lattice_data.GetFieldData()]
+        file_number_previous = file_number - 1
+        while self.cell_ids is None or self.file_name != file_names[file_number_previous]:
+            if file_number_previous < 0:
+                raise RuntimeError(f'No keyframe precedes lattice snapshot {file_names[file_number]}')
+
+            previous_lattice_data = read_lattice_data(file_names[file_number_previous])
+            if self.is_keyframe(previous_lattice_data):
+                self.cell_ids = vtk_to_numpy(previous_lattice_data.GetPointData().GetArray("CellId")).astype(np.int64)
+                break
+
+            change_sets.append(previous_lattice_data.GetFieldData())
+            file_number_previous -= 1
+
+        for field_data in reversed(change_sets):
+            self.cell_ids[vtk_to_numpy(field_data.GetArray("ChangedPixelIndex"))] = \
+                vtk_to_numpy(field_data.GetArray("ChangedPixelCellId"))
+
+        self.file_name = file_names[file_number]
+
+        # types and cluster ids are looked up in the cell table of restored snapshot. Row 0 describes medium
+        field_data = lattice_data.GetFieldData()
+        table_ids = np.concatenate(([0], vtk_to_numpy(field_data.GetArray("CellTableId"))))
+        table_types = np.concatenate(([0], vtk_to_numpy(field_data.GetArray("CellTableType"))))
+        table_cluster_ids = np.concatenate(([0], vtk_to_numpy(field_data.GetArray("CellTableClusterId"))))
+
+        order = np.argsort(table_ids)
+        rows = order[np.searchsorted(table_ids, self.cell_ids, sorter=order)]
+
+        for name, values, array_type in (("CellType", table_types[rows], vtk.VTK_CHAR),
+                                         ("CellId", self.cell_ids, vtk.VTK_LONG),
+                                         ("ClusterId", table_cluster_ids[rows], vtk.VTK_LONG)):
+            vtk_array = numpy_to_vtk(values, deep=1, array_type=array_type)
+            vtk_array.SetName(name)
+            lattice_data.GetPointData().AddArray(vtk_array)
+
+
 class _LatticeDataXMLReader:
     def __init__(self, lds_file: str):
         self.lds_file = os.path.abspath(lds_file)
@@ -145,7 +258,7 @@ class LatticeDataSummaryReader:
     @staticmethod
     def extract_lds_file_list_from_file_name(_lds_file: str) -> list:
         _lds_dir = os.path.dirname(LatticeDataSummaryReader.lds_file_check(_lds_file))
-        lds_file_list = [fName for fName in os.listdir(_lds_dir) if re.match(".*\.vtk$", fName)]
+        lds_file_list = [fName for fName in os.listdir(_lds_dir) if re.match(LATTICE_DATA_FILE_REGEX, fName)]
         lds_file_list.sort()
         return lds_file_list
 
@@ -216,6 +329,9 @@ class CMLResultReader:
         self.typeIdTypeNameCppMap = None
         self.customVis = None
 
+        # restores cell field of snapshots written between keyframes
+        self.cell_field_replay = CellFieldReplay()
+
     def dimension_change(self) -> bool:
         """
         event handler that processes change of dimension of the simulation
@@ -287,7 +403,7 @@ class CMLResultReader:
 
         fileName = self.ldsFileList[file_number]
 
-        self.simulationDataReader = vtk.vtkStructuredPointsReader()
+        self.simulationDataReader = lattice_data_reader(fileName)
 
         self.currentFileName = os.path.join(self.ldsDir, fileName)
         print('self.currentFileName=', self.currentFileName)
@@ -300,7 +416,7 @@ class CMLResultReader:
 
         data_reader_int_addr = extract_address_int_from_vtk_object(vtkObj=self.simulationDataReader)
 
-        # swig wrapper  on top of     vtkStructuredPointsReader.Update()  - releases GIL,
+        # swig wrapper  on top of     vtkStructuredPointsReader.Update() (or vtkXMLImageDataReader.Update()) - releases GIL,
         # hence can be used in multithreaded program that does not block GUI
         self.field_extractor.readVtkStructuredPointsData(data_reader_int_addr)
 
@@ -308,6 +424,9 @@ class CMLResultReader:
         # limited use in multithreaded program - blocks GUI
         self.simulationData = self.simulationDataReader.GetOutput()
 
+        self.cell_field_replay.restore(lattice_data=self.simulationData, file_number=file_number,
+                                       file_names=[os.path.join(self.ldsDir, f) for f in self.ldsFileList])
+
         self.fieldDimPrevious = self.fieldDim
 
         dim_from_vtk = self.simulationData.GetDimensions()
@@ -390,3 +509,14 @@ class CMLResultReader:
 
         self.__fileWriter.generatePIFFileFromVTKOutput(_vtkFileName, _pifFileName, self.fieldDim.x, self.fieldDim.y,
                                                        self.fieldDim.z, self.typeIdTypeNameCppMap)
+
+    def generate_compressed_pif_from_vtk(self, _vtkFileName: str, _pifFileName: str) -> None:
+        """
+        generates compressed label volume (binary counterpart of PIFF, see cc3d.core.LabelVolume) from VTK file
+        :param _vtkFileName:
+        :param _pifFileName: output .npz file
+        :return:
+        """
+
+        save_label_volume(_pifFileName, type_id_type_name_dict=self.typeIdTypeNameDict,
+                          **label_volume_from_vtk(_vtkFileName, self.fieldDim))
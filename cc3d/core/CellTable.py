@@ -0,0 +1,66 @@
+"""
+Struct-of-arrays access to core attributes of all cells. Instead of iterating over cell list and reading attributes
+of SWIG cell objects one by one, attributes of all cells are copied into numpy columns in a single C++ pass over
+cell inventory and can be written back in bulk, e.g.
+
+.. code-block:: python
+
+    table = cell_table(inventory, 'volume', 'targetVolume')
+    set_cell_attributes(inventory, table['id'], 'targetVolume', 1.1 * table['volume'])
+
+"""
+from collections import OrderedDict
+import numpy as np
+
+# attributes stored in int64 columns - remaining attributes are stored in float64 columns
+INT_CELL_ATTRIBUTES = frozenset(('id', 'clusterId', 'type', 'subtype', 'volume', 'flag'))
+
+DEFAULT_CELL_TABLE_ATTRIBUTES = ('id', 'clusterId', 'type', 'volume', 'surface', 'xCOM', 'yCOM', 'zCOM',
+                                 'targetVolume', 'lambdaVolume', 'targetSurface', 'lambdaSurface', 'fluctAmpl')
+
+
+def cell_table(inventory, *attributes) -> OrderedDict:
+    """
+    Returns core attributes of all cells as numpy columns. Row i of every column describes the same cell.
+    Rows follow cell inventory order (ascending cell id). Id column is always included
+
+    :param inventory: cell inventory
+    :type inventory: cc3d.cpp.CompuCell.CellInventory
+    :param attributes: names of cell attributes, defaults to DEFAULT_CELL_TABLE_ATTRIBUTES
+    :return: {attribute name: numpy array}
+    :rtype: OrderedDict
+    """
+
+    if not attributes:
+        attributes = DEFAULT_CELL_TABLE_ATTRIBUTES
+
+    num_cells = inventory.getSize()
+
+    columns = OrderedDict()
+    for attribute in ('id',) + tuple(attributes):
+        dtype = np.int64 if attribute in INT_CELL_ATTRIBUTES else np.float64
+        columns[attribute] = np.empty(num_cells, dtype=dtype)
+
+    inventory.fillCellTable(columns)
+
+    return columns
+
+
+def set_cell_attributes(inventory, ids, attribute: str, values) -> None:
+    """
+    Sets attribute of cells with given ids. Attributes maintained by trackers (volume, surface, center of mass etc.)
+    are read-only. Nothing is modified if any of the cells does not exist
+
+    :param inventory: cell inventory
+    :type inventory: cc3d.cpp.CompuCell.CellInventory
+    :param ids: cell ids
+    :param str attribute: name of cell attribute
+    :param values: new values - either one value per cell id or a single value for all cells
+    :return: None
+    """
+
+    ids = np.ascontiguousarray(ids, dtype=np.int64)
+    dtype = np.int64 if attribute in INT_CELL_ATTRIBUTES else np.float64
+    values = np.ascontiguousarray(np.broadcast_to(values, ids.shape), dtype=dtype)
+
+    inventory.setCellTableColumn(attribute, ids, values)
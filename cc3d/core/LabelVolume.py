@@ -0,0 +1,141 @@
+"""
+Binary counterpart of PIFF files. Cell lattice is stored as a label volume - integer array indexed [x, y, z] whose
+values are cell ids (0 means medium) - together with per-cell table (cell id, cluster id, cell type) and cell type
+table. Compressed files (.npz) are written using numpy.savez_compressed. Plain label volumes (.npy) are memory-mapped
+so that large volumes can be processed chunk by chunk
+"""
+import numpy as np
+from pathlib import Path
+from typing import Union
+
+LABEL_VOLUME_FORMAT_VERSION = 1
+
+
+def save_label_volume(file_name: Union[Path, str], labels: np.ndarray, cell_ids=None, cluster_ids=None,
+                      cell_types=None, type_id_type_name_dict: dict = None) -> None:
+    """
+    Writes compressed label volume file (.npz)
+
+    :param file_name: {str, Path} output file name
+    :param labels: {numpy.ndarray} 3D integer array of cell ids indexed [x, y, z]. 0 means medium
+    :param cell_ids: {sequence} ids of cells present in labels, optional
+    :param cluster_ids: {sequence} cluster ids of cells - one per cell id, defaults to cell ids
+    :param cell_types: {sequence} type ids of cells - one per cell id, optional
+    :param type_id_type_name_dict: {dict} {type id: type name}, optional
+    :return: None
+    """
+
+    arrays = {
+        'format_version': np.array(LABEL_VOLUME_FORMAT_VERSION),
+        'labels': np.asarray(labels)
+    }
+
+    if cell_ids is not None:
+        arrays['cell_id'] = np.asarray(cell_ids, dtype=np.int64)
+        arrays['cluster_id'] = np.asarray(cell_ids if cluster_ids is None else cluster_ids, dtype=np.int64)
+
+    if cell_types is not None:
+        arrays['cell_type'] = np.asarray(cell_types, dtype=np.int64)
+
+    if type_id_type_name_dict is not None:
+        type_ids = sorted(type_id_type_name_dict.keys())
+        arrays['type_id'] = np.asarray(type_ids, dtype=np.int64)
+        arrays['type_name'] = np.asarray([type_id_type_name_dict[type_id] for type_id in type_ids], dtype=str)
+
+    with open(str(file_name), 'wb') as fout:
+        np.savez_compressed(fout, **arrays)
+
+
+def label_volume_from_vtk(vtk_file_name: Union[Path, str], dim) -> dict:
+    """
+    Extracts label volume and per-cell table from VTK lattice snapshot written by CC3D
+
+    :param vtk_file_name: {str, Path} VTK file name - *.vti or legacy *.vtk
+    :param dim: field dimensions - tuple or Dim3D
+    :return: {dict} keyword arguments of save_label_volume except type_id_type_name_dict
+    """
+    import vtk
+    from vtk.util.numpy_support import vtk_to_numpy
+
+    dim_x, dim_y, dim_z = (dim.x, dim.y, dim.z) if hasattr(dim, 'x') else tuple(dim)
+
+    # compressed VTK XML (*.vti) or legacy VTK snapshot
+    if str(vtk_file_name).endswith('.vti'):
+        lattice_data_reader = vtk.vtkXMLImageDataReader()
+    else:
+        lattice_data_reader = vtk.vtkStructuredPointsReader()
+    lattice_data_reader.SetFileName(str(vtk_file_name))
+    lattice_data_reader.Update()
+    point_data = lattice_data_reader.GetOutput().GetPointData()
+
+    # vtk arrays are ordered with x changing fastest
+    def read_array(name):
+        return vtk_to_numpy(point_data.GetArray(name)).reshape((dim_z, dim_y, dim_x)).transpose(2, 1, 0)
+
+    if point_data.GetArray('CellType') is None:
+        raise ValueError('{} does not store full cell field. Use keyframe snapshot'.format(vtk_file_name))
+
+    cell_types = read_array('CellType')
+    labels = np.where(cell_types != 0, read_array('CellId'), 0)
+
+    cell_ids, first_idx = np.unique(labels, return_index=True)
+    first_idx = first_idx[cell_ids != 0]
+
+    return {
+        'labels': labels,
+        'cell_ids': cell_ids[cell_ids != 0],
+        'cluster_ids': read_array('ClusterId').ravel()[first_idx],
+        'cell_types': cell_types.ravel()[first_idx]
+    }
+
+
+class LabelVolume:
+    """
+    Label volume read from .npy (labels only) or .npz (labels with per-cell and cell type tables) file
+    """
+
+    def __init__(self, file_name: Union[Path, str]):
+        """
+        :param file_name: {str, Path} .npy or .npz file name
+        """
+
+        self.file_name = str(file_name)
+        #: {numpy.ndarray} cell ids of pixels indexed [x, y, z] - memory-mapped for .npy files
+        self.labels = None
+        #: {dict} {cell id: (cluster id, type id)} - empty if file has no per-cell table
+        self.cell_table = {}
+        #: {dict} {type id: type name} - empty if file has no cell type table
+        self.type_id_type_name_dict = {}
+
+        if self.file_name.endswith('.npy'):
+            self.labels = np.load(self.file_name, mmap_mode='r')
+        else:
+            with np.load(self.file_name) as npz_file:
+                self.labels = npz_file['labels']
+
+                if 'cell_id' in npz_file.files:
+                    cell_types = npz_file['cell_type'] if 'cell_type' in npz_file.files else None
+                    for row, (cell_id, cluster_id) in enumerate(zip(npz_file['cell_id'].tolist(),
+                                                                    npz_file['cluster_id'].tolist())):
+                        self.cell_table[cell_id] = (cluster_id, None if cell_types is None else int(cell_types[row]))
+
+                if 'type_id' in npz_file.files:
+                    self.type_id_type_name_dict = dict(zip(npz_file['type_id'].tolist(),
+                                                           npz_file['type_name'].tolist()))
+
+        if self.labels.ndim == 2:
+            self.labels = self.labels[:, :, np.newaxis]
+
+        if self.labels.ndim != 3:
+            raise ValueError('Label volume {} must be 2D or 3D array'.format(self.file_name))
+
+    def chunks(self, chunk_size: int = 16):
+        """
+        Iterates over z-slabs of label volume. Only one slab is held in memory for memory-mapped volumes
+
+        :param chunk_size: {int} number of z-slices in a slab
+        :return: z-coordinate of the first slice and slab
+        :rtype: (int, numpy.ndarray)
+        """
+        for z in range(0, self.labels.shape[2], chunk_size):
+            yield z, np.asarray(self.labels[:, :, z:z + chunk_size])
@@ -0,0 +1,126 @@
+"""
+Contact network of all cells exported from NeighborTracker plugin in a single call. Network is stored
+in compressed sparse row (CSR) layout - neighbors of i-th cell occupy [offsets[i], offsets[i + 1]) range
+of neighbor arrays
+"""
+import numpy as np
+
+
+class NeighborGraph:
+    """
+    Contact network of all cells. Rows follow cell inventory order (ascending cell id). Medium has id 0 and type 0
+    """
+
+    def __init__(self, cell_ids, cell_types, offsets, neighbor_ids, neighbor_types, common_surface_areas):
+        """
+        :param numpy.ndarray cell_ids: ids of cells
+        :param numpy.ndarray cell_types: types of cells
+        :param numpy.ndarray offsets: offsets of neighbor ranges of cells - has one element more than cell_ids
+        :param numpy.ndarray neighbor_ids: ids of neighbors
+        :param numpy.ndarray neighbor_types: types of neighbors
+        :param numpy.ndarray common_surface_areas: common surface areas of cells and their neighbors
+        """
+        self.cell_ids = cell_ids
+        self.cell_types = cell_types
+        self.offsets = offsets
+        self.neighbor_ids = neighbor_ids
+        self.neighbor_types = neighbor_types
+        self.common_surface_areas = common_surface_areas
+
+    def __len__(self):
+        """
+
+        :return: number of (cell, neighbor) pairs
+        :rtype: int
+        """
+        return len(self.neighbor_ids)
+
+    @property
+    def row_ids(self) -> np.ndarray:
+        """
+        Ids of cells of all (cell, neighbor) pairs - together with neighbor_ids and common_surface_areas it forms
+        coordinate (COO) representation of the network
+
+        :return: cell ids
+        :rtype: numpy.ndarray
+        """
+        return np.repeat(self.cell_ids, np.diff(self.offsets))
+
+    @property
+    def row_types(self) -> np.ndarray:
+        """
+        Types of cells of all (cell, neighbor) pairs
+
+        :return: cell types
+        :rtype: numpy.ndarray
+        """
+        return np.repeat(self.cell_types, np.diff(self.offsets))
+
+    @property
+    def neighbor_rows(self) -> np.ndarray:
+        """
+        Row indices of neighbors i.e. CSR column indices. Medium is assigned -1
+
+        :return: neighbor row indices
+        :rtype: numpy.ndarray
+        """
+        rows = np.searchsorted(self.cell_ids, self.neighbor_ids)
+        rows[self.neighbor_ids == 0] = -1
+
+        return rows
+
+    def neighbors(self, row: int) -> tuple:
+        """
+        Returns neighbors of a cell in a given row
+
+        :param int row: row index
+        :return: neighbor ids and common surface areas
+        :rtype: (numpy.ndarray, numpy.ndarray)
+        """
+        begin, end = self.offsets[row], self.offsets[row + 1]
+
+        return self.neighbor_ids[begin:end], self.common_surface_areas[begin:end]
+
+    def _by_type(self, weights, num_types) -> np.ndarray:
+        if num_types is None:
+            num_types = int(max(self.cell_types.max(initial=0), self.neighbor_types.max(initial=0))) + 1
+
+        matrix = np.zeros((num_types, num_types), dtype=weights.dtype)
+        np.add.at(matrix, (self.row_types, self.neighbor_types), weights)
+
+        return matrix
+
+    def common_surface_area_by_type(self, num_types: int = None) -> np.ndarray:
+        """
+        Returns matrix whose [i, j] element is total common surface area of cells of type i with neighbors of type j
+
+        :param int num_types: number of cell types including medium, defaults to largest type present + 1
+        :return: matrix of common surface areas
+        :rtype: numpy.ndarray
+        """
+        return self._by_type(self.common_surface_areas, num_types)
+
+    def neighbor_count_by_type(self, num_types: int = None) -> np.ndarray:
+        """
+        Returns matrix whose [i, j] element is number of (cell, neighbor) pairs of cells of type i with neighbors
+        of type j
+
+        :param int num_types: number of cell types including medium, defaults to largest type present + 1
+        :return: matrix of neighbor counts
+        :rtype: numpy.ndarray
+        """
+        return self._by_type(np.ones(len(self), dtype=np.int64), num_types)
+
+
+def neighbor_graph(neighbor_tracker_plugin, inventory, include_medium: bool = True) -> NeighborGraph:
+    """
+    Exports contact network of all cells
+
+    :param neighbor_tracker_plugin: NeighborTracker plugin
+    :param inventory: cell inventory
+    :type inventory: cc3d.cpp.CompuCell.CellInventory
+    :param bool include_medium: flag indicating whether contacts with medium are included
+    :return: contact network
+    :rtype: NeighborGraph
+    """
+    return NeighborGraph(*neighbor_tracker_plugin.getNeighborGraph(inventory, include_medium))
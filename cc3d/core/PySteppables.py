@@ -7,6 +7,10 @@ from collections import OrderedDict
 from cc3d.core.iterators import *
 from cc3d.core.enums import *
 from cc3d.core.ExtraFieldAdapter import ExtraFieldAdapter
+from cc3d.core.CellTable import cell_table, set_cell_attributes
+from cc3d.core.NeighborGraph import NeighborGraph, neighbor_graph
+from cc3d.core.LabelVolume import LabelVolume, save_label_volume
+from cc3d.core.BufferedCallbacks import BufferedCallback, register_buffered_callback
 # from cc3d.CompuCellSetup.simulation_utils import stop_simulation
 from cc3d.CompuCellSetup.simulation_utils import extract_type_names_and_ids
 from cc3d import CompuCellSetup
@@ -159,6 +163,59 @@ class CellTypeFetcher:
         return self.type_name_type_id_dict
 
 
+class FieldArrayFetcher:
+    """
+    PDE solver fields and voxel-based fields created in Python are accessible as NumPy arrays by name. Arrays share
+    memory with the field storage and are indexed the same way as fields i.e. array[x, y, z]. Ghost (boundary)
+    layers used by solvers are not part of the array
+
+    Usage in Python can be performed as follows,
+
+    .. code-block:: python
+
+        self.field.numpy.ATTR[:, :, 0] += 0.1
+        total = self.field.numpy_read_only.ATTR.sum()
+
+    Solvers swap their arrays during integration and reallocate them when lattice is resized - fetch the array
+    every time it is used instead of storing it between MCS
+    """
+
+    def __init__(self, writable=True):
+        """
+        :param bool writable: flag indicating whether returned arrays can be modified
+        """
+        self.writable = writable
+
+    def __getattr__(self, item):
+        pg = CompuCellSetup.persistent_globals
+        field_registry = pg.field_registry
+
+        try:
+            field_adapter = field_registry.get_field_adapter(field_name=item)
+        except KeyError:
+            field_adapter = None
+
+        if field_adapter is not None:
+            field_ref = field_adapter.get_ref()
+            if not isinstance(field_ref, np.ndarray):
+                raise TypeError('Field {} is not stored in NumPy array'.format(item))
+
+            array = field_ref.view()
+            array.flags.writeable = self.writable
+            return array
+
+        field = CompuCell.getConcentrationField(pg.simulator, item)
+        if field is None:
+            raise KeyError(' The requested field {} does not exist'.format(item))
+
+        array = field.getNumpyArray(self.writable)
+        if array is None:
+            raise TypeError('Solver of field {} does not store it in a single array. '
+                            'Use field[x, y, z] access instead'.format(item))
+
+        return array
+
+
 class FieldFetcher:
     """
     PDE solver fields are accessible as attributes by name
@@ -178,10 +235,20 @@ class FieldFetcher:
         field_fetcher: FieldFetcher
         my_field = field_fetcher.ATTR
 
+    The same fields are available as NumPy arrays sharing memory with the solver (see :class:`FieldArrayFetcher`),
+
+    .. code-block:: python
+
+        my_array = field_fetcher.numpy.ATTR
+        my_read_only_array = field_fetcher.numpy_read_only.ATTR
+
     """
 
     def __init__(self):
-        pass
+        #: writable NumPy views of the fields (:class:`FieldArrayFetcher`)
+        self.numpy = FieldArrayFetcher(writable=True)
+        #: read-only NumPy views of the fields (:class:`FieldArrayFetcher`)
+        self.numpy_read_only = FieldArrayFetcher(writable=False)
 
     def __getattr__(self, item):
         pg = CompuCellSetup.persistent_globals
@@ -578,6 +645,8 @@ class SteppableBasePy(SteppablePy, SBMLSolverHelper, MaBoSSHelper):
 
         self.cell_field = self.potts.getCellFieldG()
         self.cellField = self.cell_field
+        # used in bulk assignment functions in SWIG CELLFIELD3DNUMPYEXTENDER macro CompuCell.i
+        self.cell_field.cellInventory = self.inventory
         self.cell_list = CellList(self.inventory)
         self.cellList = self.cell_list
         self.cellListByType = self.cell_list_by_type
@@ -987,6 +1056,129 @@ class SteppableBasePy(SteppablePy, SBMLSolverHelper, MaBoSSHelper):
         """
         return self.potts.getMinCoordinates(), self.potts.getMaxCoordinates()
 
+    def fill_cell_lattice_arrays(self, type_array: Optional[np.ndarray] = None, id_array: Optional[np.ndarray] = None,
+                                 cluster_id_array: Optional[np.ndarray] = None, origin=(0, 0, 0)) -> None:
+        """
+        Fills preallocated arrays with cell type, cell id and cluster id of every pixel of the lattice box that
+        starts at origin and has the shape of the arrays. All arrays are filled in a single pass over the lattice.
+        Medium pixels are set to 0. 2D arrays are treated as xy slices at z=origin[2]
+
+        :param numpy.ndarray type_array: C-contiguous int32 or int64 array for cell types or None
+        :param numpy.ndarray id_array: C-contiguous int32 or int64 array for cell ids or None
+        :param numpy.ndarray cluster_id_array: C-contiguous int32 or int64 array for cluster ids or None
+        :param origin: x-, y-, z-coordinate of the box corner, defaults to (0, 0, 0)
+        :return: None
+        """
+
+        arrays = [array[:, :, np.newaxis] if array is not None and array.ndim == 2 else array
+                  for array in (type_array, id_array, cluster_id_array)]
+
+        self.cell_field.fillCellArrays(*arrays, int(origin[0]), int(origin[1]), int(origin[2]))
+
+    def get_cell_lattice_arrays(self, origin=(0, 0, 0), shape=None, dtype=np.int32) -> tuple:
+        """
+        Returns cell type, cell id and cluster id arrays of the lattice box that starts at origin. Arrays are
+        indexed [x, y, z] relative to origin. See fill_cell_lattice_arrays to reuse preallocated arrays
+
+        :param origin: x-, y-, z-coordinate of the box corner, defaults to (0, 0, 0)
+        :param shape: box dimensions, defaults to the remainder of the lattice
+        :param dtype: numpy.int32 or numpy.int64, defaults to numpy.int32
+        :return: cell type, cell id and cluster id arrays
+        :rtype: (numpy.ndarray, numpy.ndarray, numpy.ndarray)
+        """
+
+        if shape is None:
+            shape = (self.dim.x - origin[0], self.dim.y - origin[1], self.dim.z - origin[2])
+
+        type_array, id_array, cluster_id_array = [np.empty(shape, dtype=dtype) for _ in range(3)]
+        self.fill_cell_lattice_arrays(type_array=type_array, id_array=id_array, cluster_id_array=cluster_id_array,
+                                      origin=origin)
+
+        return type_array, id_array, cluster_id_array
+
+    def cell_table(self, *attributes) -> OrderedDict:
+        """
+        Returns core attributes of all cells as numpy columns copied in a single pass over cell inventory.
+        Row i of every column describes the same cell, id column is always included, e.g.
+
+        .. code-block:: python
+
+            table = self.cell_table('volume', 'targetVolume')
+            self.set_cell_attributes(table['id'], 'targetVolume', 1.1 * table['volume'])
+
+        :param attributes: names of core cell attributes, defaults to commonly used attributes
+        :return: {attribute name: numpy array}
+        :rtype: OrderedDict
+        """
+        return cell_table(self.inventory, *attributes)
+
+    def set_cell_attributes(self, ids, attribute: str, values) -> None:
+        """
+        Sets core attribute of cells with given ids in a single call. Attributes maintained by trackers
+        (volume, surface, center of mass etc.) are read-only
+
+        :param ids: cell ids
+        :param str attribute: name of core cell attribute
+        :param values: new values - either one value per cell id or a single value for all cells
+        :return: None
+        """
+        set_cell_attributes(self.inventory, ids, attribute, values)
+
+    def add_expression_energy(self, name: str, expression: str, **parameters) -> CompuCell.ExpressionEnergyFunction:
+        """
+        Adds energy term defined by muParser expression. Unlike energy functions implemented in Python,
+        expression is evaluated in C++ by all Potts threads and does not acquire GIL. Expression can use
+        pixel coordinates (x, y, z), attributes of new and old cell - e.g. new_volume, old_targetVolume,
+        new_medium (1 for medium, 0 otherwise) - and parameters, e.g.
+
+        .. code-block:: python
+
+            expression = 'lam * (1 - new_medium) * (2 * (new_volume - new_targetVolume) + 1)' \\
+                         ' + lam * (1 - old_medium) * (1 - 2 * (old_volume - old_targetVolume))'
+            energy_function = self.add_expression_energy('VolumePenalty', expression, lam=2.0)
+            energy_function.setParameter('lam', 4.0)
+
+        :param str name: energy term name - has to be unique
+        :param str expression: muParser expression returning energy change of a pixel copy
+        :param parameters: parameter values. Values can be changed later by calling setParameter
+            of returned energy function
+        :return: energy function
+        :rtype: cc3d.cpp.CompuCell.ExpressionEnergyFunction
+        :raises RuntimeError: energy function with the same name already exists
+        """
+
+        energy_functions = CompuCellSetup.persistent_globals.persistent_holder.setdefault('expression_energy', {})
+        if name in energy_functions:
+            raise RuntimeError(f'Expression energy {name} has already been added. Please use different name or '
+                               f'change the existing energy function, e.g. using its setExpression or setParameter')
+        if name in self.potts.getEnergyFunctionNames():
+            raise RuntimeError(f'Energy function named {name} is already registered with Potts. '
+                               f'Please use different name for the expression energy')
+
+        energy_function = CompuCell.ExpressionEnergyFunction()
+        energy_function.init(self.simulator)
+        for parameter_name, value in parameters.items():
+            energy_function.setParameter(parameter_name, float(value))
+        energy_function.setExpression(expression)
+
+        # energy function has to outlive the steppable that created it
+        energy_functions[name] = energy_function
+        self.potts.registerEnergyFunctionWithName(energy_function, name)
+
+        return energy_function
+
+    def register_buffered_callback(self, callback: BufferedCallback) -> BufferedCallback:
+        """
+        Registers batched callback - see :mod:`cc3d.core.BufferedCallbacks`. Events are buffered in C++ during
+        Metropolis sweep without acquiring GIL and delivered as numpy arrays once per MCS, before steppables run
+
+        :param BufferedCallback callback: instance of BufferedCellChangeWatcher, BufferedTypeChangeWatcher or
+            BufferedStepper subclass
+        :return: callback
+        :rtype: BufferedCallback
+        """
+        return register_buffered_callback(callback, self.simulator)
+
     def process_steering_panel_data(self):
         """
         Function to be implemented in steppable where we react to changes in the steering panel
@@ -1327,6 +1519,21 @@ class SteppableBasePy(SteppablePy, SBMLSolverHelper, MaBoSSHelper):
 
         return CellNeighborListFlex(self.neighbor_tracker_plugin, cell)
 
+    def neighbor_graph(self, include_medium: bool = True) -> NeighborGraph:
+        """
+        Returns contact network of all cells exported in a single call. See
+        :class:`cc3d.core.NeighborGraph.NeighborGraph` for details
+
+        :param bool include_medium: flag indicating whether contacts with medium are included, defaults to True
+        :raises AttributeError: NeighborTrackerPlugin not loaded
+        :return: contact network
+        :rtype: NeighborGraph
+        """
+        if not self.neighbor_tracker_plugin:
+            raise AttributeError('Could not find NeighborTrackerPlugin')
+
+        return neighbor_graph(self.neighbor_tracker_plugin, self.inventory, include_medium=include_medium)
+
     @deprecated(version='4.0.0', reason="You should use : fetch_cell_by_id")
     def attemptFetchingCellById(self, _id):
         return self.fetch_cell_by_id(cell_id=_id)
@@ -1852,53 +2059,17 @@ class SteppableBasePy(SteppablePy, SBMLSolverHelper, MaBoSSHelper):
             cell = self.potts.createCell()
             cell.type = cell_type
 
-        index_of1 = -1
-        dim_local = [self.dim.x, self.dim.y, self.dim.z]
-
-        for idx in range(len(dim_local)):
-
-            if dim_local[idx] == 1:
-                index_of1 = idx
-                break
-
-        # this could be recoded in a more general way
-        # 2D case
-        if index_of1 >= 0:
-
-            if index_of1 == 2:
-                # xy plane simulation
-                self.cell_field[0:self.dim.x, 0, 0] = cell
-                self.cell_field[0:self.dim.x, self.dim.y - 1:self.dim.y, 0] = cell
-                self.cell_field[0, 0:self.dim.y, 0] = cell
-                self.cell_field[self.dim.x - 1:self.dim.x, 0:self.dim.y, 0] = cell
-
-            elif index_of1 == 0:
-                # yz simulation
-                self.cell_field[0, 0:self.dim.y, 0] = cell
-                self.cell_field[0, 0:self.dim.y, self.dim.z - 1:self.dim.z] = cell
-                self.cell_field[0, 0, 0:self.dim.z] = cell
-                self.cell_field[0, self.dim.y - 1:self.dim.y, 0:self.dim.z] = cell
-
-            elif index_of1 == 1:
-                # xz simulation
-                self.cell_field[0:self.dim.x, 0, 0] = cell
-                self.cell_field[0:self.dim.x, 0, self.dim.z - 1:self.dim.z] = cell
-                self.cell_field[0, 0, 0:self.dim.z] = cell
-                self.cell_field[self.dim.x - 1:self.dim.x, 0, 0:self.dim.z] = cell
-        else:
-            # 3D case
-            # wall 1 (front)
-            self.cell_field[0:self.dim.x, 0:self.dim.y, 0] = cell
-            # wall 2 (rear)
-            self.cell_field[0:self.dim.x, 0:self.dim.y, self.dim.z - 1] = cell
-            # wall 3 (bottom)
-            self.cell_field[0:self.dim.x, 0, 0:self.dim.z] = cell
-            # wall 4 (top)
-            self.cell_field[0:self.dim.x, self.dim.y - 1, 0:self.dim.z] = cell
-            # wall 5 (left)
-            self.cell_field[0, 0:self.dim.y, 0:self.dim.z] = cell
-            # wall 6 (right)
-            self.cell_field[self.dim.x - 1, 0:self.dim.y, 0:self.dim.z] = cell
+        dim_local = (self.dim.x, self.dim.y, self.dim.z)
+        wall_mask = np.zeros(dim_local, dtype=bool)
+
+        # walls are built only along axes whose dimension is greater than 1 (e.g. 4 walls in xy simulation)
+        for axis, dim_size in enumerate(dim_local):
+            if dim_size > 1:
+                wall_index = [slice(None)] * 3
+                wall_index[axis] = [0, dim_size - 1]
+                wall_mask[tuple(wall_index)] = True
+
+        self.cell_field.assign(np.argwhere(wall_mask), cell)
 
     @deprecated(version='4.0.0', reason="You should use : destroy_wall")
     def destroyWall(self):
@@ -2263,6 +2434,55 @@ class SteppableBasePy(SteppablePy, SBMLSolverHelper, MaBoSSHelper):
         cell.type = cell_type
         return cell
 
+    def initialize_from_label_volume(self, labels, cell_types, origin=(0, 0, 0)) -> dict:
+        """
+        Creates one cell for every non-zero label of a segmented label volume (e.g. labeled image) and assigns
+        labeled pixels to those cells in a single call. Pixels labeled 0 are left unchanged
+
+        :param numpy.ndarray labels: 3D (or 2D for xy slice) integer array indexed [x, y, z]
+        :param cell_types: cell type of all cells, dictionary {label: cell type} or array indexed by label
+        :param origin: x-, y-, z-coordinate at which labels[0, 0, 0] is placed, defaults to (0, 0, 0)
+        :return: {label: cell}
+        :rtype: dict
+        """
+        labels = np.asarray(labels)
+        if labels.ndim == 2:
+            labels = labels[:, :, np.newaxis]
+
+        unique_labels = np.unique(labels)
+        unique_labels = unique_labels[unique_labels != 0]
+
+        label_cells = {}
+        for label in unique_labels.tolist():
+            if np.isscalar(cell_types):
+                cell_type = cell_types
+            else:
+                cell_type = cell_types[label]
+            label_cells[label] = self.new_cell(int(cell_type))
+
+        # labels are translated to ids of the new cells
+        ids = np.zeros(unique_labels.size + 1, dtype=np.int64)
+        ids[1:] = [label_cells[label].id for label in unique_labels.tolist()]
+        label_ids = ids[np.searchsorted(unique_labels, labels) + 1] * (labels != 0)
+
+        self.cell_field.assign(label_ids, origin=origin)
+
+        return label_cells
+
+    def save_label_volume(self, file_name: Union[Path, str]) -> None:
+        """
+        Writes current cell lattice as compressed label volume - binary counterpart of PIFF that can be loaded
+        by :class:`LabelVolumeInitializer`
+
+        :param file_name: output file name (.npz)
+        :return: None
+        """
+        _, labels, _ = self.get_cell_lattice_arrays(dtype=np.int64)
+        table = self.cell_table('clusterId', 'type')
+
+        save_label_volume(file_name, labels, cell_ids=table['id'], cluster_ids=table['clusterId'],
+                          cell_types=table['type'], type_id_type_name_dict=extract_type_names_and_ids())
+
     @deprecated(version='4.0.0', reason="You should use : get_pixel_neighbors_based_on_neighbor_order")
     def getPixelNeighborsBasedOnNeighborOrder(self, _pixel, _neighborOrder=1):
         return self.get_pixel_neighbors_based_on_neighbor_order(pixel=_pixel, neighbor_order=_neighborOrder)
@@ -2322,6 +2542,66 @@ class SteppableBasePy(SteppablePy, SBMLSolverHelper, MaBoSSHelper):
 
         return None
 
+    def get_pixel_arrays(self, cells) -> Optional[tuple]:
+        """
+        Returns pixels of several cells fetched in a single call. Pixels of i-th cell are
+        pixels[offsets[i]:offsets[i + 1]]
+
+        :param cells: cells
+        :type cells: iterable of cc3d.cpp.CompuCell.CellG
+        :return: (N x 3) int32 array of pixels and offsets if PixelTracker is loaded, otherwise None
+        :rtype: (numpy.ndarray, numpy.ndarray) or None
+        """
+        if not self.pixelTrackerPlugin:
+            return None
+
+        return self.pixelTrackerPlugin.getPixelArrays(list(cells))
+
+    def get_cell_pixel_array(self, cell) -> Optional[np.ndarray]:
+        """
+        Returns pixels of a cell fetched in a single call
+
+        :param cc3d.cpp.CompuCell.CellG cell: a cell
+        :return: (N x 3) int32 array of pixels if PixelTracker is loaded, otherwise None
+        :rtype: numpy.ndarray or None
+        """
+        pixel_arrays = self.get_pixel_arrays([cell])
+        if pixel_arrays is None:
+            return None
+
+        return pixel_arrays[0]
+
+    def get_boundary_pixel_arrays(self, cells, neighbor_order=-1) -> Optional[tuple]:
+        """
+        Returns boundary pixels of several cells fetched in a single call. Boundary pixels of i-th cell are
+        pixels[offsets[i]:offsets[i + 1]]
+
+        :param cells: cells
+        :type cells: iterable of cc3d.cpp.CompuCell.CellG
+        :param int neighbor_order: neighbor order, optional
+        :return: (N x 3) int32 array of pixels and offsets if BoundaryPixelTracker is loaded, otherwise None
+        :rtype: (numpy.ndarray, numpy.ndarray) or None
+        """
+        if not self.boundaryPixelTrackerPlugin:
+            return None
+
+        return self.boundaryPixelTrackerPlugin.getBoundaryPixelArrays(list(cells), neighbor_order)
+
+    def get_cell_boundary_pixel_array(self, cell, neighbor_order=-1) -> Optional[np.ndarray]:
+        """
+        Returns boundary pixels of a cell fetched in a single call
+
+        :param cc3d.cpp.CompuCell.CellG cell: a cell
+        :param int neighbor_order: neighbor order, optional
+        :return: (N x 3) int32 array of pixels if BoundaryPixelTracker is loaded, otherwise None
+        :rtype: numpy.ndarray or None
+        """
+        pixel_arrays = self.get_boundary_pixel_arrays([cell], neighbor_order)
+        if pixel_arrays is None:
+            return None
+
+        return pixel_arrays[0]
+
     @deprecated(version='4.0.0', reason="You should use : move_cell")
     def moveCell(self, cell, shiftVector):
         return self.move_cell(cell=cell, shift_vector=shiftVector)
@@ -2356,39 +2636,23 @@ class SteppableBasePy(SteppablePy, SBMLSolverHelper, MaBoSSHelper):
         else:
             shift_vec = shift_vector
 
-        # If we try to reassign pixels in the loop where we iterate over pixel data
-        # we will corrupt the container so in the loop below all we will do is to populate the two list mentioned above
-        pixel_list = self.get_cell_pixel_list(cell)
-        if pixel_list is None:
+        pixels = self.get_cell_pixel_array(cell)
+        if pixels is None:
             raise AttributeError('Could not find PixelTracker Plugin')
-        pt = CompuCell.Point3D()
 
-        # we have to make two sets (for faster lookup) of pixels :
-        # set used to hold pixels to delete
-        pixels_to_delete_set = set()
-        # set used to hold pixels to move
-        pixels_to_move_set = set()
-        for pixel_tracker_data in pixel_list:
-            pt.x = pixel_tracker_data.pixel.x + shift_vec.x
-            pt.y = pixel_tracker_data.pixel.y + shift_vec.y
-            pt.z = pixel_tracker_data.pixel.z + shift_vec.z
-            # here we are making a copy of the cell
-            pixels_to_delete_set.add(self.point3d_to_tuple(pixel_tracker_data.pixel))
-
-            if self.check_if_in_the_lattice(pt):
-                pixels_to_move_set.add(self.point3d_to_tuple(pt))
-
-        # Now we will move cell
-        for pt_tuple in pixels_to_move_set:
-            self.cell_field[pt_tuple] = cell
-
-        # Now we will delete old pixels
-        medium_cell = CompuCell.getMediumCell()
-        for pixel_tuple in pixels_to_delete_set:
-            # Safe deletion. Don't delete the old pixel
-            # if it is part of the new pixel set
-            if pixel_tuple not in pixels_to_move_set:
-                self.cell_field[pixel_tuple] = medium_cell
+        dim = np.array([self.dim.x, self.dim.y, self.dim.z])
+        shifted_pixels = pixels + np.array([shift_vec.x, shift_vec.y, shift_vec.z], dtype=pixels.dtype)
+        shifted_pixels = shifted_pixels[np.all((shifted_pixels >= 0) & (shifted_pixels < dim), axis=1)]
+
+        # old pixels that are not part of the moved cell are deleted - pixels are compared using lattice indices
+        def lattice_index(pts):
+            return pts[:, 0] + (pts[:, 1] + pts[:, 2].astype(np.int64) * dim[1]) * dim[0]
+
+        pixels_to_delete = pixels[~np.isin(lattice_index(pixels), lattice_index(shifted_pixels))]
+
+        # cell gets new pixels first so that it is not removed by VolumeTracker when old pixels are deleted
+        self.cell_field.set_pixels(shifted_pixels, cell)
+        self.cell_field.set_pixels(pixels_to_delete, CompuCell.getMediumCell())
 
     @deprecated(version='4.0.0', reason="You should use : check_if_in_the_lattice")
     def checkIfInTheLattice(self, _pt):
@@ -2426,8 +2690,7 @@ class SteppableBasePy(SteppablePy, SBMLSolverHelper, MaBoSSHelper):
                 return [CompuCell.Point3D(pixelTrackerData.pixel) for pixelTrackerData in
                         self.get_cell_pixel_list(cell)]
             else:
-                return [(pixelTrackerData.pixel.x, pixelTrackerData.pixel.y, pixelTrackerData.pixel.z) for
-                        pixelTrackerData in self.get_cell_pixel_list(cell)]
+                return list(map(tuple, self.get_cell_pixel_array(cell).tolist()))
         except:
             raise AttributeError('Could not find PixelTracker Plugin')
 
@@ -2452,9 +2715,7 @@ class SteppableBasePy(SteppablePy, SBMLSolverHelper, MaBoSSHelper):
                 return [CompuCell.Point3D(boundaryPixelTrackerData.pixel) for boundaryPixelTrackerData in
                         self.getCellBoundaryPixelList(cell)]
             else:
-                return [(boundaryPixelTrackerData.pixel.x, boundaryPixelTrackerData.pixel.y,
-                         boundaryPixelTrackerData.pixel.z) for boundaryPixelTrackerData in
-                        self.getCellBoundaryPixelList(cell)]
+                return list(map(tuple, self.get_cell_boundary_pixel_array(cell).tolist()))
         except:
             raise AttributeError('Could not find BoundaryPixelTracker Plugin')
 
@@ -3210,6 +3471,86 @@ class MitosisSteppableClustersBase(SteppableBasePy):
         return mitosis_done
 
 
+class LabelVolumeInitializer(SteppableBasePy):
+    """
+    Initializes cell lattice from a label volume - integer array indexed [x, y, z] whose values are cell ids.
+    Binary and much faster alternative to PIFInitializer. Supported files (see :mod:`cc3d.core.LabelVolume`):
+
+    .npz - written by SteppableBasePy.save_label_volume or generate_compressed_pif_from_vtk. Includes cluster ids
+    and cell types
+
+    .npy - plain label volume. Cell types have to be passed using cell_types argument. File is memory-mapped and
+    processed in z-slabs
+
+    Cells keep ids stored in the file. Pixels labeled 0 are left unchanged
+    """
+
+    def __init__(self, file_name: Union[Path, str], cell_types=None, origin=(0, 0, 0), chunk_size: int = 16,
+                 frequency=1):
+        """
+        :param file_name: label volume file (.npy or .npz)
+        :param cell_types: cell type (name or id) of all cells or dictionary {cell id: cell type}. Used for cells
+            whose type is not stored in the file
+        :param origin: x-, y-, z-coordinate at which labels[0, 0, 0] is placed, defaults to (0, 0, 0)
+        :param int chunk_size: number of z-slices assigned in a single call, defaults to 16
+        :param int frequency: steppable frequency
+        """
+        SteppableBasePy.__init__(self, frequency)
+        self.file_name = file_name
+        self.cell_types = cell_types
+        self.origin = origin
+        self.chunk_size = chunk_size
+        self.type_name_type_id_dict = {}
+
+    def resolve_cell_type(self, cell_id: int, label_volume: LabelVolume) -> int:
+        """
+        Returns type id of a cell read from label volume
+
+        :param int cell_id: cell id
+        :param LabelVolume label_volume: label volume
+        :return: type id
+        :rtype: int
+        """
+
+        _, cell_type = label_volume.cell_table.get(cell_id, (None, None))
+        if cell_type is not None:
+            # type ids of the file are translated using type names
+            cell_type = label_volume.type_id_type_name_dict.get(cell_type, cell_type)
+        elif isinstance(self.cell_types, dict):
+            cell_type = self.cell_types[cell_id]
+        elif self.cell_types is not None:
+            cell_type = self.cell_types
+        else:
+            raise KeyError('Could not determine type of cell {} read from {}. '
+                           'Use cell_types argument'.format(cell_id, self.file_name))
+
+        if isinstance(cell_type, str):
+            return self.type_name_type_id_dict[cell_type]
+
+        return int(cell_type)
+
+    def start(self):
+        label_volume = LabelVolume(self.file_name)
+        self.type_name_type_id_dict = {type_name: type_id
+                                       for type_id, type_name in extract_type_names_and_ids().items()}
+
+        created_cell_ids = set()
+        for z, chunk in label_volume.chunks(self.chunk_size):
+            for cell_id in np.unique(chunk).tolist():
+                if cell_id == 0 or cell_id in created_cell_ids:
+                    continue
+
+                created_cell_ids.add(cell_id)
+                if self.fetch_cell_by_id(cell_id) is not None:
+                    continue
+
+                cluster_id, _ = label_volume.cell_table.get(cell_id, (-1, None))
+                cell = self.potts.createCellSpecifiedIds(cell_id, cluster_id)
+                cell.type = self.resolve_cell_type(cell_id, label_volume)
+
+            self.cell_field.assign(chunk, origin=(self.origin[0], self.origin[1], self.origin[2] + z))
+
+
 class RunBeforeMCSSteppableBasePy(SteppableBasePy):
     def __init__(self, frequency=1):
         SteppableBasePy.__init__(self, frequency)
@@ -3,9 +3,12 @@ import os
 import pickle
 import json
 from collections import OrderedDict
+from itertools import chain
+import numpy as np
 from cc3d.cpp import CompuCell
 from cc3d.cpp import SerializerDEPy
 from cc3d.core.PySteppables import CellList
+from cc3d.core.CellTable import cell_table, set_cell_attributes
 from cc3d.core.XMLUtils import ElementCC3D
 from cc3d.core import XMLUtils
 import cc3d
@@ -13,6 +16,7 @@ from cc3d import CompuCellSetup
 from .CC3DSimulationDataHandler import CC3DSimulationDataHandler
 from .SteeringParam import SteeringParam
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import shutil
 import copyreg
 
@@ -23,6 +27,19 @@ def pickle_vector3(_vec):
 
 copyreg.pickle(CompuCell.Vector3, pickle_vector3)
 
+# version 2 of the restart files stores per-cell data as typed columns indexed by cell id ('Columnar' resources
+# written as .npz files) and arbitrary per-cell payloads as a single pickled {cell id:payload} dictionary
+# ('PickleBatch' resources). Version 1 restart files ('Pickle' resources with per-cell pickle streams) still load
+RESTART_FORMAT_VERSION = 2
+
+# core CellG attributes stored in CoreCellAttributes resource
+CORE_CELL_ATTRIBUTES = ('targetVolume', 'lambdaVolume', 'targetSurface', 'lambdaSurface', 'targetClusterSurface',
+                        'lambdaClusterSurface', 'type', 'xCOMPrev', 'yCOMPrev', 'zCOMPrev', 'lambdaVecX', 'lambdaVecY',
+                        'lambdaVecZ', 'flag', 'fluctAmpl')
+
+# big-endian numpy types of legacy VTK array types used in lattice and concentration field restart files
+VTK_LEGACY_TYPES = {'char': np.dtype('>i1'), 'long': np.dtype('l').newbyteorder('>'), 'double': np.dtype('>f8')}
+
 
 class RestartManager:
 
@@ -42,11 +59,22 @@ class RestartManager:
         self.output_frequency = 0
         self.__baseSimulationFilesCopied = False
 
+        # when enabled output_restart_files only takes in-memory copy of the simulation state and files are written
+        # by a background thread
+        self.asynchronous_output = False
+        self.__output_executor = None
+        # future of restart files being written in the background
+        self.__pending_output = None
+        # writes of the restart snapshot that is being taken - None if files are written immediately
+        self.__snapshot_writes = None
+
         # variables used during restarting
         self.__restartDirectory = ''
         self.__restart_file = ''
         self.__restartVersion = 0
         self.__restartBuild = 0
+        # restart files written before FormatVersion was introduced use version 1
+        self.__restart_format_version = 1
         self.__restart_step = 0
         self.__restart_resource_dict = {}
 
@@ -90,6 +118,211 @@ class RestartManager:
                          "ObjectType": sd.objectType, "FileName": base_file_name, 'FileFormat': sd.fileFormat}
         root_elem.ElementCC3D('ObjectData', attribute_dict)
 
+    def save_columns(self, file_name, cell_ids, columns):
+        """
+        Writes per-cell data as typed columns into a single .npz file. Row i of every per-cell column
+        holds data of the cell with id cell_ids[i]
+        :param file_name: {str} output file name
+        :param cell_ids: {list} cell ids
+        :param columns: {dict} {column name: sequence or numpy array}
+        :return: None
+        """
+        # copies are taken right away so that asynchronous write stores current state
+        arrays = {name: np.array(values) for name, values in columns.items()}
+        arrays['cell_id'] = np.asarray(cell_ids, dtype=np.int64)
+
+        self.schedule_write(self.write_npz, file_name, arrays)
+
+    def load_columns(self, sd):
+        """
+        Reads columns written by save_columns
+        :param sd: {object that has basic information about serialized module}
+        :return: {dict} {column name: numpy array}
+        """
+        full_path = os.path.abspath(os.path.join(self.__restartDirectory, sd.fileName))
+        with np.load(full_path) as npz_file:
+            return {name: npz_file[name] for name in npz_file.files}
+
+    @staticmethod
+    def ragged_columns(name, sequences, dtype=float):
+        """
+        Encodes per-cell sequences of varying length (e.g. adhesion molecule densities) as two columns -
+        concatenated values (name) and offsets of the sequences (name + '_offsets')
+        :param name: {str} column name
+        :param sequences: {list} per-cell sequences
+        :param dtype: {type} type of sequence elements
+        :return: {dict} {column name: numpy array}
+        """
+        offsets = np.zeros(len(sequences) + 1, dtype=np.int64)
+        np.cumsum([len(seq) for seq in sequences], out=offsets[1:])
+        values = np.fromiter(chain.from_iterable(sequences), dtype=dtype, count=int(offsets[-1]))
+
+        return {name: values, name + '_offsets': offsets}
+
+    @staticmethod
+    def ragged_column_arrays(columns, name):
+        """
+        Returns arrays of column written using ragged_columns in the form expected by bulk setters of plugin data
+        :param columns: {dict} {column name: numpy array}
+        :param name: {str} column name
+        :return: {tuple} float64 values and int64 offsets
+        """
+        return (np.ascontiguousarray(columns[name], dtype=np.float64),
+                np.ascontiguousarray(columns[name + '_offsets'], dtype=np.int64))
+
+    @staticmethod
+    def ragged_column_rows(columns, name, row_length):
+        """
+        Returns column written using ragged_columns whose sequences all have the same length as an array with
+        one row per cell
+        :param columns: {dict} {column name: numpy array}
+        :param name: {str} column name
+        :param row_length: {int} length of every sequence
+        :return: {numpy array}
+        """
+        values, offsets = columns[name], columns[name + '_offsets']
+        if np.any(np.diff(offsets) != row_length) or (len(offsets) and offsets[-1] > len(values)):
+            raise RuntimeError('Restart column {} does not store {} values per cell'.format(name, row_length))
+
+        return values[offsets[:-1, np.newaxis] + np.arange(row_length)]
+
+    @staticmethod
+    def stack_columns(columns, *names):
+        """
+        Stacks per-cell columns into a single float64 array with one row per cell - the form expected by bulk
+        setters of plugin data
+        :param columns: {dict} {column name: numpy array}
+        :param names: {str} column names
+        :return: {numpy array}
+        """
+        return np.ascontiguousarray(np.column_stack([columns[name] for name in names]), dtype=np.float64)
+
+    def save_pickle_batch(self, file_name, payload):
+        """
+        Pickles {cell id: payload} dictionary using a single pickle call
+        :param file_name: {str} output file name
+        :param payload: {dict} {cell id: payload}
+        :return: None
+        """
+        self.schedule_write(self.write_bytes, file_name, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def write_npz(file_name, arrays):
+        """
+        Writes numpy arrays into .npz file
+        :param file_name: {str} output file name
+        :param arrays: {dict} {array name: numpy array}
+        :return: None
+        """
+        with open(file_name, 'wb') as pf:
+            np.savez(pf, **arrays)
+
+    @staticmethod
+    def write_structured_points(file_name, dim, arrays):
+        """
+        Writes arrays defined on the lattice as binary legacy VTK structured points file - the same file
+        that compiled serializer writes and reads
+        :param file_name: {str} output file name
+        :param dim: {tuple} lattice dimensions
+        :param arrays: {list} list of (array name, legacy VTK type, numpy array indexed [x, y, z]) tuples
+        :return: None
+        """
+        num_values = dim[0] * dim[1] * dim[2]
+        header = ['# vtk DataFile Version 3.0', 'vtk output', 'BINARY', 'DATASET STRUCTURED_POINTS',
+                  'DIMENSIONS {} {} {}'.format(*dim), 'SPACING 1 1 1', 'ORIGIN 0 0 0',
+                  'POINT_DATA {}'.format(num_values), 'FIELD FieldData {}'.format(len(arrays))]
+
+        with open(file_name, 'wb') as pf:
+            pf.write(('\n'.join(header) + '\n').encode('ascii'))
+            for name, vtk_type, array in arrays:
+                pf.write('{} 1 {} {}\n'.format(name, num_values, vtk_type).encode('ascii'))
+                # x index changes fastest in VTK files
+                pf.write(np.ravel(array, order='F').astype(VTK_LEGACY_TYPES[vtk_type]).tobytes())
+                pf.write(b'\n')
+
+    @staticmethod
+    def write_bytes(file_name, data):
+        """
+        Writes binary data into a file
+        :param file_name: {str} output file name
+        :param data: {bytes}
+        :return: None
+        """
+        with open(file_name, 'wb') as pf:
+            pf.write(data)
+
+    def snapshot_in_progress(self):
+        """
+        Checks if restart snapshot that is being taken is written in the background
+        :return: {bool}
+        """
+        return self.__snapshot_writes is not None
+
+    def schedule_write(self, write_fcn, *args):
+        """
+        Writes restart file. During asynchronous output the write is deferred to the background thread -
+        args must not reference simulation objects
+        :param write_fcn: {callable} function that writes the file
+        :param args: arguments of write_fcn
+        :return: None
+        """
+        if self.__snapshot_writes is None:
+            write_fcn(*args)
+        else:
+            self.__snapshot_writes.append((write_fcn, args))
+
+    def wait_for_restart_output(self):
+        """
+        Blocks until restart files that are written in the background are complete. Errors raised while
+        writing the files are re-raised here
+        :return: None
+        """
+        if self.__pending_output is not None:
+            pending_output = self.__pending_output
+            self.__pending_output = None
+            pending_output.result()
+
+    def finish_restart_output(self):
+        """
+        Waits for background restart output and stops the background thread. Called at the end of the simulation,
+        including simulations stopped by the user or by an error
+        :return: None
+        """
+        try:
+            self.wait_for_restart_output()
+        finally:
+            if self.__output_executor is not None:
+                self.__output_executor.shutdown(wait=True)
+                self.__output_executor = None
+
+    def load_pickle_batch(self, sd):
+        """
+        Reads {cell id: payload} dictionary written by save_pickle_batch
+        :param sd: {object that has basic information about serialized module}
+        :return: {dict} {cell id: payload}
+        """
+        full_path = os.path.abspath(os.path.join(self.__restartDirectory, sd.fileName))
+        with open(full_path, 'rb') as pf:
+            return pickle.load(pf)
+
+    @staticmethod
+    def get_cell_list():
+        """
+        Returns list of all cells in the simulation
+        :return: {list}
+        """
+        inventory = CompuCellSetup.persistent_globals.simulator.getPotts().getCellInventory()
+        return list(CellList(inventory))
+
+    @staticmethod
+    def get_cells_by_id():
+        """
+        Returns dictionary of all cells in the simulation indexed by cell id
+        :return: {dict} {cell id: cell}
+        """
+        inventory = CompuCellSetup.persistent_globals.simulator.getPotts().getCellInventory()
+        return {cell.id: cell for cell in CellList(inventory)}
+
     @staticmethod
     def get_restart_output_root_path(restart_output_path):
         """
@@ -216,6 +449,8 @@ class RestartManager:
             self.__restartVersion = root_element.getAttribute('Version')
         if root_element.findAttribute('Build'):
             self.__restartVersion = root_element.getAttributeAsInt('Build')
+        if root_element.findAttribute('FormatVersion'):
+            self.__restart_format_version = root_element.getAttributeAsInt('FormatVersion')
 
         step_elem = root_element.getFirstElement('Step')
 
@@ -258,6 +493,7 @@ class RestartManager:
         self.__restart_file = str(restart_file_pth)
         self.__restartDirectory = str(restart_file_pth.parent)
         self.read_restart_file(self.__restart_file)
+        self.check_restart_format_version()
 
         # if re.match(".*\.cc3d$", str(CompuCellSetup.simulationFileName)):
         #
@@ -343,6 +579,26 @@ class RestartManager:
 
         # ---------------------- END OF LOADING RESTART FILES    --------------------
 
+    def check_restart_format_version(self):
+        """
+        Checks if restart files can be loaded. Resources of older format versions are loaded by legacy loaders,
+        resources written by newer versions of CompuCell3D are rejected
+        :return: None
+        """
+        if self.__restart_format_version > RESTART_FORMAT_VERSION:
+            raise RuntimeError('Restart files in {} use format version {}. This version of CompuCell3D reads restart '
+                               'files up to format version {}'.format(self.__restartDirectory,
+                                                                      self.__restart_format_version,
+                                                                      RESTART_FORMAT_VERSION))
+
+        if self.__restart_format_version < 2:
+            columnar_resources = [name for name, sd in self.__restart_resource_dict.items()
+                                  if sd.objectType in ('Columnar', 'PickleBatch')]
+            if columnar_resources:
+                raise RuntimeError('Restart files in {} use format version {} but contain resources of newer '
+                                   'format: {}'.format(self.__restartDirectory, self.__restart_format_version,
+                                                       ', '.join(columnar_resources)))
+
     def load_cell_field(self, ):
         """
         Restores Cell Field
@@ -484,6 +740,21 @@ class RestartManager:
 
         sim = CompuCellSetup.persistent_globals.simulator
 
+        sd = self.__restart_resource_dict.get('CoreCellAttributes')
+        if sd is not None and sd.objectType == 'Columnar':
+            columns = self.load_columns(sd)
+            inventory = sim.getPotts().getCellInventory()
+
+            # rows of cells that do not exist are skipped
+            existing_rows = np.isin(columns['cell_id'], cell_table(inventory, 'id')['id'])
+            cell_ids = columns['cell_id'][existing_rows]
+
+            for attrib_name in CORE_CELL_ATTRIBUTES:
+                if attrib_name not in columns:
+                    continue
+                set_cell_attributes(inventory, cell_ids, attrib_name, columns[attrib_name][existing_rows])
+            return
+
         for resource_name, sd in self.__restart_resource_dict.items():
             if sd.objectName == 'CoreCellAttributes' and sd.objectType == 'Pickle':
 
@@ -572,6 +843,23 @@ class RestartManager:
 
         sim = CompuCellSetup.persistent_globals.simulator
 
+        sd = self.__restart_resource_dict.get('PythonAttributes')
+        if sd is not None and sd.objectType == 'PickleBatch':
+            cells_by_id = self.get_cells_by_id()
+
+            for cell_id, unpickled_attrib in self.load_pickle_batch(sd).items():
+                cell = cells_by_id.get(cell_id)
+                if cell is None or not CompuCell.isPyAttribValid(cell):
+                    continue
+
+                # adds unpickled objects to existing attribute container -  note: deep copy will not work here
+                attrib = CompuCell.getPyAttrib(cell)
+                if isinstance(attrib, list):
+                    attrib.extend(unpickled_attrib)
+                else:
+                    attrib.update(unpickled_attrib)
+            return
+
         for resource_name, sd in self.__restart_resource_dict.items():
             if sd.objectName == 'PythonAttributes' and sd.objectType == 'Pickle':
 
@@ -662,6 +950,15 @@ class RestartManager:
                 # ( relative path stored in sbml_solver.path and root dir is passed using self.sim.getBasePath())
                 sbml_solver.loadSBML(_externalPath=sim.getBasePath())
 
+                if sbml_solver.batchState is None:
+                    CompuCellSetup.persistent_globals.unbatched_cell_sbml = True
+                else:
+                    # models pickled as members of a batch are moved back to their batch. Batches exist only
+                    # when roadrunner is available
+                    from cc3d.core.SBMLBatch import restore_batched_cell_model
+                    sbml_dict[model_name] = restore_batched_cell_model(
+                        batches=CompuCellSetup.persistent_globals.sbml_batches, rr=sbml_solver, cell_id=cell.id)
+
     def load_adhesion_flex(self):
         """
         restores AdhesionFlex Plugin
@@ -675,6 +972,20 @@ class RestartManager:
 
         adhesion_flex_plugin = CompuCell.getAdhesionFlexPlugin()
 
+        sd = self.__restart_resource_dict.get('AdhesionFlex')
+        if sd is not None and sd.objectType == 'Columnar':
+            columns = self.load_columns(sd)
+
+            adhesion_flex_plugin.assignNewMediumAdhesionMoleculeDensityVector(
+                columns['mediumAdhesionMoleculeDensity'].tolist())
+
+            adhesion_flex_plugin.assignAdhesionMoleculeDensityColumns(
+                sim.getPotts().getCellInventory(), columns['cell_id'],
+                *self.ragged_column_arrays(columns, 'adhesionMoleculeDensity'))
+
+            adhesion_flex_plugin.overrideInitialization()
+            return
+
         for resource_name, sd in self.__restart_resource_dict.items():
             if sd.objectName == 'AdhesionFlex' and sd.objectType == 'Pickle':
 
@@ -716,6 +1027,24 @@ class RestartManager:
             return
         chemotaxis_plugin = CompuCell.getChemotaxisPlugin()
 
+        sd = self.__restart_resource_dict.get('Chemotaxis')
+        if sd is not None and sd.objectType == 'PickleBatch':
+            cells_by_id = self.get_cells_by_id()
+
+            for cell_id, chd_list in self.load_pickle_batch(sd).items():
+                cell = cells_by_id.get(cell_id)
+                if cell is None:
+                    continue
+
+                for chd_dict in chd_list:
+                    # creating chemotaxis data for cell
+                    chd = chemotaxis_plugin.addChemotaxisData(cell, chd_dict['fieldName'])
+                    chd.setLambda(chd_dict['lambda'])
+                    chd.saturationCoef = chd_dict['saturationCoef']
+                    chd.setChemotaxisFormulaByName(chd_dict['formulaName'])
+                    chd.assignChemotactTowardsVectorTypes(chd_dict['chemotactTowardsTypesVec'])
+            return
+
         for resource_name, sd in self.__restart_resource_dict.items():
             if sd.objectName == 'Chemotaxis' and sd.objectType == 'Pickle':
 
@@ -761,6 +1090,14 @@ class RestartManager:
 
         length_constraint_plugin = CompuCell.getLengthConstraintPlugin()
 
+        sd = self.__restart_resource_dict.get('LengthConstraint')
+        if sd is not None and sd.objectType == 'Columnar':
+            columns = self.load_columns(sd)
+            length_constraint_plugin.setLengthConstraintColumns(
+                sim.getPotts().getCellInventory(), columns['cell_id'],
+                self.stack_columns(columns, 'lambdaLength', 'targetLength', 'minorTargetLength'))
+            return
+
         for resource_name, sd in self.__restart_resource_dict.items():
             if sd.objectName == 'LengthConstraint' and sd.objectType == 'Pickle':
 
@@ -799,6 +1136,14 @@ class RestartManager:
 
         connectivity_global_plugin = CompuCell.getConnectivityGlobalPlugin()
 
+        sd = self.__restart_resource_dict.get('ConnectivityGlobal')
+        if sd is not None and sd.objectType == 'Columnar':
+            columns = self.load_columns(sd)
+            connectivity_global_plugin.setConnectivityStrengthColumns(
+                sim.getPotts().getCellInventory(), columns['cell_id'],
+                self.stack_columns(columns, 'connectivityStrength'))
+            return
+
         for resource_name, sd in self.__restart_resource_dict.items():
             if sd.objectName == 'ConnectivityGlobal' and sd.objectType == 'Pickle':
 
@@ -834,6 +1179,14 @@ class RestartManager:
 
         connectivity_local_flex_plugin = CompuCell.getConnectivityLocalFlexPlugin()
 
+        sd = self.__restart_resource_dict.get('ConnectivityLocalFlex')
+        if sd is not None and sd.objectType == 'Columnar':
+            columns = self.load_columns(sd)
+            connectivity_local_flex_plugin.setConnectivityStrengthColumns(
+                sim.getPotts().getCellInventory(), columns['cell_id'],
+                self.stack_columns(columns, 'connectivityStrength'))
+            return
+
         for resource_name, sd in self.__restart_resource_dict.items():
             if sd.objectName == 'ConnectivityLocalFlex' and sd.objectType == 'Pickle':
 
@@ -870,6 +1223,47 @@ class RestartManager:
 
         focal_point_plasticity_plugin = CompuCell.getFocalPointPlasticityPlugin()
 
+        sd = self.__restart_resource_dict.get('FocalPointPlasticity')
+        if sd is not None and sd.objectType == 'PickleBatch':
+            inventory = sim.getPotts().getCellInventory()
+            cells_by_id = self.get_cells_by_id()
+
+            def link_data(fpp_dict):
+                fpptd = CompuCell.FocalPointPlasticityTrackerData()
+                # neighbor ids are [cell_id, cluster id]
+                neighbor_ids = fpp_dict['neighborIds']
+                fpptd.neighborAddress = inventory.getCellByIds(neighbor_ids[0], neighbor_ids[1])
+                fpptd.lambdaDistance = fpp_dict['lambdaDistance']
+                fpptd.targetDistance = fpp_dict['targetDistance']
+                fpptd.maxDistance = fpp_dict['maxDistance']
+                fpptd.activationEnergy = fpp_dict['activationEnergy']
+                fpptd.maxNumberOfJunctions = fpp_dict['maxNumberOfJunctions']
+                fpptd.neighborOrder = fpp_dict['neighborOrder']
+                return fpptd
+
+            for cell_id, (links, internal_links, anchor_links) in self.load_pickle_batch(sd).items():
+                cell = cells_by_id.get(cell_id)
+                if cell is None:
+                    continue
+
+                for fpp_dict in links:
+                    focal_point_plasticity_plugin.insertFPPData(cell, link_data(fpp_dict))
+
+                for fpp_dict in internal_links:
+                    focal_point_plasticity_plugin.insertInternalFPPData(cell, link_data(fpp_dict))
+
+                for fpp_dict in anchor_links:
+                    fpptd = CompuCell.FocalPointPlasticityTrackerData()
+                    fpptd.lambdaDistance = fpp_dict['lambdaDistance']
+                    fpptd.targetDistance = fpp_dict['targetDistance']
+                    fpptd.maxDistance = fpp_dict['maxDistance']
+                    fpptd.anchorId = fpp_dict['anchorId']
+                    fpptd.anchorPoint[0] = fpp_dict['anchorPoint'][0]
+                    fpptd.anchorPoint[1] = fpp_dict['anchorPoint'][1]
+                    fpptd.anchorPoint[2] = fpp_dict['anchorPoint'][2]
+                    focal_point_plasticity_plugin.insertAnchorFPPData(cell, fpptd)
+            return
+
         for resource_name, sd in self.__restart_resource_dict.items():
             if sd.objectName == 'FocalPointPlasticity' and sd.objectType == 'Pickle':
 
@@ -965,6 +1359,14 @@ class RestartManager:
 
         contact_local_product_plugin = CompuCell.getContactLocalProductPlugin()
 
+        sd = self.__restart_resource_dict.get('ContactLocalProduct')
+        if sd is not None and sd.objectType == 'Columnar':
+            columns = self.load_columns(sd)
+            contact_local_product_plugin.setCadherinConcentrationColumns(
+                sim.getPotts().getCellInventory(), columns['cell_id'],
+                *self.ragged_column_arrays(columns, 'cadherinConcentration'))
+            return
+
         for resourceName, sd in self.__restart_resource_dict.items():
             if sd.objectName == 'ContactLocalProduct' and sd.objectType == 'Pickle':
 
@@ -1001,6 +1403,14 @@ class RestartManager:
 
         cell_orientation_plugin = CompuCell.getCellOrientationPlugin()
 
+        sd = self.__restart_resource_dict.get('CellOrientation')
+        if sd is not None and sd.objectType == 'Columnar':
+            columns = self.load_columns(sd)
+            cell_orientation_plugin.setLambdaCellOrientationColumns(
+                sim.getPotts().getCellInventory(), columns['cell_id'],
+                self.stack_columns(columns, 'lambdaCellOrientation'))
+            return
+
         for resource_name, sd in self.__restart_resource_dict.items():
             if sd.objectName == 'CellOrientation' and sd.objectType == 'Pickle':
 
@@ -1036,6 +1446,14 @@ class RestartManager:
 
         polarization_vector_plugin = CompuCell.getPolarizationVectorPlugin()
 
+        sd = self.__restart_resource_dict.get('PolarizationVector')
+        if sd is not None and sd.objectType == 'Columnar':
+            columns = self.load_columns(sd)
+            polarization_vector_plugin.setPolarizationVectorColumns(
+                sim.getPotts().getCellInventory(), columns['cell_id'],
+                self.stack_columns(columns, 'polarizationVector'))
+            return
+
         for resource_name, sd in self.__restart_resource_dict.items():
             if sd.objectName == 'PolarizationVector' and sd.objectType == 'Pickle':
 
@@ -1071,6 +1489,16 @@ class RestartManager:
 
         polarization23_plugin = CompuCell.getPolarization23Plugin()
 
+        sd = self.__restart_resource_dict.get('Polarization23')
+        if sd is not None and sd.objectType == 'Columnar':
+            columns = self.load_columns(sd)
+            # every cell has two polarization markers
+            columns['polarizationMarkers'] = self.ragged_column_rows(columns, 'polarizationMarkers', 2)
+            polarization23_plugin.setPolarization23Columns(
+                sim.getPotts().getCellInventory(), columns['cell_id'],
+                self.stack_columns(columns, 'polarizationVector', 'polarizationMarkers', 'lambdaPolarization'))
+            return
+
         for resource_name, sd in self.__restart_resource_dict.items():
             if sd.objectName == 'Polarization23' and sd.objectType == 'Pickle':
 
@@ -1200,6 +1628,9 @@ class RestartManager:
         if not on_demand and step % self.output_frequency:
             return
 
+        # previous snapshot has to be complete before we start a new one
+        self.wait_for_restart_output()
+
         # have to initialize serialized each time in case lattice gets resized in which case cellField Ptr
         # has to be updated and lattice dimension is usually different
 
@@ -1208,7 +1639,8 @@ class RestartManager:
         self.serializer.init(pg.simulator)
 
         rst_xml_elem = ElementCC3D("RestartFiles",
-                                   {"Version": cc3d.__version__, 'Build': cc3d.__revision__})
+                                   {"Version": cc3d.__version__, 'Build': cc3d.__revision__,
+                                    'FormatVersion': RESTART_FORMAT_VERSION})
         rst_xml_elem.ElementCC3D("Step", {}, step)
         print('outputRestartFiles')
 
@@ -1223,6 +1655,33 @@ class RestartManager:
         if restart_output_path == '':
             return
 
+        if self.asynchronous_output:
+            self.__snapshot_writes = []
+
+        try:
+            self.output_restart_snapshot(restart_output_path, rst_xml_elem)
+        finally:
+            snapshot_writes = self.__snapshot_writes
+            self.__snapshot_writes = None
+
+        if snapshot_writes is None:
+            self.complete_restart_output(restart_output_path, rst_xml_elem, [])
+        else:
+            if self.__output_executor is None:
+                self.__output_executor = ThreadPoolExecutor(max_workers=1)
+            self.__pending_output = self.__output_executor.submit(self.complete_restart_output, restart_output_path,
+                                                                  rst_xml_elem, snapshot_writes)
+
+    def output_restart_snapshot(self, restart_output_path, rst_xml_elem):
+        """
+        Serializes simulation state. During asynchronous output resources are only copied and scheduled for
+        writing - lattice and concentration fields are copied into numpy arrays. Python fields are written
+        by the compiled serializer right away
+        :param restart_output_path: {str}
+        :param rst_xml_elem: {instance of CC3DXMLElement}
+        :return: None
+        """
+
         # ---------------------- OUTPUTTING RESTART FILES    --------------------
         # outputting cell field    
         self.output_cell_field(restart_output_path, rst_xml_elem)
@@ -1288,7 +1747,24 @@ class RestartManager:
         self.output_steering_panel(restart_output_path, rst_xml_elem)
         #
         # # ---------------------- END OF  OUTPUTTING RESTART FILES    --------------------
-        #
+
+    def complete_restart_output(self, restart_output_path, rst_xml_elem, snapshot_writes):
+        """
+        Writes deferred restart files, xml description of the restart files and removes previous restart directory.
+        Runs in the background thread during asynchronous output
+        :param restart_output_path: {str}
+        :param rst_xml_elem: {instance of CC3DXMLElement}
+        :param snapshot_writes: {list} deferred writes - list of (write function, args) tuples
+        :return: None
+        """
+
+        for write_fcn, args in snapshot_writes:
+            try:
+                write_fcn(*args)
+            except Exception as e:
+                # incomplete snapshot is not described by restart.xml and previous snapshot is kept
+                raise RuntimeError('Could not write restart snapshot in {}'.format(restart_output_path)) from e
+
         # -------------writing xml description of the restart files
         rst_xml_elem.CC3DXMLElement.saveXML(os.path.join(restart_output_path, 'restart.xml'))
 
@@ -1333,7 +1809,20 @@ class RestartManager:
             print('sd.fileName=', sd.fileName)
             sd.fileFormat = 'text'
             self.serializeDataList.append(sd)
-            self.serializer.serializeConcentrationField(sd)
+
+            field_array = None
+            if self.snapshot_in_progress():
+                field_array = CompuCell.getConcentrationField(sim, fieldName).getNumpyArray(False)
+
+            # solvers that do not store fields in a single array are serialized right away
+            if field_array is None:
+                self.serializer.serializeConcentrationField(sd)
+            else:
+                sd.fileFormat = 'binary'
+                dim = field_array.shape
+                self.schedule_write(self.write_structured_points, sd.fileName, dim,
+                                    [(fieldName, 'double', np.array(field_array, dtype=np.float64))])
+
             self.append_xml_stub(rst_xml_elem, sd)
             print("Got concentration field: ", fieldName)
 
@@ -1355,7 +1844,21 @@ class RestartManager:
         sd.fileName = os.path.join(restart_output_path, sd.objectName + '.dat')
         sd.fileFormat = 'text'
         self.serializeDataList.append(sd)
-        self.serializer.serializeCellField(sd)
+
+        if self.snapshot_in_progress():
+            cell_field = sim.getPotts().getCellFieldG()
+            field_dim = cell_field.getDim()
+            dim = (field_dim.x, field_dim.y, field_dim.z)
+            type_array, id_array, cluster_id_array = [np.empty(dim, dtype=np.int64) for _ in range(3)]
+            cell_field.fillCellArrays(type_array, id_array, cluster_id_array)
+
+            sd.fileFormat = 'binary'
+            self.schedule_write(self.write_structured_points, sd.fileName, dim,
+                                [('CellType', 'char', type_array), ('CellId', 'long', id_array),
+                                 ('ClusterId', 'long', cluster_id_array)])
+        else:
+            self.serializer.serializeCellField(sd)
+
         self.append_xml_stub(rst_xml_elem, sd)
 
     def output_scalar_fields(self, restart_output_path, rst_xml_elem):
@@ -1488,125 +1991,60 @@ class RestartManager:
     def output_core_cell_attributes(self, restart_output_path, rst_xml_elem):
         """
         Serializes core clel attributes - the ones from CellG C++ object such as lambdaVolume, targetVolume, etc...
+        Attributes are stored as typed columns indexed by cell id
         :param restart_output_path:{str}
         :param rst_xml_elem: {instance of CC3DXMLElement}
         :return: None
         """
-        sim = CompuCellSetup.persistent_globals.simulator
-        inventory = sim.getPotts().getCellInventory()
-        cell_list = CellList(inventory)
-        number_of_cells = len(cell_list)
+        inventory = CompuCellSetup.persistent_globals.simulator.getPotts().getCellInventory()
 
         sd = SerializerDEPy.SerializeData()
         sd.moduleName = 'Potts3D'
         sd.moduleType = 'Core'
         sd.objectName = 'CoreCellAttributes'
-        sd.objectType = 'Pickle'
-        sd.fileName = os.path.join(restart_output_path, 'CoreCellAttributes' + '.dat')
-        try:
-            pf = open(sd.fileName, 'wb')
-        except IOError:
-            return
-
-        pickle.dump(number_of_cells, pf)
-        for cell in cell_list:
-            pickle.dump(cell.id, pf)
-            pickle.dump(self.cell_core_attributes(cell), pf)
+        sd.objectType = 'Columnar'
+        sd.fileName = os.path.join(restart_output_path, 'CoreCellAttributes' + '.npz')
 
-        pf.close()
-        self.append_xml_stub(rst_xml_elem, sd)
+        columns = cell_table(inventory, *CORE_CELL_ATTRIBUTES)
+        cell_ids = columns.pop('id')
 
-    def pickleList(self, _fileName, _cellList):
-        """
-        Utility function for pickling CellList object
-        :param _fileName: {str}
-        :param _cellList: {instance of CellList} - a container representing all CC3D simulations
-        :return: None
-        """
-        numberOfCells = len(_cellList)
-
-        nullFile = open(os.devnull, 'w')
         try:
-            pf = open(_fileName, 'w')
-        except IOError as e:
+            self.save_columns(sd.fileName, cell_ids, columns)
+        except IOError:
             return
 
-        pickle.dump(numberOfCells, pf)
-
-        for cell in _cellList:
-            # print 'cell.id=',cell.id
-            listAttrib = CompuCell.getPyAttrib(cell)
-            listToPickle = []
-            # checking which list items are picklable
-            for item in listAttrib:
-                try:
-                    pickle.dump(item, nullFile)
-                    listToPickle.append(item)
-                except TypeError as e:
-                    print("PICKLNG LIST")
-                    print(e)
-                    pass
-
-            pickle.dump(cell.id, pf)
-            pickle.dump(listToPickle, pf)
-
-        nullFile.close()
-        pf.close()
+        self.append_xml_stub(rst_xml_elem, sd)
 
-    def pickleDictionary(self, _fileName, _cellList):
+    @staticmethod
+    def picklable_attributes(attrib):
         """
-        Utility function for pickling list of attributes attached to cells by user in the Python script
-        :param _fileName: {str}
-        :param _cellList: {instance of CellList} - a container representing all CC3D simulations
-        :return: None
+        Returns copy of a list or dictionary of attributes that user attached to a cell without items that
+        cannot be pickled. Used only when attributes of all cells cannot be pickled at once
+        :param attrib: {list or dict} python attributes of a cell
+        :return: {list or dict}
         """
 
-        numberOfCells = len(_cellList)
-
-        nullFile = open(os.devnull, 'wb')
-        try:
-            pf = open(_fileName, 'wb')
-        except IOError as e:
-            return
-
-        # --------------------------
-        # pt=CompuCell.Vector3(10,11,12)
-
-        # pf1=open('PickleCC3D.dat','w')
-        # cPickle.dump(pt,pf1)
-
-        # pf1.close()
-
-        # pf1=open('PickleCC3D.dat','r')
-
-        # content=cPickle.load(pf1)
-        # print 'content=',content
-        # print 'type(content)=',type(content)
-        # pf1.close()
-        # --------------------------
-
-        pickle.dump(numberOfCells, pf)
-
-        for cell in _cellList:
-            # print 'cell.id=',cell.id
-            dictAttrib = CompuCell.getPyAttrib(cell)
-            dictToPickle = {}
-            # checking which list items are picklable
-            for key in dictAttrib:
-                try:
-                    pickle.dump(dictAttrib[key], nullFile)
-                    dictToPickle[key] = dictAttrib[key]
+        if isinstance(attrib, list):
+            items = enumerate(attrib)
+            picklable = []
+        else:
+            items = attrib.items()
+            picklable = {}
 
-                except TypeError as e:
-                    print("key=", key, " cannot be pickled")
-                    print(e)
-                    pass
+        for key, item in items:
+            try:
+                pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                print("key=", key, " cannot be pickled")
+                print(e)
+                continue
 
-            pickle.dump(cell.id, pf)
-            pickle.dump(dictToPickle, pf)
+            if isinstance(picklable, list):
+                picklable.append(item)
+            else:
+                picklable[key] = item
 
-        nullFile.close()
-        pf.close()
+        return picklable
 
     def output_free_floating_sbml_solvers(self, restart_output_path, rst_xml_elem):
 
@@ -1633,45 +2071,39 @@ class RestartManager:
 
     def output_python_attributes(self, restart_output_path, rst_xml_elem):
         """
-        outputs python attributes that were attached to a cell by the user in the Python script
+        outputs python attributes that were attached to a cell by the user in the Python script.
+        Attributes of all cells are pickled at once as {cell id: attributes} dictionary
         :param restart_output_path: {str}
         :param rst_xml_elem: {instance of CC3DXMLElement}
         :return:
         """
-        sim = CompuCellSetup.persistent_globals.simulator
         # notice that this function also outputs SBMLSolver objects
-        inventory = sim.getPotts().getCellInventory()
-        cell_list = CellList(inventory)
+        cells = self.get_cell_list()
 
         # checking if cells have extra attribute
-
-        for cell in cell_list:
+        for cell in cells:
             if not CompuCell.isPyAttribValid(cell):
                 return
 
-        list_flag = True
-        for cell in cell_list:
-            attrib = CompuCell.getPyAttrib(cell)
-            if isinstance(attrib, list):
-                list_flag = True
-            else:
-                list_flag = False
-            break
-
-        print('list_flag=', list_flag)
-
         sd = SerializerDEPy.SerializeData()
         sd.moduleName = 'Python'
         sd.moduleType = 'Python'
         sd.objectName = 'PythonAttributes'
-        sd.objectType = 'Pickle'
+        sd.objectType = 'PickleBatch'
         sd.fileName = os.path.join(restart_output_path, 'PythonAttributes' + '.dat')
-        # cPickle.dump(numberOfCells,pf)
 
-        if list_flag:
-            self.pickleList(sd.fileName, cell_list)
-        else:
-            self.pickleDictionary(sd.fileName, cell_list)
+        payload = {cell.id: CompuCell.getPyAttrib(cell) for cell in cells}
+
+        try:
+            pickled_payload = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            payload = {cell_id: self.picklable_attributes(attrib) for cell_id, attrib in payload.items()}
+            pickled_payload = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+
+        try:
+            self.schedule_write(self.write_bytes, sd.fileName, pickled_payload)
+        except IOError:
+            return
 
         self.append_xml_stub(rst_xml_elem, sd)
 
@@ -1693,29 +2125,21 @@ class RestartManager:
         sd.moduleName = 'AdhesionFlex'
         sd.moduleType = 'Plugin'
         sd.objectName = 'AdhesionFlex'
-        sd.objectType = 'Pickle'
-        sd.fileName = os.path.join(restart_output_path, 'AdhesionFlex' + '.dat')
+        sd.objectType = 'Columnar'
+        sd.fileName = os.path.join(restart_output_path, 'AdhesionFlex' + '.npz')
 
-        inventory = sim.getPotts().getCellInventory()
-        cell_list = CellList(inventory)
-        number_of_cells = len(cell_list)
+        cells = self.get_cell_list()
+
+        columns = self.ragged_columns('adhesionMoleculeDensity',
+                                      [adhesion_flex_plugin.getAdhesionMoleculeDensityVector(cell) for cell in cells])
+        # medium adhesion vector is not a per-cell column
+        columns['mediumAdhesionMoleculeDensity'] = adhesion_flex_plugin.getMediumAdhesionMoleculeDensityVector()
 
         try:
-            pf = open(sd.fileName, 'w')
-        except IOError as e:
+            self.save_columns(sd.fileName, [cell.id for cell in cells], columns)
+        except IOError:
             return
 
-        pickle.dump(number_of_cells, pf)
-        # wtiting medium adhesion vector
-
-        medium_adhesion_vector = adhesion_flex_plugin.getMediumAdhesionMoleculeDensityVector()
-        pickle.dump(medium_adhesion_vector, pf)
-        for cell in cell_list:
-            pickle.dump(cell.id, pf)
-            cell_adhesion_vector = adhesion_flex_plugin.getAdhesionMoleculeDensityVector(cell)
-            pickle.dump(cell_adhesion_vector, pf)
-
-        pf.close()
         self.append_xml_stub(rst_xml_elem, sd)
 
     def output_chemotaxis_plugin(self, restart_output_path, rst_xml_elem):
@@ -1736,42 +2160,30 @@ class RestartManager:
         sd.moduleName = 'Chemotaxis'
         sd.moduleType = 'Plugin'
         sd.objectName = 'Chemotaxis'
-        sd.objectType = 'Pickle'
+        sd.objectType = 'PickleBatch'
         sd.fileName = os.path.join(restart_output_path, 'Chemotaxis' + '.dat')
 
-        inventory = sim.getPotts().getCellInventory()
-        cell_list = CellList(inventory)
-        number_of_cells = len(cell_list)
-
-        try:
-            pf = open(sd.fileName, 'wb')
-        except IOError as e:
-            return
-
-        pickle.dump(number_of_cells, pf)
-        for cell in cell_list:
-            pickle.dump(cell.id, pf)
-
-            field_names = chemotaxis_plugin.getFieldNamesWithChemotaxisData(cell)
-            # outputting numbed of chemotaxis data that cell has
-            pickle.dump(len(field_names), pf)
-
-            for fieldName in field_names:
-                chd = chemotaxis_plugin.getChemotaxisData(cell, fieldName)
+        # {cell id: list of chemotaxis data dictionaries}
+        payload = {}
+        for cell in self.get_cell_list():
+            chd_list = []
+            for field_name in chemotaxis_plugin.getFieldNamesWithChemotaxisData(cell):
+                chd = chemotaxis_plugin.getChemotaxisData(cell, field_name)
                 chd_dict = {}
-                chd_dict['fieldName'] = fieldName
+                chd_dict['fieldName'] = field_name
                 chd_dict['lambda'] = chd.getLambda()
                 chd_dict['saturationCoef'] = chd.saturationCoef
                 chd_dict['formulaName'] = chd.formulaName
-                chemotactTowardsVec = chd.getChemotactTowardsVectorTypes()
-                print('chemotactTowardsVec=', chemotactTowardsVec)
                 chd_dict['chemotactTowardsTypesVec'] = chd.getChemotactTowardsVectorTypes()
+                chd_list.append(chd_dict)
 
-                pickle.dump(chd_dict, pf)
-            print('field_names=', field_names)
-            # cPickle.dump(cellAdhesionVector,pf)        
+            payload[cell.id] = chd_list
+
+        try:
+            self.save_pickle_batch(sd.fileName, payload)
+        except IOError:
+            return
 
-        pf.close()
         self.append_xml_stub(rst_xml_elem, sd)
 
     def output_length_constraint_plugin(self, restart_output_path, rst_xml_elem):
@@ -1791,27 +2203,24 @@ class RestartManager:
         sd.moduleName = 'LengthConstraint'
         sd.moduleType = 'Plugin'
         sd.objectName = 'LengthConstraint'
-        sd.objectType = 'Pickle'
-        sd.fileName = os.path.join(restart_output_path, 'LengthConstraint' + '.dat')
+        sd.objectType = 'Columnar'
+        sd.fileName = os.path.join(restart_output_path, 'LengthConstraint' + '.npz')
 
-        inventory = sim.getPotts().getCellInventory()
-        cell_list = CellList(inventory)
-        number_of_cells = len(cell_list)
-
-        try:
-            pf = open(sd.fileName, 'wb')
-        except IOError as e:
-            return
-
-        pickle.dump(number_of_cells, pf)
+        cells = self.get_cell_list()
 
         lcp = length_constraint_plugin
 
-        for cell in cell_list:
-            pickle.dump(cell.id, pf)
-            pickle.dump([lcp.getLambdaLength(cell), lcp.getTargetLength(cell), lcp.getMinorTargetLength(cell)], pf)
+        columns = {
+            'lambdaLength': [lcp.getLambdaLength(cell) for cell in cells],
+            'targetLength': [lcp.getTargetLength(cell) for cell in cells],
+            'minorTargetLength': [lcp.getMinorTargetLength(cell) for cell in cells]
+        }
+
+        try:
+            self.save_columns(sd.fileName, [cell.id for cell in cells], columns)
+        except IOError:
+            return
 
-        pf.close()
         self.append_xml_stub(rst_xml_elem, sd)
 
     def output_connectivity_global_plugin(self, restart_output_path, rst_xml_elem):
@@ -1833,25 +2242,18 @@ class RestartManager:
         sd.moduleName = 'ConnectivityGlobal'
         sd.moduleType = 'Plugin'
         sd.objectName = 'ConnectivityGlobal'
-        sd.objectType = 'Pickle'
-        sd.fileName = os.path.join(restart_output_path, 'ConnectivityGlobal' + '.dat')
+        sd.objectType = 'Columnar'
+        sd.fileName = os.path.join(restart_output_path, 'ConnectivityGlobal' + '.npz')
 
-        inventory = sim.getPotts().getCellInventory()
-        cell_list = CellList(inventory)
-        number_of_cells = len(cell_list)
+        cells = self.get_cell_list()
+
+        columns = {'connectivityStrength': [connectivity_global_plugin.getConnectivityStrength(cell) for cell in cells]}
 
         try:
-            pf = open(sd.fileName, 'wb')
-        except IOError as e:
+            self.save_columns(sd.fileName, [cell.id for cell in cells], columns)
+        except IOError:
             return
 
-        pickle.dump(number_of_cells, pf)
-
-        for cell in cell_list:
-            pickle.dump(cell.id, pf)
-            pickle.dump(connectivity_global_plugin.getConnectivityStrength(cell), pf)
-
-        pf.close()
         self.append_xml_stub(rst_xml_elem, sd)
 
     def output_connectivity_local_flex_plugin(self, restart_output_path, rst_xml_elem):
@@ -1862,6 +2264,7 @@ class RestartManager:
         :param rst_xml_elem: {instance of CC3DXMLElement}
         :return:
         """
+
         sim = CompuCellSetup.persistent_globals.simulator
         if not sim.pluginManager.isLoaded("ConnectivityLocalFlex"):
             return
@@ -1872,25 +2275,18 @@ class RestartManager:
         sd.moduleName = 'ConnectivityLocalFlex'
         sd.moduleType = 'Plugin'
         sd.objectName = 'ConnectivityLocalFlex'
-        sd.objectType = 'Pickle'
-        sd.fileName = os.path.join(restart_output_path, 'ConnectivityLocalFlex' + '.dat')
+        sd.objectType = 'Columnar'
+        sd.fileName = os.path.join(restart_output_path, 'ConnectivityLocalFlex' + '.npz')
 
-        inventory = sim.getPotts().getCellInventory()
-        cell_list = CellList(inventory)
-        number_of_cells = len(cell_list)
+        cells = self.get_cell_list()
+
+        columns = {'connectivityStrength': [connectivity_local_flex_plugin.getConnectivityStrength(cell) for cell in cells]}
 
         try:
-            pf = open(sd.fileName, 'wb')
-        except IOError as e:
+            self.save_columns(sd.fileName, [cell.id for cell in cells], columns)
+        except IOError:
             return
 
-        pickle.dump(number_of_cells, pf)
-
-        for cell in cell_list:
-            pickle.dump(cell.id, pf)
-            pickle.dump(connectivity_local_flex_plugin.getConnectivityStrength(cell), pf)
-
-        pf.close()
         self.append_xml_stub(rst_xml_elem, sd)
 
     def output_focal_point_placticity_plugin(self, restart_output_path, rst_xml_elem):
@@ -1912,72 +2308,47 @@ class RestartManager:
         sd.moduleName = 'FocalPointPlasticity'
         sd.moduleType = 'Plugin'
         sd.objectName = 'FocalPointPlasticity'
-        sd.objectType = 'Pickle'
+        sd.objectType = 'PickleBatch'
         sd.fileName = os.path.join(restart_output_path, 'FocalPointPlasticity' + '.dat')
 
-        inventory = sim.getPotts().getCellInventory()
-        cell_list = CellList(inventory)
-        number_of_cells = len(cell_list)
+        def link_dict(fpp_data):
+            fpp_data_dict = {}
+            if fpp_data.neighborAddress:
+                fpp_data_dict['neighborIds'] = [fpp_data.neighborAddress.id, fpp_data.neighborAddress.clusterId]
+            else:
+                fpp_data_dict['neighborIds'] = [0, 0]
+            fpp_data_dict['lambdaDistance'] = fpp_data.lambdaDistance
+            fpp_data_dict['targetDistance'] = fpp_data.targetDistance
+            fpp_data_dict['maxDistance'] = fpp_data.maxDistance
+            fpp_data_dict['activationEnergy'] = fpp_data.activationEnergy
+            fpp_data_dict['maxNumberOfJunctions'] = fpp_data.maxNumberOfJunctions
+            fpp_data_dict['neighborOrder'] = fpp_data.neighborOrder
+            return fpp_data_dict
+
+        def anchor_dict(fpp_data):
+            fpp_data_dict = {}
+            fpp_data_dict['lambdaDistance'] = fpp_data.lambdaDistance
+            fpp_data_dict['targetDistance'] = fpp_data.targetDistance
+            fpp_data_dict['maxDistance'] = fpp_data.maxDistance
+            fpp_data_dict['anchorId'] = fpp_data.anchorId
+            fpp_data_dict['anchorPoint'] = [fpp_data.anchorPoint[0], fpp_data.anchorPoint[1],
+                                            fpp_data.anchorPoint[2]]
+            return fpp_data_dict
+
+        # {cell id: (external links, internal links, anchor links)}
+        payload = {}
+        for cell in self.get_cell_list():
+            payload[cell.id] = (
+                [link_dict(fpp_data) for fpp_data in focal_point_plasticity_plugin.getFPPDataVec(cell)],
+                [link_dict(fpp_data) for fpp_data in focal_point_plasticity_plugin.getInternalFPPDataVec(cell)],
+                [anchor_dict(fpp_data) for fpp_data in focal_point_plasticity_plugin.getAnchorFPPDataVec(cell)]
+            )
 
         try:
-            pf = open(sd.fileName, 'wb')
-        except IOError as e:
+            self.save_pickle_batch(sd.fileName, payload)
+        except IOError:
             return
 
-        pickle.dump(number_of_cells, pf)
-
-        for cell in cell_list:
-
-            pickle.dump(cell.id, pf)
-            fpp_vec = focal_point_plasticity_plugin.getFPPDataVec(cell)
-            internal_fpp_vec = focal_point_plasticity_plugin.getInternalFPPDataVec(cell)
-            anchor_fpp_vec = focal_point_plasticity_plugin.getAnchorFPPDataVec(cell)
-
-            # dumping 'external' fpp links
-            pickle.dump(len(fpp_vec), pf)
-            for fpp_data in fpp_vec:
-                fpp_data_dict = {}
-                if fpp_data.neighborAddress:
-                    fpp_data_dict['neighborIds'] = [fpp_data.neighborAddress.id, fpp_data.neighborAddress.clusterId]
-                else:
-                    fpp_data_dict['neighborIds'] = [0, 0]
-                fpp_data_dict['lambdaDistance'] = fpp_data.lambdaDistance
-                fpp_data_dict['targetDistance'] = fpp_data.targetDistance
-                fpp_data_dict['maxDistance'] = fpp_data.maxDistance
-                fpp_data_dict['activationEnergy'] = fpp_data.activationEnergy
-                fpp_data_dict['maxNumberOfJunctions'] = fpp_data.maxNumberOfJunctions
-                fpp_data_dict['neighborOrder'] = fpp_data.neighborOrder
-                pickle.dump(fpp_data_dict, pf)
-
-            # dumping 'internal' fpp links
-            pickle.dump(len(internal_fpp_vec), pf)
-            for fpp_data in internal_fpp_vec:
-                fpp_data_dict = {}
-                if fpp_data.neighborAddress:
-                    fpp_data_dict['neighborIds'] = [fpp_data.neighborAddress.id, fpp_data.neighborAddress.clusterId]
-                else:
-                    fpp_data_dict['neighborIds'] = [0, 0]
-                fpp_data_dict['lambdaDistance'] = fpp_data.lambdaDistance
-                fpp_data_dict['targetDistance'] = fpp_data.targetDistance
-                fpp_data_dict['maxDistance'] = fpp_data.maxDistance
-                fpp_data_dict['activationEnergy'] = fpp_data.activationEnergy
-                fpp_data_dict['maxNumberOfJunctions'] = fpp_data.maxNumberOfJunctions
-                fpp_data_dict['neighborOrder'] = fpp_data.neighborOrder
-                pickle.dump(fpp_data_dict, pf)
-
-            # dumping anchor fpp links
-            pickle.dump(len(anchor_fpp_vec), pf)
-            for fpp_data in anchor_fpp_vec:
-                fpp_data_dict = {}
-                fpp_data_dict['lambdaDistance'] = fpp_data.lambdaDistance
-                fpp_data_dict['targetDistance'] = fpp_data.targetDistance
-                fpp_data_dict['maxDistance'] = fpp_data.maxDistance
-                fpp_data_dict['anchorId'] = fpp_data.anchorId
-                fpp_data_dict['anchorPoint'] = [fpp_data.anchorPoint[0], fpp_data.anchorPoint[1],
-                                                fpp_data.anchorPoint[2]]
-                pickle.dump(fpp_data_dict, pf)
-
-        pf.close()
         self.append_xml_stub(rst_xml_elem, sd)
 
     def output_contact_local_product_plugin(self, restart_output_path, rst_xml_elem):
@@ -1998,25 +2369,20 @@ class RestartManager:
         sd.moduleName = 'ContactLocalProduct'
         sd.moduleType = 'Plugin'
         sd.objectName = 'ContactLocalProduct'
-        sd.objectType = 'Pickle'
-        sd.fileName = os.path.join(restart_output_path, 'ContactLocalProduct' + '.dat')
+        sd.objectType = 'Columnar'
+        sd.fileName = os.path.join(restart_output_path, 'ContactLocalProduct' + '.npz')
 
-        inventory = sim.getPotts().getCellInventory()
-        cell_list = CellList(inventory)
-        number_of_cells = len(cell_list)
+        cells = self.get_cell_list()
+
+        columns = self.ragged_columns('cadherinConcentration',
+                                      [contact_local_product_plugin.getCadherinConcentrationVec(cell)
+                                       for cell in cells])
 
         try:
-            pf = open(sd.fileName, 'wb')
+            self.save_columns(sd.fileName, [cell.id for cell in cells], columns)
         except IOError:
             return
 
-        pickle.dump(number_of_cells, pf)
-
-        for cell in cell_list:
-            pickle.dump(cell.id, pf)
-            pickle.dump(contact_local_product_plugin.getCadherinConcentrationVec(cell), pf)
-
-        pf.close()
         self.append_xml_stub(rst_xml_elem, sd)
 
     def output_cell_orientation_plugin(self, restart_output_path, rst_xml_elem):
@@ -2038,25 +2404,18 @@ class RestartManager:
         sd.moduleName = 'CellOrientation'
         sd.moduleType = 'Plugin'
         sd.objectName = 'CellOrientation'
-        sd.objectType = 'Pickle'
-        sd.fileName = os.path.join(restart_output_path, 'CellOrientation' + '.dat')
+        sd.objectType = 'Columnar'
+        sd.fileName = os.path.join(restart_output_path, 'CellOrientation' + '.npz')
 
-        inventory = sim.getPotts().getCellInventory()
-        cell_list = CellList(inventory)
-        number_of_cells = len(cell_list)
+        cells = self.get_cell_list()
+
+        columns = {'lambdaCellOrientation': [cell_orientation_plugin.getLambdaCellOrientation(cell) for cell in cells]}
 
         try:
-            pf = open(sd.fileName, 'wb')
-        except IOError as e:
+            self.save_columns(sd.fileName, [cell.id for cell in cells], columns)
+        except IOError:
             return
 
-        pickle.dump(number_of_cells, pf)
-
-        for cell in cell_list:
-            pickle.dump(cell.id, pf)
-            pickle.dump(cell_orientation_plugin.getLambdaCellOrientation(cell), pf)
-
-        pf.close()
         self.append_xml_stub(rst_xml_elem, sd)
 
     def output_polarization_vector_plugin(self, restart_output_path, rst_xml_elem):
@@ -2078,25 +2437,19 @@ class RestartManager:
         sd.moduleName = 'PolarizationVector'
         sd.moduleType = 'Plugin'
         sd.objectName = 'PolarizationVector'
-        sd.objectType = 'Pickle'
-        sd.fileName = os.path.join(restart_output_path, 'PolarizationVector' + '.dat')
+        sd.objectType = 'Columnar'
+        sd.fileName = os.path.join(restart_output_path, 'PolarizationVector' + '.npz')
 
-        inventory = sim.getPotts().getCellInventory()
-        cell_list = CellList(inventory)
-        number_of_cells = len(cell_list)
+        cells = self.get_cell_list()
+
+        polarization_vectors = [polarization_vector_plugin.getPolarizationVector(cell) for cell in cells]
+        columns = {'polarizationVector': np.asarray(polarization_vectors, dtype=float).reshape(-1, 3)}
 
         try:
-            pf = open(sd.fileName, 'wb')
+            self.save_columns(sd.fileName, [cell.id for cell in cells], columns)
         except IOError:
             return
 
-        pickle.dump(number_of_cells, pf)
-
-        for cell in cell_list:
-            pickle.dump(cell.id, pf)
-            pickle.dump(polarization_vector_plugin.getPolarizationVector(cell), pf)
-
-        pf.close()
         self.append_xml_stub(rst_xml_elem, sd)
 
     def output_polarization23_plugin(self, restart_output_path, rst_xml_elem):
@@ -2119,26 +2472,25 @@ class RestartManager:
         sd.moduleName = 'Polarization23'
         sd.moduleType = 'Plugin'
         sd.objectName = 'Polarization23'
-        sd.objectType = 'Pickle'
-        sd.fileName = os.path.join(restart_output_path, 'Polarization23' + '.dat')
+        sd.objectType = 'Columnar'
+        sd.fileName = os.path.join(restart_output_path, 'Polarization23' + '.npz')
 
-        inventory = sim.getPotts().getCellInventory()
-        cell_list = CellList(inventory)
-        number_of_cells = len(cell_list)
+        cells = self.get_cell_list()
+
+        polarization_vectors = []
+        for cell in cells:
+            pol_vec = polarization23_plugin.getPolarizationVector(cell)
+            polarization_vectors.append([pol_vec.fX, pol_vec.fY, pol_vec.fZ])
+
+        columns = self.ragged_columns('polarizationMarkers',
+                                      [polarization23_plugin.getPolarizationMarkers(cell) for cell in cells],
+                                      dtype=np.int64)
+        columns['polarizationVector'] = np.asarray(polarization_vectors, dtype=float).reshape(-1, 3)
+        columns['lambdaPolarization'] = [polarization23_plugin.getLambdaPolarization(cell) for cell in cells]
 
         try:
-            pf = open(sd.fileName, 'wb')
+            self.save_columns(sd.fileName, [cell.id for cell in cells], columns)
         except IOError:
             return
 
-        pickle.dump(number_of_cells, pf)
-
-        for cell in cell_list:
-            pickle.dump(cell.id, pf)
-            pol_vec = polarization23_plugin.getPolarizationVector(cell)
-            pickle.dump([pol_vec.fX, pol_vec.fY, pol_vec.fZ], pf)
-            pickle.dump(polarization23_plugin.getPolarizationMarkers(cell), pf)
-            pickle.dump(polarization23_plugin.getLambdaPolarization(cell), pf)
-
-        pf.close()
         self.append_xml_stub(rst_xml_elem, sd)
@@ -2,11 +2,161 @@
 import os
 import sys
 import pickle
+import hashlib
 
+import roadrunner
 from roadrunner import RoadRunner
 
 
+class CompiledModelCache:
+    """
+    Process-wide cache of compiled SBML models. Loading SBML JIT-compiles the model which for larger models takes
+    seconds - with the cache every model is compiled once and further solvers are restored from the saved state of
+    the freshly compiled model. Entries are keyed by hash of the SBML text and roadrunner version.
+    Integrator choice and settings are applied by callers after the model is loaded so they are not part of the key.
+
+    When cache_dir is set (e.g. via CC3D_SBML_MODEL_CACHE_DIR environment variable) compiled models are also
+    stored on disk and reused between runs, e.g. by many simulations of a parameter scan
+    """
+
+    def __init__(self, cache_dir: str = None):
+        """
+        :param cache_dir: directory where compiled models are stored. None means in-memory cache only
+        """
+
+        if cache_dir is None:
+            cache_dir = os.environ.get('CC3D_SBML_MODEL_CACHE_DIR', None)
+
+        self.cache_dir = cache_dir
+
+        # saving/restoring compiled models requires newer roadrunner versions
+        self.enabled = hasattr(RoadRunner, 'saveStateS') and hasattr(RoadRunner, 'loadStateS')
+
+        # {key:state}
+        self.__states = {}
+
+        # {sbml path:(modification time, size, key)}
+        self.__file_keys = {}
+
+    def clear(self) -> None:
+        """
+        Clears in-memory cache
+
+        :return: None
+        """
+        self.__states = {}
+        self.__file_keys = {}
+
+    @staticmethod
+    def __hash_model(model_bytes: bytes) -> str:
+        hasher = hashlib.sha1()
+        hasher.update(str(getattr(roadrunner, '__version__', '')).encode('utf-8'))
+        hasher.update(model_bytes)
+        return hasher.hexdigest()
+
+    def model_key(self, sbml_path: str = '', model_string: str = '') -> str:
+        """
+        Returns cache key of the model
+
+        :param sbml_path: path to the SBML file
+        :param model_string: SBML string - used when sbml_path is empty
+        :return: cache key
+        """
+
+        if not sbml_path:
+            return self.__hash_model(model_string.encode('utf-8'))
+
+        stat = os.stat(sbml_path)
+        try:
+            mtime, size, key = self.__file_keys[sbml_path]
+            if mtime == stat.st_mtime and size == stat.st_size:
+                return key
+        except KeyError:
+            pass
+
+        with open(sbml_path, 'rb') as fin:
+            key = self.__hash_model(fin.read())
+
+        self.__file_keys[sbml_path] = (stat.st_mtime, stat.st_size, key)
+
+        return key
+
+    def __state_fname(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + '.rrstate')
+
+    def fetch(self, key: str):
+        """
+        Returns saved state of the compiled model
+
+        :param key: cache key
+        :return: saved state or None
+        :rtype: bytes or None
+        """
+
+        try:
+            return self.__states[key]
+        except KeyError:
+            pass
+
+        if not self.cache_dir:
+            return None
+
+        try:
+            with open(self.__state_fname(key), 'rb') as fin:
+                state = fin.read()
+        except (IOError, OSError):
+            return None
+
+        self.__states[key] = state
+
+        return state
+
+    def store(self, key: str, state: bytes) -> None:
+        """
+        Stores saved state of the compiled model
+
+        :param key: cache key
+        :param state: saved state
+        :return: None
+        """
+
+        self.__states[key] = state
+
+        if not self.cache_dir:
+            return
+
+        state_fname = self.__state_fname(key)
+        # file is written under temporary name first so that concurrent simulations never read partial file
+        tmp_fname = '{}.{}.tmp'.format(state_fname, os.getpid())
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_fname, 'wb') as fout:
+                fout.write(state)
+            os.replace(tmp_fname, state_fname)
+        except (IOError, OSError):
+            pass
+
+    def discard(self, key: str) -> None:
+        """
+        Removes entry from the cache - e.g. when saved state cannot be loaded
+
+        :param key: cache key
+        :return: None
+        """
+
+        self.__states.pop(key, None)
+
+        if self.cache_dir:
+            try:
+                os.remove(self.__state_fname(key))
+            except (IOError, OSError):
+                pass
+
+
 class RoadRunnerPy(RoadRunner):
+    #: cache of compiled models shared by all instances
+    model_cache = CompiledModelCache()
+
     def __init__(self, _path='', _modelString='', sbml=None):
         if sbml is None:
             RoadRunner.__init__(self)
@@ -16,10 +166,12 @@ class RoadRunnerPy(RoadRunner):
         # self.sbmlFullPath=_sbmlFullPath
         self.path = _path  # relative path to the SBML model - CC3D uses only relative paths . In some rare cases when users do some hacking they may set self.path to be absolute path.
         self.absPath = ''  # absolute path of the SBML file. Internal use only e.g.  for debugging purposes - and is not serialized
-        self.modelString = ''  # SBML model string - used when translating model specifications
+        self.modelString = _modelString  # SBML model string - used when translating model specifications
         self.stepSize = 1.0
         self.timeStart = 0.0
         self.timeEnd = 1.0
+        # batch options of a model pickled as cc3d.core.SBMLBatch.SBMLBatchCellModel - set by loadSBML, None otherwise
+        self.batchState = None
 
         self.__state = {}
 
@@ -66,6 +218,60 @@ class RoadRunnerPy(RoadRunner):
     # self.simulate()
     # self.timeStart=self.timeEnd
 
+    def clone(self):
+        """
+        Returns copy of the solver with the same model state and integrator settings. Compiled model is copied
+        so the model is not compiled again
+
+        :return: {RoadRunnerPy} copy of the solver
+        """
+
+        if RoadRunnerPy.model_cache.enabled:
+            rr = RoadRunnerPy(_path=self.path)
+            rr.loadStateS(self.saveStateS())
+        else:
+            rr = RoadRunnerPy(_path=self.path, sbml=self.getCurrentSBML())
+            rr.setIntegrator(self.getIntegrator().getName())
+
+        rr.modelString = self.modelString
+        rr.absPath = self.absPath
+        rr.stepSize = self.stepSize
+        rr.timeStart = self.timeStart
+        rr.timeEnd = self.timeEnd
+        rr.selections = []
+
+        return rr
+
+    def load_model(self, sbml_path='', model_string=''):
+        """
+        Loads model using compiled model cache. Model is compiled only if it is not found in the cache
+
+        :param sbml_path: {str} path to the SBML file
+        :param model_string: {str} SBML string - used when sbml_path is empty
+        :return: None
+        """
+
+        model_cache = RoadRunnerPy.model_cache
+        model_source = sbml_path if sbml_path else model_string
+
+        if not model_cache.enabled:
+            self.load(model_source)
+            return
+
+        key = model_cache.model_key(sbml_path=sbml_path, model_string=model_string)
+
+        state = model_cache.fetch(key)
+        if state is not None:
+            try:
+                self.loadStateS(state)
+                return
+            except RuntimeError:
+                # e.g. state saved by different version of roadrunner
+                model_cache.discard(key)
+
+        self.load(model_source)
+        model_cache.store(key, self.saveStateS())
+
     def prepareState(self):
         self.__state = {}
         # first line covers RRPython variables, second addresses rr.simulateOptions entries
@@ -86,7 +292,8 @@ class RoadRunnerPy(RoadRunner):
 
     def __reduce__(self):
         self.prepareState()
-        return RoadRunnerPy, (self.path,), self.__state
+        # model string is stored so that models defined by strings (e.g. translated antimony) can be restored
+        return RoadRunnerPy, (self.path, self.modelString), self.__state
 
     def __setstate__(self, _state):
         self.__state = _state
@@ -100,9 +307,14 @@ class RoadRunnerPy(RoadRunner):
         TO BE REVISED - SOMEWHAT  STRANGE PATH MANIPULATIONS
 
         :param _externalPath:{str}
+        :param _modelString:{str} SBML string. If empty, model string the solver was created with is used and if
+        that is empty as well model is loaded from file
         :return: None
         """
 
+        if _modelString == '':
+            _modelString = self.modelString
+
         if _modelString == '':
             if _externalPath == '':  # if external
 
@@ -123,10 +335,10 @@ class RoadRunnerPy(RoadRunner):
                     else:
                         raise IOError('loadSBMLError : RoadRunnerPy could not find ' + _externalPath + ' in the filesystem')
 
-            self.load(self.absPath)
+            self.load_model(sbml_path=self.absPath)
         else:
             self.modelString = _modelString
-            self.load(self.modelString)
+            self.load_model(model_string=self.modelString)
 
         try:
             modelState = self.__state['ModelState']
@@ -158,5 +370,8 @@ class RoadRunnerPy(RoadRunner):
 
         except LookupError as e:
             pass
+
+        self.batchState = self.__state.get('Batch')
+
         # after using self.__state to initialize state of the model we set state dictionary to empty dicctionary
         self.__state = {}
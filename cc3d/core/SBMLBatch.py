@@ -0,0 +1,784 @@
+import copy
+import warnings
+import weakref
+import xml.etree.ElementTree as ET
+from typing import List, Union
+import numpy as np
+
+from .RoadRunnerPy import RoadRunnerPy
+
+MATHML_NS = 'http://www.w3.org/1998/Math/MathML'
+
+# suffix of SBML ids of a model copy in a stacked model
+STACKED_ID_SUFFIX = '__cc3d_row{}'
+
+# lists of SBML definitions shared by all copies of a stacked model
+SHARED_SBML_LISTS = ('listOfFunctionDefinitions', 'listOfUnitDefinitions', 'listOfCompartmentTypes',
+                     'listOfSpeciesTypes')
+
+# attributes of SBML elements that refer to ids of model components
+SBML_ID_REF_ATTRIBUTES = ('compartment', 'species', 'variable', 'symbol', 'outside', 'conversionFactor')
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def stack_sbml_model(sbml: str, num_copies: int) -> str:
+    """
+    Returns SBML model that consists of num_copies independent copies of a model. Ids of components of copy i
+    get :data:`STACKED_ID_SUFFIX` suffix, function and unit definitions are shared. Annotations, notes and meta ids
+    are not copied
+
+    :param sbml: SBML string
+    :param num_copies: number of copies
+    :return: SBML string of the stacked model
+    """
+
+    root = ET.fromstring(sbml)
+    ET.register_namespace('', root.tag[1:].split('}')[0])
+    ET.register_namespace('math', MATHML_NS)
+
+    model = next(elem for elem in root if _local_name(elem.tag) == 'model')
+    copied_lists = [elem for elem in model
+                    if _local_name(elem.tag).startswith('listOf') and _local_name(elem.tag) not in SHARED_SBML_LISTS]
+
+    ids = set()
+    for sbml_list in copied_lists:
+        for elem in sbml_list.iter():
+            if 'id' in elem.attrib:
+                ids.add(elem.attrib['id'])
+
+    model_conversion_factor = model.attrib.pop('conversionFactor', None)
+
+    for sbml_list in copied_lists:
+        model.remove(sbml_list)
+        stacked_list = ET.SubElement(model, sbml_list.tag, sbml_list.attrib)
+
+        for copy_idx in range(num_copies):
+            suffix = STACKED_ID_SUFFIX.format(copy_idx)
+            for item in sbml_list:
+                item = copy.deepcopy(item)
+                if model_conversion_factor is not None and _local_name(item.tag) == 'species':
+                    item.attrib.setdefault('conversionFactor', model_conversion_factor)
+
+                for elem in list(item.iter()):
+                    for child in list(elem):
+                        if _local_name(child.tag) in ('annotation', 'notes'):
+                            elem.remove(child)
+
+                for elem in item.iter():
+                    elem.attrib.pop('metaid', None)
+                    for attr in ('id',) + SBML_ID_REF_ATTRIBUTES:
+                        if elem.attrib.get(attr) in ids:
+                            elem.attrib[attr] += suffix
+                    if _local_name(elem.tag) == 'ci' and elem.text is not None and elem.text.strip() in ids:
+                        elem.text = elem.text.strip() + suffix
+
+                stacked_list.append(item)
+
+    return ET.tostring(root, encoding='unicode')
+
+
+def sbml_uses_time(sbml: str) -> bool:
+    """
+    Checks if model depends explicitly on simulation time
+
+    :param sbml: SBML string
+    :return: True if math of the model refers to time
+    """
+
+    for elem in ET.fromstring(sbml).iter():
+        if _local_name(elem.tag) == 'csymbol' and elem.attrib.get('definitionURL', '').endswith('/time'):
+            return True
+    return False
+
+
+class SBMLBatch:
+    """
+    Batch of cell SBML models that share one model specification. All cells of the batch are integrated by a single
+    compiled :class:`cc3d.core.RoadRunnerPy.RoadRunnerPy` instance and their states are held in one
+    (n_cells x n_values) NumPy array. Values of floating species (amounts), boundary species (amounts),
+    global parameters and compartment volumes are stored as array columns. Cells access their states through
+    :class:`SBMLBatchCellModel` objects stored in cell.dict['SBMLSolver'] - values are read from and written to
+    the state array directly, without touching the solver
+
+    A row is released when its :class:`SBMLBatchCellModel` is garbage-collected - i.e. when the model is deleted
+    from the cell or when the cell is destroyed
+
+    :meth:`timestep` integrates rows in blocks - every block is a solver of a stacked model made of block_size
+    independent copies of the cell model (see :func:`stack_sbml_model`), compiled once per batch. Rows stay in their
+    block between steps so integrator history and pending events of every cell are preserved. A block is reloaded
+    from the state array and its integrator restarted only when values of its rows were modified outside of
+    integration. When rows of the block change (cells are added or removed) the block is reloaded as well and, if the
+    model has events, its solver is replaced by a fresh one.
+    Blocks are not used when rows have different step sizes, when a time-dependent model is at different times in
+    different rows or when the stacked model cannot be compiled - rows are then integrated one by one by the shared
+    solver that is restarted for every row
+    """
+
+    def __init__(self, model_name: str, rr: RoadRunnerPy, block_size: int = 8):
+        """
+        :param model_name: model name
+        :param rr: solver with loaded model - shared by all cells of the batch. Its integrator settings apply to
+            all cells of the batch
+        :param block_size: number of rows integrated by a single solver of the stacked model. Compilation time of
+            the stacked model grows quickly with block size. Non-positive value disables integration in blocks
+        """
+
+        self.model_name = model_name
+        self.rr = rr
+        self.block_size = block_size
+
+        model = rr.model
+
+        # each group is (ids, getter, setter) - getters and setters operate on entire vectors of values
+        groups = [
+            (list(model.getFloatingSpeciesIds()), model.getFloatingSpeciesAmounts, model.setFloatingSpeciesAmounts),
+            (list(model.getBoundarySpeciesIds()), model.getBoundarySpeciesAmounts, self.__set_boundary_species),
+            (list(model.getGlobalParameterIds()), model.getGlobalParameterValues, model.setGlobalParameterValues),
+            (list(model.getCompartmentIds()), model.getCompartmentVolumes, model.setCompartmentVolumes),
+        ]
+
+        #: names of the state array columns
+        self.value_names = []
+
+        # {value name:column}
+        self.column_dict = {}
+
+        # names of values that can be assigned - values defined by assignment rules are computed by the solver
+        self.settable_names = []
+
+        # (column slice, getter, settable indices within group, settable columns, setter)
+        self.__groups = []
+        # position of every group in the list of groups - used to access corresponding vectors of stacked models
+        self.__group_kinds = []
+
+        for kind, (ids, getter, setter) in enumerate(groups):
+            first_column = len(self.value_names)
+            settable_indices = []
+            for idx, name in enumerate(ids):
+                self.column_dict[name] = len(self.value_names)
+                self.value_names.append(name)
+                if self.__is_settable(name):
+                    settable_indices.append(idx)
+                    self.settable_names.append(name)
+
+            if not ids:
+                continue
+
+            settable_indices = np.array(settable_indices, dtype=np.int32)
+            self.__groups.append((slice(first_column, len(self.value_names)), getter, settable_indices,
+                                  first_column + settable_indices, setter))
+            self.__group_kinds.append(kind)
+
+        self.__settable_name_set = set(self.settable_names)
+
+        #: values of newly added cells
+        self.initial_values = np.zeros(len(self.value_names), dtype=np.float64)
+        self.__store_values(self.initial_values)
+
+        self.num_rows = 0
+        self.values = np.zeros((0, len(self.value_names)), dtype=np.float64)
+        self.time_start = np.zeros(0, dtype=np.float64)
+        self.step_size = np.zeros(0, dtype=np.float64)
+        self.cell_id = np.zeros(0, dtype=np.int64)
+
+        # row -> key and key -> row mappings. Keys of SBMLBatchCellModel objects do not change when rows are moved
+        self.__row_keys = []
+        self.__row_dict = {}
+        self.__next_key = 0
+
+        # {key:weak reference to SBMLBatchCellModel}
+        self.__cell_model_refs = {}
+
+        # keys of rows whose SBMLBatchCellModel objects were garbage-collected
+        self.__released_keys = []
+
+        # solver of the stacked model, block solvers are its clones. None if the stacked model was not compiled yet
+        self.__block_prototype = None
+        # saved state of the stacked model solver - new block solvers are restored from it without compilation
+        self.__block_prototype_state = None
+        # for every value group - (block_size x settable values of the group) indices within stacked model vectors
+        self.__block_indices = []
+        self.__blocks = []
+        # keys of rows integrated by every block - None means that block must be replaced before it is used
+        self.__block_keys = []
+        # state array after the last integration in blocks - used to detect values modified outside of integration
+        self.__synced_values = None
+        self.__uses_time = False
+        self.__has_events = False
+
+    def __len__(self):
+        self.compact()
+        return self.num_rows
+
+    def __is_settable(self, name: str) -> bool:
+        try:
+            self.rr.model[name] = self.rr.model[name]
+        except RuntimeError:
+            return False
+        return True
+
+    def __set_boundary_species(self, indices: np.ndarray, values: np.ndarray) -> None:
+        boundary_species_ids = self.rr.model.getBoundarySpeciesIds()
+        for idx, value in zip(indices, values):
+            self.rr.model[boundary_species_ids[idx]] = value
+
+    def __load_values(self, values: np.ndarray) -> None:
+        """
+        Transfers values to the shared solver
+
+        :param values: row of the state array
+        :return: None
+        """
+        for columns, getter, settable_indices, settable_columns, setter in self.__groups:
+            if len(settable_indices):
+                setter(settable_indices, values[settable_columns])
+
+    def __store_values(self, values: np.ndarray) -> None:
+        """
+        Transfers values from the shared solver
+
+        :param values: row of the state array
+        :return: None
+        """
+        for columns, getter, settable_indices, settable_columns, setter in self.__groups:
+            values[columns] = getter()
+
+    def __reserve(self, num_rows: int) -> None:
+        capacity = self.values.shape[0]
+        if num_rows <= capacity:
+            return
+
+        capacity = max(num_rows, 2 * capacity, 16)
+
+        def grow(arr: np.ndarray) -> np.ndarray:
+            new_arr = np.zeros((capacity,) + arr.shape[1:], dtype=arr.dtype)
+            new_arr[:self.num_rows] = arr[:self.num_rows]
+            return new_arr
+
+        self.values = grow(self.values)
+        self.time_start = grow(self.time_start)
+        self.step_size = grow(self.step_size)
+        self.cell_id = grow(self.cell_id)
+
+    def __release(self, key: int) -> None:
+        self.__released_keys.append(key)
+
+    def __add_row(self, cell_id: int, values: np.ndarray, time_start: float, step_size: float):
+        self.compact()
+        self.__reserve(self.num_rows + 1)
+
+        row = self.num_rows
+        self.values[row] = values
+        self.time_start[row] = time_start
+        self.step_size[row] = step_size
+        self.cell_id[row] = cell_id
+        self.num_rows += 1
+
+        key = self.__next_key
+        self.__next_key += 1
+        self.__row_keys.append(key)
+        self.__row_dict[key] = row
+
+        cell_model = SBMLBatchCellModel(batch=self, key=key, cell_id=cell_id)
+        self.__cell_model_refs[key] = weakref.ref(cell_model, lambda ref, released_key=key: self.__release(
+            released_key))
+
+        return cell_model
+
+    def add_cell(self, cell_id: int, step_size: float = 1.0, initial_conditions: Union[None, dict] = None):
+        """
+        Adds row for a cell
+
+        :param cell_id: id of the cell
+        :param step_size: integration step size
+        :param initial_conditions: initial conditions dictionary. Entries that cannot be set are ignored
+        :return: object that gives the cell access to its state
+        :rtype: SBMLBatchCellModel
+        """
+
+        cell_model = self.__add_row(cell_id=cell_id, values=self.initial_values, time_start=0.0,
+                                    step_size=step_size)
+
+        if initial_conditions:
+            for name, value in initial_conditions.items():
+                # as with regular solvers "unsettable" entries such as reaction rates are ignored
+                try:
+                    cell_model[name] = value
+                except (RuntimeError, KeyError):
+                    pass
+
+        return cell_model
+
+    def clone_cell(self, key: int, cell_id: int):
+        """
+        Adds row for a cell using state of an existing row
+
+        :param key: key of the source row
+        :param cell_id: id of the cell
+        :return: object that gives the cell access to its state
+        :rtype: SBMLBatchCellModel
+        """
+
+        row = self.row(key)
+        return self.__add_row(cell_id=cell_id, values=self.values[row].copy(), time_start=self.time_start[row],
+                              step_size=self.step_size[row])
+
+    def add_solver_cell(self, cell_id: int, rr: RoadRunnerPy):
+        """
+        Adds row for a cell using state of a solver of the same model - e.g. of a solver restored from restart files
+
+        :param cell_id: id of the cell
+        :param rr: solver with loaded model
+        :return: object that gives the cell access to its state
+        :rtype: SBMLBatchCellModel
+        """
+
+        values = np.array([rr.model[name] for name in self.value_names], dtype=np.float64)
+        return self.__add_row(cell_id=cell_id, values=values, time_start=rr.timeStart, step_size=rr.stepSize)
+
+    def compact(self) -> None:
+        """
+        Removes rows of released cell models. The last row is moved in place of every removed row
+
+        :return: None
+        """
+
+        while self.__released_keys:
+            key = self.__released_keys.pop()
+            row = self.__row_dict.pop(key)
+            del self.__cell_model_refs[key]
+
+            last_row = self.num_rows - 1
+            if row != last_row:
+                last_key = self.__row_keys[last_row]
+                self.values[row] = self.values[last_row]
+                self.time_start[row] = self.time_start[last_row]
+                self.step_size[row] = self.step_size[last_row]
+                self.cell_id[row] = self.cell_id[last_row]
+                self.__row_keys[row] = last_key
+                self.__row_dict[last_key] = row
+
+            self.__row_keys.pop()
+            self.num_rows -= 1
+
+    def row(self, key: int) -> int:
+        """
+        Returns current row of a cell model
+
+        :param key: key of the cell model
+        :return: row of the state array
+        """
+        return self.__row_dict[key]
+
+    def load_row(self, row: int) -> None:
+        """
+        Transfers state of a row to the shared solver
+
+        :param row: row of the state array
+        :return: None
+        """
+        self.__load_values(self.values[row])
+        self.rr.model.setTime(self.time_start[row])
+
+    def store_row(self, row: int) -> None:
+        """
+        Transfers state of the shared solver to a row
+
+        :param row: row of the state array
+        :return: None
+        """
+        self.__store_values(self.values[row])
+
+    def get_value(self, key: int, name: str) -> float:
+        """
+        Returns value of the cell model. Values that are not stored in the state array (e.g. reaction rates,
+        concentrations or values defined by assignment rules) are evaluated by the shared solver
+
+        :param key: key of the cell model
+        :param name: name of the value
+        :return: value
+        """
+        row = self.row(key)
+        if name in self.__settable_name_set:
+            return float(self.values[row, self.column_dict[name]])
+
+        self.load_row(row)
+        return self.rr.model[name]
+
+    def set_value(self, key: int, name: str, value: float) -> None:
+        """
+        Sets value of the cell model
+
+        :param key: key of the cell model
+        :param name: name of the value
+        :param value: value
+        :return: None
+        """
+        row = self.row(key)
+        if name in self.__settable_name_set:
+            self.values[row, self.column_dict[name]] = value
+            return
+
+        self.load_row(row)
+        self.rr.model[name] = value
+        self.store_row(row)
+
+    def get_values(self, name: str) -> np.ndarray:
+        """
+        Returns values of all cells of the batch - ordered as :attr:`cell_ids`. Columns are returned as views of the
+        state array and must not be modified after cells are added or removed
+
+        :param name: name of the value
+        :return: array of values
+        """
+        self.compact()
+        try:
+            return self.values[:self.num_rows, self.column_dict[name]]
+        except KeyError:
+            raise KeyError('Model {} has no value {} that can be accessed in batch'.format(self.model_name, name))
+
+    @property
+    def cell_ids(self) -> np.ndarray:
+        """
+        Ids of cells of the batch - ordered as rows of the state array
+
+        :return: array of cell ids
+        """
+        self.compact()
+        return self.cell_id[:self.num_rows]
+
+    def timestep_rows(self, rows: Union[range, List[int], np.ndarray], num_steps: int = 1,
+                      step_size: float = -1.0) -> None:
+        """
+        Integrates forward given rows
+
+        :param rows: rows of the state array
+        :param num_steps: number of steps
+        :param step_size: custom step size. Non-positive value means using step size of each row
+        :return: None
+        """
+
+        rr = self.rr
+        for row in rows:
+            if step_size > 0.0:
+                delta_t = num_steps * step_size
+            else:
+                delta_t = num_steps * self.step_size[row]
+
+            self.load_row(row)
+            # restarting integrator from the state of the row
+            rr.oneStep(self.time_start[row], delta_t, True)
+            self.store_row(row)
+            self.time_start[row] += delta_t
+
+    def timestep(self) -> None:
+        """
+        Integrates forward all cells of the batch
+
+        :return: None
+        """
+        self.compact()
+        if not self.__timestep_blocks():
+            self.timestep_rows(range(self.num_rows))
+
+    def __build_block_prototype(self) -> bool:
+        """
+        Compiles stacked model used by block solvers
+
+        :return: True if block solvers can be used
+        """
+
+        try:
+            sbml = self.rr.getSBML()
+            stacked_rr = RoadRunnerPy()
+            stacked_rr.load_model(model_string=stack_sbml_model(sbml, self.block_size))
+
+            stacked_model = stacked_rr.model
+            stacked_groups = [stacked_model.getFloatingSpeciesIds(), stacked_model.getBoundarySpeciesIds(),
+                              stacked_model.getGlobalParameterIds(), stacked_model.getCompartmentIds()]
+
+            block_indices = []
+            for (columns, getter, settable_indices, settable_columns, setter), kind in zip(self.__groups,
+                                                                                           self.__group_kinds):
+                stacked_index = {name: idx for idx, name in enumerate(stacked_groups[kind])}
+                block_indices.append(np.array(
+                    [[stacked_index[name + STACKED_ID_SUFFIX.format(copy_idx)] for name in self.value_names[columns]]
+                     for copy_idx in range(self.block_size)], dtype=np.int32))
+
+        except (ET.ParseError, RuntimeError, KeyError) as e:
+            warnings.warn('Batched SBML model {} will be integrated cell by cell. '
+                          'Could not build stacked model: {}'.format(self.model_name, e))
+            self.block_size = 0
+            return False
+
+        integrator = self.rr.getIntegrator()
+        stacked_rr.setIntegrator(integrator.getName())
+        stacked_integrator = stacked_rr.getIntegrator()
+        for setting in integrator.getSettings():
+            stacked_integrator.setValue(setting, integrator.getValue(setting))
+        stacked_rr.selections = []
+
+        self.__block_indices = block_indices
+        self.__uses_time = sbml_uses_time(sbml)
+        self.__has_events = stacked_model.getNumEvents() > 0
+        self.__block_prototype = stacked_rr
+        if RoadRunnerPy.model_cache.enabled:
+            self.__block_prototype_state = stacked_rr.saveStateS()
+        return True
+
+    def __new_block(self) -> RoadRunnerPy:
+        """
+        Returns new block solver
+
+        :return: solver of the stacked model
+        """
+        if self.__block_prototype_state is None:
+            return self.__block_prototype.clone()
+
+        block = RoadRunnerPy()
+        block.loadStateS(self.__block_prototype_state)
+        block.selections = []
+        return block
+
+    def __load_block(self, block: RoadRunnerPy, first_row: int, last_row: int) -> None:
+        """
+        Transfers state of rows to a block solver
+
+        :param block: block solver
+        :param first_row: first row of the block
+        :param last_row: row past the last row of the block
+        :return: None
+        """
+        model = block.model
+        setters = [model.setFloatingSpeciesAmounts, model.setBoundarySpeciesAmounts,
+                   model.setGlobalParameterValues, model.setCompartmentVolumes]
+        num_rows = last_row - first_row
+        for (columns, getter, settable_indices, settable_columns, setter), kind, block_indices in zip(
+                self.__groups, self.__group_kinds, self.__block_indices):
+            if len(settable_indices):
+                setters[kind](block_indices[:num_rows, settable_indices].ravel(),
+                              self.values[first_row:last_row, settable_columns].ravel())
+        model.setTime(self.time_start[first_row])
+
+    def __store_block(self, block: RoadRunnerPy, first_row: int, last_row: int) -> None:
+        """
+        Transfers state of a block solver to rows
+
+        :param block: block solver
+        :param first_row: first row of the block
+        :param last_row: row past the last row of the block
+        :return: None
+        """
+        model = block.model
+        getters = [model.getFloatingSpeciesAmounts, model.getBoundarySpeciesAmounts,
+                   model.getGlobalParameterValues, model.getCompartmentVolumes]
+        num_rows = last_row - first_row
+        for (columns, getter, settable_indices, settable_columns, setter), kind, block_indices in zip(
+                self.__groups, self.__group_kinds, self.__block_indices):
+            self.values[first_row:last_row, columns] = np.asarray(getters[kind]())[block_indices[:num_rows]]
+
+    def __timestep_blocks(self) -> bool:
+        """
+        Integrates forward all rows using block solvers
+
+        :return: False if rows cannot be integrated in blocks
+        """
+
+        num_rows = self.num_rows
+        if self.block_size < 1 or num_rows == 0:
+            return False
+
+        delta_t = self.step_size[0]
+        if np.any(self.step_size[:num_rows] != delta_t):
+            return False
+
+        if self.__block_prototype is None and not self.__build_block_prototype():
+            return False
+
+        if self.__uses_time and np.any(self.time_start[:num_rows] != self.time_start[0]):
+            return False
+
+        block_size = self.block_size
+        num_blocks = (num_rows + block_size - 1) // block_size
+        while len(self.__blocks) < num_blocks:
+            self.__blocks.append(None)
+            self.__block_keys.append(None)
+
+        synced_values = self.__synced_values
+        for block_idx in range(num_blocks):
+            first_row = block_idx * block_size
+            last_row = min(first_row + block_size, num_rows)
+            keys = tuple(self.__row_keys[first_row:last_row])
+
+            block = self.__blocks[block_idx]
+            if keys != self.__block_keys[block_idx]:
+                if block is None or self.__has_events:
+                    # pending events of removed rows must not be applied to new rows - block gets fresh solver
+                    block = self.__blocks[block_idx] = self.__new_block()
+                reset = True
+            else:
+                reset = not np.array_equal(self.values[first_row:last_row], synced_values[first_row:last_row],
+                                           equal_nan=True)
+
+            if reset:
+                self.__load_block(block, first_row, last_row)
+
+            block.oneStep(block.model.getTime(), delta_t, reset)
+            self.__store_block(block, first_row, last_row)
+            self.__block_keys[block_idx] = keys
+
+        # blocks past the last row are released - rows that fill them later get fresh solvers
+        del self.__blocks[num_blocks:]
+        del self.__block_keys[num_blocks:]
+
+        self.time_start[:num_rows] += delta_t
+        self.__synced_values = self.values[:num_rows].copy()
+
+        return True
+
+    def row_state(self, key: int) -> dict:
+        """
+        Returns state of the cell model in the format used when pickling
+        :class:`cc3d.core.RoadRunnerPy.RoadRunnerPy`
+
+        :param key: key of the cell model
+        :return: state dictionary
+        """
+
+        row = self.row(key)
+        integrator = self.rr.getIntegrator()
+
+        # RoadRunnerPy restores species and global parameters
+        compartment_ids = set(self.rr.model.getCompartmentIds())
+        model_state = {}
+        for name in self.settable_names:
+            if name not in compartment_ids:
+                model_state[name] = float(self.values[row, self.column_dict[name]])
+
+        return {'SimulateOptions': {'stepSize': float(self.step_size[row]),
+                                    'timeStart': float(self.time_start[row]),
+                                    'timeEnd': float(self.time_start[row]),
+                                    'relative': integrator.relative_tolerance,
+                                    'absolute': integrator.absolute_tolerance,
+                                    'stiff': integrator.stiff,
+                                    'steps': integrator.maximum_num_steps},
+                'ModelState': model_state,
+                'Batch': {'ModelName': self.model_name,
+                          'BlockSize': self.block_size,
+                          'Integrator': integrator.getName(),
+                          'IntegratorSettings': {setting: integrator.getValue(setting)
+                                                 for setting in integrator.getSettings()}}}
+
+
+def restore_batched_cell_model(batches: dict, rr: RoadRunnerPy, cell_id: int):
+    """
+    Returns cell model that puts state of a solver restored from a pickled :class:`SBMLBatchCellModel` back to
+    its batch. The batch is created (with integrator settings of the pickled batch) if it does not exist
+
+    :param batches: dictionary {model name:batch}
+    :param rr: solver restored from a pickled :class:`SBMLBatchCellModel` after its model was loaded
+    :param cell_id: id of the cell
+    :return: object that gives the cell access to its state
+    :rtype: SBMLBatchCellModel
+    """
+
+    batch_state = rr.batchState
+    model_name = batch_state['ModelName']
+
+    try:
+        batch = batches[model_name]
+    except KeyError:
+        # shared solver is loaded separately - values of cells added to the batch later are initialized from it
+        batch_rr = RoadRunnerPy(_path=rr.path, _modelString=rr.modelString)
+        batch_rr.loadSBML(_externalPath=rr.absPath)
+        batch_rr.setIntegrator(batch_state['Integrator'])
+        integrator = batch_rr.getIntegrator()
+        for setting, value in batch_state['IntegratorSettings'].items():
+            integrator.setValue(setting, value)
+        batch_rr.selections = []
+
+        batch = SBMLBatch(model_name=model_name, rr=batch_rr, block_size=batch_state['BlockSize'])
+        batches[model_name] = batch
+
+    return batch.add_solver_cell(cell_id=cell_id, rr=rr)
+
+
+class SBMLBatchCellModel:
+    """
+    SBML model of a single cell that belongs to :class:`SBMLBatch`. Supports the parts of
+    :class:`cc3d.core.RoadRunnerPy.RoadRunnerPy` API used by cells - item access (also via model attribute),
+    stepSize and timestep(). When pickled (e.g. for restart) it is stored as a regular
+    :class:`cc3d.core.RoadRunnerPy.RoadRunnerPy`
+    """
+
+    def __init__(self, batch: SBMLBatch, key: int, cell_id: int):
+        self.batch = batch
+        self.key = key
+        self.cell_id = cell_id
+
+    @property
+    def model(self):
+        return self
+
+    @property
+    def path(self) -> str:
+        return self.batch.rr.path
+
+    @property
+    def modelString(self) -> str:
+        return self.batch.rr.modelString
+
+    @property
+    def stepSize(self) -> float:
+        return float(self.batch.step_size[self.batch.row(self.key)])
+
+    @stepSize.setter
+    def stepSize(self, step_size: float) -> None:
+        self.batch.step_size[self.batch.row(self.key)] = step_size
+
+    @property
+    def timeStart(self) -> float:
+        return float(self.batch.time_start[self.batch.row(self.key)])
+
+    def setStepSize(self, _stepSize):
+        self.stepSize = _stepSize
+
+    def timestep(self, _numSteps=1, _stepSize=-1.0):
+        self.batch.timestep_rows([self.batch.row(self.key)], num_steps=_numSteps, step_size=_stepSize)
+
+    def getIntegrator(self):
+        return self.batch.rr.getIntegrator()
+
+    def getCurrentSBML(self) -> str:
+        self.batch.load_row(self.batch.row(self.key))
+        return self.batch.rr.getCurrentSBML()
+
+    def keys(self) -> List[str]:
+        return list(self.batch.value_names)
+
+    def items(self):
+        return [(name, self[name]) for name in self.batch.value_names]
+
+    def values(self):
+        return [self[name] for name in self.batch.value_names]
+
+    def __getitem__(self, item: str) -> float:
+        return self.batch.get_value(self.key, item)
+
+    def __setitem__(self, key: str, value: float) -> None:
+        self.batch.set_value(self.key, key, value)
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.batch.column_dict
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.batch.value_names)
+
+    def __reduce__(self):
+        return RoadRunnerPy, (self.path, self.modelString), self.batch.row_state(self.key)
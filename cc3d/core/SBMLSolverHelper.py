@@ -17,6 +17,7 @@ except ImportError:
 try:
     import roadrunner
     from .RoadRunnerPy import RoadRunnerPy
+    from .SBMLBatch import SBMLBatch, SBMLBatchCellModel
 
     roadrunner_available = True
 except ImportError:
@@ -74,9 +75,9 @@ class SBMLSolverHelper(object):
                                'add_sbml_to_cell_ids', 'add_sbml_to_cell_types', 'clone_sbml_simulators',
                                'copy_sbml_simulators', 'delete_free_floating_sbml', 'delete_sbml_from_cell',
                                'delete_sbml_from_link', 'delete_sbml_from_cell_ids', 'delete_sbml_from_cell_types',
-                               'get_sbml_global_options', 'get_sbml_simulator', 'get_sbml_state',
+                               'get_sbml_batch', 'get_sbml_global_options', 'get_sbml_simulator', 'get_sbml_state',
                                'get_sbml_state_as_python_dict', 'get_sbml_value', 'normalize_path',
-                               'set_sbml_global_options', 'set_sbml_state', 'set_sbml_value', 'set_step_size_for_cell',
+                               'set_sbml_global_options', 'set_sbml_model_cache_dir', 'set_sbml_state', 'set_sbml_value', 'set_step_size_for_cell',
                                'set_step_size_for_link', 'set_step_size_for_cell_ids', 'set_step_size_for_cell_types',
                                'set_step_size_for_free_floating_sbml',
                                'timestep_cell_sbml', 'timestep_link_sbml', 'timestep_free_floating_sbml',
@@ -124,7 +125,8 @@ class SBMLSolverHelper(object):
                          step_size: float = 1.0,
                          initial_conditions: Union[None, dict] = None, options: Union[None, dict] = None,
                          current_state_sbml: object = None,
-                         integrator: str = None) -> None:
+                         integrator: str = None,
+                         batched: bool = False) -> None:
         """
         Attaches :class:`~cc3d.core.RoadRunnerPy.RoadRunnerPy` instance to a particular cell. The sbml solver is stored
         as an element of the cell's dictionary - cell.dict['SBMLSolver'][_modelName]. The function has a dual operation
@@ -160,6 +162,12 @@ class SBMLSolverHelper(object):
         :param integrator: name of integrator; passed to ``RoadRunner.setIntegrator()``;
             only applied if ``current_state_sbml`` is None
 
+        :param batched: if True the cell joins batch of cells that share the model with name model_name
+            (see :meth:`get_sbml_batch`). All cells of the batch are integrated by a single solver and their states
+            are stored in one array which removes per-cell overhead when many cells carry the same model.
+            Solver options and integrator of the first cell added to the batch apply to all cells of the batch.
+            Only applied if ``current_state_sbml`` is None
+
         :return: None
         """
 
@@ -189,6 +197,17 @@ class SBMLSolverHelper(object):
         else:
             dict_attrib['SBMLSolver'] = sbml_dict
 
+        if batched and current_state_sbml is None:
+            sbml_batch = self.__fetch_sbml_batch(model_name=core_model_name, model_file=model_file,
+                                                 model_string=model_string,
+                                                 model_path_normalized=model_path_normalized,
+                                                 options=options, integrator=integrator)
+            sbml_dict[core_model_name] = sbml_batch.add_cell(cell_id=cell.id, step_size=step_size,
+                                                             initial_conditions=initial_conditions)
+            return
+
+        CompuCellSetup.persistent_globals.unbatched_cell_sbml = True
+
         if current_state_sbml is None:
             rr = RoadRunnerPy(_path=model_file, _modelString=model_string)
             # setting stepSize
@@ -226,6 +245,17 @@ class SBMLSolverHelper(object):
         # setting output results array size
         rr.selections = []  # by default we do not request any output array at each intergration step
 
+        self.__apply_integrator_options(rr=rr, options=options)
+
+    def __apply_integrator_options(self, rr, options: dict) -> None:
+        """
+        Applies solver options - if options are empty global SBML options are applied
+
+        :param rr: sbml solver
+        :param options: dictionary of solver options
+        :return: None
+        """
+
         if options:
             for name, value in options.items():
 
@@ -246,6 +276,61 @@ class SBMLSolverHelper(object):
                         setattr(rr.getIntegrator(), self.option_name_dict[name], value)
                         # setattr(rr.simulateOptions,name,value)
 
+    def __fetch_sbml_batch(self, model_name: str, model_file: str, model_string: str, model_path_normalized: str,
+                           options: dict, integrator: Union[str, None]):
+        """
+        Returns batch of cell models with a given name - the batch is created if it does not exist
+
+        :param model_name: model name
+        :param model_file: name of the SBML file
+        :param model_string: string of SBML file
+        :param model_path_normalized: normalized path of the SBML file
+        :param options: dictionary of solver options
+        :param integrator: name of integrator
+        :return: batch of cell models
+        :rtype: SBMLBatch
+        """
+
+        pg = CompuCellSetup.persistent_globals
+
+        try:
+            sbml_batch = pg.sbml_batches[model_name]
+        except KeyError:
+            sbml_batch = None
+
+        if sbml_batch is not None:
+            if sbml_batch.rr.path != model_file or sbml_batch.rr.modelString != model_string:
+                raise RuntimeError('Batched SBML model ' + model_name + ' is already defined by a different '
+                                   'model specification')
+            return sbml_batch
+
+        rr = RoadRunnerPy(_path=model_file, _modelString=model_string)
+        rr.loadSBML(_externalPath=model_path_normalized, _modelString=model_string)
+        if integrator is not None:
+            rr.setIntegrator(name=integrator)
+        rr.selections = []
+        self.__apply_integrator_options(rr=rr, options=options)
+
+        sbml_batch = SBMLBatch(model_name=model_name, rr=rr)
+        pg.sbml_batches[model_name] = sbml_batch
+
+        return sbml_batch
+
+    def get_sbml_batch(self, model_name: str):
+        """
+        Returns batch of cell models added with batched=True. Values of all cells of the batch can be read at once,
+        e.g. ``batch.get_values('S1')`` returns array of S1 values ordered as ``batch.cell_ids``
+
+        :param str model_name: model name
+        :return: batch of cell models or None
+        :rtype: SBMLBatch or None
+        """
+
+        try:
+            return CompuCellSetup.persistent_globals.sbml_batches[model_name]
+        except KeyError:
+            return None
+
     def add_sbml_to_link(self,
                          link: CompuCell.FocalPointPlasticityLinkBase,
                          model_file: str = '',
@@ -360,7 +445,8 @@ class SBMLSolverHelper(object):
                              cell: object = None, step_size: float = 1.0,
                              initial_conditions: Union[None, dict] = None, options: Union[None, dict] = None,
                              current_state_sbml: object = None,
-                             integrator: str = None) -> None:
+                             integrator: str = None,
+                             batched: bool = False) -> None:
         """
         Same as :meth:`add_sbml_to_cell`, but with Antimony model specification
         Note that initial conditions can be specified either in the Antimony model specification,
@@ -374,6 +460,8 @@ class SBMLSolverHelper(object):
         :param dict initial_conditions: initial conditions dictionary, optional
         :param dict options: dictionary that currently only defines what type of ODE solver to choose.
         :param current_state_sbml: string representation of the SBML representing current state of the solver.
+        :param batched: if True cells join batch of cells that share the model
+            (see :meth:`add_sbml_to_cell`)
         :return: None
         """
         translated_model_string, main_module_name = self.translate_to_sbml_string(model_file=model_file,
@@ -382,7 +470,8 @@ class SBMLSolverHelper(object):
             model_name = main_module_name
         self.add_sbml_to_cell(model_string=translated_model_string, model_name=model_name,
                               cell=cell, step_size=step_size, initial_conditions=initial_conditions,
-                              options=options, current_state_sbml=current_state_sbml, integrator=integrator)
+                              options=options, current_state_sbml=current_state_sbml, integrator=integrator,
+                              batched=batched)
 
     def add_antimony_to_link(self,
                              link: CompuCell.FocalPointPlasticityLinkBase,
@@ -411,7 +500,8 @@ class SBMLSolverHelper(object):
                            cell: object = None, step_size: float = 1.0,
                            initial_conditions: Union[None, dict] = None, options: Union[None, dict] = None,
                            current_state_sbml: object = None,
-                           integrator: str = None) -> None:
+                           integrator: str = None,
+                           batched: bool = False) -> None:
         """
         Same as :meth:`add_sbml_to_cell`, but with CellML model specification
         Note that initial conditions can be specified either in the CellML model specification,
@@ -425,12 +515,15 @@ class SBMLSolverHelper(object):
         :param dict initial_conditions: initial conditions dictionary, optional
         :param dict options: dictionary that currently only defines what type of ODE solver to choose.
         :param current_state_sbml: string representation of the SBML representing current state of the solver.
+        :param batched: if True cells join batch of cells that share the model
+            (see :meth:`add_sbml_to_cell`)
         :return: None
         """
         self.add_antimony_to_cell(model_file=model_file, model_string=model_string, model_name=model_name,
                                   cell=cell, step_size=step_size,
                                   initial_conditions=initial_conditions, options=options,
-                                  current_state_sbml=current_state_sbml, integrator=integrator)
+                                  current_state_sbml=current_state_sbml, integrator=integrator,
+                                  batched=batched)
 
     def add_cellml_to_link(self,
                            link: CompuCell.FocalPointPlasticityLinkBase,
@@ -470,6 +563,18 @@ class SBMLSolverHelper(object):
     def setSBMLGlobalOptions(self, _options):
         return self.set_sbml_global_options(_options)
 
+    def set_sbml_model_cache_dir(self, cache_dir: Union[str, None]) -> None:
+        """
+        Sets directory where compiled SBML models are stored. Compiled models are reused between runs - e.g. by
+        simulations of a parameter scan - so that the same model is not compiled again. Can be also set using
+        CC3D_SBML_MODEL_CACHE_DIR environment variable. None disables storing compiled models on disk
+
+        :param cache_dir: directory of compiled models
+        :return: None
+        """
+
+        RoadRunnerPy.model_cache.cache_dir = cache_dir
+
     def set_sbml_global_options(self, options: dict) -> None:
         """
         Deprecated - sets global SBML options
@@ -491,7 +596,8 @@ class SBMLSolverHelper(object):
                                cell_types: Union[None, list] = None,
                                step_size: float = 1.0, initial_conditions: Union[None, dict] = None,
                                options: Union[None, dict] = None,
-                               integrator: str = None) -> None:
+                               integrator: str = None,
+                               batched: bool = False) -> None:
         """
         Adds SBML Solver to all cells of given cell type - internally it calls addSBMLToCell(fcn).
         Used during initialization of the simulation. It is important to always set
@@ -513,6 +619,9 @@ class SBMLSolverHelper(object):
 
         :param integrator: name of integrator; passed to ``RoadRunner.setIntegrator()``
 
+        :param batched: if True cells join batch of cells that share the model
+            (see :meth:`add_sbml_to_cell`)
+
         :return: None
         """
 
@@ -528,13 +637,15 @@ class SBMLSolverHelper(object):
         for cell in self.cellListByType(*cell_types):
             self.add_sbml_to_cell(model_file=model_file, model_string=model_string, model_name=model_name, cell=cell,
                                   step_size=step_size,
-                                  initial_conditions=initial_conditions, options=options, integrator=integrator)
+                                  initial_conditions=initial_conditions, options=options, integrator=integrator,
+                                  batched=batched)
 
     def add_antimony_to_cell_types(self, model_file: str = '', model_string: str = '',
                                    model_name: str = '', cell_types: Union[None, list] = None,
                                    step_size: float = 1.0, initial_conditions: Union[None, dict] = None,
                                    options: Union[None, dict] = None,
-                                   integrator: str = None) -> None:
+                                   integrator: str = None,
+                                   batched: bool = False) -> None:
         """
         Same as :meth:`add_sbml_to_cell_types`, but with Antimony model specification
         Note that initial conditions can be specified either in the Antimony model specification,
@@ -548,6 +659,8 @@ class SBMLSolverHelper(object):
         :param float step_size: time step
         :param dict initial_conditions: initial conditions dictionary
         :param options: dictionary that currently only defines what type of ODE solver to choose.
+        :param batched: if True cells join batch of cells that share the model
+            (see :meth:`add_sbml_to_cell`)
         :return: None
         """
         translated_model_string, main_module_name = self.translate_to_sbml_string(model_file=model_file,
@@ -556,13 +669,15 @@ class SBMLSolverHelper(object):
             model_name = main_module_name
         self.add_sbml_to_cell_types(model_string=translated_model_string, model_name=model_name,
                                     cell_types=cell_types, step_size=step_size,
-                                    initial_conditions=initial_conditions, options=options, integrator=integrator)
+                                    initial_conditions=initial_conditions, options=options, integrator=integrator,
+                                    batched=batched)
 
     def add_cellml_to_cell_types(self, model_file: str = '', model_string: str = '',
                                  model_name: str = '', cell_types: Union[None, list] = None,
                                  step_size: float = 1.0, initial_conditions: Union[None, dict] = None,
                                  options: Union[None, dict] = None,
-                                 integrator: str = None) -> None:
+                                 integrator: str = None,
+                                 batched: bool = False) -> None:
         """
         Same as :meth:`add_sbml_to_cell_types`, but with CellML model specification
         Note that initial conditions can be specified either in the CellML model specification,
@@ -576,11 +691,14 @@ class SBMLSolverHelper(object):
         :param float step_size: time step
         :param dict initial_conditions: initial conditions dictionary
         :param options: dictionary that currently only defines what type of ODE solver to choose.
+        :param batched: if True cells join batch of cells that share the model
+            (see :meth:`add_sbml_to_cell`)
         :return: None
         """
         self.add_antimony_to_cell_types(model_file=model_file, model_string=model_string,
                                         model_name=model_name, cell_types=cell_types, step_size=step_size,
-                                        initial_conditions=initial_conditions, options=options, integrator=integrator)
+                                        initial_conditions=initial_conditions, options=options, integrator=integrator,
+                                        batched=batched)
 
     @deprecated(version='4.0.0', reason="You should use : add_sbml_to_cell_ids")
     def addSBMLToCellIds(self, _modelFile, _modelName='', _ids=[], _stepSize=1.0, _initialConditions={}, _options={}):
@@ -591,7 +709,8 @@ class SBMLSolverHelper(object):
                              cell_ids: Union[None, list] = None,
                              step_size: float = 1.0, initial_conditions: Union[None, dict] = None,
                              options: Union[None, dict] = None,
-                             integrator: str = None) -> None:
+                             integrator: str = None,
+                             batched: bool = False) -> None:
         """
         Adds SBML Solver to all cells of given cell ids - internally it calls add_sbml_to_cell fcn.
         Used during initialization of the simulation. It is important to always set
@@ -618,6 +737,9 @@ class SBMLSolverHelper(object):
 
         :param integrator: name of integrator; passed to ``RoadRunner.setIntegrator()``
 
+        :param batched: if True cells join batch of cells that share the model
+            (see :meth:`add_sbml_to_cell`)
+
         :return: None
         """
 
@@ -636,13 +758,15 @@ class SBMLSolverHelper(object):
 
             self.add_sbml_to_cell(model_file=model_file, model_string=model_string, model_name=model_name, cell=cell,
                                   step_size=step_size,
-                                  initial_conditions=initial_conditions, options=options, integrator=integrator)
+                                  initial_conditions=initial_conditions, options=options, integrator=integrator,
+                                  batched=batched)
 
     def add_antimony_to_cell_ids(self, model_file: str = '', model_string: str = '', model_name: str = '',
                                  cell_ids: Union[None, list] = None, step_size: float = 1.0,
                                  initial_conditions: Union[None, dict] = None,
                                  options: Union[None, dict] = None,
-                                 integrator: str = None) -> None:
+                                 integrator: str = None,
+                                 batched: bool = False) -> None:
         """
         Same as :meth:`add_sbml_to_cell_ids`, but with Antimony model specification
         Note that initial conditions can be specified either in the Antimony model specification,
@@ -656,6 +780,8 @@ class SBMLSolverHelper(object):
         :param step_size: time step - determines how much in "real" time units timestep() fcn advances SBML solver
         :param initial_conditions: initial conditions dictionary
         :param options: dictionary that currently only defines what type of ODE solver to choose.
+        :param batched: if True cells join batch of cells that share the model
+            (see :meth:`add_sbml_to_cell`)
         :return: None
         """
         translated_model_string, main_module_name = self.translate_to_sbml_string(model_file=model_file,
@@ -664,13 +790,14 @@ class SBMLSolverHelper(object):
             model_name = main_module_name
         self.add_sbml_to_cell_ids(model_string=translated_model_string, model_name=model_name,
                                   cell_ids=cell_ids, step_size=step_size, initial_conditions=initial_conditions,
-                                  options=options, integrator=integrator)
+                                  options=options, integrator=integrator, batched=batched)
 
     def add_cellml_to_cell_ids(self, model_file: str = '', model_string: str = '', model_name: str = '',
                                cell_ids: Union[None, list] = None, step_size: float = 1.0,
                                initial_conditions: Union[None, dict] = None,
                                options: Union[None, dict] = None,
-                               integrator: str = None) -> None:
+                               integrator: str = None,
+                               batched: bool = False) -> None:
         """
         Same as :meth:`add_sbml_to_cell_ids`, but with CellML model specification
         Note that initial conditions can be specified either in the CellML model specification,
@@ -684,12 +811,14 @@ class SBMLSolverHelper(object):
         :param step_size: time step - determines how much in "real" time units timestep() fcn advances SBML solver
         :param initial_conditions: initial conditions dictionary
         :param options: dictionary that currently only defines what type of ODE solver to choose.
+        :param batched: if True cells join batch of cells that share the model
+            (see :meth:`add_sbml_to_cell`)
         :return: None
         """
         self.add_antimony_to_cell_ids(model_file=model_file, model_string=model_string,
                                       model_name=model_name, cell_ids=cell_ids, step_size=step_size,
                                       initial_conditions=initial_conditions,
-                                      options=options, integrator=integrator)
+                                      options=options, integrator=integrator, batched=batched)
 
     @deprecated(version='4.0.0', reason="You should use : add_free_floating_sbml")
     def addFreeFloatingSBML(self, _modelFile, _modelName, _stepSize=1.0, _initialConditions={}, _options={}):
@@ -937,6 +1066,15 @@ class SBMLSolverHelper(object):
         :return: None
         """
 
+        pg = CompuCellSetup.persistent_globals
+
+        # batched models are integrated without visiting cells
+        for sbml_batch in pg.sbml_batches.values():
+            sbml_batch.timestep()
+
+        if not pg.unbatched_cell_sbml:
+            return
+
         # time-stepping SBML attached to cells
         for cell in self.cellList:
             dict_attrib = CompuCell.getPyAttrib(cell)
@@ -944,6 +1082,8 @@ class SBMLSolverHelper(object):
                 sbml_dict = dict_attrib['SBMLSolver']
 
                 for model_name, rrTmp in sbml_dict.items():
+                    if isinstance(rrTmp, SBMLBatchCellModel):
+                        continue
                     # integrating SBML
                     rrTmp.timestep()
 
@@ -1303,7 +1443,7 @@ class SBMLSolverHelper(object):
         :param cc3d.cpp.CompuCell.CellG to_cell: target cell
         :param sbml_names: list of SBML model name whose solver are to be copied, optional
         :type sbml_names: list of str
-        :param options: Deprecated - list of SBML solver options
+        :param options: Deprecated - list of SBML solver options. Not supported for batched models
         :return: None
         """
         sbml_names = self.__default_mutable_type(sbml_names, [])
@@ -1336,20 +1476,23 @@ class SBMLSolverHelper(object):
             # dict_attrib_to['SBMLSolver'] = {}
             # sbml_dict_to = dict_attrib_to['SBMLSolver']
 
+        if options:
+            for sbml_name in sbml_names_to_copy:
+                if isinstance(sbml_dict_from[sbml_name], SBMLBatchCellModel):
+                    raise ValueError('Solver options of batched SBML model ' + sbml_name + ' apply to all cells of '
+                                     'the batch and cannot be set when copying the model to a cell')
+
         for sbml_name in sbml_names_to_copy:
             rr_from = sbml_dict_from[sbml_name]
-            current_state_sbml = sbml_dict_from[sbml_name].getCurrentSBML()
-            self.add_sbml_to_cell(
-                model_file=rr_from.path,  # necessary to get deserialization working properly
-                model_name=sbml_name,
-                cell=to_cell,
-                step_size=rr_from.stepSize,
-                options=options,
-                current_state_sbml=current_state_sbml
-            )
-            # Assume same integrator; user can decide what to do with settings
-            rr_to = self.get_sbml_simulator(model_name=sbml_name, cell=to_cell)
-            rr_to.setIntegrator(rr_from.getIntegrator().getName())
+            if isinstance(rr_from, SBMLBatchCellModel):
+                self.__clone_batched_sbml(cell_model=rr_from, model_name=sbml_name, cell=to_cell)
+                continue
+
+            # cloning copies compiled model, state and integrator settings
+            rr_to = rr_from.clone()
+            if options:
+                self.__apply_integrator_options(rr=rr_to, options=options)
+            self.__attach_sbml_solver(rr=rr_to, model_name=sbml_name, cell=to_cell)
 
     def clone_sbml_simulators(self,
                               from_obj: Union[CompuCell.CellG, CompuCell.FocalPointPlasticityLinkBase],
@@ -1362,6 +1505,8 @@ class SBMLSolverHelper(object):
             - CompuCell.CellG
             - CompuCell.FocalPointPlasticityLinkBase
 
+        Batched models can be cloned only to cells
+
         :param from_obj: source object with the SBML solvers to be copied
         :param to_obj: target object receiving the copied SBML solvers
         :param sbml_names:
@@ -1376,9 +1521,9 @@ class SBMLSolverHelper(object):
         supported_from = False
         supported_to = False
         for st in supported_types:
-            if isinstance(supported_from, st):
+            if isinstance(from_obj, st):
                 supported_from = True
-            if isinstance(supported_to, st):
+            if isinstance(to_obj, st):
                 supported_to = True
         if not supported_from:
             raise TypeError('Source object type is not supported')
@@ -1406,29 +1551,67 @@ class SBMLSolverHelper(object):
         else:
             sbml_names_to_copy = sbml_names
 
+        if not isinstance(to_obj, CompuCell.CellG):
+            for sbml_name in sbml_names_to_copy:
+                if isinstance(sbml_dict_from[sbml_name], SBMLBatchCellModel):
+                    raise TypeError('Batched SBML model ' + sbml_name + ' can be cloned only to cells')
+
         for sbml_name in sbml_names_to_copy:
             rr_from = sbml_dict_from[sbml_name]
-            current_state_sbml = sbml_dict_from[sbml_name].getCurrentSBML()
+            if isinstance(rr_from, SBMLBatchCellModel):
+                self.__clone_batched_sbml(cell_model=rr_from, model_name=sbml_name, cell=to_obj)
+                continue
+
+            # cloning copies compiled model, state and integrator settings
             if isinstance(to_obj, CompuCell.CellG):
-                self.add_sbml_to_cell(
-                    model_file=rr_from.path,  # necessary to get deserialization working properly
-                    model_name=sbml_name,
-                    step_size=rr_from.stepSize,
-                    current_state_sbml=current_state_sbml,
-                    cell=to_obj
-                )
-                # Assume same integrator; user can decide what to do with settings
-                rr_to = self.get_sbml_simulator(model_name=sbml_name, cell=to_obj)
+                self.__attach_sbml_solver(rr=rr_from.clone(), model_name=sbml_name, cell=to_obj)
             else:
-                self.add_sbml_to_link(
-                    model_file=rr_from.path,  # necessary to get deserialization working properly
-                    model_name=sbml_name,
-                    step_size=rr_from.stepSize,
-                    current_state_sbml=current_state_sbml,
-                    link=to_obj,
-                )
-                rr_to = self.get_sbml_simulator(model_name=sbml_name, link=to_obj)
-            rr_to.setIntegrator(rr_from.getIntegrator().getName())
+                self.__attach_sbml_solver(rr=rr_from.clone(), model_name=sbml_name, link=to_obj)
+
+    @staticmethod
+    def __attach_sbml_solver(rr, model_name: str, cell: CompuCell.CellG = None,
+                             link: CompuCell.FocalPointPlasticityLinkBase = None) -> None:
+        """
+        Stores sbml solver in the dictionary of a cell or a link
+
+        :param rr: sbml solver
+        :type rr: RoadRunnerPy
+        :param model_name: model name
+        :param cell: cell object
+        :param link: link object
+        :return: None
+        """
+
+        if cell is not None:
+            dict_attrib = CompuCell.getPyAttrib(cell)
+            sbml_key = 'SBMLSolver'
+            CompuCellSetup.persistent_globals.unbatched_cell_sbml = True
+        else:
+            dict_attrib = link.dict
+            sbml_key = CompuCell.FocalPointPlasticityLinkBase.__sbml__
+
+        if sbml_key not in dict_attrib:
+            dict_attrib[sbml_key] = {}
+
+        dict_attrib[sbml_key][model_name] = rr
+
+    @staticmethod
+    def __clone_batched_sbml(cell_model, model_name: str, cell: CompuCell.CellG) -> None:
+        """
+        Adds cell to the batch of cell_model using state of cell_model
+
+        :param cell_model: source model
+        :type cell_model: SBMLBatchCellModel
+        :param model_name: model name
+        :param cell: target cell
+        :return: None
+        """
+
+        dict_attrib = CompuCell.getPyAttrib(cell)
+        if 'SBMLSolver' not in dict_attrib:
+            dict_attrib['SBMLSolver'] = {}
+
+        dict_attrib['SBMLSolver'][model_name] = cell_model.batch.clone_cell(key=cell_model.key, cell_id=cell.id)
 
     @deprecated(version='4.0.0', reason="You should use : normalize_path")
     def normalizePath(self, _path):
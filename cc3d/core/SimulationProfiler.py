@@ -0,0 +1,108 @@
+"""
+Access to run times collected by C++ SimulationProfiler when simulation runs with profiling enabled
+(--profile command line option). Run times are reported per energy function, per C++ steppable and - for
+DiffusionSolverFE, FlexibleDiffusionSolverFE and ReactionDiffusionSolverFE - separately for secretion and
+diffusion. Energy function run times are summed over all Potts work nodes (threads) and can therefore exceed
+wall-clock time of Metropolis algorithm.
+
+Optional per-MCS timeline (--profile-timeline) is written as CSV (rows: mcs, category, name, time, calls) or,
+for .json/.jsonl files, as JSON Lines - one object per MCS.
+"""
+import csv
+import json
+from pathlib import Path
+
+# categories whose records count events (e.g. pixel copies) and have no run time
+COUNTER_CATEGORIES = ('PixelCopies',)
+
+
+def get_cpp_profiling_report(simulator, current_step_only: bool = False) -> dict:
+    """
+    Returns values collected by C++ profiler
+
+    :param simulator: simulator
+    :param bool current_step_only: if True, values of the most recent MCS are returned, otherwise totals
+    :return: dictionary {category: {name: {'time': run time in seconds, 'calls': number of calls}}}
+    :rtype: dict
+    """
+
+    profiler = simulator.getProfiler()
+    report = {}
+    for category in profiler.getCategories():
+        category_report = report[category] = {}
+        for name in profiler.getNames(category):
+            if current_step_only:
+                time_s, calls = profiler.getStepTime(category, name), profiler.getStepCalls(category, name)
+            else:
+                time_s, calls = profiler.getTotalTime(category, name), profiler.getTotalCalls(category, name)
+            category_report[name] = {'time': time_s, 'calls': calls}
+
+    return report
+
+
+def print_cpp_profiling_report(cpp_profiler_report: dict, total_run_time: float) -> None:
+    """
+    prints breakdown of compiled code run time
+
+    :param dict cpp_profiler_report: report returned by get_cpp_profiling_report
+    :param float total_run_time: total run time in milliseconds
+    :return: None
+    """
+    profiling_format = '{:>32.32}: {:11.2f} ({:5.1%}) calls: {}'
+    counter_format = '{:>32.32}: {:11d}'
+
+    print('-----------------------------------------------------------')
+    print('COMPILED CODE (C++) RUNTIMES')
+
+    for category, category_report in sorted(cpp_profiler_report.items()):
+        print('-----------------------------------------------------------')
+        print(category)
+        for name, record in sorted(category_report.items()):
+            if category in COUNTER_CATEGORIES:
+                print(counter_format.format(name, record['calls']))
+            else:
+                print(profiling_format.format(name, record['time'], record['time'] * 1000.0 / total_run_time,
+                                              record['calls']))
+
+    print('-----------------------------------------------------------')
+
+
+class ProfilingTimelineWriter:
+    """
+    Writes values collected by C++ profiler during every MCS
+    """
+
+    def __init__(self, file_name: str):
+        """
+        :param str file_name: output file name - .csv for CSV, .json or .jsonl for JSON Lines
+        """
+        suffix = Path(file_name).suffix.lower()
+        if suffix not in ('.csv', '.json', '.jsonl'):
+            raise ValueError(f'Unsupported profiling timeline format: {file_name}. Use .csv, .json or .jsonl file')
+
+        self.json_format = suffix != '.csv'
+        self.file = open(file_name, 'w', newline='')
+        self.csv_writer = None
+        if not self.json_format:
+            self.csv_writer = csv.writer(self.file)
+            self.csv_writer.writerow(['mcs', 'category', 'name', 'time', 'calls'])
+
+    def write_step(self, simulator, mcs: int) -> None:
+        """
+        Writes values collected during most recent MCS
+
+        :param simulator: simulator
+        :param int mcs: MCS
+        :return: None
+        """
+        report = get_cpp_profiling_report(simulator, current_step_only=True)
+        if self.json_format:
+            self.file.write(json.dumps({'mcs': mcs, 'report': report}) + '\n')
+            return
+
+        for category, category_report in report.items():
+            for name, record in category_report.items():
+                self.csv_writer.writerow([mcs, category, name, record['time'], record['calls']])
+
+    def close(self) -> None:
+        self.file.close()
@@ -1,6 +1,7 @@
 import time
 from cc3d.core.PySteppables import SteppablePy
 from cc3d import CompuCellSetup
+from cc3d.core.BufferedCallbacks import flush_buffered_callbacks
 # from cc3d.core import SteppablePy
 
 
@@ -154,6 +155,9 @@ class SteppableRegistry(SteppablePy):
 
     def step(self, _mcs):
 
+        # events buffered during the MCS are delivered before steppables run
+        flush_buffered_callbacks()
+
         for steppable in self.steppableList:
 
             # this executes given steppable every "frequency" Monte Carlo Steps
@@ -38,9 +38,8 @@ class CellListIterator:
     def __init__(self, cell_list):
         self.next = self.__next__
         self.inventory = cell_list.inventory
-        self.invItr = CompuCell.STLPyIteratorCINV()
-        self.invItr.initialize(self.inventory.getContainer())
-        self.invItr.setToBegin()
+        # all cells are fetched in a single call - iterator visits cells that exist when iteration starts
+        self.cell_itr = iter(self.inventory.getCells())
 
     def __next__(self):
         """
@@ -48,12 +47,8 @@ class CellListIterator:
         :return: a cell
         :rtype: cc3d.cpp.CompuCell.CellG
         """
-        if not self.invItr.isEnd():
-            self.cell = self.invItr.getCurrentRef()
-            self.invItr.next()
-            return self.cell
-        else:
-            raise StopIteration
+        self.cell = next(self.cell_itr)
+        return self.cell
 
     def __iter__(self):
         return self
@@ -63,17 +58,15 @@ class CellListIterator:
 # iterating over inventory of cells of a given type
 class CellListByType:
     """
-    List of all cells in current inventory of a variable number of particular types
+    List of all cells in current inventory of a variable number of particular types. Cells are selected
+    when iteration starts so the list always reflects current inventory
     """
     def __init__(self, inventory, *args):
         self.inventory = inventory
 
         self.types = CompuCell.vectorint()
 
-        self.inventoryByType = CompuCell.mapLongCellGPtr()
-
         self.initTypeVec(args)
-        self.inventory.initCellInventoryByMultiType(self.inventoryByType, self.types)
 
     def __iter__(self):
         """
@@ -89,7 +82,7 @@ class CellListByType:
         :return: number of cells
         :rtype: int
         """
-        return int(self.inventoryByType.size())
+        return int(self.inventory.getNumberOfCellsByType(self.types))
 
     def initTypeVec(self, _type_list):
 
@@ -103,18 +96,16 @@ class CellListByType:
     def initializeWithType(self, _type):
         self.types.clear()
         self.types.push_back(_type)
-        self.inventory.initCellInventoryByMultiType(self.inventoryByType, self.types)
 
     def refresh(self):
-        self.inventory.initCellInventoryByMultiType(self.inventoryByType, self.types)
+        # kept for backward compatibility - cells are selected every time iteration starts
+        pass
 
 
 class CellListByTypeIterator:
     def __init__(self, _cellListByType):
-        self.inventoryByType = _cellListByType.inventoryByType
-        self.invItr = CompuCell.mapLongCellGPtrPyItr()
-        self.invItr.initialize(self.inventoryByType)
-        self.invItr.setToBegin()
+        # cells of selected types are fetched in a single call
+        self.cell_itr = iter(_cellListByType.inventory.getCellsByType(_cellListByType.types))
         self.next = self.__next__
 
     def __next__(self):
@@ -123,15 +114,8 @@ class CellListByTypeIterator:
         :return: a cell
         :rtype: cc3d.cpp.CompuCell.CellG
         """
-        if not self.invItr.isEnd():
-            self.cell = self.invItr.getCurrentRef()
-            # print 'self.idCellPair=',self.idCellPair
-            # print 'dir(self.idCellPair)=',dir(self.idCellPair)
-            self.invItr.next()
-            return self.cell
-        #
-        else:
-            raise StopIteration
+        self.cell = next(self.cell_itr)
+        return self.cell
 
     def __iter__(self):
         return self
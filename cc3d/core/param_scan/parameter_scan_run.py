@@ -45,7 +45,8 @@ def main():
                  output_dir=output_dir,
                  output_frequency=output_frequency,
                  screenshot_output_frequency=screenshot_output_frequency,
-                 run_script=run_script)
+                 run_script=run_script,
+                 staging_mode=args.staging_mode)
 
 
 def execute_scan(cc3d_proj_fname: str,
@@ -53,7 +54,8 @@ def execute_scan(cc3d_proj_fname: str,
                  output_frequency: int,
                  screenshot_output_frequency: int,
                  run_script: str,
-                 gui_flag: bool = False):
+                 gui_flag: bool = False,
+                 staging_mode: str = 'copy'):
     """
     Executes parameter scan
 
@@ -69,6 +71,9 @@ def execute_scan(cc3d_proj_fname: str,
     :type run_script: str
     :param gui_flag: optional flag for gui-based execution; launches will pass additional argument '--exit-when-done'
     :type gui_flag: bool
+    :param staging_mode: how project files that are not templates are placed in iteration output folders - one of
+        'copy', 'hardlink', 'symlink'. Linked files are shared with the original project
+    :type staging_mode: str
     :return: None
     """
 
@@ -116,7 +121,7 @@ def execute_scan(cc3d_proj_fname: str,
 
         run_single_param_scan_simulation(cc3d_proj_fname=cc3d_proj_fname, run_script=run_script, gui_flag=gui_flag,
                                          current_scan_parameters=current_scan_parameters, output_dir=output_dir,
-                                         arg_list=arg_list)
+                                         arg_list=arg_list, staging_mode=staging_mode)
 
         if stop_scan:
             handle_param_scan_complete(output_dir)
@@ -138,6 +143,10 @@ class ParamScanArgumentParser(argparse.ArgumentParser):
         self.add_argument('--screenshot-output-frequency', required=False, action='store', default=0, type=int,
                           help='screenshot output frequency')
         self.add_argument('--install-dir', required=True, type=str, help='CC3D install directory')
+        self.add_argument('--staging-mode', required=False, action='store', default='copy',
+                          choices=['copy', 'hardlink', 'symlink'],
+                          help='how project files that are not templates are placed in iteration output folders. '
+                               'Linked files are shared with the original project and must not be modified')
         # Legacy support
         self.add_argument('--gui', required=False, action='store_true', default=False,
                           help='flag indicating whether to use Player or not')
@@ -12,7 +12,7 @@ from cc3d.core.CC3DSimulationDataHandler import CC3DSimulationDataHandler
 from cc3d.core.filelock import FileLock
 from cc3d.core.ParameterScanEnums import SCAN_FINISHED_OR_DIRECTORY_ISSUE
 import cc3d.core.param_scan
-from .template_utils import generate_simulation_files_from_template
+from .template_utils import stage_simulation_from_template
 
 
 class ParamScanStop(Exception):
@@ -308,7 +308,7 @@ def next_cartesian_product_from_state(curr_list: List[int], max_list: List[int])
 
 def run_single_param_scan_simulation(cc3d_proj_fname: Union[str, Path], current_scan_parameters: dict,
                                      run_script: Union[str, Path] = '', gui_flag: bool = False,
-                                     output_dir: str = None, arg_list: list = []):
+                                     output_dir: str = None, arg_list: list = [], staging_mode: str = 'copy'):
     """
     Given the set of scanned parameters This function creates CC3D project (by applying)
     parameter set to the .cc3d template and the runs such newly created simulation
@@ -317,6 +317,8 @@ def run_single_param_scan_simulation(cc3d_proj_fname: Union[str, Path], current_
     :param cc3d_proj_fname:{str, Path} - path to the "original" cc3d project
     :param current_scan_parameters: {str, path} dictionary with current set of parameters for the simulation
     :param output_dir:{str, Path} output directory
+    :param staging_mode: {str} how project files that are not templates are placed in the iteration output folder -
+    one of 'copy', 'hardlink', 'symlink'. Linked files are shared with the original project
     :return:
     """
 
@@ -334,17 +336,17 @@ def run_single_param_scan_simulation(cc3d_proj_fname: Union[str, Path], current_
     with open(str(scan_iteration_output_dir.joinpath('current_scan_parameters.json')), 'w') as fout:
         json.dump(obj=current_scan_parameters, fp=fout, indent=4)
 
-    # copy template to the iteration output folder
-    copy_project_to_output_folder(cc3d_proj_fname=cc3d_proj_fname, output_dir=scan_iteration_output_dir)
-
-    # replace macros in cc3d template (in XML and py) with actual values to create a valid, runnable cc3d project
+    # stage template in the iteration output folder - macros in cc3d template (in XML and py) are replaced
+    # with actual values to create a valid, runnable cc3d project. Remaining project files are staged according
+    # to staging_mode
 
     cc3d_proj_template = cc3d_proj_pth_in_output_dir(cc3d_proj_fname=cc3d_proj_fname,
                                                      output_dir=scan_iteration_output_dir)
 
     print("current_scan_parameters=", current_scan_parameters)
     param_dict = current_scan_parameters['parameters']
-    generate_simulation_files_from_template(cc3d_proj_template=cc3d_proj_template, param_dict=param_dict)
+    stage_simulation_from_template(cc3d_proj_template=cc3d_proj_fname, target_dir=cc3d_proj_template.parent,
+                                   param_dict=param_dict, staging_mode=staging_mode)
 
     # at this point arg_list may have args from main script
     arg_list_local = deepcopy(arg_list)
@@ -1,8 +1,17 @@
+import os
+import shutil
 from typing import Union
 from pathlib import Path
 from jinja2 import Environment, FileSystemLoader
 from glob import glob
 
+REPLACEMENT_CANDIDATE_GLOBS = ['*.py', '*xml']
+
+STAGING_MODES = ('copy', 'hardlink', 'symlink')
+
+# {project_dir:SimulationTemplate} - templates are compiled once per process
+_simulation_template_cache = {}
+
 
 def generate_simulation_files_from_template(cc3d_proj_template: Union[Path, str], param_dict: dict) -> None:
     """
@@ -20,7 +29,7 @@ def generate_simulation_files_from_template(cc3d_proj_template: Union[Path, str]
     """
     simulation_template_dir = Path(cc3d_proj_template).parent
 
-    replacement_candidate_globs = ['*.py', '*xml']
+    replacement_candidate_globs = REPLACEMENT_CANDIDATE_GLOBS
 
     replacement_candidates = []
     for glob_pattern in replacement_candidate_globs:
@@ -36,3 +45,149 @@ def generate_simulation_files_from_template(cc3d_proj_template: Union[Path, str]
 
         with open(replacement_candidate_fname, 'w') as fout:
             fout.write(filled_out_template_str)
+
+
+def stage_file(src: Union[Path, str], dst: Union[Path, str], staging_mode: str = 'copy') -> None:
+    """
+    Places a file that is not a template in the staged project. Depending on staging_mode file is copied,
+    hard-linked or symlinked. If linking is not possible (e.g. target is on a different file system) file gets copied
+
+    :param src: {str, Path} source file
+    :param dst: {str, Path} destination file
+    :param staging_mode: {str} one of 'copy', 'hardlink', 'symlink'
+    :return: None
+    """
+
+    try:
+        if staging_mode == 'hardlink':
+            os.link(str(src), str(dst))
+            return
+        elif staging_mode == 'symlink':
+            os.symlink(str(Path(src).resolve()), str(dst))
+            return
+    except (OSError, NotImplementedError):
+        pass
+
+    shutil.copy2(str(src), str(dst))
+
+
+class SimulationTemplate:
+    """
+    Compiled .cc3d project template. Jinja2 templates (*.py and *xml files) are parsed and compiled once and
+    can be rendered into many staged projects. Files that are not templates (e.g. PIFF initial conditions,
+    SBML or CSV inputs) are copied into the staged project unless linking is requested explicitly.
+    Linked files are shared with the original project and must be treated as read-only by simulations
+    """
+
+    def __init__(self, cc3d_proj_template: Union[Path, str]):
+        """
+        :param cc3d_proj_template: {str, Path} path to the .cc3d project template
+        """
+
+        self.cc3d_proj_template = Path(cc3d_proj_template).resolve()
+        self.project_dir = self.cc3d_proj_template.parent
+
+        template_fnames = set()
+        for glob_pattern in REPLACEMENT_CANDIDATE_GLOBS:
+            template_fnames.update(glob(str(self.project_dir.joinpath('**', glob_pattern)), recursive=True))
+
+        j2_env = Environment(loader=FileSystemLoader(str(self.project_dir)), trim_blocks=True)
+
+        # {relative posix path:compiled template}
+        self.templates = {}
+        for template_fname in template_fnames:
+            rel_path = Path(template_fname).relative_to(self.project_dir).as_posix()
+            self.templates[rel_path] = j2_env.get_template(rel_path)
+
+        self.signature = self.compute_signature()
+
+    def compute_signature(self) -> tuple:
+        """
+        Returns modification times of template files. Used to detect templates that changed on disk
+        :return: {tuple}
+        """
+
+        return tuple(sorted((rel_path, self.project_dir.joinpath(rel_path).stat().st_mtime)
+                            for rel_path in self.templates.keys()))
+
+    def stage(self, target_dir: Union[Path, str], param_dict: dict, staging_mode: str = 'copy') -> Path:
+        """
+        Creates runnable project in target_dir. Templates are rendered using param_dict, remaining files are
+        staged according to staging_mode
+
+        :param target_dir: {str, Path} directory of the staged project. Must not exist
+        :param param_dict: {dict} - dictionary of template parameters
+        :param staging_mode: {str} one of 'copy', 'hardlink', 'symlink'
+        :return: {Path} path to .cc3d file of the staged project
+        """
+
+        if staging_mode not in STAGING_MODES:
+            raise ValueError('Unknown staging mode {}. Supported modes are: {}'.format(
+                staging_mode, ', '.join(STAGING_MODES)))
+
+        target_dir = Path(target_dir)
+        target_dir.mkdir(parents=True, exist_ok=False)
+
+        for root, dirs, files in os.walk(str(self.project_dir)):
+            root_pth = Path(root)
+            target_root = target_dir.joinpath(root_pth.relative_to(self.project_dir))
+
+            for dirname in dirs:
+                target_root.joinpath(dirname).mkdir()
+
+            for fname in files:
+                rel_path = root_pth.joinpath(fname).relative_to(self.project_dir).as_posix()
+                target_fname = target_root.joinpath(fname)
+
+                try:
+                    template = self.templates[rel_path]
+                except KeyError:
+                    stage_file(src=root_pth.joinpath(fname), dst=target_fname, staging_mode=staging_mode)
+                    continue
+
+                with open(str(target_fname), 'w') as fout:
+                    fout.write(template.render(**param_dict))
+
+        return target_dir.joinpath(self.cc3d_proj_template.name)
+
+
+def get_simulation_template(cc3d_proj_template: Union[Path, str]) -> SimulationTemplate:
+    """
+    Returns compiled simulation template. Templates are compiled once per process and recompiled only
+    when template files change on disk
+
+    :param cc3d_proj_template: {str, Path} path to the .cc3d project template
+    :return: {SimulationTemplate}
+    """
+
+    key = str(Path(cc3d_proj_template).resolve())
+
+    try:
+        simulation_template = _simulation_template_cache[key]
+        if simulation_template.signature == simulation_template.compute_signature():
+            return simulation_template
+    except (KeyError, OSError):
+        pass
+
+    simulation_template = SimulationTemplate(cc3d_proj_template)
+    _simulation_template_cache[key] = simulation_template
+
+    return simulation_template
+
+
+def stage_simulation_from_template(cc3d_proj_template: Union[Path, str], target_dir: Union[Path, str],
+                                   param_dict: dict, staging_mode: str = 'copy') -> Path:
+    """
+    Creates runnable project in target_dir from the .cc3d project template. Templates are compiled once per process
+    and rendered directly into target_dir, remaining files are staged according to staging_mode
+    (see SimulationTemplate.stage)
+
+    :param cc3d_proj_template: {str, Path} path to the .cc3d project template - it is not modified
+    :param target_dir: {str, Path} directory of the staged project. Must not exist
+    :param param_dict: {dict} - dictionary of template parameters used to replace template labels with actual parameters
+    :param staging_mode: {str} one of 'copy', 'hardlink', 'symlink'
+    :return: {Path} path to .cc3d file of the staged project
+    """
+
+    return get_simulation_template(cc3d_proj_template).stage(target_dir=target_dir, param_dict=param_dict,
+                                                             staging_mode=staging_mode)
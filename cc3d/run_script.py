@@ -34,6 +34,13 @@ def process_cml():
     cml_parser.add_argument('-f', '--output-frequency', required=False, action='store', default=0, type=int,
                             help='simulation snapshot output frequency')
 
+    cml_parser.add_argument('--output-format', required=False, action='store', default='vti', choices=['vti', 'vtk'],
+                            help='simulation snapshot format - compressed binary VTK XML (vti) or legacy VTK (vtk)')
+
+    cml_parser.add_argument('--output-keyframe-interval', required=False, action='store', default=0, type=int,
+                            help='number of simulation snapshots per keyframe - remaining snapshots store only '
+                                 'cell field changes since previous snapshot')
+
     cml_parser.add_argument('-fs', '--screenshot-output-frequency', required=False, action='store', default=0, type=int,
                             help='screenshot output frequency')
 
@@ -43,6 +50,17 @@ def process_cml():
     cml_parser.add_argument('--restart-multiple-snapshots', required=False, action='store_true', default=False,
                             help='turns on storing of multiple restart snapshots')
 
+    cml_parser.add_argument('--restart-asynchronous-output', required=False, action='store_true', default=False,
+                            help='turns on writing of restart snapshots in the background')
+
+    cml_parser.add_argument('--profile', required=False, action='store_true', default=False,
+                            help='turns on reporting of run times of energy functions, C++ steppables '
+                                 'and PDE solvers')
+
+    cml_parser.add_argument('--profile-timeline', required=False, type=str, default=None,
+                            help='optional .csv, .json or .jsonl file storing run times collected during every MCS '
+                                 '- implies --profile')
+
     cml_parser.add_argument('--parameter-scan-iteration', required=False, type=str, default='',
                             help='optional argument that specifies parameter scan iteration - used to enable steppables'
                                  'to access current param scan iteration number')
@@ -81,6 +99,7 @@ if __name__ == '__main__':
     screenshot_output_frequency = args.screenshot_output_frequency
     restart_snapshot_frequency = args.restart_snapshot_frequency
     restart_multiple_snapshots = args.restart_multiple_snapshots
+    restart_asynchronous_output = args.restart_asynchronous_output
 
     output_dir = args.output_dir
     output_file_core_name = args.output_file_core_name
@@ -94,12 +113,17 @@ if __name__ == '__main__':
 
     persistent_globals.simulation_file_name = cc3d_sim_fname_abs
     persistent_globals.output_frequency = output_frequency
+    persistent_globals.output_format = args.output_format
+    persistent_globals.output_keyframe_interval = args.output_keyframe_interval
     persistent_globals.screenshot_output_frequency = screenshot_output_frequency
     persistent_globals.set_output_dir(output_dir)
     persistent_globals.output_file_core_name = output_file_core_name
     persistent_globals.restart_snapshot_frequency = restart_snapshot_frequency
     persistent_globals.restart_multiple_snapshots = restart_multiple_snapshots
+    persistent_globals.restart_asynchronous_output = restart_asynchronous_output
     persistent_globals.parameter_scan_iteration = args.parameter_scan_iteration
+    persistent_globals.profile_simulation = args.profile or args.profile_timeline is not None
+    persistent_globals.profiling_timeline_file = args.profile_timeline
 
     run_cc3d_project(cc3d_sim_fname=cc3d_sim_fname_abs)
 
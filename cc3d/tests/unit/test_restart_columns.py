@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip('cc3d.cpp.CompuCell')
+
+# CompuCellSetup has to be initialized before modules that use steppables
+from cc3d import CompuCellSetup  # noqa: F401
+from cc3d.core.RestartManager import RestartManager, RESTART_FORMAT_VERSION
+
+
+def restart_manager(restart_dir, format_version=RESTART_FORMAT_VERSION, resources=None):
+    """
+    RestartManager that reads and writes files in restart_dir without a running simulation
+    """
+    manager = RestartManager.__new__(RestartManager)
+    manager._RestartManager__snapshot_writes = None
+    manager._RestartManager__restartDirectory = str(restart_dir)
+    manager._RestartManager__restart_format_version = format_version
+    manager._RestartManager__restart_resource_dict = resources or {}
+    return manager
+
+
+def test_columns_round_trip(tmp_path):
+    manager = restart_manager(tmp_path)
+
+    cell_ids = [3, 1, 7]
+    densities = [[0.5, 1.5], [], [2.0]]
+    columns = manager.ragged_columns('adhesionMoleculeDensity', densities)
+    columns['lambdaLength'] = [1.0, 2.0, 3.0]
+    columns['polarizationVector'] = np.arange(9, dtype=float).reshape(3, 3)
+
+    manager.save_columns(str(tmp_path / 'Plugin.npz'), cell_ids, columns)
+    loaded = manager.load_columns(SimpleNamespace(fileName='Plugin.npz'))
+
+    assert loaded['cell_id'].dtype == np.int64
+    assert loaded['cell_id'].tolist() == cell_ids
+
+    values, offsets = manager.ragged_column_arrays(loaded, 'adhesionMoleculeDensity')
+    assert values.dtype == np.float64 and offsets.dtype == np.int64
+    assert [values[begin:end].tolist() for begin, end in zip(offsets[:-1], offsets[1:])] == densities
+
+    stacked = manager.stack_columns(loaded, 'lambdaLength', 'polarizationVector')
+    assert stacked.dtype == np.float64 and stacked.flags.c_contiguous
+    np.testing.assert_array_equal(stacked, np.column_stack((columns['lambdaLength'], columns['polarizationVector'])))
+
+
+def test_ragged_column_rows():
+    columns = {'polarizationMarkers': np.array([9, 1, 2, 3, 4]), 'polarizationMarkers_offsets': np.array([1, 3, 5])}
+    np.testing.assert_array_equal(RestartManager.ragged_column_rows(columns, 'polarizationMarkers', 2),
+                                  [[1, 2], [3, 4]])
+
+    columns['polarizationMarkers_offsets'] = np.array([0, 3, 5])
+    with pytest.raises(RuntimeError, match='2 values per cell'):
+        RestartManager.ragged_column_rows(columns, 'polarizationMarkers', 2)
+
+
+def test_structured_points_layout(tmp_path):
+    file_name = tmp_path / 'CellField.dat'
+    cell_ids = np.arange(24).reshape(2, 3, 4)
+
+    RestartManager.write_structured_points(str(file_name), (2, 3, 4), [('CellId', 'long', cell_ids)])
+
+    data = file_name.read_bytes()
+    header, _, payload = data.partition(b'CellId 1 24 long\n')
+    assert b'DIMENSIONS 2 3 4\n' in header
+    assert b'FIELD FieldData 1\n' in header
+
+    # x index changes fastest
+    values = np.frombuffer(payload[:24 * np.dtype('l').itemsize], dtype=np.dtype('l').newbyteorder('>'))
+    np.testing.assert_array_equal(values, cell_ids.ravel(order='F'))
+
+
+def test_newer_format_version_is_rejected(tmp_path):
+    with pytest.raises(RuntimeError, match='format version'):
+        restart_manager(tmp_path, format_version=RESTART_FORMAT_VERSION + 1).check_restart_format_version()
+
+
+def test_legacy_format_version(tmp_path):
+    legacy_resources = {'LengthConstraint': SimpleNamespace(objectType='Pickle')}
+    restart_manager(tmp_path, format_version=1, resources=legacy_resources).check_restart_format_version()
+
+    columnar_resources = {'LengthConstraint': SimpleNamespace(objectType='Columnar')}
+    with pytest.raises(RuntimeError, match='LengthConstraint'):
+        restart_manager(tmp_path, format_version=1, resources=columnar_resources).check_restart_format_version()
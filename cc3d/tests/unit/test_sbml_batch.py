@@ -0,0 +1,256 @@
+import gc
+import pickle
+
+import numpy as np
+import pytest
+
+roadrunner = pytest.importorskip('roadrunner')
+
+from cc3d.core.RoadRunnerPy import RoadRunnerPy
+from cc3d.core.SBMLBatch import SBMLBatch, restore_batched_cell_model, stack_sbml_model
+
+MATH = 'xmlns="http://www.w3.org/1998/Math/MathML"'
+
+# S0 -> S1 -> S2 decay chain. Event with delay counts how many times S0 dropped below 0.5
+SBML = f'''<?xml version="1.0" encoding="UTF-8"?>
+<sbml xmlns="http://www.sbml.org/sbml/level3/version1/core" level="3" version="1">
+  <model id="decay_chain">
+    <listOfCompartments>
+      <compartment id="c" size="1" constant="true" spatialDimensions="3"/>
+    </listOfCompartments>
+    <listOfSpecies>
+      <species id="S0" compartment="c" initialAmount="1" hasOnlySubstanceUnits="true" boundaryCondition="false"
+               constant="false"/>
+      <species id="S1" compartment="c" initialAmount="0" hasOnlySubstanceUnits="true" boundaryCondition="false"
+               constant="false"/>
+      <species id="S2" compartment="c" initialAmount="0" hasOnlySubstanceUnits="true" boundaryCondition="false"
+               constant="false"/>
+    </listOfSpecies>
+    <listOfParameters>
+      <parameter id="k" value="0.5" constant="false"/>
+      <parameter id="crossings" value="0" constant="false"/>
+    </listOfParameters>
+    <listOfReactions>
+      <reaction id="J0" reversible="false">
+        <listOfReactants><speciesReference species="S0" stoichiometry="1" constant="true"/></listOfReactants>
+        <listOfProducts><speciesReference species="S1" stoichiometry="1" constant="true"/></listOfProducts>
+        <kineticLaw><math {MATH}><apply><times/><ci>k</ci><ci>S0</ci></apply></math></kineticLaw>
+      </reaction>
+      <reaction id="J1" reversible="false">
+        <listOfReactants><speciesReference species="S1" stoichiometry="1" constant="true"/></listOfReactants>
+        <listOfProducts><speciesReference species="S2" stoichiometry="1" constant="true"/></listOfProducts>
+        <kineticLaw><math {MATH}><apply><times/><ci>k</ci><ci>S1</ci></apply></math></kineticLaw>
+      </reaction>
+    </listOfReactions>
+    <listOfEvents>
+      <event id="E0" useValuesFromTriggerTime="true">
+        <trigger initialValue="true" persistent="true">
+          <math {MATH}><apply><lt/><ci>S0</ci><cn>0.5</cn></apply></math>
+        </trigger>
+        <delay><math {MATH}><cn>2.5</cn></math></delay>
+        <listOfEventAssignments>
+          <eventAssignment variable="crossings">
+            <math {MATH}><apply><plus/><ci>crossings</ci><cn>1</cn></apply></math>
+          </eventAssignment>
+        </listOfEventAssignments>
+      </event>
+    </listOfEvents>
+  </model>
+</sbml>
+'''
+
+INITIAL_S0 = [0.6, 1.0, 2.0, 3.0, 40.0]
+
+
+def set_tolerances(rr):
+    # default tolerances are too loose to compare solvers integrating with and without restarts
+    rr.getIntegrator().relative_tolerance = 1e-10
+    rr.getIntegrator().absolute_tolerance = 1e-12
+
+
+SBML_WITHOUT_EVENTS = SBML.split('    <listOfEvents>')[0] + SBML.split('</listOfEvents>\n')[1]
+
+
+def create_batch(block_size, sbml=SBML):
+    rr = RoadRunnerPy(_modelString=sbml)
+    rr.loadSBML()
+    rr.selections = []
+    set_tolerances(rr)
+    return SBMLBatch(model_name='decay_chain', rr=rr, block_size=block_size)
+
+
+def reference_values(initial_s0, num_steps):
+    """
+    Integrates every cell by its own solver without restarting integrator
+    """
+    values = []
+    for s0 in initial_s0:
+        rr = roadrunner.RoadRunner(SBML)
+        rr.selections = []
+        set_tolerances(rr)
+        rr.model['S0'] = s0
+        for step in range(num_steps):
+            rr.oneStep(float(step), 1.0, step == 0)
+        values.append([rr.model['S0'], rr.model['S1'], rr.model['crossings']])
+    return np.array(values)
+
+
+def test_stacked_model_has_independent_copies():
+    stacked_rr = roadrunner.RoadRunner(stack_sbml_model(SBML, 3))
+
+    assert stacked_rr.model.getNumFloatingSpecies() == 9
+    assert stacked_rr.model.getNumEvents() == 3
+    assert stacked_rr.model.getNumReactions() == 6
+
+
+def test_row_load_store():
+    batch = create_batch(block_size=0)
+    cell_models = [batch.add_cell(cell_id=cell_id, initial_conditions={'S0': s0})
+                   for cell_id, s0 in enumerate(INITIAL_S0)]
+
+    assert len(batch) == len(INITIAL_S0)
+    np.testing.assert_array_equal(batch.get_values('S0'), INITIAL_S0)
+    np.testing.assert_array_equal(batch.cell_ids, range(len(INITIAL_S0)))
+
+    # row state is transferred to the shared solver and back without changes
+    batch.load_row(batch.row(cell_models[3].key))
+    assert batch.rr.model['S0'] == INITIAL_S0[3]
+    batch.store_row(batch.row(cell_models[0].key))
+    assert cell_models[0]['S0'] == INITIAL_S0[3]
+
+    # values that are not array columns are evaluated by the shared solver
+    cell_models[1]['k'] = 2.0
+    assert cell_models[1]['J0'] == pytest.approx(2.0 * INITIAL_S0[1])
+
+    # released row is replaced by the last row
+    del cell_models[1]
+    gc.collect()
+    assert len(batch) == len(INITIAL_S0) - 1
+    assert sorted(batch.cell_ids) == [0, 2, 3, 4]
+    assert cell_models[-1]['S0'] == INITIAL_S0[4]
+
+
+@pytest.mark.parametrize('block_size', [0, 2, 8])
+def test_timestep_matches_independent_solvers(block_size):
+    batch = create_batch(block_size=block_size)
+    cell_models = [batch.add_cell(cell_id=cell_id, initial_conditions={'S0': s0})
+                   for cell_id, s0 in enumerate(INITIAL_S0)]
+
+    for step in range(8):
+        batch.timestep()
+
+    values = np.array([[cell_model['S0'], cell_model['S1'], cell_model['crossings']]
+                       for cell_model in cell_models])
+    expected = reference_values(INITIAL_S0, 8)
+
+    np.testing.assert_allclose(values[:, :2], expected[:, :2], rtol=1e-6, atol=1e-9)
+    assert cell_models[0].timeStart == 8.0
+
+    if block_size > 0:
+        # delayed events of every cell are kept until they fire - rows integrated one by one by the shared solver
+        # lose events scheduled while other rows were loaded
+        np.testing.assert_array_equal(values[:, 2], expected[:, 2])
+        np.testing.assert_array_equal(values[:, 2], [1, 1, 1, 1, 0])
+
+
+@pytest.mark.parametrize('sbml', [SBML, SBML_WITHOUT_EVENTS])
+def test_block_integration_uses_modified_values_and_rows(sbml):
+    batch = create_batch(block_size=2, sbml=sbml)
+    cell_models = [batch.add_cell(cell_id=cell_id, initial_conditions={'S0': 1.0}) for cell_id in range(3)]
+    batch.timestep()
+
+    cell_models[1]['S0'] = 4.0
+    batch.get_values('S0')[2] = 0.0
+    cell_models.append(batch.clone_cell(key=cell_models[0].key, cell_id=3))
+    batch.timestep()
+
+    s0 = [cell_model['S0'] for cell_model in cell_models]
+    decay = np.exp(-0.5)
+    np.testing.assert_allclose(s0, [decay ** 2, 4.0 * decay, 0.0, decay ** 2], rtol=1e-6, atol=1e-9)
+
+    # first row is removed - the last row takes its place
+    del cell_models[0]
+    gc.collect()
+    batch.timestep()
+
+    s0 = [cell_model['S0'] for cell_model in cell_models]
+    np.testing.assert_allclose(s0, [4.0 * decay ** 2, 0.0, decay ** 3], rtol=1e-6, atol=1e-9)
+
+
+def test_cell_model_pickles_as_solver_with_model_source():
+    batch = create_batch(block_size=2)
+    cell_model = batch.add_cell(cell_id=1, step_size=0.5, initial_conditions={'S0': 3.0})
+    batch.timestep()
+
+    rr = pickle.loads(pickle.dumps(cell_model))
+
+    assert isinstance(rr, RoadRunnerPy)
+    assert rr.path == ''
+    assert rr.modelString == SBML
+
+    # restart - model is loaded from the pickled model string
+    rr.loadSBML()
+    assert rr.model['S0'] == pytest.approx(cell_model['S0'])
+    assert rr.model['S1'] == pytest.approx(cell_model['S1'])
+    assert rr.stepSize == 0.5
+    assert rr.timeStart == 0.5
+
+
+def test_clone_cell_copies_row_state():
+    batch = create_batch(block_size=2)
+    cell_model = batch.add_cell(cell_id=1, step_size=0.5, initial_conditions={'S0': 3.0})
+    batch.timestep()
+    cell_model['k'] = 2.0
+
+    clone = batch.clone_cell(key=cell_model.key, cell_id=2)
+
+    assert clone.cell_id == 2 and clone.key != cell_model.key
+    assert clone.items() == cell_model.items()
+    assert clone.stepSize == 0.5 and clone.timeStart == 0.5
+
+    # rows are independent
+    clone['S0'] = 10.0
+    assert cell_model['S0'] != 10.0
+
+
+def test_restart_restores_batch():
+    batch = create_batch(block_size=2)
+    cell_models = [batch.add_cell(cell_id=cell_id, step_size=0.5, initial_conditions={'S0': s0})
+                   for cell_id, s0 in enumerate(INITIAL_S0)]
+    for step in range(3):
+        batch.timestep()
+
+    restored_rrs = [pickle.loads(pickle.dumps(cell_model)) for cell_model in cell_models]
+    batches = {}
+    restored_models = []
+    for cell_id, rr in enumerate(restored_rrs):
+        rr.loadSBML()
+        assert rr.batchState['ModelName'] == 'decay_chain'
+        restored_models.append(restore_batched_cell_model(batches=batches, rr=rr, cell_id=cell_id))
+
+    restored_batch = batches['decay_chain']
+    assert len(restored_batch) == len(INITIAL_S0)
+    assert restored_batch.block_size == 2
+    assert restored_batch.rr.getIntegrator().relative_tolerance == 1e-10
+    np.testing.assert_array_equal(restored_batch.cell_ids, range(len(INITIAL_S0)))
+    for cell_model, restored_model in zip(cell_models, restored_models):
+        assert restored_model.batch is restored_batch
+        assert restored_model.stepSize == 0.5 and restored_model.timeStart == 1.5
+        np.testing.assert_allclose(restored_model.values(), cell_model.values(), rtol=1e-12)
+
+    # cells added after restart start from the initial state of the model
+    assert restored_batch.add_cell(cell_id=10)['S0'] == 1.0
+
+    batch.timestep()
+    restored_batch.timestep()
+    np.testing.assert_allclose(restored_batch.get_values('S0')[:len(INITIAL_S0)], batch.get_values('S0'),
+                               rtol=1e-6, atol=1e-9)
+
+
+def test_regular_solver_has_no_batch_state():
+    rr = RoadRunnerPy(_modelString=SBML)
+    rr.loadSBML()
+
+    restored_rr = pickle.loads(pickle.dumps(rr))
+    restored_rr.loadSBML()
+    assert restored_rr.batchState is None
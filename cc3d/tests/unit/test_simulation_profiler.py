@@ -0,0 +1,98 @@
+import csv
+import json
+
+import pytest
+
+from cc3d.core.SimulationProfiler import ProfilingTimelineWriter, get_cpp_profiling_report
+
+
+class FakeProfiler:
+    """
+    Stands in for C++ SimulationProfiler - records are {category: {name: (step time, step calls)}}
+    """
+
+    def __init__(self, records):
+        self.records = records
+
+    def getCategories(self):
+        return list(self.records)
+
+    def getNames(self, category):
+        return list(self.records.get(category, {}))
+
+    def getStepTime(self, category, name):
+        return self.records[category][name][0]
+
+    def getStepCalls(self, category, name):
+        return self.records[category][name][1]
+
+    def getTotalTime(self, category, name):
+        return 10 * self.getStepTime(category, name)
+
+    def getTotalCalls(self, category, name):
+        return 10 * self.getStepCalls(category, name)
+
+
+class FakeSimulator:
+
+    def __init__(self, records):
+        self.profiler = FakeProfiler(records)
+
+    def getProfiler(self):
+        return self.profiler
+
+
+STEP_RECORDS = [
+    {'EnergyFunction': {'Volume': (0.25, 4)}, 'PixelCopies': {'Accepted': (0.0, 7)}},
+    {'EnergyFunction': {'Volume': (0.5, 3)}, 'PixelCopies': {'Accepted': (0.0, 2)}},
+]
+
+
+def write_timeline(file_name):
+    writer = ProfilingTimelineWriter(str(file_name))
+    try:
+        for mcs, records in enumerate(STEP_RECORDS):
+            writer.write_step(FakeSimulator(records), mcs)
+    finally:
+        writer.close()
+
+
+def test_report_totals_and_step_values():
+    simulator = FakeSimulator(STEP_RECORDS[0])
+
+    assert get_cpp_profiling_report(simulator, current_step_only=True)['EnergyFunction']['Volume'] == \
+        {'time': 0.25, 'calls': 4}
+    assert get_cpp_profiling_report(simulator)['EnergyFunction']['Volume'] == {'time': 2.5, 'calls': 40}
+
+
+def test_csv_timeline(tmp_path):
+    file_name = tmp_path / 'timeline.csv'
+    write_timeline(file_name)
+
+    with open(file_name, newline='') as f:
+        rows = list(csv.reader(f))
+
+    assert rows[0] == ['mcs', 'category', 'name', 'time', 'calls']
+    assert rows[1:] == [
+        ['0', 'EnergyFunction', 'Volume', '0.25', '4'],
+        ['0', 'PixelCopies', 'Accepted', '0.0', '7'],
+        ['1', 'EnergyFunction', 'Volume', '0.5', '3'],
+        ['1', 'PixelCopies', 'Accepted', '0.0', '2'],
+    ]
+
+
+@pytest.mark.parametrize('suffix', ['.json', '.jsonl'])
+def test_json_lines_timeline(tmp_path, suffix):
+    file_name = tmp_path / ('timeline' + suffix)
+    write_timeline(file_name)
+
+    lines = [json.loads(line) for line in file_name.read_text().splitlines()]
+
+    assert [line['mcs'] for line in lines] == [0, 1]
+    assert lines[1]['report'] == {'EnergyFunction': {'Volume': {'time': 0.5, 'calls': 3}},
+                                  'PixelCopies': {'Accepted': {'time': 0.0, 'calls': 2}}}
+
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(ValueError, match='Unsupported profiling timeline format'):
+        ProfilingTimelineWriter(str(tmp_path / 'timeline.txt'))
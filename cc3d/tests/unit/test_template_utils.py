@@ -0,0 +1,75 @@
+import os
+import time
+
+import pytest
+
+from cc3d.core.param_scan.template_utils import get_simulation_template, stage_simulation_from_template
+
+
+@pytest.fixture
+def project(tmp_path):
+    project_dir = tmp_path / 'project'
+    (project_dir / 'Simulation').mkdir(parents=True)
+    (project_dir / 'demo.cc3d').write_text('<Simulation><PythonScript>Simulation/demo.py</PythonScript></Simulation>')
+    (project_dir / 'Simulation' / 'demo.py').write_text('temperature = {{temperature}}\n')
+    (project_dir / 'Simulation' / 'demo.xml').write_text('<Temperature>{{temperature}}</Temperature>\n')
+    (project_dir / 'Simulation' / 'cells.piff').write_text('0 Medium 0 0 0 0 0 0\n')
+    return project_dir / 'demo.cc3d'
+
+
+def test_stage_renders_templates_and_copies_remaining_files(project, tmp_path):
+    target_dir = tmp_path / 'staged'
+
+    cc3d_fname = stage_simulation_from_template(cc3d_proj_template=project, target_dir=target_dir,
+                                                param_dict={'temperature': 12.5})
+
+    assert cc3d_fname == target_dir / 'demo.cc3d'
+    assert (target_dir / 'Simulation' / 'demo.py').read_text() == 'temperature = 12.5'
+    assert (target_dir / 'Simulation' / 'demo.xml').read_text() == '<Temperature>12.5</Temperature>'
+
+    piff_fname = target_dir / 'Simulation' / 'cells.piff'
+    assert piff_fname.read_text() == '0 Medium 0 0 0 0 0 0\n'
+    assert not piff_fname.is_symlink()
+    assert not os.path.samefile(str(piff_fname), str(project.parent / 'Simulation' / 'cells.piff'))
+
+    # template is left untouched
+    assert (project.parent / 'Simulation' / 'demo.py').read_text() == 'temperature = {{temperature}}\n'
+
+
+def test_stage_links_files_when_requested(project, tmp_path):
+    src_piff_fname = project.parent / 'Simulation' / 'cells.piff'
+
+    stage_simulation_from_template(cc3d_proj_template=project, target_dir=tmp_path / 'hardlink',
+                                   param_dict={'temperature': 1}, staging_mode='hardlink')
+    assert os.path.samefile(str(tmp_path / 'hardlink' / 'Simulation' / 'cells.piff'), str(src_piff_fname))
+
+    stage_simulation_from_template(cc3d_proj_template=project, target_dir=tmp_path / 'symlink',
+                                   param_dict={'temperature': 1}, staging_mode='symlink')
+    assert (tmp_path / 'symlink' / 'Simulation' / 'cells.piff').resolve() == src_piff_fname.resolve()
+
+
+def test_stage_rejects_unknown_mode_and_existing_target(project, tmp_path):
+    with pytest.raises(ValueError):
+        stage_simulation_from_template(cc3d_proj_template=project, target_dir=tmp_path / 'staged',
+                                       param_dict={'temperature': 1}, staging_mode='move')
+
+    (tmp_path / 'existing').mkdir()
+    with pytest.raises(FileExistsError):
+        stage_simulation_from_template(cc3d_proj_template=project, target_dir=tmp_path / 'existing',
+                                       param_dict={'temperature': 1})
+
+
+def test_template_is_recompiled_when_changed_on_disk(project, tmp_path):
+    simulation_template = get_simulation_template(project)
+    assert get_simulation_template(project) is simulation_template
+
+    template_fname = project.parent / 'Simulation' / 'demo.py'
+    template_fname.write_text('temperature = 2 * {{temperature}}\n')
+    mtime = time.time() + 10
+    os.utime(str(template_fname), (mtime, mtime))
+
+    assert get_simulation_template(project) is not simulation_template
+
+    stage_simulation_from_template(cc3d_proj_template=project, target_dir=tmp_path / 'staged',
+                                   param_dict={'temperature': 3})
+    assert (tmp_path / 'staged' / 'Simulation' / 'demo.py').read_text() == 'temperature = 2 * 3'